@@ -4,16 +4,27 @@ Agents Package
 Chứa các agent cho hệ thống Phong Thủy Số
 """
 
-from python_adk.agents.root_agent.agent import root_agent  # Import only the instance
-from python_adk.agents.batcuclinh_so_agent import BatCucLinhSoAgent
+import importlib
+
+from python_adk.agents.root_agent.agent import get_root_agent
+from python_adk.shared_libraries.lazy import lazy_module_getattr
 # Removed PaymentAgent and UserAgent to prevent import issues
 # from python_adk.agents.payment_agent import PaymentAgent
 # from python_adk.agents.user_agent import UserAgent
 
+# root_agent và BatCucLinhSoAgent (kéo theo Google ADK) chỉ được nạp khi truy cập.
+# Bỏ thuộc tính subpackage `root_agent` do lệnh import trên gán, để tên này trỏ tới agent như trước
+del root_agent
+__getattr__ = lazy_module_getattr(__name__, {
+    "root_agent": get_root_agent,
+    "BatCucLinhSoAgent": lambda: importlib.import_module("python_adk.agents.batcuclinh_so_agent.agent").BatCucLinhSoAgent
+})
+
 __all__ = [
     'root_agent',
+    'get_root_agent',
     'BatCucLinhSoAgent',
     # Removed PaymentAgent and UserAgent to prevent import issues
     # 'PaymentAgent',
     # 'UserAgent'
-] 
\ No newline at end of file
+]
@@ -0,0 +1,147 @@
+"""
+Agent Pool Module
+
+Pool các instance agent cho một cặp (AgentType, model). Mỗi instance chỉ phục vụ một request
+tại một thời điểm (BaseAgent giữ context / lịch sử theo instance), nên kích thước pool chính là
+giới hạn số lượt chạy đồng thời của agent đó. Request phải chờ khi pool bận; hàng đợi có giới
+hạn, đầy thì từ chối ngay (429) và chờ quá lâu thì trả lỗi (503) thay vì dồn request.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List
+
+from python_adk.shared_libraries.logger import get_logger
+from python_adk.shared_libraries.metrics import LatencyStats
+
+
+class AgentOverloadedError(Exception):
+    """Agent quá tải: hàng đợi đầy (429) hoặc chờ quá thời gian (503)"""
+
+    def __init__(self, message: str, status_code: int = 429, retry_after: int = 1):
+        """
+        Args:
+            message: Thông báo lỗi
+            status_code: Mã HTTP gợi ý cho API (429 hoặc 503)
+            retry_after: Số giây client nên chờ trước khi thử lại
+        """
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class AgentPool:
+    """Pool instance agent với hàng đợi chờ có giới hạn"""
+
+    def __init__(
+        self,
+        name: str,
+        factory: Callable[[], Any],
+        size: int = 2,
+        max_waiters: int = 16,
+        wait_timeout: float = 30.0
+    ):
+        """
+        Khởi tạo AgentPool
+
+        Args:
+            name (str): Tên pool (dùng cho log / thống kê), ví dụ "batcuclinh_so:gemini-2.0-flash"
+            factory (Callable[[], Any]): Hàm tạo một instance agent mới
+            size (int): Số instance tối đa (số lượt chạy đồng thời)
+            max_waiters (int): Số request được phép chờ khi pool bận
+            wait_timeout (float): Thời gian chờ tối đa (giây)
+        """
+        self.name = name
+        self.size = max(1, size)
+        self.max_waiters = max(0, max_waiters)
+        self.wait_timeout = wait_timeout
+        self._factory = factory
+        self._idle: List[Any] = []
+        self._semaphore = asyncio.Semaphore(self.size)
+        self.logger = get_logger("AgentPool")
+
+        # Thống kê
+        self.created = 0
+        self.in_use = 0
+        self.waiting = 0
+        self.served = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.wait_time = LatencyStats()
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[Any]:
+        """
+        Mượn một instance agent trong suốt khối `async with`
+
+        Yields:
+            Any: Instance agent dùng riêng cho request hiện tại
+
+        Raises:
+            AgentOverloadedError: Hàng đợi đầy hoặc chờ quá `wait_timeout`
+        """
+        queued_at = time.perf_counter()
+        if not self._semaphore.locked():
+            # Còn chỗ: acquire trả về ngay, không nhường event loop (wait_for sẽ nhường)
+            await self._semaphore.acquire()
+        else:
+            if self.waiting >= self.max_waiters:
+                self.rejected += 1
+                raise AgentOverloadedError(
+                    f"Agent {self.name} đang quá tải ({self.waiting} request đang chờ)",
+                    status_code=429
+                )
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.wait_timeout)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                raise AgentOverloadedError(
+                    f"Agent {self.name} không rảnh sau {self.wait_timeout}s",
+                    status_code=503,
+                    retry_after=max(1, int(self.wait_timeout))
+                )
+            finally:
+                self.waiting -= 1
+        self.wait_time.observe(time.perf_counter() - queued_at)
+
+        try:
+            agent = self._idle.pop() if self._idle else await self._create()
+        except BaseException:
+            self._semaphore.release()
+            raise
+        self.in_use += 1
+        try:
+            yield agent
+        finally:
+            self.in_use -= 1
+            self.served += 1
+            self._idle.append(agent)
+            self._semaphore.release()
+
+    async def _create(self) -> Any:
+        """Tạo instance mới ngoài event loop (dựng agent có thể import Google ADK)"""
+        agent = await asyncio.to_thread(self._factory)
+        self.created += 1
+        self.logger.info(f"Tạo instance agent #{self.created} cho pool {self.name}")
+        return agent
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Lấy thống kê pool
+
+        Returns:
+            Dict[str, Any]: Kích thước, số instance đã tạo / đang dùng, hàng đợi và số request bị từ chối
+        """
+        return {
+            "size": self.size,
+            "created": self.created,
+            "in_use": self.in_use,
+            "waiting": self.waiting,
+            "max_waiters": self.max_waiters,
+            "served": self.served,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "wait_time": self.wait_time.snapshot()
+        }
@@ -0,0 +1,417 @@
+"""
+Agent Runtime Module
+
+Module cung cấp đường thực thi bất đồng bộ cho các agent, để các endpoint `async def`
+không gọi agent đồng bộ trực tiếp trên event loop.
+
+- Agent của Google ADK (hoặc BaseAgent bao bọc agent ADK) được chạy bằng Runner
+  bất đồng bộ gốc của ADK.
+- Các agent khác (chỉ có `invoke` đồng bộ) được chạy trong thread pool có giới hạn.
+
+Số lượt chạy đồng thời được giới hạn bởi một semaphore, kèm thống kê độ dài hàng đợi
+và thời gian chờ. Session ADK của các phiên hội thoại được giới hạn theo số lượng (LRU)
+và thời gian không hoạt động, phiên cũ bị xóa khỏi session service dùng chung.
+"""
+
+import asyncio
+import inspect
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Optional, Set, Tuple
+
+from python_adk.config.config import AppConfig
+from python_adk.shared_libraries.logger import get_logger
+from python_adk.shared_libraries.metrics import LatencyStats
+
+if TYPE_CHECKING:
+    # Google ADK chỉ được import khi thực sự chạy agent, không phải lúc import module
+    from google.adk.agents import BaseAgent as AdkBaseAgent
+    from google.adk.runners import Runner
+
+
+async def _maybe_await(value: Any) -> Any:
+    """Hỗ trợ cả session service đồng bộ (ADK cũ) lẫn bất đồng bộ"""
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+async def _aiter(items: Any) -> AsyncIterator[Any]:
+    """Duyệt thống nhất cả iterable thường lẫn async iterable"""
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+def _event_text(event: Any) -> str:
+    """Lấy phần văn bản trong một event của ADK"""
+    content = getattr(event, "content", None)
+    if not content or not content.parts:
+        return ""
+    return "".join(part.text for part in content.parts if getattr(part, "text", None))
+
+
+class AgentRuntime:
+    """
+    Thực thi agent bất đồng bộ với giới hạn số lượt chạy đồng thời
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        app_name: str = "phong_thuy_so",
+        default_user_id: str = "anonymous",
+        max_sessions: int = 10000,
+        session_ttl: Optional[float] = 3600
+    ):
+        """
+        Khởi tạo AgentRuntime
+
+        Args:
+            max_concurrency (int): Số lượt gọi agent chạy đồng thời tối đa
+            app_name (str): Tên ứng dụng dùng cho session của ADK Runner
+            default_user_id (str): User ID mặc định khi request không có user
+            max_sessions (int): Số session ADK không hoạt động được giữ tối đa (bỏ session dùng lâu nhất)
+            session_ttl (Optional[float]): Session không hoạt động quá thời gian này (giây) bị xóa,
+                None nếu chỉ giới hạn theo số lượng
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.app_name = app_name
+        self.default_user_id = default_user_id
+        self.max_sessions = max(1, max_sessions)
+        self.session_ttl = session_ttl if session_ttl and session_ttl > 0 else None
+        self.logger = get_logger("AgentRuntime")
+
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix="agent-invoke"
+        )
+        self._runners: Dict[int, "Runner"] = {}
+        # Session service dùng chung cho mọi Runner: root agent và sub-agent được gọi trực tiếp
+        # cùng đọc / ghi lịch sử của một session_id
+        self._services: Optional[Dict[str, Any]] = None
+        # Session đang không chạy: (user_id, session_id) -> thời điểm dùng gần nhất, cũ nhất đứng đầu;
+        # session đang chạy chỉ nằm trong `_in_use` nên không bao giờ bị xóa giữa chừng
+        self._idle_sessions: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self._in_use: Dict[Tuple[str, str], int] = {}
+        # session_id -> các user_id đang có session này (để xóa theo session_id khi phiên hết hạn)
+        self._session_users: Dict[str, Set[str]] = {}
+
+        # Thống kê
+        self.queue_depth = 0
+        self.active = 0
+        self.completed = 0
+        self.failed = 0
+        self.wait_time = LatencyStats()
+        self.run_time = LatencyStats()
+        self.first_chunk_time = LatencyStats()
+        self.evicted_sessions = 0
+
+    async def run(
+        self,
+        agent: Any,
+        message: str,
+        session_id: Optional[str] = None,
+        user_id: Optional[str] = None
+    ) -> str:
+        """
+        Chạy agent với một tin nhắn và trả về phản hồi cuối cùng
+
+        Args:
+            agent (Any): Agent của ADK, BaseAgent bao bọc agent ADK, hoặc đối tượng có `invoke`
+            message (str): Tin nhắn của người dùng
+            session_id (Optional[str]): ID phiên để giữ ngữ cảnh hội thoại
+            user_id (Optional[str]): ID người dùng
+
+        Returns:
+            str: Phản hồi của agent
+        """
+        async with self._slot():
+            adk_agent = self._resolve_adk_agent(agent)
+            if adk_agent is None:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._executor, agent.invoke, message)
+
+            final_text = ""
+            async for event in self._run_events(adk_agent, message, session_id, user_id):
+                if event.is_final_response():
+                    text = _event_text(event)
+                    if text:
+                        final_text = text
+            return final_text
+
+    async def stream(
+        self,
+        agent: Any,
+        message: str,
+        session_id: Optional[str] = None,
+        user_id: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Chạy agent và trả về từng đoạn văn bản ngay khi model sinh ra (SSE streaming của ADK)
+
+        Agent không phải ADK chỉ có `invoke` đồng bộ nên được trả về thành một đoạn duy nhất.
+
+        Args:
+            agent (Any): Agent của ADK, BaseAgent bao bọc agent ADK, hoặc đối tượng có `invoke`
+            message (str): Tin nhắn của người dùng
+            session_id (Optional[str]): ID phiên để giữ ngữ cảnh hội thoại
+            user_id (Optional[str]): ID người dùng
+
+        Yields:
+            str: Đoạn văn bản tiếp theo của phản hồi
+        """
+        requested_at = time.perf_counter()
+        first_chunk = True
+
+        async with self._slot():
+            adk_agent = self._resolve_adk_agent(agent)
+            if adk_agent is None:
+                loop = asyncio.get_running_loop()
+                chunks = [await loop.run_in_executor(self._executor, agent.invoke, message)]
+            else:
+                chunks = self._stream_text(adk_agent, message, session_id, user_id)
+
+            async for chunk in _aiter(chunks):
+                if not chunk:
+                    continue
+                if first_chunk:
+                    first_chunk = False
+                    self.first_chunk_time.observe(time.perf_counter() - requested_at)
+                yield chunk
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Lấy thống kê thực thi agent
+
+        Returns:
+            Dict[str, Any]: Độ dài hàng đợi, số lượt đang chạy, số session đang giữ / đã xóa,
+                thời gian chờ và thời gian chạy
+        """
+        return {
+            "max_concurrency": self.max_concurrency,
+            "queue_depth": self.queue_depth,
+            "sessions": len(self._idle_sessions) + len(self._in_use),
+            "evicted_sessions": self.evicted_sessions,
+            "active": self.active,
+            "completed": self.completed,
+            "failed": self.failed,
+            "wait_time": self.wait_time.snapshot(),
+            "run_time": self.run_time.snapshot(),
+            "first_chunk_time": self.first_chunk_time.snapshot()
+        }
+
+    @asynccontextmanager
+    async def _slot(self) -> AsyncIterator[None]:
+        """Chờ tới lượt chạy, ghi nhận thời gian chờ và thời gian chạy"""
+        self.queue_depth += 1
+        queued_at = time.perf_counter()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queue_depth -= 1
+        started_at = time.perf_counter()
+        self.wait_time.observe(started_at - queued_at)
+
+        self.active += 1
+        try:
+            yield
+            self.completed += 1
+        except BaseException:
+            self.failed += 1
+            raise
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+            self.run_time.observe(time.perf_counter() - started_at)
+
+    async def _run_events(
+        self,
+        adk_agent: "AdkBaseAgent",
+        message: str,
+        session_id: Optional[str],
+        user_id: Optional[str],
+        run_config: Any = None
+    ) -> AsyncIterator[Any]:
+        """Chạy agent ADK bằng Runner và trả về các event theo thứ tự phát sinh"""
+        runner = self._get_runner(adk_agent)
+        user_id = user_id or self.default_user_id
+        ephemeral = session_id is None
+        session_id = session_id or f"ephemeral-{uuid.uuid4()}"
+        key = (user_id, session_id)
+        if not ephemeral:
+            self._checkout(key)
+
+        from google.genai import types
+
+        content = types.Content(role="user", parts=[types.Part(text=message)])
+        try:
+            await self._ensure_session(runner, user_id, session_id)
+            async for event in runner.run_async(
+                user_id=user_id,
+                session_id=session_id,
+                new_message=content,
+                run_config=run_config
+            ):
+                yield event
+        finally:
+            # Phiên tạm chỉ dùng cho một lượt, xóa để không giữ lại trong bộ nhớ
+            if ephemeral:
+                await self._delete_session(user_id, session_id)
+            else:
+                self._release(key)
+                await self._evict_sessions()
+
+    async def _stream_text(
+        self,
+        adk_agent: "AdkBaseAgent",
+        message: str,
+        session_id: Optional[str],
+        user_id: Optional[str]
+    ) -> AsyncIterator[str]:
+        """
+        Lấy văn bản từ các event của Runner ở chế độ SSE.
+
+        Event partial mang phần văn bản mới sinh; event hoàn chỉnh ngay sau đó lặp lại
+        toàn bộ nội dung nên chỉ được dùng khi trước đó không có event partial nào
+        (model/agent không hỗ trợ streaming).
+        """
+        from google.adk.agents.run_config import RunConfig, StreamingMode
+
+        run_config = RunConfig(streaming_mode=StreamingMode.SSE)
+        streamed = False
+        async for event in self._run_events(adk_agent, message, session_id, user_id, run_config):
+            text = _event_text(event)
+            if event.partial:
+                streamed = streamed or bool(text)
+                yield text
+                continue
+            if text and not streamed:
+                yield text
+            streamed = False
+
+    def _get_runner(self, adk_agent: "AdkBaseAgent") -> "Runner":
+        """Lấy (hoặc tạo) Runner cho agent ADK, dùng chung session / artifact / memory service"""
+        runner = self._runners.get(id(adk_agent))
+        if runner is None:
+            from google.adk.runners import Runner
+
+            if self._services is None:
+                from google.adk.artifacts import InMemoryArtifactService
+                from google.adk.memory import InMemoryMemoryService
+                from google.adk.sessions import InMemorySessionService
+
+                self._services = {
+                    "session_service": InMemorySessionService(),
+                    "artifact_service": InMemoryArtifactService(),
+                    "memory_service": InMemoryMemoryService()
+                }
+            runner = Runner(agent=adk_agent, app_name=self.app_name, **self._services)
+            self._runners[id(adk_agent)] = runner
+            self.logger.info(f"Khởi tạo Runner cho agent {adk_agent.name}")
+        return runner
+
+    async def end_session(self, session_id: str, user_id: Optional[str] = None) -> int:
+        """
+        Xóa session ADK của một phiên hội thoại (ví dụ khi phiên hết hạn)
+
+        Args:
+            session_id (str): ID phiên
+            user_id (Optional[str]): ID người dùng của phiên, None để xóa session này của mọi người dùng
+
+        Returns:
+            int: Số session đã xóa (session đang chạy không bị xóa)
+        """
+        users = [user_id] if user_id else list(self._session_users.get(session_id, ()))
+        ended = 0
+        for user in users:
+            key = (user, session_id)
+            if key in self._idle_sessions:
+                del self._idle_sessions[key]
+                await self._delete_session(*key)
+                ended += 1
+        return ended
+
+    def _checkout(self, key: Tuple[str, str]) -> None:
+        """Đánh dấu session đang chạy"""
+        self._idle_sessions.pop(key, None)
+        self._in_use[key] = self._in_use.get(key, 0) + 1
+        self._session_users.setdefault(key[1], set()).add(key[0])
+
+    def _release(self, key: Tuple[str, str]) -> None:
+        """Trả session về danh sách không hoạt động khi lượt chạy cuối cùng của nó kết thúc"""
+        remaining = self._in_use[key] - 1
+        if remaining:
+            self._in_use[key] = remaining
+            return
+        del self._in_use[key]
+        self._idle_sessions[key] = time.monotonic()
+
+    async def _evict_sessions(self) -> None:
+        """Xóa session dùng lâu nhất khi vượt `max_sessions` và session không hoạt động quá `session_ttl`"""
+        now = time.monotonic()
+        while self._idle_sessions:
+            key, last_used = next(iter(self._idle_sessions.items()))
+            expired = self.session_ttl is not None and now - last_used >= self.session_ttl
+            if not expired and len(self._idle_sessions) <= self.max_sessions:
+                break
+            del self._idle_sessions[key]
+            await self._delete_session(*key)
+            self.evicted_sessions += 1
+
+    async def _delete_session(self, user_id: str, session_id: str) -> None:
+        """Xóa session khỏi session service dùng chung"""
+        users = self._session_users.get(session_id)
+        if users is not None and (user_id, session_id) not in self._in_use:
+            users.discard(user_id)
+            if not users:
+                del self._session_users[session_id]
+        if self._services is None:
+            return
+        await _maybe_await(self._services["session_service"].delete_session(
+            app_name=self.app_name, user_id=user_id, session_id=session_id
+        ))
+
+    async def _ensure_session(self, runner: "Runner", user_id: str, session_id: str) -> None:
+        """Tạo session trong session service của Runner nếu chưa có"""
+        session = await _maybe_await(runner.session_service.get_session(
+            app_name=self.app_name, user_id=user_id, session_id=session_id
+        ))
+        if session is None:
+            await _maybe_await(runner.session_service.create_session(
+                app_name=self.app_name, user_id=user_id, session_id=session_id
+            ))
+
+    @staticmethod
+    def _resolve_adk_agent(agent: Any) -> Optional["AdkBaseAgent"]:
+        """Lấy agent ADK từ agent truyền vào (trực tiếp hoặc qua thuộc tính `_agent`)"""
+        from google.adk.agents import BaseAgent as AdkBaseAgent
+
+        if isinstance(agent, AdkBaseAgent):
+            return agent
+        inner = getattr(agent, "_agent", None)
+        if isinstance(inner, AdkBaseAgent):
+            return inner
+        return None
+
+
+def _create_agent_runtime() -> AgentRuntime:
+    """Tạo AgentRuntime dùng chung từ cấu hình ứng dụng"""
+    config = AppConfig()
+    return AgentRuntime(
+        max_concurrency=config.agent_max_concurrency,
+        app_name=config.agent_app_name,
+        max_sessions=config.agent_max_sessions,
+        session_ttl=config.agent_session_ttl
+    )
+
+
+# Runtime dùng chung cho toàn bộ tiến trình
+agent_runtime = _create_agent_runtime()
@@ -6,7 +6,7 @@ Lớp này dựa trên RootAgent nhưng chỉ chứa các phương thức cần
 """
 
 import abc
-from typing import Any, Dict, List, Optional, Set, Type, Union, Callable
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Type, Union, Callable
 
 # Bỏ import không cần thiết và gây lỗi
 # from python_adk.agents.root_agent.agent import agent_tool_registry, agent_tool, annotate_type
@@ -133,6 +133,58 @@ class BaseAgent:
         
         return response
     
+    async def process_message_async(self, user_message: str, session_id: Optional[str] = None) -> str:
+        """
+        Xử lý tin nhắn từ người dùng mà không chặn event loop.
+        Agent được chạy qua AgentRuntime dùng chung (giới hạn số lượt đồng thời).
+        
+        Args:
+            user_message (str): Tin nhắn của người dùng
+            session_id (Optional[str]): ID phiên để giữ ngữ cảnh hội thoại
+            
+        Returns:
+            str: Phản hồi của agent
+        """
+        from python_adk.agents.agent_runtime import agent_runtime
+        
+        self.logger.info(f"Nhận tin nhắn: {user_message}")
+        self.add_to_history("user", user_message)
+        
+        try:
+            response = await agent_runtime.run(self._agent, user_message, session_id=session_id)
+        except Exception as e:
+            self.logger.error(f"Lỗi khi chạy GeminiAgent: {e}")
+            response = f"Đã xảy ra lỗi: {str(e)}"
+        
+        self.add_to_history("assistant", response)
+        self.logger.info(f"Phản hồi: {response}")
+        
+        return response
+    
+    async def stream_message_async(self, user_message: str, session_id: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Xử lý tin nhắn từ người dùng và trả về phản hồi theo từng đoạn khi model sinh ra
+        
+        Args:
+            user_message (str): Tin nhắn của người dùng
+            session_id (Optional[str]): ID phiên để giữ ngữ cảnh hội thoại
+            
+        Yields:
+            str: Đoạn văn bản tiếp theo của phản hồi
+        """
+        from python_adk.agents.agent_runtime import agent_runtime
+        
+        self.logger.info(f"Nhận tin nhắn (stream): {user_message}")
+        self.add_to_history("user", user_message)
+        
+        chunks: List[str] = []
+        try:
+            async for chunk in agent_runtime.stream(self._agent, user_message, session_id=session_id):
+                chunks.append(chunk)
+                yield chunk
+        finally:
+            self.add_to_history("assistant", "".join(chunks))
+    
     def invoke(self, user_message: str) -> str:
         """
         Cách gọi thay thế cho process_message
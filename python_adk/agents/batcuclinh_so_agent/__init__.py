@@ -5,6 +5,13 @@ BatCucLinhSo Agent là agent chuyên biệt phân tích phong thủy số học,
 cung cấp dịch vụ phân tích số điện thoại, CCCD, tài khoản ngân hàng và mật khẩu.
 """
 
-from python_adk.agents.batcuclinh_so_agent.agent import BatCucLinhSoAgent
+import importlib
 
-__all__ = ['BatCucLinhSoAgent'] 
\ No newline at end of file
+from python_adk.shared_libraries.lazy import lazy_module_getattr
+
+# Nạp agent (kéo theo Google ADK) khi truy cập, để các tools phân tích import được độc lập
+__getattr__ = lazy_module_getattr(__name__, {
+    "BatCucLinhSoAgent": lambda: importlib.import_module("python_adk.agents.batcuclinh_so_agent.agent").BatCucLinhSoAgent
+})
+
+__all__ = ['BatCucLinhSoAgent']
@@ -13,6 +13,7 @@ from google.adk.tools import FunctionTool # Import FunctionTool
 # from python_adk.agents.root_agent.agent import AgentType # Chỉ import AgentType
 from python_adk.agents.base_agent import BaseAgent # Import BaseAgent để gọi super
 from python_adk.prompt import get_agent_prompt
+from python_adk.shared_libraries.lazy import LazySingleton, lazy_module_getattr
 from python_adk.shared_libraries.logger import get_logger
 from python_adk.shared_libraries.models import (
     PhoneAnalysisRequest,
@@ -20,6 +21,8 @@ from python_adk.shared_libraries.models import (
     BankAccountRequest,
     PasswordRequest
 )
+from python_adk.agents.batcuclinh_so_agent.tools.phone_generator import generate_phone_numbers, score_phone
+from python_adk.agents.batcuclinh_so_agent.tools.star_inventory_index import star_inventory_query
 
 class BatCucLinhSoAgent(BaseAgent):
     """
@@ -48,7 +51,8 @@ class BatCucLinhSoAgent(BaseAgent):
             FunctionTool(self.analyze_cccd),
             FunctionTool(self.suggest_phone),
             FunctionTool(self.analyze_bank_account),
-            FunctionTool(self.generate_password)
+            FunctionTool(self.generate_password),
+            FunctionTool(star_inventory_query)  # Lọc kho số theo sao
         ]
         
         # Gọi constructor của BaseAgent, truyền tools vào
@@ -293,108 +297,67 @@ class BatCucLinhSoAgent(BaseAgent):
         else:
             return f"CCCD của bạn có phong thủy kém. Đặc biệt cặp số {min_pair['pair']} ({min_pair['name']}) ở vị trí {min_pair['position']} cần được lưu ý."
     
-    def suggest_phone(self, purpose: str, preferred_digits: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    def suggest_phone(
+        self,
+        purpose: str,
+        preferred_digits: Optional[List[str]] = None,
+        prefix: Optional[str] = None,
+        avoided_digits: Optional[List[str]] = None,
+        count: int = 5
+    ) -> List[Dict[str, Any]]:
         """
         Đề xuất số điện thoại phù hợp với mục đích
         
         Args:
             purpose (str): Mục đích sử dụng số điện thoại
-            preferred_digits (Optional[List[str]]): Các chữ số ưa thích
+            preferred_digits (Optional[List[str]]): Các chữ số bắt buộc có trong số
+            prefix (Optional[str]): Nhà mạng (viettel, vinaphone, mobifone, ...) hoặc đầu số mong muốn
+            avoided_digits (Optional[List[str]]): Các chữ số không muốn có trong số (không áp dụng cho đầu số)
+            count (int): Số lượng số điện thoại đề xuất
             
         Returns:
             List[Dict[str, Any]]: Danh sách số điện thoại đề xuất kèm phân tích
         """
         self.logger.info(f"Đề xuất số điện thoại cho mục đích: {purpose}")
         
-        # Mẫu số điện thoại (sẽ thay bằng thuật toán thực tế)
-        sample_phones = [
-            "0901234567",
-            "0912345678",
-            "0923456789",
-            "0934567890",
-            "0945678901"
-        ]
+        # Sinh số bằng beam search trên đồ thị sao thay cho danh sách mẫu cố định
+        candidates = generate_phone_numbers(
+            prefix=prefix,
+            required_digits=preferred_digits,
+            forbidden_digits=avoided_digits,
+            purpose=purpose,
+            top_k=count
+        )
         
-        # Phân tích và đề xuất số điện thoại
         suggestions = []
-        for phone in sample_phones:
-            analysis = self.analyze_phone(PhoneAnalysisRequest(phone_number=phone))
-            
-            # Tính mức độ phù hợp với mục đích
-            purpose_match_score = self._calculate_purpose_match(phone, purpose)
-            
+        for candidate in candidates:
+            phone = candidate["phone_number"]
+            total_score = candidate["fengshui_score"]
+            purpose_match_score = candidate["purpose_score"]
             suggestions.append({
                 "phone_number": phone,
-                "total_score": analysis["total_score"],
+                "carrier": candidate["carrier"],
+                "stars": candidate["stars"],
+                "total_score": total_score,
                 "purpose_match_score": purpose_match_score,
-                "combined_score": (analysis["total_score"] + purpose_match_score) / 2,
-                "summary": f"Số điện thoại {phone} có điểm phong thủy {analysis['total_score']:.1f}/10, phù hợp {purpose_match_score:.1f}/10 cho mục đích {purpose}"
+                "combined_score": (total_score + purpose_match_score) / 2,
+                "summary": f"Số điện thoại {phone} có điểm phong thủy {total_score:.1f}/10, phù hợp {purpose_match_score:.1f}/10 cho mục đích {purpose}"
             })
         
-        # Sắp xếp theo điểm tổng hợp
-        suggestions.sort(key=lambda x: x["combined_score"], reverse=True)
-        
-        return suggestions[:5]  # Trả về 5 đề xuất tốt nhất
+        return suggestions
     
     def _calculate_purpose_match(self, phone: str, purpose: str) -> float:
         """
-        Tính điểm phù hợp với mục đích
+        Tính điểm phù hợp với mục đích dựa trên các sao thuận lợi / bất lợi của mục đích (PURPOSE_STARS)
         
         Args:
             phone (str): Số điện thoại
             purpose (str): Mục đích sử dụng
             
         Returns:
-            float: Điểm phù hợp (0-10)
+            float: Điểm phù hợp (0-10), 5 nếu không nhận diện được mục đích
         """
-        purpose_lower = purpose.lower()
-        
-        # Điểm cơ bản
-        score = 7.0
-        
-        # Kiểm tra từng cặp số có phù hợp với mục đích không
-        for i in range(len(phone) - 1):
-            pair = phone[i:i+2]
-            if pair in self.number_pairs_meaning:
-                info = self.number_pairs_meaning[pair]
-                
-                # Kinh doanh, tài chính
-                if "kinh doanh" in purpose_lower or "tài chính" in purpose_lower or "công ty" in purpose_lower:
-                    if info["name"] in ["Phát Tài", "Sinh Khí"]:
-                        score += 0.5
-                
-                # Sự nghiệp, công việc
-                elif "sự nghiệp" in purpose_lower or "công việc" in purpose_lower or "thăng tiến" in purpose_lower:
-                    if info["name"] in ["Đường Quan", "Sinh Khí"]:
-                        score += 0.5
-                
-                # Học tập
-                elif "học tập" in purpose_lower or "giáo dục" in purpose_lower or "nghiên cứu" in purpose_lower:
-                    if info["name"] in ["Thiên Y", "Diên Niên"]:
-                        score += 0.5
-                
-                # Tình cảm, gia đình
-                elif "tình cảm" in purpose_lower or "gia đình" in purpose_lower or "hôn nhân" in purpose_lower:
-                    if info["name"] in ["Khả Ái", "Diên Niên"]:
-                        score += 0.5
-                
-                # Sức khỏe
-                elif "sức khỏe" in purpose_lower or "y tế" in purpose_lower:
-                    if info["name"] in ["Thiên Y", "Sinh Khí"]:
-                        score += 0.5
-                
-                # Trừ điểm cho Tuyệt Mệnh
-                if info["name"] == "Tuyệt Mệnh":
-                    score -= 1.0
-        
-        # Kiểm tra số cuối
-        if "kinh doanh" in purpose_lower and phone[-1] in ["8", "9"]:
-            score += 0.5
-        elif "sức khỏe" in purpose_lower and phone[-1] in ["6", "9"]:
-            score += 0.5
-        
-        # Giới hạn điểm
-        return min(max(score, 1.0), 10.0)
+        return score_phone(phone, purpose)["purpose_score"]
     
     def analyze_bank_account(self, request: BankAccountRequest) -> Dict[str, Any]:
         """
@@ -663,5 +626,6 @@ class BatCucLinhSoAgent(BaseAgent):
             "strength": strength
         }
 
-# Instantiate the agent for easy import by root_agent
-batcuclinh_so_agent = BatCucLinhSoAgent()
\ No newline at end of file
+# Instantiate the agent for easy import by root_agent (dựng ở lần truy cập đầu tiên)
+get_batcuclinh_so_agent = LazySingleton(BatCucLinhSoAgent)
+__getattr__ = lazy_module_getattr(__name__, {"batcuclinh_so_agent": get_batcuclinh_so_agent})
\ No newline at end of file
@@ -2,10 +2,107 @@
 Tool để phân tích số tài khoản ngân hàng dựa trên phương pháp Bát Cục Linh Số
 """
 
-from google.adk.tools import FunctionTool
 from typing import Dict, Any, List, Optional
 from python_adk.mcp.common import extract_digits
+from python_adk.shared_libraries.cache import memoize_analysis
+from python_adk.constants.star_index import star_pairs
+from python_adk.shared_libraries.lazy import lazy_function_tool, lazy_module_getattr
 
+# Ngũ hành theo số năng lượng
+FIVE_ELEMENTS_MAP = {
+    1: "Thủy",
+    2: "Thổ",
+    3: "Mộc",
+    4: "Kim",
+    5: "Thổ",
+    6: "Kim",
+    7: "Thủy",
+    8: "Mộc",
+    9: "Hỏa"
+}
+
+# Ý nghĩa năng lượng số
+ENERGY_MEANINGS = {
+    1: "Chủ động, sáng tạo, khởi đầu mới, độc lập",
+    2: "Hợp tác, cân bằng, kiên nhẫn, bền bỉ",
+    3: "Phát triển, mở rộng, linh hoạt, sáng tạo",
+    4: "Ổn định, chắc chắn, kỷ luật, xây dựng",
+    5: "Thay đổi, linh hoạt, tự do, phiêu lưu",
+    6: "Hài hòa, trách nhiệm, phụng sự, cống hiến",
+    7: "Phân tích, chiêm nghiệm, trí tuệ, tâm linh",
+    8: "Thịnh vượng, quyền lực, thành tựu, vật chất",
+    9: "Hoàn thành, viên mãn, lý tưởng, nhân đạo"
+}
+
+# Các cặp số đặc biệt
+SPECIAL_PAIRS = [
+    ('6', '8'), # Tấn Lộc - Vượng Tài
+    ('8', '9'), # Tài Lộc - Tài Thành
+    ('9', '6'), # Thành Tấn - Công Thành
+    ('1', '6'), # Nguyên Tấn - Thủy Sinh Mộc
+    ('2', '8'), # Địa Tài - Thổ Sinh Kim
+    ('3', '9'), # Sinh Thành - Mộc Sinh Hỏa
+    ('4', '6')  # Kim sinh Thủy
+]
+
+LUCKY_DIGITS = ['6', '8', '9']
+UNLUCKY_DIGITS = ['4', '7']
+
+# Trọng số chấm điểm: điểm cộng dồn theo từng chữ số và từng cặp số liền kề,
+# cộng thêm điểm khi số năng lượng hợp với mục đích sử dụng tài khoản
+LUCKY_DIGIT_SCORE = 1
+UNLUCKY_DIGIT_SCORE = -1
+SPECIAL_PAIR_SCORE = 2
+ENERGY_MATCH_SCORE = 3
+
+# Số năng lượng hợp với từng mục đích (theo ENERGY_MEANINGS)
+PURPOSE_ENERGY_NUMBERS = {
+    "personal": (6, 9),    # Hài hòa, viên mãn
+    "business": (8, 1),    # Thịnh vượng, chủ động
+    "savings": (4, 6),     # Ổn định, trách nhiệm
+    "investment": (8, 3)   # Thịnh vượng, phát triển
+}
+
+
+def score_bank_account(digits: str, purpose: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Chấm điểm một dãy chữ số tài khoản theo cùng tiêu chí với bank_account_analyzer.
+    
+    Args:
+        digits (str): Dãy chữ số (đã loại bỏ ký tự khác chữ số)
+        purpose (str, optional): Mục đích sử dụng tài khoản; None thì bỏ qua điểm năng lượng
+        
+    Returns:
+        Dict[str, Any]: energy_number, special_pairs, lucky_count, unlucky_count, score
+    """
+    energy_number = sum(int(d) for d in digits) % 9 or 9
+    
+    found_pairs = []
+    for pair in SPECIAL_PAIRS:
+        for i in range(len(digits) - 1):
+            if digits[i] == pair[0] and digits[i+1] == pair[1]:
+                found_pairs.append(f"{pair[0]}{pair[1]}")
+    
+    lucky_count = sum(digits.count(d) for d in LUCKY_DIGITS)
+    unlucky_count = sum(digits.count(d) for d in UNLUCKY_DIGITS)
+    
+    score = (
+        lucky_count * LUCKY_DIGIT_SCORE
+        + unlucky_count * UNLUCKY_DIGIT_SCORE
+        + len(found_pairs) * SPECIAL_PAIR_SCORE
+    )
+    if purpose and energy_number in PURPOSE_ENERGY_NUMBERS.get(purpose.lower(), ()):
+        score += ENERGY_MATCH_SCORE
+    
+    return {
+        "energy_number": energy_number,
+        "special_pairs": found_pairs,
+        "lucky_count": lucky_count,
+        "unlucky_count": unlucky_count,
+        "score": score
+    }
+
+@memoize_analysis("bank_account")
 def bank_account_analyzer(account_number: str) -> Dict[str, Any]:
     """
     Phân tích số tài khoản ngân hàng dựa trên phương pháp Bát Cục Linh Số.
@@ -25,63 +122,16 @@ def bank_account_analyzer(account_number: str) -> Dict[str, Any]:
     if not digits:
         raise ValueError("Số tài khoản phải chứa ít nhất một chữ số")
     
-    # Tính tổng các chữ số
-    digit_sum = sum(int(d) for d in digits)
-    energy_number = digit_sum % 9 or 9
-    
-    # Phân tích ngũ hành
-    five_elements_map = {
-        1: "Thủy",
-        2: "Thổ",
-        3: "Mộc",
-        4: "Kim",
-        5: "Thổ",
-        6: "Kim",
-        7: "Thủy",
-        8: "Mộc",
-        9: "Hỏa"
-    }
+    # Chấm điểm: số năng lượng, cặp số đặc biệt, số lượng chữ số may mắn / xui
+    scored = score_bank_account(digits)
+    energy_number = scored["energy_number"]
+    found_pairs = scored["special_pairs"]
+    lucky_count = scored["lucky_count"]
+    unlucky_count = scored["unlucky_count"]
     
     # Đếm tần suất các chữ số
     digit_frequency = {str(i): digits.count(str(i)) for i in range(10)}
     
-    # Xác định các cặp số đặc biệt
-    special_pairs = [
-        ('6', '8'), # Tấn Lộc - Vượng Tài
-        ('8', '9'), # Tài Lộc - Tài Thành
-        ('9', '6'), # Thành Tấn - Công Thành
-        ('1', '6'), # Nguyên Tấn - Thủy Sinh Mộc
-        ('2', '8'), # Địa Tài - Thổ Sinh Kim
-        ('3', '9'), # Sinh Thành - Mộc Sinh Hỏa
-        ('4', '6')  # Kim sinh Thủy
-    ]
-    
-    found_pairs = []
-    for pair in special_pairs:
-        for i in range(len(digits) - 1):
-            if digits[i] == pair[0] and digits[i+1] == pair[1]:
-                found_pairs.append(f"{pair[0]}{pair[1]}")
-    
-    # Ý nghĩa năng lượng số
-    energy_meanings = {
-        1: "Chủ động, sáng tạo, khởi đầu mới, độc lập",
-        2: "Hợp tác, cân bằng, kiên nhẫn, bền bỉ",
-        3: "Phát triển, mở rộng, linh hoạt, sáng tạo",
-        4: "Ổn định, chắc chắn, kỷ luật, xây dựng",
-        5: "Thay đổi, linh hoạt, tự do, phiêu lưu",
-        6: "Hài hòa, trách nhiệm, phụng sự, cống hiến",
-        7: "Phân tích, chiêm nghiệm, trí tuệ, tâm linh",
-        8: "Thịnh vượng, quyền lực, thành tựu, vật chất",
-        9: "Hoàn thành, viên mãn, lý tưởng, nhân đạo"
-    }
-    
-    # Đánh giá mức độ may mắn
-    lucky_numbers = ['6', '8', '9']
-    unlucky_numbers = ['4', '7']
-    
-    lucky_count = sum(digits.count(d) for d in lucky_numbers)
-    unlucky_count = sum(digits.count(d) for d in unlucky_numbers)
-    
     lucky_ratio = lucky_count / len(digits) if len(digits) > 0 else 0
     
     # Đánh giá mức độ thuận lợi
@@ -100,16 +150,18 @@ def bank_account_analyzer(account_number: str) -> Dict[str, Any]:
         "accountNumber": account_number,
         "analysis": {
             "energyNumber": energy_number,
-            "element": five_elements_map[energy_number],
-            "energyMeaning": energy_meanings[energy_number],
+            "element": FIVE_ELEMENTS_MAP[energy_number],
+            "energyMeaning": ENERGY_MEANINGS[energy_number],
             "digitFrequency": digit_frequency,
             "specialPairs": found_pairs,
             "prosperityLevel": prosperity_level,
-            "recommendation": f"Số tài khoản này mang năng lượng số {energy_number} ({five_elements_map[energy_number]}), {energy_meanings[energy_number].lower()}.",
+            "recommendation": f"Số tài khoản này mang năng lượng số {energy_number} ({FIVE_ELEMENTS_MAP[energy_number]}), {ENERGY_MEANINGS[energy_number].lower()}.",
             "luckyCount": lucky_count,
-            "unluckyCount": unlucky_count
+            "unluckyCount": unlucky_count,
+            "score": scored["score"],
+            "starSequence": star_pairs(digits)
         }
     }
 
 # Tạo Function Tool
-bank_account_analyzer_tool = FunctionTool(bank_account_analyzer) 
\ No newline at end of file
+__getattr__ = lazy_module_getattr(__name__, {"bank_account_analyzer_tool": lazy_function_tool(bank_account_analyzer)}) 
\ No newline at end of file
@@ -1,17 +1,133 @@
 """
 Tool để gợi ý số tài khoản ngân hàng dựa trên phương pháp Bát Cục Linh Số
+
+Số tài khoản được sinh bằng tìm kiếm có ràng buộc (độ dài theo ngân hàng, tiền tố cố định)
+và chấm điểm bằng đúng tiêu chí của bank_account_analyzer. Điểm là tổng điểm từng chữ số,
+từng cặp số liền kề và điểm số năng lượng (tổng chữ số mod 9) ở cuối, nên trạng thái tìm kiếm
+chỉ cần (chữ số trước, tổng mod 9): giữ top-k theo từng trạng thái cho kết quả top-k chính xác,
+không trùng lặp và không cần vòng lặp thử lại.
 """
 
-from google.adk.tools import FunctionTool
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+import heapq
 import random
 import re
+from itertools import islice
+
+from python_adk.agents.batcuclinh_so_agent.tools.bank_account_analyzer import (
+    LUCKY_DIGITS,
+    UNLUCKY_DIGITS,
+    LUCKY_DIGIT_SCORE,
+    UNLUCKY_DIGIT_SCORE,
+    SPECIAL_PAIRS,
+    SPECIAL_PAIR_SCORE,
+    ENERGY_MATCH_SCORE,
+    PURPOSE_ENERGY_NUMBERS,
+    score_bank_account
+)
+from python_adk.shared_libraries.lazy import lazy_function_tool, lazy_module_getattr
+
+# Độ dài số tài khoản mặc định theo ngân hàng
+BANK_LENGTHS = {
+    "VCB": 13,  # Vietcombank
+    "TCB": 14,  # Techcombank
+    "ACB": 13,  # Asia Commercial Bank
+    "BIDV": 14, # BIDV
+    "VTB": 13,  # Vietinbank
+    "TPB": 12,  # TPBank
+    "MB": 13,   # MB Bank
+    "OCB": 15,  # OCB
+    "SHB": 13,  # SHB
+    "MSB": 13   # Maritime Bank
+}
+
+DEFAULT_ACCOUNT_LENGTH = 13
+MAX_SUGGESTIONS = 1000
+
+DIGITS = "0123456789"
+
+# Điểm của từng chữ số và từng cặp số liền kề
+_DIGIT_GAIN = {
+    d: LUCKY_DIGIT_SCORE if d in LUCKY_DIGITS else UNLUCKY_DIGIT_SCORE if d in UNLUCKY_DIGITS else 0
+    for d in DIGITS
+}
+_PAIR_GAIN = {a + b: SPECIAL_PAIR_SCORE if (a, b) in SPECIAL_PAIRS else 0 for a in DIGITS for b in DIGITS}
+
+# Ứng viên: (-điểm, khóa sắp xếp khi bằng điểm); khóa là số tài khoản viết theo bảng chữ số đã hoán vị
+_Candidate = Tuple[int, str]
+
+
+def _extend(entries: List[_Candidate], gain: int, char: str):
+    """Nối thêm một chữ số vào mọi ứng viên của một trạng thái (giữ nguyên thứ tự đã sắp xếp)"""
+    return ((neg_score - gain, key + char) for neg_score, key in entries)
+
+
+def search_bank_accounts(
+    prefix: str,
+    length: int,
+    purpose: Optional[str] = None,
+    count: int = 5,
+    seed: Optional[int] = None
+) -> List[Tuple[str, int]]:
+    """
+    Tìm các số tài khoản có điểm cao nhất với tiền tố và độ dài cho trước.
+
+    Args:
+        prefix (str): Tiền tố cố định (chỉ gồm chữ số)
+        length (int): Độ dài số tài khoản
+        purpose (str, optional): Mục đích sử dụng, quyết định số năng lượng được cộng điểm
+        count (int): Số lượng kết quả
+        seed (int, optional): Hạt giống để xáo thứ tự ưu tiên giữa các số bằng điểm
+
+    Returns:
+        List[Tuple[str, int]]: (số tài khoản, điểm) theo điểm giảm dần, không trùng lặp
+    """
+    # Thứ tự ưu tiên chữ số khi bằng điểm: mặc định tăng dần, có seed thì xáo trộn cố định
+    order = list(DIGITS)
+    if seed is not None:
+        random.Random(seed).shuffle(order)
+    encode = {d: DIGITS[rank] for rank, d in enumerate(order)}
+    decode = str.maketrans({DIGITS[rank]: d for rank, d in enumerate(order)})
+
+    scored_prefix = score_bank_account(prefix)
+    start_key = "".join(encode[d] for d in prefix)
+    states: Dict[Tuple[str, int], List[_Candidate]] = {
+        (prefix[-1:], sum(map(int, prefix)) % 9): [(-scored_prefix["score"], start_key)]
+    }
+
+    for _ in range(length - len(prefix)):
+        sources: Dict[Tuple[str, int], list] = {}
+        for (previous, remainder), entries in states.items():
+            for digit in DIGITS:
+                gain = _DIGIT_GAIN[digit] + _PAIR_GAIN.get(previous + digit, 0)
+                target = (digit, (remainder + int(digit)) % 9)
+                sources.setdefault(target, []).append(_extend(entries, gain, encode[digit]))
+        # Mỗi nguồn đã sắp xếp nên chỉ cần trộn và lấy count phần tử đầu
+        states = {
+            target: list(islice(heapq.merge(*iterators), count))
+            for target, iterators in sources.items()
+        }
+
+    # Cộng điểm số năng lượng rồi chọn top-k trên mọi trạng thái cuối
+    favored = PURPOSE_ENERGY_NUMBERS.get(purpose.lower(), ()) if purpose else ()
+    finals = []
+    for (_, remainder), entries in states.items():
+        bonus = ENERGY_MATCH_SCORE if (remainder or 9) in favored else 0
+        finals.append(_extend(entries, bonus, ""))
+
+    return [
+        (key.translate(decode), -neg_score)
+        for neg_score, key in islice(heapq.merge(*finals), count)
+    ]
+
 
 def bank_account_suggester(
     bank_code: str,
     prefix: Optional[str] = None,
     length: Optional[int] = None,
-    purpose: str = "personal"
+    purpose: str = "personal",
+    count: int = 5,
+    seed: Optional[int] = None
 ) -> Dict[str, Any]:
     """
     Gợi ý số tài khoản ngân hàng may mắn dựa trên phương pháp Bát Cục Linh Số.
@@ -20,7 +136,9 @@ def bank_account_suggester(
         bank_code (str): Mã ngân hàng (VCB, TCB, ACB, v.v.)
         prefix (str, optional): Tiền tố cố định của số tài khoản
         length (int, optional): Độ dài mong muốn của số tài khoản
-        purpose (str): Mục đích sử dụng tài khoản (personal, business, savings, v.v.)
+        purpose (str): Mục đích sử dụng tài khoản (personal, business, savings, investment)
+        count (int): Số lượng gợi ý
+        seed (int, optional): Hạt giống để thay đổi lựa chọn giữa các số bằng điểm
         
     Returns:
         Dict[str, Any]: Kết quả gợi ý với danh sách các số tài khoản may mắn
@@ -31,23 +149,9 @@ def bank_account_suggester(
     # Chuẩn hóa bank_code
     bank_code = bank_code.upper()
     
-    # Xác định độ dài mặc định dựa trên ngân hàng
-    bank_lengths = {
-        "VCB": 13,  # Vietcombank
-        "TCB": 14,  # Techcombank
-        "ACB": 13,  # Asia Commercial Bank
-        "BIDV": 14, # BIDV
-        "VTB": 13,  # Vietinbank
-        "TPB": 12,  # TPBank
-        "MB": 13,   # MB Bank
-        "OCB": 15,  # OCB
-        "SHB": 13,  # SHB
-        "MSB": 13   # Maritime Bank
-    }
-    
     # Xác định độ dài của số tài khoản
     if not length:
-        length = bank_lengths.get(bank_code, 13)
+        length = BANK_LENGTHS.get(bank_code, DEFAULT_ACCOUNT_LENGTH)
     
     # Xác định tiền tố mặc định nếu không cung cấp
     if not prefix:
@@ -57,92 +161,22 @@ def bank_account_suggester(
     if not re.match(r'^\d*$', prefix):
         raise ValueError("Tiền tố phải chỉ chứa chữ số")
     
-    # Xác định độ dài phần còn lại cần tạo
-    remaining_length = length - len(prefix)
-    
-    if remaining_length <= 0:
+    if length - len(prefix) <= 0:
         raise ValueError("Tiền tố đã dài bằng hoặc vượt quá độ dài yêu cầu")
     
-    # Các chữ số may mắn trong phong thủy
-    lucky_digits = ['6', '8', '9']
-    neutral_digits = ['0', '1', '2', '3', '5']
-    unlucky_digits = ['4', '7']
+    if count < 1 or count > MAX_SUGGESTIONS:
+        raise ValueError(f"Số lượng gợi ý phải từ 1 đến {MAX_SUGGESTIONS}")
     
-    # Các mẫu số tài khoản may mắn
-    lucky_patterns = [
-        "68",  # Tấn Lộc - Vượng Tài
-        "89",  # Tài Lộc - Tài Thành
-        "96",  # Thành Tấn - Công Thành
-        "16",  # Nguyên Tấn - Thủy Sinh Mộc
-        "28",  # Địa Tài - Thổ Sinh Kim
-        "39",  # Sinh Thành - Mộc Sinh Hỏa
-        "168", # Lộc Phát - Phát Tài
-        "688", # Lộc Phát Phát
-        "869", # Tài Lộc Phát
-        "986"  # Cửu Phát Lộc
-    ]
-    
-    # Xác định số lượng may mắn và trung tính dựa vào mục đích
-    purpose_weights = {
-        "personal": (0.5, 0.4, 0.1),   # (may mắn, trung tính, xui)
-        "business": (0.7, 0.25, 0.05), # Tài khoản kinh doanh cần nhiều số may mắn
-        "savings": (0.6, 0.35, 0.05),  # Tài khoản tiết kiệm
-        "investment": (0.8, 0.15, 0.05) # Tài khoản đầu tư
-    }
-    
-    lucky_weight, neutral_weight, unlucky_weight = purpose_weights.get(purpose.lower(), (0.5, 0.4, 0.1))
-    
-    # Sinh ngẫu nhiên các số tài khoản may mắn
     result_accounts = []
-    for _ in range(5):  # Tạo 5 gợi ý
-        account = prefix
-        
-        # Thêm mẫu may mắn vào giữa
-        if remaining_length > 4:
-            pattern = random.choice(lucky_patterns)
-            if len(pattern) <= remaining_length - 2:
-                # Vị trí chèn mẫu
-                insert_pos = random.randint(0, remaining_length - len(pattern))
-                
-                # Tạo phần còn lại
-                for i in range(remaining_length):
-                    if i == insert_pos:
-                        account += pattern
-                        i += len(pattern) - 1
-                    else:
-                        r = random.random()
-                        if r < lucky_weight:
-                            account += random.choice(lucky_digits)
-                        elif r < lucky_weight + neutral_weight:
-                            account += random.choice(neutral_digits)
-                        else:
-                            account += random.choice(unlucky_digits)
-            else:
-                # Nếu mẫu quá dài, sử dụng cách thông thường
-                for _ in range(remaining_length):
-                    r = random.random()
-                    if r < lucky_weight:
-                        account += random.choice(lucky_digits)
-                    elif r < lucky_weight + neutral_weight:
-                        account += random.choice(neutral_digits)
-                    else:
-                        account += random.choice(unlucky_digits)
-        else:
-            # Nếu số còn lại ngắn, chỉ dùng số may mắn
-            for _ in range(remaining_length):
-                account += random.choice(lucky_digits)
-        
-        # Kiểm tra và cắt nếu vượt quá độ dài
-        if len(account) > length:
-            account = account[:length]
-        
-        # Tính năng lượng số
-        digit_sum = sum(int(d) for d in account)
-        energy_number = digit_sum % 9 or 9
-        
+    for account, score in search_bank_accounts(prefix, length, purpose, count, seed):
+        scored = score_bank_account(account, purpose)
         result_accounts.append({
             "accountNumber": account,
-            "energyNumber": energy_number
+            "energyNumber": scored["energy_number"],
+            "specialPairs": scored["special_pairs"],
+            "luckyCount": scored["lucky_count"],
+            "unluckyCount": scored["unlucky_count"],
+            "score": score
         })
     
     # Kết quả gợi ý
@@ -150,8 +184,9 @@ def bank_account_suggester(
         "success": True,
         "suggestions": result_accounts,
         "bank": bank_code,
+        "length": length,
         "purpose": purpose
     }
 
 # Tạo Function Tool
-bank_account_suggester_tool = FunctionTool(bank_account_suggester) 
\ No newline at end of file
+__getattr__ = lazy_module_getattr(__name__, {"bank_account_suggester_tool": lazy_function_tool(bank_account_suggester)})
@@ -2,11 +2,14 @@
 CCCD Analyzer Tool for Bát Cục Linh Số method
 """
 
-from google.adk.tools import FunctionTool
 from typing import Dict, Any, Optional
-from python_adk.constants.bat_tinh import BAT_TINH
+from python_adk.constants.star_index import PAIR_INDEX
+from python_adk.shared_libraries.cache import memoize_analysis
+from python_adk.shared_libraries.digit_tokenizer import tokenize_digits
 from python_adk.constants.combinations import COMBINATIONS
+from python_adk.shared_libraries.lazy import lazy_function_tool, lazy_module_getattr
 
+@memoize_analysis("cccd")
 def cccd_analyzer(cccd_number: str, purpose: Optional[str] = None) -> Dict[str, Any]:
     """Phân tích số CCCD theo phương pháp Bát Cục Linh Số.
     
@@ -28,27 +31,25 @@ def cccd_analyzer(cccd_number: str, purpose: Optional[str] = None) -> Dict[str,
         birth_day = int(cccd_number[6:8])
         last_four = cccd_number[8:12]
 
-        # Calculate Bát Tinh numbers
-        bat_tinh_numbers = []
-        for i in range(0, 12, 2):
-            pair = cccd_number[i:i+2]
-            bat_tinh_numbers.append(pair)
-
-        # Analyze each pair
+        # Tách cặp Bát Tinh (nhóm 0/5 gộp vào cặp như số điện thoại):
+        # "number" là cặp đã bỏ 0/5, "digits" là nhóm chữ số gốc (ví dụ "203" cho cặp "23"),
+        # "energy_level" là năng lượng của cặp sau khi cộng số 5 / trừ số 0 (giống star_pairs)
         analysis = []
-        for number in bat_tinh_numbers:
-            for tinh, info in BAT_TINH.items():
-                if number in info["numbers"]:
-                    analysis.append({
-                        "number": number,
-                        "tinh": tinh,
-                        "name": info["name"],
-                        "description": info["description"],
-                        "energy": info["energy"],
-                        "position": info["position"],
-                        "nature": info["nature"]
-                    })
-                    break
+        for token in tokenize_digits(cccd_number):
+            entry = PAIR_INDEX.get(token.pair)
+            if entry:
+                info = entry.info
+                analysis.append({
+                    "number": token.pair,
+                    "digits": cccd_number[token.start:token.end],
+                    "tinh": entry.star,
+                    "name": info["name"],
+                    "description": info["description"],
+                    "energy": info["energy"],
+                    "energy_level": max(1, entry.energy + token.five_count - token.zero_count),
+                    "position": info["position"],
+                    "nature": info["nature"]
+                })
 
         # Analyze combinations
         combinations = []
@@ -81,4 +82,4 @@ def cccd_analyzer(cccd_number: str, purpose: Optional[str] = None) -> Dict[str,
         raise ValueError(f"Error analyzing CCCD number: {str(e)}")
 
 # Tạo Function Tool
-cccd_analyzer_tool = FunctionTool(cccd_analyzer) 
\ No newline at end of file
+__getattr__ = lazy_module_getattr(__name__, {"cccd_analyzer_tool": lazy_function_tool(cccd_analyzer)})
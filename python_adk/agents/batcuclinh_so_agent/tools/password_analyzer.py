@@ -2,10 +2,13 @@
 Tool để phân tích mật khẩu dựa trên phương pháp Bát Cục Linh Số
 """
 
-from google.adk.tools import FunctionTool
 from typing import Dict, Any, List, Optional
 from python_adk.mcp.common import extract_digits
+from python_adk.shared_libraries.cache import hash_key, memoize_analysis
+from python_adk.constants.star_index import star_pairs
+from python_adk.shared_libraries.lazy import lazy_function_tool, lazy_module_getattr
 
+@memoize_analysis("password", key=hash_key)
 def password_analyzer(password: str) -> Dict[str, Any]:
     """
     Phân tích mật khẩu dựa trên phương pháp Bát Cục Linh Số.
@@ -56,6 +59,7 @@ def password_analyzer(password: str) -> Dict[str, Any]:
             "isSecure": is_secure,
             "energyNumber": energy_score,
             "energyMeaning": energy_meanings.get(energy_score, "Không xác định"),
+            "starSequence": star_pairs(digits),
             "recommendations": [
                 "Mật khẩu nên có ít nhất 8 ký tự" if length < 8 else "Độ dài mật khẩu tốt",
                 "Nên kết hợp cả chữ và số" if not (any(c.isdigit() for c in password) and any(c.isalpha() for c in password)) else "Kết hợp chữ và số tốt",
@@ -66,4 +70,4 @@ def password_analyzer(password: str) -> Dict[str, Any]:
     }
 
 # Tạo Function Tool
-password_analyzer_tool = FunctionTool(password_analyzer) 
\ No newline at end of file
+__getattr__ = lazy_module_getattr(__name__, {"password_analyzer_tool": lazy_function_tool(password_analyzer)})
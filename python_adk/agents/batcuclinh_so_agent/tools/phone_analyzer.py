@@ -3,14 +3,15 @@ Phone Analyzer: Tool để phân tích số điện thoại theo phương pháp
 """
 
 import re
-from typing import Dict, Any, List, Optional
-# Sử dụng Google ADK FunctionTool
-from google.adk.tools import FunctionTool
+from typing import Dict, Any, List, Optional, Tuple
 import os
-from python_adk.constants.bat_tinh import BAT_TINH
 from python_adk.constants.combinations import COMBINATIONS
 from python_adk.constants.digit_meanings import DIGIT_MEANINGS
-from python_adk.constants.response_factors import RESPONSE_FACTORS
+from python_adk.constants.purposes import PURPOSE_STARS, resolve_purpose
+from python_adk.constants.star_index import PAIR_INDEX
+from python_adk.shared_libraries.cache import memoize_analysis
+from python_adk.shared_libraries.digit_tokenizer import PairToken, tokenize_digits
+from python_adk.shared_libraries.lazy import lazy_function_tool, lazy_module_getattr
 
 class PhoneAnalyzer:
     """Class để phân tích số điện thoại theo phương pháp Bát Cục Linh Số"""
@@ -54,18 +55,18 @@ class PhoneAnalyzer:
             # Analyze each pair
             analysis = []
             for number in bat_tinh_numbers:
-                for tinh, info in BAT_TINH.items():
-                    if number in info["numbers"]:
-                        analysis.append({
-                            "number": number,
-                            "tinh": tinh,
-                            "name": info["name"],
-                            "description": info["description"],
-                            "energy": info["energy"],
-                            "position": info["position"],
-                            "nature": info["nature"]
-                        })
-                        break
+                entry = PAIR_INDEX.get(number)
+                if entry:
+                    info = entry.info
+                    analysis.append({
+                        "number": number,
+                        "tinh": entry.star,
+                        "name": info["name"],
+                        "description": info["description"],
+                        "energy": info["energy"],
+                        "position": info["position"],
+                        "nature": info["nature"]
+                    })
 
             # Analyze combinations
             combinations = []
@@ -117,112 +118,81 @@ class PhoneAnalyzer:
 
     @staticmethod
     def _generate_pairs(digits: str) -> List[str]:
-        pairs: List[str] = []
-        i = 0
-        while i < len(digits) - 1:
-            if digits[i] in ("0", "5"):
-                i += 1
-                continue
-            if digits[i+1] not in ("0", "5"):
-                pairs.append(digits[i:i+2])
-                i += 1
-            else:
-                j = i + 1
-                group = digits[i]
-                while j < len(digits) and digits[j] in ("0", "5"):
-                    group += digits[j]
-                    j += 1
-                if j < len(digits):
-                    group += digits[j]
-                    j += 1
-                pairs.append(group)
-                i = j - 1
-        # xử lý nhóm cuối
-        if pairs:
-            last = pairs[-1]
-            if len(last) > 1 and last[0] not in ("0", "5") and all(c in ("0","5") for c in last[1:]):
-                trailing = last[1:]
-                pairs[-1] = last[0] + trailing
-        return pairs
+        return [digits[token.start:token.end] for token in tokenize_digits(digits)]
     
     @staticmethod
-    def _map_to_star_sequence(normalized: str) -> List[Dict[str, Any]]:
-        pairs = PhoneAnalyzer._generate_pairs(normalized)
-        zero_count = normalized.count("0")
-        five_count = normalized.count("5")
+    def _special_attributes(normalized: str) -> Tuple[str, str]:
+        """Thuộc tính đặc biệt của cả dãy số theo sự có mặt của số 0 / số 5"""
         special_attr = ""
         special_effect = ""
-        if zero_count:
+        if "0" in normalized:
             special_attr = "zero"
             special_effect = "Số 0 làm giảm năng lượng của các sao"
-        if five_count:
+        if "5" in normalized:
             special_attr = f"{special_attr}_five" if special_attr else "five"
             msg = "Số 5 tăng cường năng lượng của các sao"
             special_effect = f"{special_effect}, {msg}" if special_effect else msg
-        sequence: List[Dict[str,Any]] = []
-        for pair in pairs:
-            zeroes = pair.count("0")
-            fives = pair.count("5")
-            clean = "".join(d for d in pair if d not in ("0","5"))
-            star_key, star_obj = None, None
-            for k,v in BAT_TINH.items():
-                if clean in v.get("numbers",[]):
-                    star_key, star_obj = k, v
-                    break
-            base_energy = star_obj.get("energy", {}).get(clean, 1) if star_obj else 1
-            energy_level = max(1, base_energy + fives - zeroes)
-            level = PhoneAnalyzer._get_star_level(energy_level)
-            response_factor = RESPONSE_FACTORS.get("STAR_RESPONSE_FACTORS", {}).get(star_key, 1)
-            weighted = energy_level
-            adjusted = weighted * response_factor
-            sequence.append({
-                "originalPair": pair,
-                "mappedPair": clean,
-                "star": star_key or "UNKNOWN",
-                "name": star_obj.get("name", "") if star_obj else "",
-                "nature": star_obj.get("nature", "") if star_obj else "",
-                "level": level,
-                "energyLevel": energy_level,
-                "baseEnergyLevel": base_energy,
-                "specialAttribute": special_attr,
-                "specialEffect": special_effect,
-                "detailedDescription": star_obj.get("detailedDescription", "") if star_obj else "",
-                "description": star_obj.get("description", "") if star_obj else "",
-                "isZeroVariant": zeroes > 0,
-                "zeroCount": zeroes,
-                "fiveCount": fives,
-                "weightedEnergy": weighted,
-                "responseFactor": response_factor,
-                "adjustedEnergy": adjusted
-            })
-        return sequence
+        return special_attr, special_effect
+
+    @staticmethod
+    def _star_entry(pair: str, token: PairToken, special_attr: str = "", special_effect: str = "") -> Dict[str, Any]:
+        """Ánh xạ một cặp số (có thể kèm nhóm 0/5) sang sao và mức năng lượng
+        
+        Args:
+            pair: Cặp số gốc (kể cả nhóm 0/5)
+            token: Cặp số đã tách bởi tokenize_digits
+            special_attr: Thuộc tính đặc biệt của cả dãy số
+            special_effect: Mô tả thuộc tính đặc biệt
+        """
+        zeroes = token.zero_count
+        fives = token.five_count
+        clean = token.pair
+        entry = PAIR_INDEX.get(clean)
+        star_key = entry.star if entry else None
+        star_obj = entry.info if entry else None
+        base_energy = entry.energy if entry else 1
+        energy_level = max(1, base_energy + fives - zeroes)
+        level = PhoneAnalyzer._get_star_level(energy_level)
+        response_factor = entry.response_factor if entry else 1
+        weighted = energy_level
+        adjusted = weighted * response_factor
+        return {
+            "originalPair": pair,
+            "mappedPair": clean,
+            "star": star_key or "UNKNOWN",
+            "name": star_obj.get("name", "") if star_obj else "",
+            "nature": star_obj.get("nature", "") if star_obj else "",
+            "level": level,
+            "energyLevel": energy_level,
+            "baseEnergyLevel": base_energy,
+            "specialAttribute": special_attr,
+            "specialEffect": special_effect,
+            "detailedDescription": star_obj.get("detailedDescription", "") if star_obj else "",
+            "description": star_obj.get("description", "") if star_obj else "",
+            "isZeroVariant": zeroes > 0,
+            "zeroCount": zeroes,
+            "fiveCount": fives,
+            "weightedEnergy": weighted,
+            "responseFactor": response_factor,
+            "adjustedEnergy": adjusted
+        }
+    
+    @staticmethod
+    def _map_to_star_sequence(normalized: str) -> List[Dict[str, Any]]:
+        special_attr, special_effect = PhoneAnalyzer._special_attributes(normalized)
+        return [
+            PhoneAnalyzer._star_entry(normalized[token.start:token.end], token, special_attr, special_effect)
+            for token in tokenize_digits(normalized)
+        ]
 
     @staticmethod
     def _analyze_purpose_compatibility(star_sequence: List[Dict[str, Any]], purpose: str) -> Dict[str, Any]:
         """Phân tích độ phù hợp với mục đích sử dụng"""
-        # Các mục đích phổ biến
-        purposes = {
-            "business": {
-                "name": "Kinh doanh",
-                "favorable_stars": ["THIEN_Y", "DIEN_NIEN"],
-                "unfavorable_stars": ["TUYET_MENH", "NGU_QUY"]
-            },
-            "personal": {
-                "name": "Cá nhân",
-                "favorable_stars": ["SINH_KHI", "THIEN_Y"],
-                "unfavorable_stars": ["HOA_HAI", "LUC_SAT"]
-            },
-            "wealth": {
-                "name": "Tài lộc",
-                "favorable_stars": ["THIEN_Y", "SINH_KHI"],
-                "unfavorable_stars": ["TUYET_MENH", "NGU_QUY"]
-            }
-        }
-        
-        # Lấy thông tin mục đích
-        purpose_info = purposes.get(purpose.lower())
-        if not purpose_info:
+        # Lấy thông tin mục đích (nhận cả mã mục đích lẫn mô tả tiếng Việt)
+        purpose_key = resolve_purpose(purpose)
+        if not purpose_key:
             return None
+        purpose_info = PURPOSE_STARS[purpose_key]
             
         # Đếm số sao thuận lợi và bất lợi
         favorable_count = sum(1 for star in star_sequence if star["star"] in purpose_info["favorable_stars"])
@@ -244,14 +214,15 @@ class PhoneAnalyzer:
         
         return {
             "purpose": purpose_info["name"],
-            "favorable_stars": purpose_info["favorable_stars"],
-            "unfavorable_stars": purpose_info["unfavorable_stars"],
+            "favorable_stars": list(purpose_info["favorable_stars"]),
+            "unfavorable_stars": list(purpose_info["unfavorable_stars"]),
             "favorable_count": favorable_count,
             "unfavorable_count": unfavorable_count,
             "compatibility_score": compatibility_score,
             "compatibility_level": compatibility_level
         }
 
+@memoize_analysis("phone")
 def phone_analyzer(phone_number: str, purpose: Optional[str] = None) -> Dict[str, Any]:
     """Phân tích số điện thoại theo phương pháp Bát Cục Linh Số.
     
@@ -265,4 +236,4 @@ def phone_analyzer(phone_number: str, purpose: Optional[str] = None) -> Dict[str
     return PhoneAnalyzer.analyze_phone_number(phone_number, purpose)
 
 # Tạo Function Tool
-phone_analyzer_tool = FunctionTool(phone_analyzer) 
\ No newline at end of file
+__getattr__ = lazy_module_getattr(__name__, {"phone_analyzer_tool": lazy_function_tool(phone_analyzer)})
@@ -0,0 +1,246 @@
+"""
+Phone Batch Analyzer: Engine vector hóa bằng NumPy để chấm điểm hàng loạt số điện thoại
+
+Engine nhận một mảng chữ số `uint8` có shape (N, 10) và tính toàn bộ chuỗi sao,
+mức năng lượng, điều chỉnh số 0/5 (khớp với `PhoneAnalyzer._map_to_star_sequence`)
+và các tổ hợp sao liền kề bằng các phép toán mảng trên bảng tra cứu,
+thay vì dựng dict cho từng số một.
+
+Kết quả trả về dạng cột: mỗi trường là một mảng (N, 9) theo vị trí bắt đầu của cặp số
+trong số điện thoại (chỉ các vị trí có `pair_mask` = True là một cặp thực sự).
+"""
+
+from typing import Iterable, Iterator, List, NamedTuple, Sequence, Tuple, Union
+
+import numpy as np
+
+from python_adk.constants.combinations import COMBINATIONS
+from python_adk.constants.star_index import PAIR_INDEX, STAR_CODES, STAR_KEYS
+
+PHONE_LENGTH = 10
+MAX_PAIRS = PHONE_LENGTH - 1
+NO_STAR = -1
+NO_COMBINATION = -1
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+# Thứ tự mức sao, khớp với PhoneAnalyzer._get_star_level
+STAR_LEVELS: Tuple[str, ...] = ("LOW", "MEDIUM", "HIGH", "VERY_HIGH")
+COMBINATION_KEYS: Tuple[str, ...] = tuple(COMBINATIONS.keys())
+
+
+def _build_pair_tables() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Dựng bảng tra cứu 10x10 cho cặp chữ số: mã sao, năng lượng gốc, hệ số ứng nghiệm"""
+    star_table = np.full((10, 10), NO_STAR, dtype=np.int16)
+    energy_table = np.ones((10, 10), dtype=np.float32)
+    factor_table = np.ones((10, 10), dtype=np.float32)
+    for first in range(10):
+        for second in range(10):
+            entry = PAIR_INDEX.get(f"{first}{second}")
+            if entry:
+                star_table[first, second] = STAR_CODES[entry.star]
+                energy_table[first, second] = entry.energy
+                factor_table[first, second] = entry.response_factor
+    return star_table, energy_table, factor_table
+
+
+def _build_combination_table() -> np.ndarray:
+    """Dựng bảng tra cứu (sao trước, sao sau) → mã tổ hợp
+
+    Hàng/cột cuối cùng dành cho NO_STAR để có thể tra cứu trực tiếp bằng chỉ số -1.
+    """
+    size = len(STAR_KEYS) + 1
+    table = np.full((size, size), NO_COMBINATION, dtype=np.int16)
+    for code, key in enumerate(COMBINATION_KEYS):
+        for first in STAR_KEYS:
+            prefix = f"{first}_"
+            if key.startswith(prefix) and key[len(prefix):] in STAR_CODES:
+                table[STAR_CODES[first], STAR_CODES[key[len(prefix):]]] = code
+    return table
+
+
+STAR_TABLE, ENERGY_TABLE, FACTOR_TABLE = _build_pair_tables()
+COMBINATION_TABLE = _build_combination_table()
+
+
+class PhoneBatchResult(NamedTuple):
+    """Kết quả phân tích hàng loạt dạng cột
+
+    Các mảng (N, 9) được đánh chỉ số theo vị trí bắt đầu của cặp số,
+    các mảng (N,) là giá trị tổng hợp cho từng số điện thoại.
+    """
+    pair_mask: np.ndarray          # (N, 9) bool - vị trí có cặp số
+    star_index: np.ndarray         # (N, 9) int16 - mã sao theo STAR_KEYS, NO_STAR nếu không có
+    base_energy: np.ndarray        # (N, 9) float32 - năng lượng gốc của cặp sạch
+    energy_level: np.ndarray       # (N, 9) float32 - năng lượng sau điều chỉnh 0/5
+    level_index: np.ndarray        # (N, 9) int8 - chỉ số theo STAR_LEVELS
+    zero_count: np.ndarray         # (N, 9) uint8 - số chữ số 0 trong nhóm
+    five_count: np.ndarray         # (N, 9) uint8 - số chữ số 5 trong nhóm
+    adjusted_energy: np.ndarray    # (N, 9) float32 - năng lượng x hệ số ứng nghiệm
+    combination_index: np.ndarray  # (N, 9) int16 - mã tổ hợp với cặp kế tiếp theo COMBINATION_KEYS
+    has_zero: np.ndarray           # (N,) bool
+    has_five: np.ndarray           # (N,) bool
+    pair_count: np.ndarray         # (N,) int16
+    combination_count: np.ndarray  # (N,) int16
+    total_energy: np.ndarray       # (N,) float32 - tổng năng lượng đã điều chỉnh
+
+    def __len__(self) -> int:
+        return self.pair_mask.shape[0]
+
+    def star_sequence(self, row: int) -> List[str]:
+        """Chuỗi tên sao của một số, theo đúng thứ tự của `_map_to_star_sequence`"""
+        codes = self.star_index[row][self.pair_mask[row]]
+        return [STAR_KEYS[code] if code != NO_STAR else "UNKNOWN" for code in codes]
+
+    def combinations(self, row: int) -> List[str]:
+        """Danh sách tổ hợp sao liền kề của một số"""
+        codes = self.combination_index[row]
+        return [COMBINATION_KEYS[code] for code in codes[codes != NO_COMBINATION]]
+
+
+def phones_to_digit_array(phone_numbers: Sequence[str]) -> np.ndarray:
+    """Chuyển danh sách số điện thoại 10 chữ số thành mảng uint8 (N, 10)
+
+    Args:
+        phone_numbers: Các số điện thoại đã chuẩn hóa (chỉ gồm chữ số)
+
+    Returns:
+        np.ndarray: Mảng chữ số shape (N, 10)
+
+    Raises:
+        ValueError: Nếu có số không đúng 10 chữ số
+    """
+    for phone in phone_numbers:
+        if len(phone) != PHONE_LENGTH or not phone.isdigit():
+            raise ValueError(f"Invalid phone number format: {phone}. Must be 10 digits.")
+    if not phone_numbers:
+        return np.empty((0, PHONE_LENGTH), dtype=np.uint8)
+    raw = np.frombuffer("".join(phone_numbers).encode("ascii"), dtype=np.uint8)
+    return (raw - ord("0")).reshape(-1, PHONE_LENGTH)
+
+
+def open_digit_file(path: str) -> np.ndarray:
+    """Mở file nhị phân chứa các bản ghi 10 byte chữ số (0-9) dưới dạng memmap
+
+    Dùng cùng `iter_batch_analyze_phones` cho kho số lớn hơn bộ nhớ.
+    """
+    return np.memmap(path, dtype=np.uint8, mode="r").reshape(-1, PHONE_LENGTH)
+
+
+def batch_analyze_phones(digits: np.ndarray) -> PhoneBatchResult:
+    """Phân tích hàng loạt số điện thoại theo phương pháp Bát Cục Linh Số
+
+    Args:
+        digits: Mảng uint8 shape (N, 10), mỗi phần tử là một chữ số 0-9
+
+    Returns:
+        PhoneBatchResult: Kết quả dạng cột cho N số điện thoại
+
+    Raises:
+        ValueError: Nếu mảng đầu vào sai shape hoặc chứa giá trị ngoài 0-9
+    """
+    digits = np.asarray(digits)
+    if digits.ndim != 2 or digits.shape[1] != PHONE_LENGTH:
+        raise ValueError(f"Expected digit array of shape (N, {PHONE_LENGTH}), got {digits.shape}")
+    digits = digits.astype(np.uint8, copy=False)
+    if digits.size and digits.max() > 9:
+        raise ValueError("Digit array must only contain values 0-9")
+
+    count = digits.shape[0]
+    is_zero = digits == 0
+    is_five = digits == 5
+    anchor = ~(is_zero | is_five)
+
+    # Vị trí chữ số "neo" (khác 0/5) kế tiếp sau mỗi vị trí, PHONE_LENGTH nếu không có
+    next_anchor = np.full((count, PHONE_LENGTH), PHONE_LENGTH, dtype=np.intp)
+    for position in range(PHONE_LENGTH - 2, -1, -1):
+        next_anchor[:, position] = np.where(
+            anchor[:, position + 1], position + 1, next_anchor[:, position + 1]
+        )
+    next_anchor = next_anchor[:, :MAX_PAIRS]
+
+    # Mỗi chữ số neo ở vị trí 0..8 mở một nhóm kéo dài tới chữ số neo kế tiếp
+    pair_mask = anchor[:, :MAX_PAIRS]
+    closed = pair_mask & (next_anchor < PHONE_LENGTH)
+
+    # Đếm số 0/5 nằm giữa hai chữ số neo bằng tổng tích lũy
+    zeros_before = np.zeros((count, PHONE_LENGTH + 1), dtype=np.int16)
+    fives_before = np.zeros((count, PHONE_LENGTH + 1), dtype=np.int16)
+    np.cumsum(is_zero, axis=1, out=zeros_before[:, 1:])
+    np.cumsum(is_five, axis=1, out=fives_before[:, 1:])
+    start = zeros_before[:, 1:PHONE_LENGTH]
+    zero_count = np.take_along_axis(zeros_before, next_anchor, axis=1) - start
+    start = fives_before[:, 1:PHONE_LENGTH]
+    five_count = np.take_along_axis(fives_before, next_anchor, axis=1) - start
+    zero_count = np.where(pair_mask, zero_count, 0).astype(np.uint8)
+    five_count = np.where(pair_mask, five_count, 0).astype(np.uint8)
+
+    # Tra cứu sao cho cặp sạch (chữ số neo + chữ số neo kế tiếp)
+    first = digits[:, :MAX_PAIRS]
+    second = np.take_along_axis(digits, np.minimum(next_anchor, PHONE_LENGTH - 1), axis=1)
+    star_index = np.where(closed, STAR_TABLE[first, second], NO_STAR).astype(np.int16)
+    base_energy = np.where(closed, ENERGY_TABLE[first, second], 1).astype(np.float32)
+    factor = np.where(closed, FACTOR_TABLE[first, second], 1).astype(np.float32)
+
+    energy_level = np.maximum(1, base_energy + five_count - zero_count.astype(np.float32))
+    energy_level = np.where(pair_mask, energy_level, 0).astype(np.float32)
+    level_index = np.select(
+        [energy_level >= 4, energy_level == 3, energy_level == 2],
+        [3, 2, 1],
+        default=0,
+    ).astype(np.int8)
+    adjusted_energy = (energy_level * factor).astype(np.float32)
+
+    # Tổ hợp với cặp kế tiếp: cặp kế tiếp bắt đầu tại chữ số neo kế tiếp (nếu <= 8)
+    has_next = pair_mask & (next_anchor < MAX_PAIRS)
+    next_star = np.take_along_axis(star_index, np.minimum(next_anchor, MAX_PAIRS - 1), axis=1)
+    next_star = np.where(has_next, next_star, NO_STAR)
+    combination_index = np.where(
+        has_next, COMBINATION_TABLE[star_index, next_star], NO_COMBINATION
+    ).astype(np.int16)
+
+    return PhoneBatchResult(
+        pair_mask=pair_mask,
+        star_index=star_index,
+        base_energy=base_energy,
+        energy_level=energy_level,
+        level_index=level_index,
+        zero_count=zero_count,
+        five_count=five_count,
+        adjusted_energy=adjusted_energy,
+        combination_index=combination_index,
+        has_zero=is_zero.any(axis=1),
+        has_five=is_five.any(axis=1),
+        pair_count=pair_mask.sum(axis=1, dtype=np.int16),
+        combination_count=(combination_index != NO_COMBINATION).sum(axis=1, dtype=np.int16),
+        total_energy=adjusted_energy.sum(axis=1, dtype=np.float32),
+    )
+
+
+def iter_batch_analyze_phones(
+    source: Union[np.ndarray, Iterable[Union[np.ndarray, Sequence[str]]]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Tuple[int, PhoneBatchResult]]:
+    """Phân tích theo từng khối cho kho số quá lớn để nạp vào bộ nhớ
+
+    Args:
+        source: Mảng (N, 10) (có thể là np.memmap từ `open_digit_file`)
+            hoặc một iterable các khối (mảng chữ số hoặc danh sách số điện thoại)
+        chunk_size: Số dòng tối đa mỗi khối khi `source` là một mảng
+
+    Yields:
+        Tuple[int, PhoneBatchResult]: Vị trí dòng đầu tiên của khối và kết quả của khối đó
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+
+    if isinstance(source, np.ndarray):
+        for offset in range(0, source.shape[0], chunk_size):
+            yield offset, batch_analyze_phones(source[offset:offset + chunk_size])
+        return
+
+    offset = 0
+    for chunk in source:
+        if not isinstance(chunk, np.ndarray):
+            chunk = phones_to_digit_array(list(chunk))
+        yield offset, batch_analyze_phones(chunk)
+        offset += chunk.shape[0]
@@ -0,0 +1,218 @@
+"""
+Phone Edit Session: Phân tích tăng dần khi người dùng sửa số điện thoại từng chữ số
+
+Mỗi cặp số của `tokenize_digits` đi từ một chữ số neo (khác 0/5) qua nhóm 0/5
+tới chữ số neo kế tiếp, nên một lần sửa một chữ số chỉ làm thay đổi các cặp nằm giữa chữ số
+neo liền trước và chữ số neo liền sau vị trí sửa. Phiên giữ sẵn các cặp (kèm vị trí), sao và
+tổ hợp sao liền kề; mỗi lần sửa chỉ tách lại cửa sổ đó, ánh xạ sao cho các cặp mới, tính lại
+các tổ hợp ở biên và trả về phần thay đổi (delta) thay vì toàn bộ kết quả.
+"""
+
+import threading
+import uuid
+from typing import Any, Dict, List, Optional
+
+from python_adk.agents.batcuclinh_so_agent.tools.phone_analyzer import PhoneAnalyzer
+from python_adk.config.config import AppConfig
+from python_adk.constants.combinations import COMBINATIONS
+from python_adk.shared_libraries.cache import LRUCache
+from python_adk.shared_libraries.digit_tokenizer import PairToken, tokenize_digits
+
+MAX_DIGITS = 15
+EDIT_OPERATIONS = ("insert", "delete", "replace")
+_SPECIAL_DIGITS = ("0", "5")
+
+def _combination(left: Dict[str, Any], right: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Tổ hợp của hai sao liền kề, None nếu không có trong COMBINATIONS"""
+    key = f"{left['star']}_{right['star']}"
+    if key not in COMBINATIONS:
+        return None
+    return {
+        "pairs": f"{left['originalPair']}-{right['originalPair']}",
+        "combination": key,
+        "description": COMBINATIONS[key]["description"]
+    }
+
+
+class PhoneEditSession:
+    """Trạng thái phân tích của một số điện thoại đang được sửa"""
+
+    def __init__(self, digits: str = "", purpose: Optional[str] = None):
+        """
+        Args:
+            digits: Dãy chữ số ban đầu (đã chuẩn hóa)
+            purpose: Mục đích sử dụng, dùng khi tính độ phù hợp
+        """
+        if not digits.isdigit() and digits:
+            raise ValueError("Số điện thoại chỉ được chứa chữ số")
+        if len(digits) > MAX_DIGITS:
+            raise ValueError(f"Số điện thoại tối đa {MAX_DIGITS} chữ số")
+        self.session_id = uuid.uuid4().hex
+        self.purpose = purpose
+        self.version = 0
+        self.digits = digits
+        self.special = PhoneAnalyzer._special_attributes(digits)
+        self.tokens: List[PairToken] = tokenize_digits(digits)
+        self.stars: List[Dict[str, Any]] = [self._entry(digits, token) for token in self.tokens]
+        self.combinations: List[Optional[Dict[str, Any]]] = [
+            _combination(self.stars[i], self.stars[i + 1]) for i in range(len(self.stars) - 1)
+        ]
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _entry(digits: str, token: PairToken) -> Dict[str, Any]:
+        """Sao của một cặp số (chưa gắn thuộc tính đặc biệt của cả dãy)"""
+        return PhoneAnalyzer._star_entry(digits[token.start:token.end], token)
+
+    def _star_view(self, star: Dict[str, Any]) -> Dict[str, Any]:
+        """Sao kèm thuộc tính đặc biệt của cả dãy (giống `_map_to_star_sequence`)"""
+        return {**star, "specialAttribute": self.special[0], "specialEffect": self.special[1]}
+
+    def _purpose(self) -> Optional[Dict[str, Any]]:
+        """Độ phù hợp với mục đích trên toàn bộ chuỗi sao"""
+        if not self.purpose:
+            return None
+        return PhoneAnalyzer._analyze_purpose_compatibility(self.stars, self.purpose)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Toàn bộ kết quả phân tích hiện tại"""
+        return {
+            "sessionId": self.session_id,
+            "version": self.version,
+            "digits": self.digits,
+            "starSequence": [self._star_view(star) for star in self.stars],
+            "combinations": [
+                {"index": index, **combination}
+                for index, combination in enumerate(self.combinations) if combination
+            ],
+            "purposeCompatibility": self._purpose()
+        }
+
+    def _edited_digits(self, operation: str, position: int, digit: Optional[str]) -> str:
+        """Dãy chữ số sau khi sửa (kiểm tra tham số)"""
+        if operation not in EDIT_OPERATIONS:
+            raise ValueError(f"Thao tác không hợp lệ: {operation}. Hỗ trợ: {', '.join(EDIT_OPERATIONS)}")
+        limit = len(self.digits) if operation == "insert" else len(self.digits) - 1
+        if position < 0 or position > limit:
+            raise ValueError(f"Vị trí sửa nằm ngoài dãy số: {position}")
+        if operation != "delete" and (not digit or len(digit) != 1 or not digit.isdigit()):
+            raise ValueError("Cần đúng một chữ số cho thao tác insert / replace")
+        if operation == "insert":
+            if len(self.digits) >= MAX_DIGITS:
+                raise ValueError(f"Số điện thoại tối đa {MAX_DIGITS} chữ số")
+            return self.digits[:position] + digit + self.digits[position:]
+        if operation == "delete":
+            return self.digits[:position] + self.digits[position + 1:]
+        return self.digits[:position] + digit + self.digits[position + 1:]
+
+    def apply(self, operation: str, position: int, digit: Optional[str] = None) -> Dict[str, Any]:
+        """Sửa một chữ số và tính lại phần bị ảnh hưởng
+
+        Args:
+            operation: "insert" (chèn trước vị trí), "delete" hoặc "replace"
+            position: Vị trí chữ số (tính từ 0)
+            digit: Chữ số mới (cho insert / replace)
+
+        Returns:
+            Dict[str, Any]: Delta gồm version, digits, starSequence / combinations dạng
+            {start, deleteCount, items} và specialAttribute nếu thuộc tính cả dãy thay đổi
+
+        Raises:
+            ValueError: Nếu thao tác hoặc tham số không hợp lệ
+        """
+        old_digits = self.digits
+        new_digits = self._edited_digits(operation, position, digit)
+        shift = {"insert": 1, "delete": -1, "replace": 0}[operation]
+
+        # Chữ số neo liền trước vị trí sửa (không đổi chỗ) và liền sau (dịch theo shift)
+        left = next((i for i in range(position - 1, -1, -1) if old_digits[i] not in _SPECIAL_DIGITS), None)
+        right_from = position if operation == "insert" else position + 1
+        right = next((i for i in range(right_from, len(old_digits)) if old_digits[i] not in _SPECIAL_DIGITS), None)
+
+        # Các cặp cũ bắt đầu trong [left, right) bị thay bằng các cặp tách lại trong cửa sổ mới
+        first = 0
+        if left is not None:
+            first = next((k for k, token in enumerate(self.tokens) if token[0] >= left), len(self.tokens))
+        last = len(self.tokens)
+        if right is not None:
+            last = next((k for k, token in enumerate(self.tokens) if token[0] >= right), len(self.tokens))
+
+        window_start = left if left is not None else 0
+        window_end = right + shift + 1 if right is not None else len(new_digits)
+        new_tokens = tokenize_digits(new_digits, window_start, window_end)
+        new_stars = [self._entry(new_digits, token) for token in new_tokens]
+
+        self.tokens[first:last] = new_tokens
+        if shift:
+            for k in range(first + len(new_tokens), len(self.tokens)):
+                token = self.tokens[k]
+                self.tokens[k] = token._replace(start=token.start + shift, end=token.end + shift)
+        self.stars[first:last] = new_stars
+
+        # Tổ hợp bị ảnh hưởng: các tổ hợp chạm vào đoạn sao đã thay
+        combo_first = max(0, first - 1)
+        combo_old_last = min(len(self.combinations), last)
+        combo_new_last = min(len(self.stars) - 1, first + len(new_stars))
+        new_combinations = [_combination(self.stars[i], self.stars[i + 1]) for i in range(combo_first, combo_new_last)]
+        combo_deleted = max(0, combo_old_last - combo_first)
+        self.combinations[combo_first:combo_first + combo_deleted] = new_combinations
+
+        self.digits = new_digits
+        self.version += 1
+        delta: Dict[str, Any] = {
+            "sessionId": self.session_id,
+            "version": self.version,
+            "digits": new_digits,
+            "starSequence": {
+                "start": first,
+                "deleteCount": last - first,
+                "items": [self._star_view(star) for star in new_stars]
+            },
+            "combinations": {
+                "start": combo_first,
+                "deleteCount": combo_deleted,
+                "items": new_combinations
+            }
+        }
+
+        special = PhoneAnalyzer._special_attributes(new_digits)
+        if special != self.special:
+            self.special = special
+            delta["specialAttribute"] = {"specialAttribute": special[0], "specialEffect": special[1]}
+        if self.purpose:
+            delta["purposeCompatibility"] = self._purpose()
+        return delta
+
+
+class PhoneEditSessionStore:
+    """Lưu các phiên sửa số trong LRUCache (giới hạn số phiên và TTL)"""
+
+    def __init__(self, max_entries: int = 10000, ttl: Optional[float] = 1800):
+        self._sessions = LRUCache(max_entries=max_entries, ttl=ttl, name="phone_edit_sessions", size_of=lambda _: 1)
+
+    def create(self, digits: str = "", purpose: Optional[str] = None) -> PhoneEditSession:
+        """Tạo phiên mới"""
+        session = PhoneEditSession(digits, purpose)
+        self._sessions.set(session.session_id, session)
+        return session
+
+    def get(self, session_id: str) -> Optional[PhoneEditSession]:
+        """Lấy phiên, None nếu không có hoặc đã hết hạn"""
+        return self._sessions.get(session_id)
+
+    def delete(self, session_id: str) -> bool:
+        """Xóa phiên"""
+        return self._sessions.delete(session_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """Thống kê cache phiên"""
+        return self._sessions.stats()
+
+
+def _create_phone_edit_sessions() -> PhoneEditSessionStore:
+    """Tạo kho phiên sửa số từ cấu hình ứng dụng"""
+    return PhoneEditSessionStore(**AppConfig().phone_edit_session_config)
+
+
+# Kho phiên sửa số dùng chung
+phone_edit_sessions = _create_phone_edit_sessions()
@@ -0,0 +1,312 @@
+"""
+Phone Generator: Sinh số điện thoại đẹp theo ràng buộc bằng beam search trên đồ thị sao
+
+Số điện thoại được dựng từng chữ số một. Mỗi khi một cặp số (theo đúng quy tắc nhóm 0/5
+của `PhoneAnalyzer._generate_pairs`) khép lại, điểm được cộng theo sao của cặp (BAT_TINH),
+theo tổ hợp với sao liền trước (COMBINATIONS) và theo mục đích sử dụng (PURPOSE_STARS).
+
+Phần điểm còn lại của một số chỉ phụ thuộc vào trạng thái (chữ số neo, hiệu số 5 - số 0
+đang chờ, sao liền trước, các chữ số bắt buộc còn thiếu), nên chỉ cần giữ `top_k` ứng viên
+tốt nhất cho mỗi trạng thái là đủ để tìm đúng `top_k` số tốt nhất mà không phải duyệt 10^7 số.
+"""
+
+import heapq
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from python_adk.agents.batcuclinh_so_agent.tools.phone_analyzer import PhoneAnalyzer
+from python_adk.constants.combinations import COMBINATIONS
+from python_adk.constants.phone_prefixes import MOBILE_PREFIXES, PREFIX_CARRIERS, carrier_of
+from python_adk.constants.purposes import PURPOSE_STARS, resolve_purpose
+from python_adk.constants.star_index import PAIR_INDEX
+from python_adk.shared_libraries.lazy import lazy_function_tool, lazy_module_getattr
+
+PHONE_LENGTH = 10
+MAX_TOP_K = 100
+DEFAULT_TOP_K = 5
+
+# Dấu điểm theo tính chất sao: Cát cộng, Hung trừ, Cát/Hung trung tính
+NATURE_SIGN = {"Cát": 1, "Hung": -1}
+# Điểm cộng / trừ cho mỗi sao thuận lợi / bất lợi với mục đích
+PURPOSE_BONUS = 2.0
+# Điểm cộng / trừ cho tổ hợp hai sao Cát / hai sao Hung liền kề
+COMBINATION_BONUS = 1.0
+# Năng lượng tối đa của một cặp và số cặp tối đa (số 0 đầu luôn bị bỏ qua), dùng để quy điểm về thang 0-10
+MAX_PAIR_ENERGY = 4
+MAX_SCORED_PAIRS = PHONE_LENGTH - 2
+
+# Chữ số 0/5 không tạo cặp mà điều chỉnh năng lượng cặp kế tiếp, nên sao *_ZERO không bao giờ được phát ra
+SPECIAL_DIGITS = frozenset("05")
+
+
+def _build_star_signs() -> Dict[str, int]:
+    """Dấu điểm của từng sao theo tính chất trong BAT_TINH"""
+    return {entry.star: NATURE_SIGN.get(entry.nature, 0) for entry in PAIR_INDEX.values()}
+
+
+STAR_SIGNS: Dict[str, int] = _build_star_signs()
+
+
+def _combination_gain(previous_star: Optional[str], star: Optional[str]) -> float:
+    """Điểm của tổ hợp hai sao liền kề"""
+    if not previous_star or not star or f"{previous_star}_{star}" not in COMBINATIONS:
+        return 0.0
+    previous_sign, sign = STAR_SIGNS.get(previous_star, 0), STAR_SIGNS.get(star, 0)
+    if previous_sign == sign and sign != 0:
+        return sign * COMBINATION_BONUS
+    return 0.0
+
+
+def _purpose_gain(star: Optional[str], purpose_key: Optional[str]) -> float:
+    """Điểm của sao theo mục đích sử dụng"""
+    if not star or not purpose_key:
+        return 0.0
+    info = PURPOSE_STARS[purpose_key]
+    if star in info["favorable_stars"]:
+        return PURPOSE_BONUS
+    if star in info["unfavorable_stars"]:
+        return -PURPOSE_BONUS
+    return 0.0
+
+
+def _pair_gain(
+    previous_star: Optional[str],
+    star: Optional[str],
+    energy: float,
+    response_factor: float,
+    purpose_key: Optional[str]
+) -> float:
+    """Điểm cộng thêm khi một cặp số khép lại"""
+    if not star:
+        return 0.0
+    return (
+        STAR_SIGNS.get(star, 0) * energy * response_factor
+        + _purpose_gain(star, purpose_key)
+        + _combination_gain(previous_star, star)
+    )
+
+
+def score_phone(phone_number: str, purpose: Optional[str] = None) -> Dict[str, Any]:
+    """Chấm điểm một số điện thoại theo cùng thang điểm của bộ sinh số
+
+    Args:
+        phone_number: Số điện thoại 10 chữ số
+        purpose: Mục đích sử dụng (mã hoặc mô tả tự do), có thể bỏ trống
+
+    Returns:
+        Dict[str, Any]: Điểm tối ưu (score), điểm phong thủy và điểm phù hợp mục đích (thang 0-10),
+        chuỗi sao và số sao thuận lợi / bất lợi
+    """
+    purpose_key = resolve_purpose(purpose)
+    sequence = PhoneAnalyzer._map_to_star_sequence(phone_number)
+
+    score = 0.0
+    base_score = 0.0
+    favorable = unfavorable = 0
+    stars: List[str] = []
+    previous_star = None
+    for item in sequence:
+        star = item["star"] if item["star"] != "UNKNOWN" else None
+        if star:
+            stars.append(star)
+            base_score += STAR_SIGNS.get(star, 0) * item["energyLevel"] * item["responseFactor"]
+            purpose_gain = _purpose_gain(star, purpose_key)
+            favorable += purpose_gain > 0
+            unfavorable += purpose_gain < 0
+        score += _pair_gain(previous_star, star, item["energyLevel"], item["responseFactor"], purpose_key)
+        previous_star = star
+
+    max_base = MAX_PAIR_ENERGY * MAX_SCORED_PAIRS
+    fengshui_score = min(10.0, max(0.0, 5.0 + 5.0 * base_score / max_base))
+    purpose_score = 5.0
+    if purpose_key and stars:
+        purpose_score = min(10.0, max(0.0, 5.0 + 5.0 * (favorable - unfavorable) / len(stars)))
+
+    return {
+        "phone_number": phone_number,
+        "carrier": carrier_of(phone_number),
+        "purpose": PURPOSE_STARS[purpose_key]["name"] if purpose_key else None,
+        "score": round(score, 4),
+        "fengshui_score": round(fengshui_score, 2),
+        "purpose_score": round(purpose_score, 2),
+        "favorable_count": favorable,
+        "unfavorable_count": unfavorable,
+        "stars": stars
+    }
+
+
+def _parse_digits(digits: Optional[Iterable[Any]], name: str) -> frozenset:
+    """Chuẩn hóa danh sách chữ số (chấp nhận chuỗi "368" hoặc list ["3", 6, "8"])"""
+    if not digits:
+        return frozenset()
+    parsed = set()
+    for digit in (digits if not isinstance(digits, str) else list(digits)):
+        digit = str(digit).strip()
+        if len(digit) != 1 or not digit.isdigit():
+            raise ValueError(f"{name} chỉ được chứa các chữ số 0-9: {digit!r}")
+        parsed.add(digit)
+    return frozenset(parsed)
+
+
+def _resolve_prefixes(prefix: Optional[str]) -> List[str]:
+    """Danh sách đầu số bắt đầu tìm kiếm từ tên nhà mạng hoặc đầu số"""
+    if not prefix:
+        return sorted(PREFIX_CARRIERS)
+
+    prefix = prefix.strip().lower()
+    if prefix in MOBILE_PREFIXES:
+        return list(MOBILE_PREFIXES[prefix])
+
+    prefix = prefix.replace(" ", "").replace(".", "").replace("-", "")
+    if prefix.startswith("+84"):
+        prefix = "0" + prefix[3:]
+    if not prefix.isdigit() or len(prefix) > PHONE_LENGTH:
+        raise ValueError(f"Đầu số không hợp lệ: {prefix}")
+    if len(prefix) < 3:
+        prefixes = [known for known in sorted(PREFIX_CARRIERS) if known.startswith(prefix)]
+    else:
+        prefixes = [prefix] if prefix[:3] in PREFIX_CARRIERS else []
+    if not prefixes:
+        raise ValueError(f"Đầu số không thuộc nhà mạng di động Việt Nam nào: {prefix}")
+    return prefixes
+
+
+# Trạng thái: (chữ số neo, hiệu số 5 - số 0 đang chờ, sao liền trước, chữ số bắt buộc còn thiếu)
+SearchState = Tuple[Optional[str], int, Optional[str], frozenset]
+
+
+def advance_state(state: SearchState, digit: str, purpose_key: Optional[str]) -> Tuple[SearchState, float]:
+    """Thêm một chữ số vào cuối, trả về trạng thái mới và điểm cộng thêm
+
+    Dùng chung cho beam search và bộ dựng bảng điểm (`phone_score_table`).
+
+    Args:
+        state: Trạng thái hiện tại
+        digit: Chữ số được thêm
+        purpose_key: Mã mục đích trong PURPOSE_STARS, None để bỏ qua điểm mục đích
+
+    Returns:
+        Tuple[SearchState, float]: Trạng thái mới và điểm cộng thêm khi một cặp số khép lại
+    """
+    anchor, net_five, previous_star, missing = state
+    missing = missing - {digit} if digit in missing else missing
+
+    if digit in SPECIAL_DIGITS:
+        # Số 0/5 chỉ có tác dụng khi đã có chữ số neo (số 0 đầu bị bỏ qua)
+        if anchor is not None:
+            # Năng lượng tối thiểu là 1 nên hiệu số nhỏ hơn -(MAX_PAIR_ENERGY - 1) không còn khác biệt
+            net_five = max(net_five + (1 if digit == "5" else -1), 1 - MAX_PAIR_ENERGY)
+        return (anchor, net_five, previous_star, missing), 0.0
+
+    if anchor is None:
+        return (digit, 0, previous_star, missing), 0.0
+
+    entry = PAIR_INDEX.get(anchor + digit)
+    if entry is None:
+        return (digit, 0, None, missing), 0.0
+    energy = max(1, entry.energy + net_five)
+    gain = _pair_gain(previous_star, entry.star, energy, entry.response_factor, purpose_key)
+    return (digit, 0, entry.star, missing), gain
+
+
+def generate_phone_numbers(
+    prefix: Optional[str] = None,
+    required_digits: Optional[Iterable[Any]] = None,
+    forbidden_digits: Optional[Iterable[Any]] = None,
+    purpose: Optional[str] = None,
+    top_k: int = DEFAULT_TOP_K
+) -> List[Dict[str, Any]]:
+    """Sinh các số điện thoại 10 chữ số có điểm cao nhất thỏa mãn ràng buộc
+
+    Args:
+        prefix: Tên nhà mạng (ví dụ "viettel") hoặc đầu số (ví dụ "098", "0988"), bỏ trống để dùng mọi đầu số
+        required_digits: Các chữ số bắt buộc phải xuất hiện
+        forbidden_digits: Các chữ số không được xuất hiện trong phần được sinh sau đầu số
+            (đầu số do nhà mạng / người dùng chọn, ví dụ số 0 đầu, không bị ràng buộc)
+        purpose: Mục đích sử dụng (mã trong PURPOSE_STARS hoặc mô tả tự do)
+        top_k: Số lượng số điện thoại trả về (tối đa MAX_TOP_K)
+
+    Returns:
+        List[Dict[str, Any]]: Các số điện thoại theo điểm giảm dần, kèm điểm và chuỗi sao
+
+    Raises:
+        ValueError: Nếu ràng buộc không hợp lệ hoặc mâu thuẫn
+    """
+    top_k = max(1, min(int(top_k), MAX_TOP_K))
+    required = _parse_digits(required_digits, "required_digits")
+    forbidden = _parse_digits(forbidden_digits, "forbidden_digits")
+    if required & forbidden:
+        raise ValueError(f"Chữ số vừa bắt buộc vừa bị cấm: {', '.join(sorted(required & forbidden))}")
+
+    allowed = [str(d) for d in range(10) if str(d) not in forbidden]
+    if not allowed:
+        raise ValueError("Không còn chữ số nào được phép sử dụng")
+    prefixes = _resolve_prefixes(prefix)
+    purpose_key = resolve_purpose(purpose)
+
+    # Beam ban đầu: chạy qua các chữ số của đầu số.
+    # Ứng viên lưu dạng (-điểm, số) để sắp xếp tăng dần là điểm giảm dần, cùng điểm thì số nhỏ hơn trước
+    beams: Dict[SearchState, List[Tuple[float, str]]] = defaultdict(list)
+    for start in prefixes:
+        state: SearchState = (None, 0, None, required)
+        score = 0.0
+        for digit in start:
+            state, gain = advance_state(state, digit, purpose_key)
+            score += gain
+        beams[state].append((-score, start))
+    length = len(prefixes[0])
+    transitions: Dict[Tuple[SearchState, str], Tuple[SearchState, float]] = {}
+
+    while length < PHONE_LENGTH:
+        remaining = PHONE_LENGTH - length - 1
+        next_beams: Dict[SearchState, List[Tuple[float, str]]] = defaultdict(list)
+        for state, candidates in beams.items():
+            for digit in allowed:
+                transition = transitions.get((state, digit))
+                if transition is None:
+                    transition = transitions[(state, digit)] = advance_state(state, digit, purpose_key)
+                next_state, gain = transition
+                # Cắt nhánh không thể đủ các chữ số bắt buộc trong số vị trí còn lại
+                if len(next_state[3]) > remaining:
+                    continue
+                bucket = next_beams[next_state]
+                bucket.extend([(neg_score - gain, number + digit) for neg_score, number in candidates])
+        # Chỉ giữ top_k ứng viên cho mỗi trạng thái (phần điểm còn lại chỉ phụ thuộc trạng thái)
+        beams = {state: sorted(bucket)[:top_k] for state, bucket in next_beams.items()}
+        length += 1
+
+    finals = [candidate for state, candidates in beams.items() if not state[3] for candidate in candidates]
+    best = heapq.nsmallest(top_k, finals)
+    return [score_phone(number, purpose) for _, number in best]
+
+
+def phone_generator(
+    prefix: Optional[str] = None,
+    required_digits: Optional[List[str]] = None,
+    forbidden_digits: Optional[List[str]] = None,
+    purpose: Optional[str] = None,
+    top_k: int = DEFAULT_TOP_K
+) -> Dict[str, Any]:
+    """Gợi ý số điện thoại đẹp theo phương pháp Bát Cục Linh Số.
+
+    Sử dụng tool này khi người dùng muốn tìm / chọn số điện thoại mới hợp phong thủy.
+
+    Args:
+        prefix: Nhà mạng (viettel, vinaphone, mobifone, ...) hoặc đầu số mong muốn (ví dụ "098").
+        required_digits: Các chữ số bắt buộc có trong số.
+        forbidden_digits: Các chữ số không muốn có trong số (không áp dụng cho đầu số).
+        purpose: Mục đích sử dụng (kinh doanh, tài lộc, sự nghiệp, tình cảm, sức khỏe, học tập, cá nhân).
+        top_k: Số lượng số điện thoại gợi ý.
+
+    Returns:
+        Danh sách số điện thoại gợi ý kèm điểm.
+    """
+    try:
+        suggestions = generate_phone_numbers(prefix, required_digits, forbidden_digits, purpose, top_k)
+    except ValueError as e:
+        return {"success": False, "message": str(e), "suggestions": []}
+    return {"success": True, "suggestions": suggestions}
+
+
+# Tạo Function Tool
+__getattr__ = lazy_module_getattr(__name__, {"phone_generator_tool": lazy_function_tool(phone_generator)})
@@ -0,0 +1,459 @@
+"""
+Phone Score Table: Bảng điểm dựng sẵn cho toàn bộ thuê bao của một đầu số
+
+Số di động gồm 3 chữ số đầu số (network_code) và 7 chữ số thuê bao (subscriber_number),
+nên mỗi đầu số chỉ có 10^7 số. Bộ dựng chạy offline, tính cho mọi thuê bao một bản ghi gọn
+(chuỗi sao, tổng năng lượng, điểm, điểm theo từng mục đích, số sao Cát / Hung) bằng cùng máy
+trạng thái với `phone_generator`, vector hóa bằng numpy theo từng chữ số.
+
+Mỗi đầu số được ghi thành:
+    <dir>/<prefix>.npy   mảng bản ghi, mở bằng memmap (chỉ đọc, dùng chung page cache giữa các worker)
+    <dir>/<prefix>.json  sidecar: histogram điểm (tính phần trăm xếp hạng) và top-N theo từng mục đích
+
+Dựng bảng:
+    python -m python_adk.agents.batcuclinh_so_agent.tools.phone_score_table --prefix 098 096
+    python -m python_adk.agents.batcuclinh_so_agent.tools.phone_score_table --carrier viettel
+"""
+
+import argparse
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from python_adk.agents.batcuclinh_so_agent.tools.phone_generator import (
+    PHONE_LENGTH,
+    PURPOSE_BONUS,
+    SPECIAL_DIGITS,
+    STAR_SIGNS,
+    SearchState,
+    advance_state
+)
+from python_adk.config.config import AppConfig
+from python_adk.constants.phone_prefixes import MOBILE_PREFIXES, PREFIX_CARRIERS
+from python_adk.constants.purposes import PURPOSE_STARS, resolve_purpose
+from python_adk.constants.star_index import PAIR_INDEX, STAR_CODES, STAR_KEYS
+from python_adk.shared_libraries.logger import get_logger
+
+logger = get_logger("phone_score_table")
+
+FORMAT_VERSION = 1
+PREFIX_LENGTH = 3
+SUBSCRIBER_DIGITS = PHONE_LENGTH - PREFIX_LENGTH
+SUBSCRIBER_COUNT = 10 ** SUBSCRIBER_DIGITS
+# Điểm và năng lượng lưu dạng số nguyên theo phần trăm đơn vị
+SCORE_SCALE = 100
+DEFAULT_TOP_N = 1000
+# Mỗi sao chiếm một nibble, giá trị 0 đánh dấu hết chuỗi nên mã sao + 1 phải <= 0xF
+STAR_NIBBLE_MAX = 0xF
+
+PURPOSE_KEYS: Tuple[str, ...] = tuple(PURPOSE_STARS.keys())
+# Khóa top-N / histogram khi không xét mục đích
+NO_PURPOSE = ""
+
+# Bản ghi 17 byte / số:
+#   stars   - chuỗi sao, mỗi sao 4 bit (mã sao + 1), sao đầu ở nibble cao nhất
+#   energy  - tổng năng lượng có dấu (Cát +, Hung -) × SCORE_SCALE
+#   score   - điểm của bộ sinh số khi không xét mục đích × SCORE_SCALE
+#   purpose - số sao thuận lợi trừ bất lợi theo từng mục đích (thứ tự PURPOSE_KEYS)
+#   good / bad - số sao Cát / Hung
+RECORD_DTYPE = np.dtype([
+    ("stars", "<u4"),
+    ("energy", "<i2"),
+    ("score", "<i2"),
+    ("purpose", "i1", (len(PURPOSE_KEYS),)),
+    ("good", "u1"),
+    ("bad", "u1")
+])
+
+
+def _star_code(star: str) -> int:
+    """Mã sao để đóng gói 4 bit
+
+    Raises:
+        ValueError: Nếu mã sao + 1 không vừa một nibble (ví dụ sao *_ZERO, vốn không bao giờ
+            được máy trạng thái phát ra vì chữ số 0/5 không tạo cặp)
+    """
+    code = STAR_CODES[star]
+    if code + 1 > STAR_NIBBLE_MAX:
+        raise ValueError(f"Sao {star} không đóng gói được trong 4 bit")
+    return code
+
+
+def _purpose_net(star: str) -> List[int]:
+    """Sao thuận lợi (+1) / bất lợi (-1) / trung tính (0) theo từng mục đích"""
+    return [
+        1 if star in PURPOSE_STARS[key]["favorable_stars"]
+        else -1 if star in PURPOSE_STARS[key]["unfavorable_stars"]
+        else 0
+        for key in PURPOSE_KEYS
+    ]
+
+
+class _TransitionTable:
+    """Bảng chuyển trạng thái dạng mảng cho các chữ số thuê bao, dựng từ `advance_state`"""
+
+    def __init__(self, start: SearchState, steps: int = SUBSCRIBER_DIGITS):
+        self.states: List[SearchState] = [start]
+        self.ids: Dict[SearchState, int] = {start: 0}
+        depths = [0]
+        rows: List[Tuple[int, float, float, int, List[int]]] = []
+
+        # Duyệt BFS theo số bước: hiệu số 5 - số 0 không bị chặn trên nên chỉ mở rộng trong `steps` bước,
+        # trạng thái ở bước cuối nhận các dòng rỗng để giữ đúng chỉ số state * 10 + digit
+        index = 0
+        while index < len(self.states):
+            state = self.states[index]
+            if depths[index] >= steps:
+                rows.extend([(index, 0.0, 0.0, -1, [0] * len(PURPOSE_KEYS))] * 10)
+                index += 1
+                continue
+            for digit in "0123456789":
+                next_state, gain = advance_state(state, digit, None)
+                if next_state not in self.ids:
+                    self.ids[next_state] = len(self.states)
+                    self.states.append(next_state)
+                    depths.append(depths[index] + 1)
+                rows.append(self._emission(state, digit, next_state, gain))
+            index += 1
+
+        self.next_state = np.array([row[0] for row in rows], dtype=np.int16)
+        self.gain = np.array([round(row[1] * SCORE_SCALE) for row in rows], dtype=np.int16)
+        self.energy = np.array([round(row[2] * SCORE_SCALE) for row in rows], dtype=np.int16)
+        self.star = np.array([row[3] for row in rows], dtype=np.int8)
+        self.purpose = np.array([row[4] for row in rows], dtype=np.int8)
+
+    def _emission(
+        self,
+        state: SearchState,
+        digit: str,
+        next_state: SearchState,
+        gain: float
+    ) -> Tuple[int, float, float, int, List[int]]:
+        """(trạng thái kế, điểm, năng lượng, mã sao phát ra hoặc -1, điểm mục đích) của một bước"""
+        anchor, net_five = state[0], state[1]
+        next_id = self.ids[next_state]
+        if digit in SPECIAL_DIGITS or anchor is None:
+            return next_id, gain, 0.0, -1, [0] * len(PURPOSE_KEYS)
+        entry = PAIR_INDEX[anchor + digit]
+        energy = STAR_SIGNS.get(entry.star, 0) * max(1, entry.energy + net_five) * entry.response_factor
+        return next_id, gain, energy, _star_code(entry.star), _purpose_net(entry.star)
+
+
+def _prefix_state(prefix: str) -> Tuple[SearchState, float, float, List[str]]:
+    """Chạy máy trạng thái qua các chữ số đầu số"""
+    state: SearchState = (None, 0, None, frozenset())
+    score = energy = 0.0
+    stars: List[str] = []
+    for digit in prefix:
+        anchor, net_five = state[0], state[1]
+        next_state, gain = advance_state(state, digit, None)
+        if digit not in SPECIAL_DIGITS and anchor is not None:
+            entry = PAIR_INDEX[anchor + digit]
+            stars.append(entry.star)
+            energy += STAR_SIGNS.get(entry.star, 0) * max(1, entry.energy + net_five) * entry.response_factor
+        score += gain
+        state = next_state
+    return state, score, energy, stars
+
+
+def build_score_records(prefix: str) -> np.ndarray:
+    """Tính bản ghi điểm cho mọi thuê bao của một đầu số
+
+    Args:
+        prefix: Đầu số 3 chữ số (ví dụ "098")
+
+    Returns:
+        np.ndarray: Mảng RECORD_DTYPE dài 10^7, vị trí i là thuê bao i (0000000-9999999)
+    """
+    start, prefix_score, prefix_energy, prefix_stars = _prefix_state(prefix)
+    table = _TransitionTable(start)
+
+    subscribers = np.arange(SUBSCRIBER_COUNT, dtype=np.int32)
+    state = np.zeros(SUBSCRIBER_COUNT, dtype=np.int32)
+    score = np.full(SUBSCRIBER_COUNT, round(prefix_score * SCORE_SCALE), dtype=np.int32)
+    energy = np.full(SUBSCRIBER_COUNT, round(prefix_energy * SCORE_SCALE), dtype=np.int32)
+    stars = np.zeros(SUBSCRIBER_COUNT, dtype=np.uint32)
+    purpose = np.zeros((SUBSCRIBER_COUNT, len(PURPOSE_KEYS)), dtype=np.int8)
+    good = np.zeros(SUBSCRIBER_COUNT, dtype=np.uint8)
+    bad = np.zeros(SUBSCRIBER_COUNT, dtype=np.uint8)
+
+    for star in prefix_stars:
+        stars = (stars << np.uint32(4)) | np.uint32(_star_code(star) + 1)
+        purpose += np.array(_purpose_net(star), dtype=np.int8)
+        good += STAR_SIGNS.get(star, 0) > 0
+        bad += STAR_SIGNS.get(star, 0) < 0
+
+    star_sign = np.array([STAR_SIGNS.get(key, 0) for key in STAR_KEYS], dtype=np.int8)
+    for position in range(SUBSCRIBER_DIGITS):
+        digit = (subscribers // 10 ** (SUBSCRIBER_DIGITS - 1 - position)) % 10
+        transition = state * 10 + digit
+        score += table.gain[transition]
+        energy += table.energy[transition]
+        purpose += table.purpose[transition]
+
+        emitted = table.star[transition]
+        mask = emitted >= 0
+        codes = emitted[mask]
+        stars[mask] = (stars[mask] << np.uint32(4)) | (codes.astype(np.uint32) + np.uint32(1))
+        signs = star_sign[codes]
+        good[mask] += (signs > 0).astype(np.uint8)
+        bad[mask] += (signs < 0).astype(np.uint8)
+
+        state = table.next_state[transition].astype(np.int32)
+
+    records = np.empty(SUBSCRIBER_COUNT, dtype=RECORD_DTYPE)
+    records["stars"] = stars
+    records["energy"] = energy
+    records["score"] = score
+    records["purpose"] = purpose
+    records["good"] = good
+    records["bad"] = bad
+    return records
+
+
+def _ranking_scores(records: np.ndarray, purpose_key: Optional[str]) -> np.ndarray:
+    """Điểm xếp hạng (× SCORE_SCALE) theo mục đích, cùng thang với `generate_phone_numbers`"""
+    score = records["score"].astype(np.int32)
+    if purpose_key:
+        column = PURPOSE_KEYS.index(purpose_key)
+        score += records["purpose"][:, column].astype(np.int32) * round(PURPOSE_BONUS * SCORE_SCALE)
+    return score
+
+
+def _top_subscribers(ranking: np.ndarray, k: int) -> np.ndarray:
+    """Chỉ số k thuê bao điểm cao nhất, điểm giảm dần, cùng điểm thì số nhỏ hơn trước"""
+    k = min(k, len(ranking))
+    candidates = np.argpartition(-ranking, k - 1)[:k]
+    # Lấy đủ mọi thuê bao bằng điểm ngưỡng để thứ tự khi bằng điểm không phụ thuộc argpartition
+    threshold = ranking[candidates].min()
+    candidates = np.flatnonzero(ranking >= threshold)
+    order = np.lexsort((candidates, -ranking[candidates]))
+    return candidates[order][:k]
+
+
+def build_prefix_table(prefix: str, directory: str, top_n: int = DEFAULT_TOP_N) -> Dict[str, Any]:
+    """Dựng và ghi bảng điểm của một đầu số
+
+    Args:
+        prefix: Đầu số 3 chữ số
+        directory: Thư mục lưu bảng
+        top_n: Số thuê bao tốt nhất lưu sẵn trong sidecar cho mỗi mục đích
+
+    Returns:
+        Dict[str, Any]: Nội dung sidecar đã ghi
+
+    Raises:
+        ValueError: Nếu đầu số không thuộc nhà mạng nào
+    """
+    if prefix not in PREFIX_CARRIERS:
+        raise ValueError(f"Đầu số không thuộc nhà mạng di động Việt Nam nào: {prefix}")
+    os.makedirs(directory, exist_ok=True)
+
+    started = time.perf_counter()
+    records = build_score_records(prefix)
+
+    histograms = {}
+    top = {}
+    for purpose_key in (NO_PURPOSE,) + PURPOSE_KEYS:
+        ranking = _ranking_scores(records, purpose_key)
+        offset = int(ranking.min())
+        histograms[purpose_key] = {
+            "offset": offset,
+            "counts": np.bincount(ranking - offset).tolist()
+        }
+        top[purpose_key] = _top_subscribers(ranking, top_n).tolist()
+
+    # Ghi ra file tạm rồi đổi tên để worker đang đọc không thấy bảng dở dang
+    data_path = os.path.join(directory, f"{prefix}.npy")
+    np.save(data_path + ".tmp.npy", records)
+    os.replace(data_path + ".tmp.npy", data_path)
+
+    sidecar = {
+        "version": FORMAT_VERSION,
+        "prefix": prefix,
+        "carrier": PREFIX_CARRIERS[prefix],
+        "count": SUBSCRIBER_COUNT,
+        "score_scale": SCORE_SCALE,
+        "purposes": list(PURPOSE_KEYS),
+        "stars": list(STAR_KEYS),
+        "built_at": time.time(),
+        "build_seconds": round(time.perf_counter() - started, 3),
+        "histograms": histograms,
+        "top": top
+    }
+    sidecar_path = os.path.join(directory, f"{prefix}.json")
+    with open(sidecar_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(sidecar, f)
+    os.replace(sidecar_path + ".tmp", sidecar_path)
+
+    logger.info(f"Đã dựng bảng điểm đầu số {prefix} trong {sidecar['build_seconds']}s")
+    return sidecar
+
+
+class _PrefixTable:
+    """Bảng điểm đã mở của một đầu số"""
+
+    def __init__(self, records: np.ndarray, sidecar: Dict[str, Any]):
+        self.records = records
+        self.sidecar = sidecar
+        # Phân phối tích lũy: cumulative[i] = số thuê bao có điểm < offset + i
+        self.cumulative = {
+            key: (histogram["offset"], np.concatenate(([0], np.cumsum(histogram["counts"]))))
+            for key, histogram in sidecar["histograms"].items()
+        }
+
+
+class PhoneScoreTable:
+    """Tra cứu bảng điểm dựng sẵn; mỗi đầu số được memmap khi dùng lần đầu"""
+
+    def __init__(self, directory: Optional[str] = None):
+        """
+        Args:
+            directory: Thư mục chứa bảng điểm, mặc định theo AppConfig (PHONE_SCORE_TABLE_DIR)
+        """
+        self.directory = directory or AppConfig().phone_score_table_dir
+        self._tables: Dict[str, Optional[_PrefixTable]] = {}
+
+    def _open(self, prefix: str) -> Optional[_PrefixTable]:
+        """Mở (và ghi nhớ) bảng của một đầu số, None nếu chưa được dựng"""
+        if prefix in self._tables:
+            return self._tables[prefix]
+        data_path = os.path.join(self.directory, f"{prefix}.npy")
+        sidecar_path = os.path.join(self.directory, f"{prefix}.json")
+        table = None
+        if os.path.exists(data_path) and os.path.exists(sidecar_path):
+            with open(sidecar_path, encoding="utf-8") as f:
+                sidecar = json.load(f)
+            if sidecar.get("version") == FORMAT_VERSION:
+                table = _PrefixTable(np.load(data_path, mmap_mode="r"), sidecar)
+            else:
+                logger.warning(f"Bảng điểm {prefix} khác phiên bản định dạng, bỏ qua")
+        self._tables[prefix] = table
+        return table
+
+    def has_prefix(self, prefix: str) -> bool:
+        """Đầu số đã có bảng điểm hay chưa"""
+        return self._open(prefix) is not None
+
+    @staticmethod
+    def _split(phone_number: str) -> Tuple[str, int]:
+        """Tách số điện thoại thành (đầu số, chỉ số thuê bao)"""
+        if not phone_number.isdigit() or len(phone_number) != PHONE_LENGTH:
+            raise ValueError("Invalid phone number format. Must be 10 digits.")
+        return phone_number[:PREFIX_LENGTH], int(phone_number[PREFIX_LENGTH:])
+
+    @staticmethod
+    def _decode_stars(code: int) -> List[str]:
+        """Giải mã chuỗi sao từ các nibble"""
+        stars = []
+        while code:
+            stars.append(STAR_KEYS[(code & 0xF) - 1])
+            code >>= 4
+        return stars[::-1]
+
+    def lookup(self, phone_number: str) -> Optional[Dict[str, Any]]:
+        """Đọc bản ghi điểm của một số điện thoại (O(1))
+
+        Args:
+            phone_number: Số điện thoại 10 chữ số
+
+        Returns:
+            Dict[str, Any]: Chuỗi sao, năng lượng, điểm, điểm theo mục đích, số sao Cát / Hung;
+            None nếu đầu số chưa có bảng điểm
+        """
+        prefix, subscriber = self._split(phone_number)
+        table = self._open(prefix)
+        if table is None:
+            return None
+        record = table.records[subscriber]
+        return {
+            "phone_number": phone_number,
+            "carrier": table.sidecar["carrier"],
+            "stars": self._decode_stars(int(record["stars"])),
+            "energy": int(record["energy"]) / SCORE_SCALE,
+            "score": int(record["score"]) / SCORE_SCALE,
+            "purpose_net": {key: int(value) for key, value in zip(PURPOSE_KEYS, record["purpose"])},
+            "good_count": int(record["good"]),
+            "bad_count": int(record["bad"])
+        }
+
+    def percentile(self, phone_number: str, purpose: Optional[str] = None) -> Optional[float]:
+        """Phần trăm xếp hạng của số trong đầu số (0-100, cao hơn là tốt hơn)
+
+        Args:
+            phone_number: Số điện thoại 10 chữ số
+            purpose: Mục đích sử dụng (mã hoặc mô tả), bỏ trống để xếp theo điểm chung
+
+        Returns:
+            float: Tỉ lệ phần trăm số cùng đầu số có điểm thấp hơn (tính nửa số bằng điểm),
+            None nếu đầu số chưa có bảng điểm
+        """
+        prefix, subscriber = self._split(phone_number)
+        table = self._open(prefix)
+        if table is None:
+            return None
+        purpose_key = resolve_purpose(purpose) or NO_PURPOSE
+        score = int(_ranking_scores(table.records[subscriber:subscriber + 1], purpose_key)[0])
+        offset, cumulative = table.cumulative[purpose_key]
+        below = cumulative[score - offset]
+        equal = cumulative[score - offset + 1] - below
+        return round(100.0 * (below + equal / 2) / table.sidecar["count"], 4)
+
+    def best(self, prefix: str, k: int = 10, purpose: Optional[str] = None) -> List[Tuple[str, float]]:
+        """Các số tốt nhất của một đầu số
+
+        Đọc thẳng top-N trong sidecar (O(k)); chỉ khi k lớn hơn top-N mới quét cột điểm trên memmap.
+
+        Args:
+            prefix: Đầu số 3 chữ số
+            k: Số lượng kết quả
+            purpose: Mục đích sử dụng (mã hoặc mô tả), bỏ trống để xếp theo điểm chung
+
+        Returns:
+            List[Tuple[str, float]]: (số điện thoại, điểm) theo điểm giảm dần;
+            rỗng nếu đầu số chưa có bảng điểm
+        """
+        table = self._open(prefix)
+        if table is None or k < 1:
+            return []
+        purpose_key = resolve_purpose(purpose) or NO_PURPOSE
+        subscribers = table.sidecar["top"][purpose_key]
+        if k > len(subscribers):
+            subscribers = _top_subscribers(_ranking_scores(table.records, purpose_key), k).tolist()
+        subscribers = subscribers[:k]
+        scores = _ranking_scores(table.records[subscribers], purpose_key)
+        return [
+            (f"{prefix}{subscriber:0{SUBSCRIBER_DIGITS}d}", int(score) / SCORE_SCALE)
+            for subscriber, score in zip(subscribers, scores)
+        ]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Dựng bảng điểm cho các đầu số từ dòng lệnh"""
+    parser = argparse.ArgumentParser(description="Dựng bảng điểm memmap cho toàn bộ thuê bao của đầu số")
+    parser.add_argument("--prefix", nargs="*", default=[], help="Đầu số 3 chữ số (ví dụ 098 096)")
+    parser.add_argument("--carrier", nargs="*", default=[], choices=sorted(MOBILE_PREFIXES), help="Dựng mọi đầu số của nhà mạng")
+    parser.add_argument("--all", action="store_true", help="Dựng mọi đầu số")
+    parser.add_argument("--out", default=None, help="Thư mục lưu bảng (mặc định PHONE_SCORE_TABLE_DIR)")
+    parser.add_argument("--top-n", type=int, default=DEFAULT_TOP_N, help="Số thuê bao tốt nhất lưu trong sidecar")
+    args = parser.parse_args(argv)
+
+    prefixes = list(args.prefix)
+    for carrier in args.carrier:
+        prefixes.extend(MOBILE_PREFIXES[carrier])
+    if args.all:
+        prefixes = sorted(PREFIX_CARRIERS)
+    if not prefixes:
+        parser.error("Cần ít nhất một --prefix, --carrier hoặc --all")
+
+    directory = args.out or AppConfig().phone_score_table_dir
+    for prefix in dict.fromkeys(prefixes):
+        sidecar = build_prefix_table(prefix, directory, args.top_n)
+        print(f"{prefix}: {sidecar['count']} số, {sidecar['build_seconds']}s -> {directory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,417 @@
+"""
+Star Inventory Index: Chỉ mục ngược theo sao cho kho số điện thoại
+
+Mỗi số trong kho được gán một slot. Với mỗi (sao, vị trí) và mỗi (sao, số lần xuất hiện >= c)
+chỉ mục giữ một bitmap uint64 trên các slot, nên truy vấn kiểu "THIEN_Y ở cặp cuối, không có
+TUYET_MENH, ít nhất hai SINH_KHI" chỉ là phép AND / ANDNOT giữa vài bitmap (numpy, vector hóa),
+không phải chạy lại `_map_to_star_sequence` cho từng số.
+
+Vị trí đếm từ đầu (0, 1, ...) hoặc từ cuối (-1 là cặp cuối, -2 là cặp kế cuối, ...).
+Thêm / bớt số (khi số được bán) chỉ bật / tắt các bit của slot đó; slot trống được dùng lại.
+
+Kho số dùng chung được nạp từ file STAR_INVENTORY_FILE khi khởi động và cập nhật qua
+các endpoint /inventory/numbers.
+"""
+
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from python_adk.agents.batcuclinh_so_agent.tools.phone_analyzer import PhoneAnalyzer
+from python_adk.config.config import AppConfig
+from python_adk.constants.star_index import PAIR_INDEX, STAR_KEYS
+from python_adk.shared_libraries.digit_tokenizer import tokenize_digits
+from python_adk.shared_libraries.lazy import lazy_function_tool, lazy_module_getattr
+from python_adk.shared_libraries.logger import get_logger
+
+logger = get_logger("star_inventory_index")
+
+PHONE_LENGTH = 10
+WORD_BITS = 64
+DEFAULT_CAPACITY = 1024
+DEFAULT_QUERY_LIMIT = 100
+# Cặp không có sao tương ứng (ví dụ nhóm 0/5 ở cuối số) vẫn chiếm một vị trí
+UNKNOWN_STAR = "UNKNOWN"
+INDEXED_STARS = frozenset(STAR_KEYS) | {UNKNOWN_STAR}
+
+_Key = Tuple[Any, ...]
+
+if hasattr(np, "bitwise_count"):
+    def _popcount(bitmap: np.ndarray) -> int:
+        return int(np.bitwise_count(bitmap).sum())
+else:
+    def _popcount(bitmap: np.ndarray) -> int:
+        return int(np.unpackbits(bitmap.view(np.uint8)).sum())
+
+
+def star_keys_of(stars: List[str]) -> List[_Key]:
+    """Các khóa bitmap mà một chuỗi sao bật lên
+
+    Args:
+        stars: Chuỗi sao theo thứ tự cặp số
+
+    Returns:
+        List[_Key]: ("at", vị trí, sao) theo cả hai chiều và ("count", sao, c) với c = 1..số lần xuất hiện
+    """
+    keys: List[_Key] = []
+    counts: Dict[str, int] = {}
+    length = len(stars)
+    for position, star in enumerate(stars):
+        keys.append(("at", position, star))
+        keys.append(("at", position - length, star))
+        counts[star] = counts.get(star, 0) + 1
+        keys.append(("count", star, counts[star]))
+    return keys
+
+
+class StarInventoryIndex:
+    """Chỉ mục bitmap theo sao cho một kho số điện thoại (an toàn luồng)"""
+
+    def __init__(self, initial_capacity: int = DEFAULT_CAPACITY):
+        """
+        Args:
+            initial_capacity: Số slot cấp phát ban đầu (tự tăng gấp đôi khi đầy)
+        """
+        self._words = max(1, -(-initial_capacity // WORD_BITS))
+        self._alive = np.zeros(self._words, dtype=np.uint64)
+        self._bitmaps: Dict[_Key, np.ndarray] = {}
+        self._slots: Dict[str, int] = {}
+        self._numbers: List[Optional[str]] = []
+        self._slot_keys: List[Tuple[_Key, ...]] = []
+        self._free: List[int] = []
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _stars_of(phone_number: str) -> List[str]:
+        """Chuỗi sao của một số điện thoại đã chuẩn hóa (giống trường "star" của `_map_to_star_sequence`)"""
+        stars = []
+        for token in tokenize_digits(phone_number):
+            entry = PAIR_INDEX.get(token.pair)
+            stars.append(entry.star if entry else UNKNOWN_STAR)
+        return stars
+
+    @staticmethod
+    def _normalize(phone_number: str) -> str:
+        """Chuẩn hóa và kiểm tra số điện thoại"""
+        normalized = PhoneAnalyzer._normalize_phone_number(phone_number)
+        if len(normalized) != PHONE_LENGTH:
+            raise ValueError(f"Số điện thoại không hợp lệ: {phone_number}")
+        return normalized
+
+    def _grow(self, slots: int) -> None:
+        """Mở rộng mọi bitmap để chứa đủ `slots` slot"""
+        needed = -(-slots // WORD_BITS)
+        if needed <= self._words:
+            return
+        words = max(needed, self._words * 2)
+        padding = np.zeros(words - self._words, dtype=np.uint64)
+        self._alive = np.concatenate((self._alive, padding))
+        for key, bitmap in self._bitmaps.items():
+            self._bitmaps[key] = np.concatenate((bitmap, padding))
+        self._words = words
+
+    def _bitmap(self, key: _Key) -> np.ndarray:
+        """Bitmap của một khóa, tạo mới nếu chưa có"""
+        bitmap = self._bitmaps.get(key)
+        if bitmap is None:
+            bitmap = self._bitmaps[key] = np.zeros(self._words, dtype=np.uint64)
+        return bitmap
+
+    @staticmethod
+    def _set_bits(bitmap: np.ndarray, slots: List[int]) -> None:
+        """Bật bit của các slot trong bitmap"""
+        slots_array = np.asarray(slots, dtype=np.uint64)
+        np.bitwise_or.at(bitmap, (slots_array >> np.uint64(6)).astype(np.intp), np.uint64(1) << (slots_array & np.uint64(63)))
+
+    @staticmethod
+    def _clear_bits(bitmap: np.ndarray, slots: List[int]) -> None:
+        """Tắt bit của các slot trong bitmap"""
+        slots_array = np.asarray(slots, dtype=np.uint64)
+        np.bitwise_and.at(bitmap, (slots_array >> np.uint64(6)).astype(np.intp), ~(np.uint64(1) << (slots_array & np.uint64(63))))
+
+    def add_many(self, phone_numbers: Iterable[str]) -> int:
+        """Thêm nhiều số vào kho (bỏ qua số đã có)
+
+        Args:
+            phone_numbers: Các số điện thoại
+
+        Returns:
+            int: Số lượng số mới được thêm
+
+        Raises:
+            ValueError: Nếu có số điện thoại không hợp lệ
+        """
+        # Tính chuỗi sao ngoài khóa; bật bit theo lô cho từng khóa
+        prepared = []
+        for phone_number in phone_numbers:
+            normalized = self._normalize(phone_number)
+            prepared.append((normalized, tuple(star_keys_of(self._stars_of(normalized)))))
+
+        with self._lock:
+            postings: Dict[_Key, List[int]] = {}
+            added: List[int] = []
+            for normalized, keys in prepared:
+                if normalized in self._slots:
+                    continue
+                if self._free:
+                    slot = self._free.pop()
+                    self._numbers[slot] = normalized
+                    self._slot_keys[slot] = keys
+                else:
+                    slot = len(self._numbers)
+                    self._numbers.append(normalized)
+                    self._slot_keys.append(keys)
+                self._slots[normalized] = slot
+                added.append(slot)
+                for key in keys:
+                    postings.setdefault(key, []).append(slot)
+
+            if added:
+                self._grow(len(self._numbers))
+                self._set_bits(self._alive, added)
+                for key, slots in postings.items():
+                    self._set_bits(self._bitmap(key), slots)
+            return len(added)
+
+    def load_file(self, path: str) -> int:
+        """Nạp kho số từ file, mỗi dòng một số điện thoại
+
+        Dòng trống và dòng bắt đầu bằng `#` bị bỏ qua; số không hợp lệ được ghi log và bỏ qua
+        thay vì làm hỏng cả lần nạp.
+
+        Args:
+            path: Đường dẫn file
+
+        Returns:
+            int: Số lượng số mới được thêm
+        """
+        numbers: List[str] = []
+        invalid = 0
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                try:
+                    numbers.append(self._normalize(line))
+                except ValueError:
+                    invalid += 1
+        if invalid:
+            logger.warning(f"Bỏ qua {invalid} số không hợp lệ trong file kho số {path}")
+        return self.add_many(numbers)
+
+    def add(self, phone_number: str) -> bool:
+        """Thêm một số vào kho
+
+        Returns:
+            bool: True nếu số chưa có và đã được thêm
+        """
+        return self.add_many([phone_number]) == 1
+
+    def remove_many(self, phone_numbers: Iterable[str]) -> int:
+        """Bỏ nhiều số khỏi kho (ví dụ khi đã bán)
+
+        Returns:
+            int: Số lượng số đã bỏ
+        """
+        with self._lock:
+            postings: Dict[_Key, List[int]] = {}
+            removed: List[int] = []
+            for phone_number in phone_numbers:
+                slot = self._slots.pop(PhoneAnalyzer._normalize_phone_number(phone_number), None)
+                if slot is None:
+                    continue
+                for key in self._slot_keys[slot]:
+                    postings.setdefault(key, []).append(slot)
+                self._numbers[slot] = None
+                self._slot_keys[slot] = ()
+                removed.append(slot)
+
+            if removed:
+                self._clear_bits(self._alive, removed)
+                for key, slots in postings.items():
+                    self._clear_bits(self._bitmaps[key], slots)
+                self._free.extend(removed)
+            return len(removed)
+
+    def remove(self, phone_number: str) -> bool:
+        """Bỏ một số khỏi kho
+
+        Returns:
+            bool: True nếu số có trong kho và đã được bỏ
+        """
+        return self.remove_many([phone_number]) == 1
+
+    @staticmethod
+    def _check_star(star: str) -> str:
+        """Chuẩn hóa và kiểm tra tên sao"""
+        normalized = star.strip().upper()
+        if normalized not in INDEXED_STARS:
+            raise ValueError(f"Sao không hợp lệ: {star}. Các sao hợp lệ: {', '.join(STAR_KEYS)}")
+        return normalized
+
+    def _match(
+        self,
+        at: Optional[Mapping[int, str]],
+        include: Optional[Iterable[str]],
+        exclude: Optional[Iterable[str]],
+        min_counts: Optional[Mapping[str, int]],
+        max_counts: Optional[Mapping[str, int]]
+    ) -> np.ndarray:
+        """Bitmap các slot thỏa mãn truy vấn (gọi khi đang giữ khóa)"""
+        result = self._alive.copy()
+        empty = np.zeros(self._words, dtype=np.uint64)
+
+        required: List[_Key] = []
+        forbidden: List[_Key] = []
+        for position, star in (at or {}).items():
+            required.append(("at", int(position), self._check_star(star)))
+        for star in include or ():
+            required.append(("count", self._check_star(star), 1))
+        for star in exclude or ():
+            forbidden.append(("count", self._check_star(star), 1))
+        for star, count in (min_counts or {}).items():
+            if count > 0:
+                required.append(("count", self._check_star(star), int(count)))
+        for star, count in (max_counts or {}).items():
+            forbidden.append(("count", self._check_star(star), max(0, int(count)) + 1))
+
+        for key in required:
+            np.bitwise_and(result, self._bitmaps.get(key, empty), out=result)
+        for key in forbidden:
+            bitmap = self._bitmaps.get(key)
+            if bitmap is not None:
+                np.bitwise_and(result, ~bitmap, out=result)
+        return result
+
+    def _slots_of(self, bitmap: np.ndarray, limit: Optional[int]) -> List[int]:
+        """Các slot có bit bật, theo thứ tự slot, tối đa `limit` (không lấy slot nào nếu `limit` <= 0)"""
+        slots: List[int] = []
+        if limit is not None and limit <= 0:
+            return slots
+        for word_index in np.flatnonzero(bitmap):
+            word = int(bitmap[word_index])
+            base = int(word_index) * WORD_BITS
+            while word:
+                low = word & -word
+                slots.append(base + low.bit_length() - 1)
+                word ^= low
+                if limit is not None and len(slots) >= limit:
+                    return slots
+        return slots
+
+    def query(
+        self,
+        at: Optional[Mapping[int, str]] = None,
+        include: Optional[Iterable[str]] = None,
+        exclude: Optional[Iterable[str]] = None,
+        min_counts: Optional[Mapping[str, int]] = None,
+        max_counts: Optional[Mapping[str, int]] = None,
+        limit: Optional[int] = DEFAULT_QUERY_LIMIT
+    ) -> Dict[str, Any]:
+        """Tìm các số trong kho theo sao
+
+        Args:
+            at: Vị trí -> sao bắt buộc (0 là cặp đầu, -1 là cặp cuối)
+            include: Các sao phải xuất hiện ít nhất một lần
+            exclude: Các sao không được xuất hiện
+            min_counts: Sao -> số lần xuất hiện tối thiểu
+            max_counts: Sao -> số lần xuất hiện tối đa
+            limit: Số lượng số trả về tối đa (None để lấy hết)
+
+        Returns:
+            Dict[str, Any]: total (tổng số khớp) và numbers (các số khớp theo thứ tự thêm vào kho)
+
+        Raises:
+            ValueError: Nếu tên sao không hợp lệ
+        """
+        with self._lock:
+            matched = self._match(at, include, exclude, min_counts, max_counts)
+            numbers = [self._numbers[slot] for slot in self._slots_of(matched, limit)]
+            return {"total": _popcount(matched), "numbers": numbers}
+
+    def star_counts(self) -> Dict[str, int]:
+        """Số lượng số trong kho có chứa từng sao"""
+        with self._lock:
+            return {
+                star: _popcount(self._bitmaps[("count", star, 1)])
+                for star in sorted(INDEXED_STARS)
+                if ("count", star, 1) in self._bitmaps
+            }
+
+    def stats(self) -> Dict[str, Any]:
+        """Thống kê kích thước chỉ mục"""
+        with self._lock:
+            return {
+                "numbers": len(self._slots),
+                "slots": len(self._numbers),
+                "free_slots": len(self._free),
+                "bitmaps": len(self._bitmaps),
+                "bytes": (len(self._bitmaps) + 1) * self._words * 8
+            }
+
+    def __contains__(self, phone_number: str) -> bool:
+        return PhoneAnalyzer._normalize_phone_number(phone_number) in self._slots
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+
+def _create_star_inventory_index() -> StarInventoryIndex:
+    """Tạo kho số dùng chung, nạp sẵn từ file cấu hình (STAR_INVENTORY_FILE) nếu có"""
+    index = StarInventoryIndex()
+    path = AppConfig().star_inventory_file
+    if path:
+        if os.path.exists(path):
+            added = index.load_file(path)
+            logger.info(f"Đã nạp {added} số vào kho số từ {path}")
+        else:
+            logger.warning(f"Không tìm thấy file kho số: {path}")
+    return index
+
+
+# Kho số dùng chung trong tiến trình
+star_inventory_index = _create_star_inventory_index()
+
+
+def star_inventory_query(
+    last_star: Optional[str] = None,
+    include_stars: Optional[List[str]] = None,
+    exclude_stars: Optional[List[str]] = None,
+    min_counts: Optional[Dict[str, int]] = None,
+    limit: int = 20
+) -> Dict[str, Any]:
+    """Tìm số điện thoại trong kho số theo các sao Bát Tinh.
+
+    Sử dụng tool này khi nhân viên cửa hàng muốn lọc kho số theo sao, ví dụ
+    "THIEN_Y ở cặp cuối, không có TUYET_MENH, ít nhất hai SINH_KHI".
+
+    Args:
+        last_star: Sao bắt buộc ở cặp số cuối cùng.
+        include_stars: Các sao phải xuất hiện.
+        exclude_stars: Các sao không được xuất hiện.
+        min_counts: Số lần xuất hiện tối thiểu của từng sao, ví dụ {"SINH_KHI": 2}.
+        limit: Số lượng số trả về tối đa, phải lớn hơn 0.
+
+    Returns:
+        Tổng số khớp và danh sách số điện thoại khớp.
+    """
+    if limit <= 0:
+        return {"success": False, "message": "limit phải lớn hơn 0", "total": 0, "numbers": []}
+    try:
+        result = star_inventory_index.query(
+            at={-1: last_star} if last_star else None,
+            include=include_stars,
+            exclude=exclude_stars,
+            min_counts=min_counts,
+            limit=limit
+        )
+    except ValueError as e:
+        return {"success": False, "message": str(e), "total": 0, "numbers": []}
+    return {"success": True, **result}
+
+
+# Tạo Function Tool
+__getattr__ = lazy_module_getattr(__name__, {"star_inventory_query_tool": lazy_function_tool(star_inventory_query)})
@@ -4,4 +4,11 @@ Payment Agent Module
 Module quản lý agent cho xử lý thanh toán.
 """
 
-from python_adk.agents.payment_agent.agent import payment_agent 
\ No newline at end of file
+import importlib
+
+from python_adk.shared_libraries.lazy import lazy_module_getattr
+
+# payment_agent được tạo ở lần truy cập đầu tiên
+__getattr__ = lazy_module_getattr(__name__, {
+    "payment_agent": lambda: importlib.import_module("python_adk.agents.payment_agent.agent").payment_agent
+})
@@ -9,6 +9,7 @@ from typing import Any, Dict
 from python_adk.agents.base_agent import BaseAgent
 from python_adk.agents.root_agent.agent import AgentType
 from python_adk.prompt import get_agent_prompt
+from python_adk.shared_libraries.lazy import LazySingleton, lazy_module_getattr
 
 # Tạo một agent kế thừa từ BaseAgent
 class PaymentAgent(BaseAgent):
@@ -34,5 +35,6 @@ class PaymentAgent(BaseAgent):
             instruction=instruction
         )
 
-# Tạo instance của PaymentAgent
-payment_agent = PaymentAgent() 
\ No newline at end of file
+# Tạo instance của PaymentAgent (tạo ở lần truy cập đầu tiên)
+get_payment_agent = LazySingleton(PaymentAgent)
+__getattr__ = lazy_module_getattr(__name__, {"payment_agent": get_payment_agent})
@@ -4,6 +4,10 @@ Root Agent Package
 Root Agent là agent chính, điều phối các yêu cầu từ người dùng đến các agent chuyên biệt.
 """
 
-from python_adk.agents.root_agent.agent import root_agent
+from python_adk.agents.root_agent.agent import get_root_agent
+from python_adk.shared_libraries.lazy import lazy_module_getattr
 
-__all__ = ['root_agent'] 
\ No newline at end of file
+# root_agent được dựng ở lần truy cập đầu tiên
+__getattr__ = lazy_module_getattr(__name__, {"root_agent": get_root_agent})
+
+__all__ = ['root_agent', 'get_root_agent']
@@ -2,31 +2,14 @@
 Root Agent Implementation using direct GeminiAgent initialization.
 """
 
-from enum import Enum
-from typing import Any, Dict, List, Optional, Set, Type, Union
-
-# Google ADK imports
-from google.adk.agents import Agent as GeminiAgent
-# from google.adk.tools.agent_tool import AgentTool # Removed as AgentRouter is removed
-from google.genai.types import GenerateContentConfig
-
-# Import Tools (excluding AgentRouter)
-from python_adk.agents.root_agent.tools.intent_classifier import IntentClassifier
-# from python_adk.agents.root_agent.tools.agent_router import AgentRouter # Removed
-from python_adk.agents.root_agent.tools.context_tracker import ContextTracker
-from python_adk.agents.root_agent.tools.conversation_manager import ConversationManager
+from typing import Any
 
 # Import AgentType from the new module
 from python_adk.agents.agent_types import AgentType
 
-# Import Sub-Agents
-from python_adk.agents.batcuclinh_so_agent import BatCucLinhSoAgent
-# Removed PaymentAgent and UserAgent to fix import issues
-# from python_adk.agents.payment_agent import PaymentAgent
-# from python_adk.agents.user_agent import UserAgent
-
 # Logger and Prompt
 from python_adk.shared_libraries.logger import get_logger
+from python_adk.shared_libraries.lazy import LazySingleton, lazy_module_getattr
 from python_adk.prompt import get_agent_prompt
 
 
@@ -38,56 +21,71 @@ from python_adk.prompt import get_agent_prompt
 #     PAYMENT = "payment"
 #     USER = "user"
 
-# --- Initialize Tools ---
-intent_classifier_tool = IntentClassifier()
-context_tracker_tool = ContextTracker()
-conversation_manager_tool = ConversationManager()
-
-# List of tools for the Root Agent
-root_agent_tools = [
-    intent_classifier_tool,
-    context_tracker_tool,
-    conversation_manager_tool
-]
-
-# --- Initialize Sub-Agents ---
-# Assuming sub-agents don't need specific model overrides here
-# and will use their default defined models.
-bat_cuc_linh_so_agent = BatCucLinhSoAgent()
-# Removed PaymentAgent and UserAgent to fix import issues
-# payment_agent = PaymentAgent()
-# user_agent = UserAgent()
-
-# List of sub-agents for the Root Agent
-root_agent_sub_agents = [
-    bat_cuc_linh_so_agent._agent,  # Pass the underlying GeminiAgent instance
-    # Removed PaymentAgent and UserAgent to fix import issues
-    # payment_agent,
-    # user_agent
-]
-
 # --- Agent Configuration ---
 ROOT_AGENT_NAME = "root_agent"
 MODEL_NAME = "gemini-2.0-flash"
-ROOT_AGENT_INSTRUCTION = get_agent_prompt(AgentType.ROOT)
-ROOT_AGENT_CONFIG = GenerateContentConfig(
-    temperature=0.2,
-    top_p=0.8,
-)
-
-# Get logger
-logger = get_logger(f"{ROOT_AGENT_NAME}_agent", log_to_file=True)
-
-# --- Create Root Agent Instance directly ---
-logger.info(f"Khởi tạo {ROOT_AGENT_NAME} với model {MODEL_NAME}, {len(root_agent_tools)} tools, và {len(root_agent_sub_agents)} sub-agents")
-root_agent = GeminiAgent(
-    name=ROOT_AGENT_NAME,
-    model=MODEL_NAME,
-    instruction=ROOT_AGENT_INSTRUCTION,
-    tools=root_agent_tools,
-    sub_agents=root_agent_sub_agents,
-    generate_content_config=ROOT_AGENT_CONFIG,
-    # after_agent_callback is removed for simplicity, rely on ADK history
-    # sub_agents can be added here if they are imported or later via root_agent.sub_agents = [...]
-)
-logger.info(f"{ROOT_AGENT_NAME} initialized successfully.") 
\ No newline at end of file
+
+
+def _create_root_agent() -> Any:
+    """
+    Dựng root agent cùng tools và sub-agents (import Google ADK tại đây, không phải lúc import module)
+
+    Returns:
+        GeminiAgent: Root agent
+    """
+    # Google ADK imports
+    from google.adk.agents import Agent as GeminiAgent
+    from google.genai.types import GenerateContentConfig
+
+    # Import Tools (excluding AgentRouter)
+    from python_adk.agents.root_agent.tools.intent_classifier import IntentClassifier
+    from python_adk.agents.root_agent.tools.context_tracker import ContextTracker
+    from python_adk.agents.root_agent.tools.conversation_manager import ConversationManager
+
+    # Import Sub-Agents
+    from python_adk.agents.batcuclinh_so_agent import BatCucLinhSoAgent
+    # Removed PaymentAgent and UserAgent to fix import issues
+
+    # --- Initialize Tools ---
+    root_agent_tools = [
+        IntentClassifier(),
+        ContextTracker(),
+        ConversationManager()
+    ]
+
+    # --- Initialize Sub-Agents ---
+    # Assuming sub-agents don't need specific model overrides here
+    # and will use their default defined models.
+    bat_cuc_linh_so_agent = BatCucLinhSoAgent()
+    root_agent_sub_agents = [
+        bat_cuc_linh_so_agent._agent,  # Pass the underlying GeminiAgent instance
+    ]
+
+    root_agent_config = GenerateContentConfig(
+        temperature=0.2,
+        top_p=0.8,
+    )
+
+    # Get logger
+    logger = get_logger(f"{ROOT_AGENT_NAME}_agent", log_to_file=True)
+
+    # --- Create Root Agent Instance directly ---
+    logger.info(f"Khởi tạo {ROOT_AGENT_NAME} với model {MODEL_NAME}, {len(root_agent_tools)} tools, và {len(root_agent_sub_agents)} sub-agents")
+    agent = GeminiAgent(
+        name=ROOT_AGENT_NAME,
+        model=MODEL_NAME,
+        instruction=get_agent_prompt(AgentType.ROOT),
+        tools=root_agent_tools,
+        sub_agents=root_agent_sub_agents,
+        generate_content_config=root_agent_config,
+        # after_agent_callback is removed for simplicity, rely on ADK history
+    )
+    logger.info(f"{ROOT_AGENT_NAME} initialized successfully.")
+    return agent
+
+
+# Root agent dùng chung, dựng ở lần truy cập đầu tiên hoặc trong startup hook của API
+get_root_agent = LazySingleton(_create_root_agent)
+
+# `from python_adk.agents.root_agent.agent import root_agent` vẫn dùng được
+__getattr__ = lazy_module_getattr(__name__, {"root_agent": get_root_agent})
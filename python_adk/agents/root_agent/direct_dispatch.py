@@ -0,0 +1,119 @@
+"""
+Direct Dispatch Module
+
+Chế độ gọi thẳng sub-agent: khi IntentClassifier đủ tự tin về một ý định duy nhất, tin nhắn
+được chạy trực tiếp trên sub-agent tương ứng của root agent (cùng session, nên sub-agent vẫn
+thấy lịch sử hội thoại), bỏ qua lượt gọi model của root agent chỉ để quyết định chuyển tiếp.
+Root agent chỉ xử lý tin nhắn có độ tin cậy thấp hoặc nhiều ý định.
+"""
+
+from typing import Any, Dict, Optional, Tuple
+
+from python_adk.config.config import AppConfig
+from python_adk.shared_libraries.logger import get_logger
+
+# Loại agent của IntentClassifier -> tên sub-agent trong cây của root agent
+SUB_AGENT_NAMES = {
+    "batcuclinh_so": "bat_cuc_linh_so_agent",
+    "payment": "payment_agent",
+    "user": "user_agent",
+}
+
+
+class DirectDispatcher:
+    """Chọn agent chạy tin nhắn: sub-agent đích nếu ý định rõ ràng, ngược lại root agent"""
+
+    def __init__(self, enabled: bool = True, min_confidence: float = 0.5):
+        """
+        Khởi tạo DirectDispatcher
+
+        Args:
+            enabled (bool): Bật chế độ gọi thẳng sub-agent
+            min_confidence (float): Độ tin cậy tối thiểu (0-1) của IntentClassifier
+        """
+        self.enabled = enabled
+        self.min_confidence = min_confidence
+        self.logger = get_logger("DirectDispatcher")
+
+        # Thống kê
+        self.dispatched: Dict[str, int] = {}
+        self.to_root: Dict[str, int] = {}
+
+    def route(self, message: str) -> Tuple[Optional[str], str]:
+        """
+        Xác định sub-agent đích cho tin nhắn
+
+        Args:
+            message (str): Tin nhắn của người dùng
+
+        Returns:
+            Tuple[Optional[str], str]: (tên sub-agent hoặc None nếu để root agent xử lý, lý do)
+        """
+        if not self.enabled:
+            return None, "disabled"
+
+        from python_adk.agents.root_agent.tools.intent_classifier import get_intent_classifier
+        intent = get_intent_classifier().classify(message)
+        agent_type = intent["agent_type"]
+        if agent_type.value not in SUB_AGENT_NAMES:
+            return None, "unknown"
+        if intent["confidence"] < self.min_confidence:
+            return None, "low_confidence"
+
+        # Nhiều ý định: loại agent khác có từ khóa riêng (không trùng với từ khóa của ý định chính)
+        keywords = set(intent["keywords"])
+        for other_type, other_keywords in intent["matches"].items():
+            if other_type != agent_type and not keywords.issuperset(other_keywords):
+                return None, "mixed"
+
+        return SUB_AGENT_NAMES[agent_type.value], "ok"
+
+    def select(self, message: str, root_agent: Any) -> Any:
+        """
+        Chọn agent ADK để chạy tin nhắn
+
+        Args:
+            message (str): Tin nhắn của người dùng
+            root_agent (Any): Root agent (GeminiAgent)
+
+        Returns:
+            Any: Sub-agent đích, hoặc root agent
+        """
+        name, reason = self.route(message)
+        sub_agent = root_agent.find_sub_agent(name) if name else None
+        if sub_agent is None:
+            reason = "no_sub_agent" if name else reason
+            self.to_root[reason] = self.to_root.get(reason, 0) + 1
+            return root_agent
+
+        self.dispatched[name] = self.dispatched.get(name, 0) + 1
+        self.logger.info(f"Gọi thẳng {name}, bỏ qua root agent")
+        return sub_agent
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Lấy thống kê gọi thẳng sub-agent
+
+        Returns:
+            Dict[str, Any]: Số tin nhắn gọi thẳng theo sub-agent, số tin nhắn để root agent xử lý theo lý do
+                và tỉ lệ gọi thẳng (số lượt model của root agent tiết kiệm được)
+        """
+        dispatched = sum(self.dispatched.values())
+        total = dispatched + sum(self.to_root.values())
+        return {
+            "enabled": self.enabled,
+            "min_confidence": self.min_confidence,
+            "dispatched": dict(self.dispatched),
+            "to_root": dict(self.to_root),
+            "dispatch_rate": round(dispatched / total, 4) if total else 0.0
+        }
+
+
+def _create_direct_dispatcher() -> DirectDispatcher:
+    """Tạo DirectDispatcher dùng chung từ cấu hình ứng dụng"""
+    config = AppConfig()
+    return DirectDispatcher(**config.direct_dispatch_config)
+
+
+# Bộ điều phối dùng chung cho toàn bộ tiến trình
+direct_dispatcher = _create_direct_dispatcher()
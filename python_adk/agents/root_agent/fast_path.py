@@ -0,0 +1,288 @@
+"""
+Fast Path Module
+
+Tầng tiền định tuyến đặt trước root agent: các yêu cầu phân tích số rõ ràng
+("phân tích số 0912345678", "cccd 001203012345", hay chỉ một số điện thoại) được trả lời
+trực tiếp bằng analyzer và mẫu câu dựng sẵn, không gọi LLM. Tin nhắn mơ hồ hoặc mang tính
+hội thoại vẫn đi qua root agent.
+"""
+
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from python_adk.config.config import AppConfig
+from python_adk.shared_libraries.logger import get_logger
+from python_adk.shared_libraries.metrics import LatencyStats
+from python_adk.shared_libraries.number_extractor import extract_numbers
+
+# Từ khóa xác định loại số
+PHONE_KEYWORDS = ("số điện thoại", "điện thoại", "sđt", "sdt", "sim", "số sim", "thuê bao")
+CCCD_KEYWORDS = ("cccd", "căn cước", "cmnd", "chứng minh")
+BANK_KEYWORDS = ("số tài khoản", "stk", "tài khoản", "ngân hàng")
+
+# Tin nhắn có ý phân tích / đánh giá số
+ANALYSIS_HINTS = (
+    "phân tích", "xem", "đánh giá", "kiểm tra", "ý nghĩa", "luận", "bói",
+    "tốt không", "đẹp không", "hợp không", "thế nào", "ra sao"
+)
+
+# Yêu cầu khác cần agent (gợi ý / tạo số, mật khẩu, so sánh, thanh toán, ...) nên không đi fast path
+BLOCK_KEYWORDS = (
+    "gợi ý", "đề xuất", "tạo", "sinh số", "chọn", "so sánh", "đổi", "sửa", "mật khẩu", "password",
+    "thanh toán", "nạp", "mua", "đăng ký", "đăng nhập", "tại sao", "vì sao", "giải thích"
+)
+
+# Câu hỏi gắn với thông tin cá nhân (mệnh, năm sinh, ...) hoặc ngữ cảnh hội thoại (so với số trước)
+# cần agent trả lời, mẫu câu phân tích chung sẽ bỏ qua phần điều kiện này
+CONTEXT_KEYWORDS = (
+    "mệnh", "ngũ hành", "tuổi", "sinh năm", "năm sinh", "ngày sinh", "con giáp",
+    "so với", "hơn", "trước", "số kia", "số cũ", "vừa rồi", "lúc nãy"
+)
+
+# Mẫu câu trả lời
+PHONE_TEMPLATE = (
+    "Kết quả phân tích số điện thoại {number} theo Bát Cục Linh Số:\n"
+    "{stars}\n"
+    "{combinations}"
+    "Tổng quan: {good} cặp sao cát, {bad} cặp sao hung{verdict}"
+)
+CCCD_TEMPLATE = (
+    "Kết quả phân tích số CCCD {number} theo Bát Cục Linh Số:\n"
+    "{stars}\n"
+    "{combinations}"
+    "Tổng quan: {good} cặp sao cát, {bad} cặp sao hung{verdict}"
+)
+BANK_TEMPLATE = (
+    "Kết quả phân tích số tài khoản {number} theo Bát Cục Linh Số:\n"
+    "- Số năng lượng: {energy} (hành {element})\n"
+    "- Mức độ thuận lợi: {prosperity} (điểm {score})\n"
+    "- Cặp số đặc biệt: {pairs}\n"
+    "{recommendation}"
+)
+STAR_LINE = "- {number}: {name} ({nature}, năng lượng {energy})"
+COMBINATION_LINE = "- {numbers}: {description}"
+FOOTER = "\n\nBạn có thể hỏi thêm về ý nghĩa từng sao hoặc nhờ gợi ý số hợp mục đích sử dụng."
+
+
+class FastPath:
+    """Trả lời trực tiếp các yêu cầu phân tích số rõ ràng, không qua LLM"""
+
+    def __init__(self, enabled: bool = True, max_chars: int = 160):
+        """
+        Khởi tạo FastPath
+
+        Args:
+            enabled (bool): Bật fast path
+            max_chars (int): Tin nhắn dài hơn được coi là hội thoại, luôn chuyển cho root agent
+        """
+        self.enabled = enabled
+        self.max_chars = max_chars
+        self.logger = get_logger("FastPath")
+
+        # Thống kê
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self.fast_latency = LatencyStats()
+        self.agent_latency = LatencyStats()
+
+    @staticmethod
+    def _classifier() -> Any:
+        """
+        IntentClassifier dùng chung; là FunctionTool của Google ADK nên chỉ import
+        và dựng khi có tin nhắn đầu tiên (hoặc trong warm-up)
+        """
+        from python_adk.agents.root_agent.tools.intent_classifier import get_intent_classifier
+        return get_intent_classifier()
+
+    def warm(self) -> None:
+        """Dựng IntentClassifier trước (import Google ADK), dùng trong warm-up"""
+        self._classifier()
+
+    def match(self, message: str) -> Tuple[Optional[Tuple[str, str]], str]:
+        """
+        Kiểm tra tin nhắn có phải yêu cầu phân tích số rõ ràng không
+
+        Args:
+            message (str): Tin nhắn của người dùng
+
+        Returns:
+            Tuple[Optional[Tuple[str, str]], str]: ((loại số, số) hoặc None, lý do)
+        """
+        if not self.enabled:
+            return None, "disabled"
+        if not message or len(message) > self.max_chars:
+            return None, "length"
+
+        numbers = extract_numbers(message, min_digits=6)
+        if len(numbers) != 1:
+            return None, "numbers" if numbers else "no_number"
+        number = numbers[0]
+
+        text = message.lower()
+        if any(keyword in text for keyword in BLOCK_KEYWORDS):
+            return None, "blocked"
+        if any(keyword in text for keyword in CONTEXT_KEYWORDS):
+            return None, "context"
+
+        kind = self._number_kind(text, number.digits)
+        if kind is None:
+            return None, "number_kind"
+
+        # Phần còn lại sau khi bỏ số: rỗng (chỉ gửi số) hoặc phải có ý phân tích
+        rest = (text[:number.start] + text[number.end:]).strip(" \t\n.,:;!?-")
+        # Còn chữ số khác (năm sinh, số ngắn, ...) thì câu hỏi không chỉ về một số
+        if any(char.isdigit() for char in rest):
+            return None, "numbers"
+        if rest:
+            agent_type = self._classifier().classify(rest)["agent_type"].value
+            if agent_type not in ("batcuclinh_so", "unknown"):
+                return None, "intent"
+            if agent_type == "unknown" and not any(hint in rest for hint in ANALYSIS_HINTS):
+                return None, "intent"
+
+        return (kind, number.digits), "ok"
+
+    @staticmethod
+    def _number_kind(text: str, digits: str) -> Optional[str]:
+        """Xác định loại số theo từ khóa trong tin nhắn và độ dài dãy số"""
+        if any(keyword in text for keyword in BANK_KEYWORDS):
+            return "bank_account" if 6 <= len(digits) <= 19 else None
+        if any(keyword in text for keyword in CCCD_KEYWORDS):
+            return "cccd" if len(digits) == 12 else None
+        if len(digits) == 11 and digits.startswith("84"):
+            digits = "0" + digits[2:]
+        if len(digits) == 10 and digits.startswith("0"):
+            return "phone"
+        if len(digits) == 12 and not any(keyword in text for keyword in PHONE_KEYWORDS):
+            return "cccd"
+        return None
+
+    def answer(self, message: str) -> Optional[str]:
+        """
+        Trả lời tin nhắn bằng fast path nếu được
+
+        Args:
+            message (str): Tin nhắn của người dùng
+
+        Returns:
+            Optional[str]: Câu trả lời, None nếu cần chuyển cho root agent
+        """
+        started = time.perf_counter()
+        try:
+            matched, reason = self.match(message)
+            if matched is None:
+                self.misses[reason] = self.misses.get(reason, 0) + 1
+                return None
+            kind, digits = matched
+            reply = self._render(kind, digits)
+        except Exception as e:
+            # Analyzer từ chối số (sai định dạng, ...): để root agent trả lời
+            self.logger.warning(f"Fast path bỏ qua tin nhắn: {e}")
+            self.misses["error"] = self.misses.get("error", 0) + 1
+            return None
+
+        self.hits[kind] = self.hits.get(kind, 0) + 1
+        self.fast_latency.observe(time.perf_counter() - started)
+        return reply
+
+    def record_agent_latency(self, seconds: float) -> None:
+        """
+        Ghi nhận thời gian xử lý của root agent cho tin nhắn không đi fast path
+        (dùng để ước lượng thời gian tiết kiệm được)
+
+        Args:
+            seconds (float): Thời gian xử lý (giây)
+        """
+        self.agent_latency.observe(seconds)
+
+    def _render(self, kind: str, digits: str) -> str:
+        """Gọi analyzer và điền kết quả vào mẫu câu trả lời"""
+        if kind == "phone":
+            from python_adk.agents.batcuclinh_so_agent.tools.phone_analyzer import PhoneAnalyzer, phone_analyzer
+            number = PhoneAnalyzer._normalize_phone_number(digits)
+            return self._render_stars(PHONE_TEMPLATE, number, phone_analyzer(number)) + FOOTER
+        if kind == "cccd":
+            from python_adk.agents.batcuclinh_so_agent.tools.cccd_analyzer import cccd_analyzer
+            return self._render_stars(CCCD_TEMPLATE, digits, cccd_analyzer(digits)) + FOOTER
+
+        from python_adk.agents.batcuclinh_so_agent.tools.bank_account_analyzer import bank_account_analyzer
+        analysis = bank_account_analyzer(digits)["analysis"]
+        pairs = ", ".join(analysis["specialPairs"]) or "không có"
+        return BANK_TEMPLATE.format(
+            number=digits,
+            energy=analysis["energyNumber"],
+            element=analysis["element"],
+            prosperity=analysis["prosperityLevel"],
+            score=analysis["score"],
+            pairs=pairs,
+            recommendation=analysis["recommendation"]
+        ) + FOOTER
+
+    @staticmethod
+    def _star_energy(star: Dict[str, Any]) -> Any:
+        """
+        Năng lượng của một cặp sao: cccd_analyzer đã tính sẵn `energy_level` (có điều chỉnh
+        theo số 0 / số 5 trong nhóm), phone_analyzer thì tra bảng năng lượng theo cặp số
+        """
+        if "energy_level" in star:
+            return star["energy_level"]
+        return star["energy"].get(star["number"], "?")
+
+    @staticmethod
+    def _render_stars(template: str, number: str, result: Dict[str, Any]) -> str:
+        """Điền danh sách sao / tổ hợp sao (kết quả phone_analyzer, cccd_analyzer) vào mẫu"""
+        stars: List[Dict[str, Any]] = result["analysis"]
+        good = sum(1 for star in stars if star["nature"] == "Cát")
+        bad = sum(1 for star in stars if star["nature"].startswith("Hung") or "hóa hung" in star["nature"])
+        combinations = "".join(
+            COMBINATION_LINE.format(**combination) + "\n" for combination in result["combinations"]
+        )
+        if good > bad:
+            verdict = ", số mang năng lượng tốt."
+        elif good < bad:
+            verdict = ", nên cân nhắc trước khi sử dụng."
+        else:
+            verdict = ", năng lượng cát hung cân bằng."
+        return template.format(
+            number=number,
+            stars="\n".join(
+                STAR_LINE.format(number=star.get("digits", star["number"]), name=star["name"],
+                                 nature=star["nature"], energy=FastPath._star_energy(star))
+                for star in stars
+            ),
+            combinations=f"Tổ hợp sao:\n{combinations}" if combinations else "",
+            good=good,
+            bad=bad,
+            verdict=verdict
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Lấy thống kê fast path
+
+        Returns:
+            Dict[str, Any]: Số lần trúng / trượt (theo loại số / lý do), tỉ lệ trúng,
+                độ trễ fast path, độ trễ root agent và thời gian ước tính tiết kiệm được
+        """
+        hits = sum(self.hits.values())
+        total = hits + sum(self.misses.values())
+        saved = hits * max(0.0, self.agent_latency.average - self.fast_latency.average)
+        return {
+            "enabled": self.enabled,
+            "hits": dict(self.hits),
+            "misses": dict(self.misses),
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+            "fast_latency": self.fast_latency.snapshot(),
+            "agent_latency": self.agent_latency.snapshot(),
+            "estimated_saved_ms": round(saved * 1000, 3)
+        }
+
+
+def _create_fast_path() -> FastPath:
+    """Tạo FastPath dùng chung từ cấu hình ứng dụng"""
+    config = AppConfig()
+    return FastPath(**config.fast_path_config)
+
+
+# Fast path dùng chung cho toàn bộ tiến trình
+fast_path = _create_fast_path()
@@ -3,26 +3,49 @@ Agent Router Tool - Công cụ chuyển hướng yêu cầu đến agent phù h
 
 Tool này chuyển hướng yêu cầu từ Root Agent đến các Expert Agent
 phù hợp dựa trên phân tích ý định và context.
+
+Router dùng chung cho toàn tiến trình (`get_agent_router()`), lấy agent từ AgentRegistry
+qua pool theo (loại agent, model): mỗi instance chỉ phục vụ một request tại một thời điểm,
+pool đầy thì request chờ trong hàng đợi có giới hạn (AgentOverloadedError khi quá tải).
 """
 
 import logging
-from typing import Dict, Any, List, Optional
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
 from enum import Enum
 
 # Google ADK imports
 from google.adk.tools import FunctionTool
 
 # Local imports
+from python_adk.agents.agent_pool import AgentOverloadedError, AgentPool
+from python_adk.agents.agent_runtime import agent_runtime
 from python_adk.agents.root_agent.tools.intent_classifier import AgentType
+from python_adk.config.config import AppConfig
+from python_adk.shared_libraries.lazy import LazySingleton, lazy_module_getattr
 
 
 class AgentRouter(FunctionTool):
     """Tool chuyển hướng yêu cầu đến agent phù hợp"""
     
-    def __init__(self):
-        """Khởi tạo Agent Router Tool"""
+    def __init__(
+        self,
+        registry: Any = None,
+        size: int = 2,
+        sizes: Optional[Dict[str, int]] = None,
+        max_waiters: int = 16,
+        wait_timeout: float = 30.0
+    ):
+        """Khởi tạo Agent Router Tool
+        
+        Args:
+            registry: AgentRegistry dùng để tạo instance agent cho pool (None = chỉ dùng agent đăng ký thủ công)
+            size: Kích thước pool mặc định mỗi loại agent
+            sizes: Kích thước pool riêng theo loại agent, ví dụ {"batcuclinh_so": 4}
+            max_waiters: Số request được chờ tối đa mỗi pool
+            wait_timeout: Thời gian chờ tối đa (giây) để mượn được agent
+        """
         # Define the route_to_agent_function
-        def route_to_agent_function(agent_type: str, request: str, session_id: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        async def route_to_agent_function(agent_type: str, request: str, session_id: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
             """Chuyển hướng yêu cầu đến agent phù hợp
             
             Args:
@@ -50,7 +73,10 @@ class AgentRouter(FunctionTool):
                 }
             
             # Route the request
-            return self.route_to_agent(agent_type_enum, request, session_id, context)
+            try:
+                return await self.route_to_agent(agent_type_enum, request, session_id, context)
+            except AgentOverloadedError as e:
+                return self._overloaded_result(agent_type_enum, e)
         
         # Initialize FunctionTool with the function
         super().__init__(func=route_to_agent_function)
@@ -58,21 +84,77 @@ class AgentRouter(FunctionTool):
         # Khởi tạo logger
         self.logger = logging.getLogger("AgentRouter")
         
-        # Các agent đã đăng ký (sẽ được cập nhật bởi Root Agent)
+        self.registry = registry
+        self.pool_size = size
+        self.pool_sizes = sizes or {}
+        self.max_waiters = max_waiters
+        self.wait_timeout = wait_timeout
+        
+        # Pool theo (loại agent, model); agent đăng ký thủ công dùng pool riêng một instance
+        self.pools: Dict[Tuple[str, Optional[str]], AgentPool] = {}
         self.registered_agents = {}
     
     def register_agent(self, agent_type: AgentType, agent: Any) -> None:
-        """Đăng ký agent với router
+        """Đăng ký agent với router (thay cho instance lấy từ registry)
         
         Args:
             agent_type: Loại agent
             agent: Instance của agent
         """
+        agent_type = AgentType(agent_type.value)
         self.registered_agents[agent_type] = agent
+        self.pools[(agent_type.value, None)] = self._new_pool(agent_type.value, None, lambda: agent, size=1)
         self.logger.info(f"Đã đăng ký {agent_type} Agent với Router")
     
+    def get_pool(self, agent_type: AgentType, model_name: Optional[str] = None) -> AgentPool:
+        """Lấy (tạo nếu chưa có) pool agent theo loại agent và model
+        
+        Args:
+            agent_type: Loại agent (AgentType của IntentClassifier hoặc của registry)
+            model_name: Tên model, None = model mặc định của agent
+            
+        Returns:
+            AgentPool: Pool agent
+            
+        Raises:
+            ValueError: Nếu agent chưa được đăng ký
+        """
+        key = (getattr(agent_type, "value", agent_type), model_name)
+        pool = self.pools.get(key)
+        if pool is None:
+            if self.registry is None or not self._is_registered(key[0]):
+                raise ValueError(f"Agent loại {agent_type} chưa được đăng ký")
+            pool = self._new_pool(key[0], model_name, lambda: self.registry.create_agent(key[0], model_name))
+            self.pools[key] = pool
+        return pool
+    
+    def _is_registered(self, agent_type: str) -> bool:
+        """Loại agent có lớp đăng ký trong registry không"""
+        return any(registered.value == agent_type for registered in self.registry.agent_classes)
+    
+    def _new_pool(self, agent_type: str, model_name: Optional[str], factory: Any, size: Optional[int] = None) -> AgentPool:
+        """Tạo pool với cấu hình của router"""
+        return AgentPool(
+            name=f"{agent_type}:{model_name or 'default'}",
+            factory=factory,
+            size=size or self.pool_sizes.get(agent_type, self.pool_size),
+            max_waiters=self.max_waiters,
+            wait_timeout=self.wait_timeout
+        )
+    
+    @staticmethod
+    def _overloaded_result(agent_type: AgentType, error: AgentOverloadedError) -> Dict[str, Any]:
+        """Kết quả trả về cho Root Agent khi agent quá tải"""
+        return {
+            "success": False,
+            "agent_type": agent_type,
+            "response": "Hệ thống đang bận, vui lòng thử lại sau ít phút.",
+            "error": str(error)
+        }
+    
     async def route_to_agent(self, agent_type: AgentType, request: str, session_id: str, 
-                          context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+                          context: Optional[Dict[str, Any]] = None,
+                          model_name: Optional[str] = None) -> Dict[str, Any]:
         """Chuyển hướng yêu cầu đến agent phù hợp
         
         Args:
@@ -80,15 +162,21 @@ class AgentRouter(FunctionTool):
             request: Nội dung yêu cầu
             session_id: ID phiên trò chuyện
             context: Context bổ sung (optional)
+            model_name: Tên model (optional)
             
         Returns:
             Dict[str, Any]: Kết quả từ agent
+            
+        Raises:
+            AgentOverloadedError: Nếu pool agent quá tải
         """
         self.logger.info(f"Chuyển hướng yêu cầu đến {agent_type} Agent")
         
         # Kiểm tra xem agent đã được đăng ký chưa
-        if agent_type not in self.registered_agents:
-            error_msg = f"Agent loại {agent_type} chưa được đăng ký"
+        try:
+            pool = self.get_pool(agent_type, model_name)
+        except ValueError as e:
+            error_msg = str(e)
             self.logger.error(error_msg)
             return {
                 "success": False,
@@ -98,11 +186,13 @@ class AgentRouter(FunctionTool):
             }
         
         try:
-            # Lấy agent từ registry
-            agent = self.registered_agents[agent_type]
-            
-            # Xử lý yêu cầu bằng agent
-            response = await agent.process_message(request)
+            # Mượn agent từ pool trong suốt lượt xử lý (hàng đợi đầy / chờ quá lâu thì báo quá tải)
+            async with pool.acquire() as agent:
+                # Xử lý yêu cầu bằng agent mà không chặn event loop
+                if hasattr(agent, "process_message_async"):
+                    response = await agent.process_message_async(request, session_id)
+                else:
+                    response = await agent_runtime.run(agent, request, session_id=session_id)
             
             return {
                 "success": True,
@@ -110,6 +200,8 @@ class AgentRouter(FunctionTool):
                 "response": response,
                 "error": None
             }
+        except AgentOverloadedError:
+            raise
         except Exception as e:
             error_msg = f"Lỗi khi xử lý yêu cầu với {agent_type} Agent: {str(e)}"
             self.logger.error(error_msg)
@@ -120,6 +212,44 @@ class AgentRouter(FunctionTool):
                 "error": error_msg
             }
     
+    async def stream_to_agent(self, agent_type: AgentType, request: str, session_id: str,
+                              model_name: Optional[str] = None) -> AsyncIterator[str]:
+        """Chuyển hướng yêu cầu đến agent phù hợp và trả về phản hồi theo từng đoạn
+        
+        Args:
+            agent_type: Loại agent
+            request: Nội dung yêu cầu
+            session_id: ID phiên trò chuyện
+            model_name: Tên model (optional)
+            
+        Yields:
+            str: Đoạn văn bản tiếp theo của phản hồi
+            
+        Raises:
+            ValueError: Nếu agent chưa được đăng ký
+            AgentOverloadedError: Nếu pool agent quá tải
+        """
+        self.logger.info(f"Chuyển hướng yêu cầu (stream) đến {agent_type} Agent")
+        
+        pool = self.get_pool(agent_type, model_name)
+        
+        # Giữ agent tới khi stream kết thúc (hoặc client ngắt kết nối)
+        async with pool.acquire() as agent:
+            if hasattr(agent, "stream_message_async"):
+                chunks = agent.stream_message_async(request, session_id)
+            else:
+                chunks = agent_runtime.stream(agent, request, session_id=session_id)
+            async for chunk in chunks:
+                yield chunk
+    
+    def stats(self) -> Dict[str, Any]:
+        """Lấy thống kê các pool agent
+        
+        Returns:
+            Dict[str, Any]: Thống kê theo tên pool
+        """
+        return {pool.name: pool.stats() for pool in self.pools.values()}
+    
     async def execute(self, **kwargs) -> Dict[str, Any]:
         """Thực thi tool với tham số từ ADK
         
@@ -128,6 +258,9 @@ class AgentRouter(FunctionTool):
             
         Returns:
             Dict[str, Any]: Kết quả routing
+            
+        Raises:
+            AgentOverloadedError: Nếu pool agent quá tải
         """
         agent_type = kwargs.get("agent_type")
         request = kwargs.get("request")
@@ -146,4 +279,16 @@ class AgentRouter(FunctionTool):
             }
         
         # Chuyển hướng yêu cầu
-        return await self.route_to_agent(agent_type_enum, request, session_id, context) 
\ No newline at end of file
+        return await self.route_to_agent(agent_type_enum, request, session_id, context)
+
+
+def _create_agent_router() -> AgentRouter:
+    """Tạo AgentRouter dùng chung từ cấu hình ứng dụng, nối với AgentRegistry"""
+    from python_adk.registry import agent_registry
+    config = AppConfig()
+    return AgentRouter(registry=agent_registry, **config.agent_pool_config)
+
+
+# Router dùng chung cho toàn bộ tiến trình (tạo ở lần truy cập đầu tiên)
+get_agent_router = LazySingleton(_create_agent_router)
+__getattr__ = lazy_module_getattr(__name__, {"agent_router": get_agent_router})
@@ -11,6 +11,9 @@ from typing import Dict, Any, List, Optional, Union
 # Google ADK imports
 from google.adk.tools import FunctionTool
 
+# Local imports
+from python_adk.session.history_store import history_store
+
 
 class ConversationManager(FunctionTool):
     """Tool quản lý trò chuyện"""
@@ -18,7 +21,7 @@ class ConversationManager(FunctionTool):
     def __init__(self):
         """Khởi tạo Conversation Manager Tool"""
         # Define the conversation_manager_function
-        def conversation_manager_function(action: str, session_id: str, message: Optional[Dict[str, Any]] = None, limit: Optional[int] = None) -> Dict[str, Any]:
+        async def conversation_manager_function(action: str, session_id: str, message: Optional[Dict[str, Any]] = None, limit: Optional[int] = None) -> Dict[str, Any]:
             """Quản lý lịch sử và luồng trò chuyện
             
             Args:
@@ -30,7 +33,8 @@ class ConversationManager(FunctionTool):
             Returns:
                 Dict[str, Any]: Kết quả của hành động, bao gồm:
                     success: Trạng thái thành công
-                    history: Lịch sử trò chuyện (nếu có)
+                    history: Lịch sử trò chuyện (get_history, clear_history)
+                    message_count: Số tin nhắn của phiên sau khi thêm (add_message)
                     error: Thông báo lỗi nếu có
             """
             # Validate action
@@ -49,17 +53,17 @@ class ConversationManager(FunctionTool):
                 
             # Execute the corresponding action
             if action == "add_message":
-                return self.add_message(session_id, message)
+                return await self.add_message(session_id, message)
             elif action == "get_history":
-                return self.get_history(session_id, limit)
+                return await self.get_history(session_id, limit)
             elif action == "clear_history":
-                return self.clear_history(session_id)
+                return await self.clear_history(session_id)
         
         # Initialize FunctionTool with the function
         super().__init__(func=conversation_manager_function)
         
-        # Memory lưu trữ lịch sử trò chuyện theo session
-        self.conversation_memory = {}
+        # Lịch sử trò chuyện dùng chung theo session (ring buffer giới hạn theo số tin nhắn và dung lượng)
+        self.conversation_memory = history_store
     
     async def add_message(self, session_id: str, message: Dict[str, Any]) -> Dict[str, Any]:
         """Thêm tin nhắn vào lịch sử
@@ -69,22 +73,19 @@ class ConversationManager(FunctionTool):
             message: Tin nhắn cần thêm
             
         Returns:
-            Dict[str, Any]: Kết quả thêm tin nhắn
+            Dict[str, Any]: Kết quả thêm tin nhắn, gồm số tin nhắn của phiên đang giữ trong bộ
+                nhớ (dùng action=get_history để đọc lại lịch sử)
         """
-        # Khởi tạo lịch sử cho session nếu chưa có
-        if session_id not in self.conversation_memory:
-            self.conversation_memory[session_id] = []
-        
         # Thêm timestamp nếu chưa có
         if "timestamp" not in message:
             message["timestamp"] = time.time()
         
-        # Thêm tin nhắn vào lịch sử
-        self.conversation_memory[session_id].append(message)
+        # Thêm tin nhắn vào lịch sử (tin nhắn cũ bị loại nếu vượt giới hạn)
+        count = self.conversation_memory.append(session_id, message)
         
         return {
             "success": True,
-            "history": self.conversation_memory[session_id]
+            "message_count": count
         }
     
     async def get_history(self, session_id: str, limit: Optional[int] = None) -> Dict[str, Any]:
@@ -97,23 +98,11 @@ class ConversationManager(FunctionTool):
         Returns:
             Dict[str, Any]: Lịch sử trò chuyện
         """
-        # Kiểm tra xem session có tồn tại không
-        if session_id not in self.conversation_memory:
-            return {
-                "success": True,
-                "history": []
-            }
-        
-        # Lấy lịch sử
-        history = self.conversation_memory[session_id]
-        
-        # Giới hạn số lượng tin nhắn nếu có yêu cầu
-        if limit and limit > 0:
-            history = history[-limit:]
-        
+        # Chỉ lấy `limit` tin nhắn gần nhất, không sao chép toàn bộ lịch sử
         return {
             "success": True,
-            "history": history
+            "history": self.conversation_memory.get(session_id, limit),
+            "summary": self.conversation_memory.get_summary(session_id)
         }
     
     async def clear_history(self, session_id: str) -> Dict[str, Any]:
@@ -126,8 +115,7 @@ class ConversationManager(FunctionTool):
             Dict[str, Any]: Kết quả xóa lịch sử
         """
         # Xóa lịch sử
-        if session_id in self.conversation_memory:
-            self.conversation_memory[session_id] = []
+        self.conversation_memory.clear(session_id)
         
         return {
             "success": True,
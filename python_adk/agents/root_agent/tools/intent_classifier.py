@@ -12,6 +12,10 @@ from enum import Enum
 # Google ADK imports
 from google.adk.tools import FunctionTool
 
+# Local imports
+from python_adk.shared_libraries.keyword_automaton import KeywordAutomaton
+from python_adk.shared_libraries.lazy import LazySingleton
+
 
 class AgentType(str, Enum):
     """Các loại agent được hỗ trợ trong hệ thống"""
@@ -27,7 +31,7 @@ class IntentClassifier(FunctionTool):
     def __init__(self):
         """Khởi tạo Intent Classifier Tool"""
         # Define the analyze_intent_function
-        def analyze_intent_function(message: str) -> Dict[str, Any]:
+        async def analyze_intent_function(message: str) -> Dict[str, Any]:
             """Phân tích nội dung tin nhắn để xác định agent phù hợp
             
             Args:
@@ -39,7 +43,7 @@ class IntentClassifier(FunctionTool):
                     confidence: Độ tin cậy của kết quả phân loại (0-1)
                     keywords: Các từ khóa được nhận diện
             """
-            return self.analyze_intent(message)
+            return await self.analyze_intent(message)
         
         # Initialize FunctionTool with the function
         super().__init__(func=analyze_intent_function)
@@ -68,10 +72,42 @@ class IntentClassifier(FunctionTool):
             "quên mật khẩu", "khôi phục", "xóa tài khoản", "cập nhật", "update", 
             "xác thực", "api key", "token", "logout", "đăng xuất"
         ]
+        
+        # Biên dịch toàn bộ từ khóa thành một automaton, chấm điểm mọi loại agent trong một lần duyệt
+        self.keyword_automaton = KeywordAutomaton()
+        self.keyword_automaton.add_many(AgentType.BAT_CUC_LINH_SO, self.batcuclinh_so_keywords)
+        self.keyword_automaton.add_many(AgentType.PAYMENT, self.payment_keywords)
+        self.keyword_automaton.add_many(AgentType.USER, self.user_keywords)
+        self.keyword_automaton.build()
+    
+    def add_keywords(self, agent_type: AgentType, keywords: List[str]) -> None:
+        """Bổ sung từ khóa cho một loại agent
+        
+        Từ khóa được so khớp không phân biệt hoa thường (sau chuẩn hóa NFC); từ khóa trùng
+        với từ khóa đã có của cùng loại agent sau chuẩn hóa bị bỏ qua, nên mỗi từ khóa chỉ
+        được tính điểm một lần và xuất hiện một lần trong "keywords".
+        
+        Args:
+            agent_type: Loại agent
+            keywords: Danh sách từ khóa cần thêm
+        """
+        self.keyword_automaton.add_many(agent_type, keywords)
+        self.keyword_automaton.build()
     
     async def analyze_intent(self, message: str) -> Dict[str, Any]:
         """Phân tích ý định của người dùng từ tin nhắn
         
+        Args:
+            message: Nội dung tin nhắn cần phân tích
+            
+        Returns:
+            Dict[str, Any]: Kết quả phân tích ý định
+        """
+        return self.classify(message)
+    
+    def classify(self, message: str) -> Dict[str, Any]:
+        """Phân tích ý định của người dùng từ tin nhắn (đồng bộ, không gọi LLM)
+        
         Args:
             message: Nội dung tin nhắn cần phân tích
             
@@ -80,10 +116,14 @@ class IntentClassifier(FunctionTool):
         """
         message = message.lower()
         
-        # Phát hiện từ khóa
-        batcuc_score, batcuc_keywords = self._detect_keywords(message, self.batcuclinh_so_keywords)
-        payment_score, payment_keywords = self._detect_keywords(message, self.payment_keywords)
-        user_score, user_keywords = self._detect_keywords(message, self.user_keywords)
+        # Phát hiện từ khóa của mọi loại agent trong một lần duyệt
+        detected = self.keyword_automaton.search(message)
+        batcuc_keywords = detected.get(AgentType.BAT_CUC_LINH_SO, [])
+        payment_keywords = detected.get(AgentType.PAYMENT, [])
+        user_keywords = detected.get(AgentType.USER, [])
+        batcuc_score = len(batcuc_keywords)
+        payment_score = len(payment_keywords)
+        user_score = len(user_keywords)
         
         # Tìm loại agent có điểm cao nhất
         max_score = max(batcuc_score, payment_score, user_score)
@@ -112,29 +152,11 @@ class IntentClassifier(FunctionTool):
         return {
             "agent_type": agent_type,
             "confidence": confidence,
-            "keywords": keywords
+            "keywords": keywords,
+            # Từ khóa của mọi loại agent (để nhận biết tin nhắn có nhiều ý định)
+            "matches": detected
         }
     
-    def _detect_keywords(self, message: str, keywords: List[str]) -> tuple:
-        """Phát hiện từ khóa trong tin nhắn
-        
-        Args:
-            message: Tin nhắn cần phân tích
-            keywords: Danh sách từ khóa cần phát hiện
-            
-        Returns:
-            tuple: (điểm số, danh sách từ khóa phát hiện được)
-        """
-        score = 0
-        detected_keywords = []
-        
-        for keyword in keywords:
-            if keyword in message:
-                score += 1
-                detected_keywords.append(keyword)
-        
-        return score, detected_keywords
-    
     async def execute(self, **kwargs) -> Dict[str, Any]:
         """Thực thi tool với tham số từ ADK
         
@@ -145,4 +167,8 @@ class IntentClassifier(FunctionTool):
             Dict[str, Any]: Kết quả phân tích ý định
         """
         message = kwargs.get("message", "")
-        return await self.analyze_intent(message) 
\ No newline at end of file
+        return await self.analyze_intent(message)
+
+
+# Bộ phân loại dùng chung cho các tầng tiền định tuyến (fast path, gọi thẳng sub-agent)
+get_intent_classifier = LazySingleton(IntentClassifier)
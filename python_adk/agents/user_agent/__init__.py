@@ -4,4 +4,11 @@ User Agent Module
 Module quản lý agent cho xử lý thông tin người dùng.
 """
 
-from python_adk.agents.user_agent.agent import user_agent 
\ No newline at end of file
+import importlib
+
+from python_adk.shared_libraries.lazy import lazy_module_getattr
+
+# user_agent được tạo ở lần truy cập đầu tiên
+__getattr__ = lazy_module_getattr(__name__, {
+    "user_agent": lambda: importlib.import_module("python_adk.agents.user_agent.agent").user_agent
+})
@@ -9,6 +9,7 @@ from typing import Any, Dict
 from python_adk.agents.base_agent import BaseAgent
 from python_adk.agents.root_agent.agent import AgentType
 from python_adk.prompt import get_agent_prompt
+from python_adk.shared_libraries.lazy import LazySingleton, lazy_module_getattr
 
 # Tạo một agent kế thừa từ BaseAgent
 class UserAgent(BaseAgent):
@@ -34,5 +35,6 @@ class UserAgent(BaseAgent):
             instruction=instruction
         )
 
-# Tạo instance của UserAgent
-user_agent = UserAgent() 
\ No newline at end of file
+# Tạo instance của UserAgent (tạo ở lần truy cập đầu tiên)
+get_user_agent = LazySingleton(UserAgent)
+__getattr__ = lazy_module_getattr(__name__, {"user_agent": get_user_agent})
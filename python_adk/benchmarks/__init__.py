@@ -0,0 +1,5 @@
+"""
+Benchmarks Package
+
+Các script đo hiệu năng, chạy bằng `python -m python_adk.benchmarks.<tên_script>`.
+"""
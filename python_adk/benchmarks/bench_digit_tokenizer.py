@@ -0,0 +1,95 @@
+"""
+Benchmark bộ tách cặp số
+
+So sánh `tokenize_digits` (máy trạng thái một lượt) với vòng lặp ghép chuỗi cũ của
+`PhoneAnalyzer._generate_pairs` (kèm bước đếm 0/5 và bỏ 0/5 cho từng cặp như
+`_map_to_star_sequence` cũ) trên dãy 12-20 chữ số, từng dãy và theo lô.
+
+    python -m python_adk.benchmarks.bench_digit_tokenizer --iterations 20000 --batch-size 1000
+"""
+
+import argparse
+import random
+import timeit
+from typing import List, Tuple
+
+from python_adk.shared_libraries.digit_tokenizer import tokenize_digits, tokenize_many
+
+
+def _legacy_generate_pairs(digits: str) -> List[str]:
+    """Bản sao vòng lặp cũ của `PhoneAnalyzer._generate_pairs`, chỉ dùng làm mốc so sánh"""
+    pairs: List[str] = []
+    i = 0
+    while i < len(digits) - 1:
+        if digits[i] in ("0", "5"):
+            i += 1
+            continue
+        if digits[i+1] not in ("0", "5"):
+            pairs.append(digits[i:i+2])
+            i += 1
+        else:
+            j = i + 1
+            group = digits[i]
+            while j < len(digits) and digits[j] in ("0", "5"):
+                group += digits[j]
+                j += 1
+            if j < len(digits):
+                group += digits[j]
+                j += 1
+            pairs.append(group)
+            i = j - 1
+    return pairs
+
+
+def _legacy_tokens(digits: str) -> List[Tuple[str, int, int]]:
+    """Tách cặp theo cách cũ rồi đếm 0/5 và bỏ 0/5 cho từng cặp"""
+    return [
+        ("".join(d for d in pair if d not in ("0", "5")), pair.count("0"), pair.count("5"))
+        for pair in _legacy_generate_pairs(digits)
+    ]
+
+
+def _random_digits(rng: random.Random, length: int) -> str:
+    """Dãy chữ số ngẫu nhiên, tăng tỉ lệ 0/5 để có nhiều nhóm"""
+    return "".join(rng.choice("01234567890555") for _ in range(length))
+
+
+def run(iterations: int, batch_size: int, seed: int = 0) -> None:
+    """Chạy benchmark và in kết quả (micro giây / dãy)"""
+    rng = random.Random(seed)
+    print(f"{'input':<18}{'legacy us':>12}{'fsm us':>12}{'speedup':>10}")
+    for length in (12, 16, 20):
+        samples = [_random_digits(rng, length) for _ in range(256)]
+        for sample in samples:
+            assert [(t.pair, t.zero_count, t.five_count) for t in tokenize_digits(sample)] == _legacy_tokens(sample)
+
+        def legacy() -> None:
+            for sample in samples:
+                _legacy_tokens(sample)
+
+        def fsm() -> None:
+            for sample in samples:
+                tokenize_digits(sample)
+
+        rounds = max(1, iterations // len(samples))
+        legacy_us = min(timeit.repeat(legacy, number=rounds, repeat=3)) / (rounds * len(samples)) * 1e6
+        fsm_us = min(timeit.repeat(fsm, number=rounds, repeat=3)) / (rounds * len(samples)) * 1e6
+        print(f"{f'{length} digits':<18}{legacy_us:>12.3f}{fsm_us:>12.3f}{legacy_us / fsm_us:>9.2f}x")
+
+    batch = [_random_digits(rng, rng.randint(12, 20)) for _ in range(batch_size)]
+    legacy_batch = min(timeit.repeat(lambda: [_legacy_tokens(s) for s in batch], number=3, repeat=3)) / 3
+    fsm_batch = min(timeit.repeat(lambda: tokenize_many(batch), number=3, repeat=3)) / 3
+    print(f"{f'batch {batch_size}':<18}{legacy_batch * 1e3:>10.2f}ms{fsm_batch * 1e3:>10.2f}ms{legacy_batch / fsm_batch:>9.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark bộ tách cặp số")
+    parser.add_argument("--iterations", type=int, default=20000, help="Số dãy cho mỗi độ dài")
+    parser.add_argument("--batch-size", type=int, default=10000, help="Kích thước lô")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.iterations, args.batch_size, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Đo thời gian import (cold start) theo từng module
+
+Chạy `python -X importtime -c "import <module>"` trong tiến trình con, tổng hợp chi phí theo
+từng module / package gốc và kiểm tra ngân sách thời gian: tổng thời gian import vượt
+`--budget-ms`, hoặc có module bị cấm (mặc định Google ADK, nạp trễ khi dựng agent) bị kéo vào,
+thì thoát với mã 1 để dùng được trong CI.
+
+    python -m python_adk.benchmarks.bench_import_time --module python_adk.main --budget-ms 1000
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+DEFAULT_FORBIDDEN = ("google.adk", "google.generativeai")
+
+# (tên module, self us, cumulative us, độ sâu)
+_Entry = Tuple[str, int, int, int]
+
+
+def _profile(module: str) -> List[_Entry]:
+    """Import module trong tiến trình con mới và đọc báo cáo `-X importtime`"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=os.environ.copy()
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Import {module} thất bại:\n{result.stderr[-2000:]}")
+    entries: List[_Entry] = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return entries
+
+
+def _by_package(entries: List[_Entry]) -> Dict[str, int]:
+    """Tổng self time theo package gốc (google.adk, fastapi, python_adk, ...)"""
+    totals: Dict[str, int] = defaultdict(int)
+    for name, self_us, _, _ in entries:
+        parts = name.split(".")
+        key = ".".join(parts[:2]) if parts[0] == "google" else parts[0]
+        totals[key] += self_us
+    return totals
+
+
+def run(module: str, repeat: int, top: int, budget_ms: float, forbidden: List[str]) -> bool:
+    """
+    Đo và in báo cáo, lấy lần import nhanh nhất trong `repeat` lần
+
+    Returns:
+        bool: True nếu đạt ngân sách và không nạp module bị cấm
+    """
+    runs = [_profile(module) for _ in range(max(1, repeat))]
+    entries = min(runs, key=lambda e: sum(self_us for _, self_us, _, _ in e))
+    total_ms = sum(self_us for _, self_us, _, _ in entries) / 1000
+
+    print(f"import {module}: {total_ms:.1f} ms ({len(entries)} module, tốt nhất trong {len(runs)} lần)")
+
+    print(f"\nTop {top} package theo self time:")
+    for package, self_us in sorted(_by_package(entries).items(), key=lambda item: -item[1])[:top]:
+        print(f"  {self_us / 1000:>9.1f} ms  {package}")
+
+    print(f"\nTop {top} module theo cumulative time:")
+    for name, _, cumulative_us, depth in sorted(entries, key=lambda e: -e[2])[:top]:
+        print(f"  {cumulative_us / 1000:>9.1f} ms  {'  ' * depth}{name}")
+
+    own = [entry for entry in entries if entry[0].split(".")[0] == module.split(".")[0]]
+    print(f"\nModule của {module.split('.')[0]} (self / cumulative):")
+    for name, self_us, cumulative_us, _ in sorted(own, key=lambda e: -e[2]):
+        print(f"  {self_us / 1000:>7.1f} / {cumulative_us / 1000:>7.1f} ms  {name}")
+
+    ok = True
+    loaded = [name for name, _, _, _ in entries]
+    for prefix in forbidden:
+        hits = [name for name in loaded if name == prefix or name.startswith(prefix + ".")]
+        if hits:
+            ok = False
+            print(f"\n[FAIL] {prefix} bị import ({len(hits)} module), cần nạp trễ")
+    if budget_ms and total_ms > budget_ms:
+        ok = False
+        print(f"\n[FAIL] Vượt ngân sách: {total_ms:.1f} ms > {budget_ms:.1f} ms")
+    if ok:
+        print(f"\n[OK] Trong ngân sách {budget_ms:.1f} ms")
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Đo thời gian import theo từng module")
+    parser.add_argument("--module", default="python_adk.main", help="Module cần đo")
+    parser.add_argument("--repeat", type=int, default=3, help="Số lần đo (lấy lần nhanh nhất)")
+    parser.add_argument("--top", type=int, default=15, help="Số dòng trong mỗi bảng")
+    parser.add_argument("--budget-ms", type=float, default=1000.0, help="Ngân sách thời gian import (0 = không kiểm tra)")
+    parser.add_argument("--forbid", action="append", default=None,
+                        help=f"Module không được import (lặp lại được), mặc định: {', '.join(DEFAULT_FORBIDDEN)}")
+    args = parser.parse_args()
+    forbidden = args.forbid if args.forbid is not None else list(DEFAULT_FORBIDDEN)
+    sys.exit(0 if run(args.module, args.repeat, args.top, args.budget_ms, forbidden) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark tuần tự hóa response và xác thực request cho các endpoint phân tích
+
+So sánh CPU mỗi request cho payload phân tích số điện thoại / CCCD:
+- cũ: `jsonable_encoder` + `json.dumps` (đường mặc định của FastAPI khi endpoint trả dict)
+  và model kiểu pydantic v1 với `@validator` Python trên dict đã `json.loads`
+- mới: `dumps_json` (orjson nếu đã cài) và `model_validate_json` với ràng buộc
+  `StringConstraints` do pydantic-core kiểm tra
+
+    python -m python_adk.benchmarks.bench_serialization --iterations 5000
+"""
+
+import argparse
+import json
+import time
+import timeit
+import warnings
+from typing import Any, Callable, Dict
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, Field
+
+from python_adk.agents.batcuclinh_so_agent.tools.cccd_analyzer import cccd_analyzer
+from python_adk.agents.batcuclinh_so_agent.tools.phone_analyzer import phone_analyzer
+from python_adk.shared_libraries.json_response import HAS_ORJSON, dumps_json
+from python_adk.shared_libraries.models import CCCDAnalysisRequest, PhoneAnalysisRequest
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore")
+    from pydantic import validator
+
+    class _LegacyPhoneAnalysisRequest(BaseModel):
+        """Bản sao model cũ (validator Python), chỉ dùng làm mốc so sánh"""
+        phone_number: str = Field(...)
+
+        @validator("phone_number")
+        def validate_phone_number(cls, v):
+            if not v.isdigit():
+                raise ValueError("Số điện thoại chỉ được chứa chữ số")
+            if len(v) not in [10, 11]:
+                raise ValueError("Số điện thoại phải có 10 hoặc 11 chữ số")
+            return v
+
+    class _LegacyCCCDAnalysisRequest(BaseModel):
+        """Bản sao model cũ (validator Python), chỉ dùng làm mốc so sánh"""
+        cccd_last_digits: str = Field(...)
+
+        @validator("cccd_last_digits")
+        def validate_cccd_last_digits(cls, v):
+            if not v.isdigit():
+                raise ValueError("Dãy số chỉ được chứa chữ số")
+            if len(v) != 6:
+                raise ValueError("Phải nhập đúng 6 chữ số cuối của CCCD")
+            return v
+
+
+def _legacy_render(content: Any) -> bytes:
+    """Đường cũ: jsonable_encoder rồi JSONResponse.render của Starlette"""
+    return json.dumps(
+        jsonable_encoder(content), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _envelope(kind: str, value: str, analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """Response giống /analyze"""
+    return {
+        "success": True,
+        "message": "Phân tích thành công",
+        "type": kind,
+        "result": {"success": True, "value": value, "normalized": value, "analysis": analysis}
+    }
+
+
+def _cpu_us(func: Callable[[], Any], iterations: int) -> float:
+    """CPU (micro giây) cho mỗi lần gọi, lấy lần đo tốt nhất"""
+    timer = timeit.Timer(func, timer=time.process_time)
+    return min(timer.repeat(repeat=3, number=iterations)) / iterations * 1e6
+
+
+def run(iterations: int) -> None:
+    """Chạy benchmark và in kết quả (micro giây CPU / request)"""
+    cases = [
+        ("phone", _envelope("phone", "0912345678", phone_analyzer("0912345678", "kinh doanh")),
+         b'{"phone_number": "0912345678"}', _LegacyPhoneAnalysisRequest, PhoneAnalysisRequest),
+        ("cccd", _envelope("cccd", "001203012345", cccd_analyzer("001203012345")),
+         b'{"cccd_last_digits": "012345"}', _LegacyCCCDAnalysisRequest, CCCDAnalysisRequest),
+    ]
+    print(f"orjson: {'có' if HAS_ORJSON else 'không'} ({len(cases)} loại payload, {iterations} lần)")
+    print(f"{'payload':<18}{'bytes':>8}{'legacy us':>12}{'fast us':>12}{'speedup':>10}")
+    for name, payload, body, legacy_model, model in cases:
+        assert json.loads(dumps_json(payload)) == json.loads(_legacy_render(payload))
+        size = len(dumps_json(payload))
+
+        encode_legacy = _cpu_us(lambda: _legacy_render(payload), iterations)
+        encode_fast = _cpu_us(lambda: dumps_json(payload), iterations)
+        parse_legacy = _cpu_us(lambda: legacy_model(**json.loads(body)), iterations)
+        parse_fast = _cpu_us(lambda: model.model_validate_json(body), iterations)
+
+        rows = [
+            (f"{name} response", size, encode_legacy, encode_fast),
+            (f"{name} request", len(body), parse_legacy, parse_fast),
+            (f"{name} total", size + len(body), encode_legacy + parse_legacy, encode_fast + parse_fast),
+        ]
+        for label, nbytes, legacy_us, fast_us in rows:
+            print(f"{label:<18}{nbytes:>8}{legacy_us:>12.2f}{fast_us:>12.2f}{legacy_us / fast_us:>9.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark tuần tự hóa response / xác thực request")
+    parser.add_argument("--iterations", type=int, default=5000, help="Số lần lặp mỗi phép đo")
+    args = parser.parse_args()
+    run(args.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -40,10 +40,90 @@ class AppConfig:
         self.root_agent_model = os.getenv("ROOT_AGENT_MODEL", "gemini-pro")
         self.specialist_agent_model = os.getenv("SPECIALIST_AGENT_MODEL", "gemini-pro")
         
+        # Agent runtime settings
+        self.agent_app_name = os.getenv("AGENT_APP_NAME", "phong_thuy_so")
+        self.agent_max_concurrency = int(os.getenv("AGENT_MAX_CONCURRENCY", 8))
+        self.agent_eager_init = os.getenv("AGENT_EAGER_INIT", "1") == "1"  # Dựng agent trong warm-up
+        self.agent_max_sessions = int(os.getenv("AGENT_MAX_SESSIONS", 10000))
+        self.agent_session_ttl = int(os.getenv("AGENT_SESSION_TTL", 3600))  # 1 hour in seconds
+        
+        # Fast path: trả lời yêu cầu phân tích số rõ ràng bằng analyzer + mẫu câu, không gọi LLM
+        self.fast_path_enabled = os.getenv("FAST_PATH_ENABLED", "1") == "1"
+        self.fast_path_max_chars = int(os.getenv("FAST_PATH_MAX_CHARS", 160))
+        
+        # Gọi thẳng sub-agent khi IntentClassifier đủ tự tin, bỏ qua lượt model của root agent
+        self.direct_dispatch_enabled = os.getenv("DIRECT_DISPATCH_ENABLED", "1") == "1"
+        self.direct_dispatch_min_confidence = float(os.getenv("DIRECT_DISPATCH_MIN_CONFIDENCE", 0.5))
+        
+        # Cache câu trả lời của agent theo tin nhắn đã chuẩn hóa (câu hỏi dạng FAQ)
+        self.response_cache_enabled = os.getenv("RESPONSE_CACHE_ENABLED", "1") == "1"
+        self.response_cache_max_entries = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 5000))
+        self.response_cache_ttl = int(os.getenv("RESPONSE_CACHE_TTL", 3600))  # 1 hour in seconds
+        self.response_cache_max_bytes = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", 16 * 1024 * 1024))
+        self.response_cache_max_chars = int(os.getenv("RESPONSE_CACHE_MAX_CHARS", 300))
+        self.response_cache_exclude_agents = [
+            name.strip() for name in os.getenv("RESPONSE_CACHE_EXCLUDE_AGENTS", "payment_agent,user_agent").split(",")
+            if name.strip()
+        ]
+        
+        # Gộp request trùng nhau đang chạy đồng thời và lưu response theo Idempotency-Key
+        self.single_flight_enabled = os.getenv("SINGLE_FLIGHT_ENABLED", "1") == "1"
+        self.idempotency_max_entries = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", 10000))
+        self.idempotency_ttl = int(os.getenv("IDEMPOTENCY_TTL", 600))  # 10 minutes in seconds
+        self.idempotency_max_bytes = int(os.getenv("IDEMPOTENCY_MAX_BYTES", 32 * 1024 * 1024))
+        
+        # Pool agent của AgentRouter: mỗi (loại agent, model) một pool, mỗi instance phục vụ một request
+        self.agent_pool_size = int(os.getenv("AGENT_POOL_SIZE", 2))
+        self.agent_pool_sizes = self._parse_pool_sizes(os.getenv("AGENT_POOL_SIZES", ""))  # "batcuclinh_so=4,payment=1"
+        self.agent_pool_max_waiters = int(os.getenv("AGENT_POOL_MAX_WAITERS", 16))
+        self.agent_pool_wait_timeout = float(os.getenv("AGENT_POOL_WAIT_TIMEOUT", 30))  # seconds
+        
+        # Warm-up khi khởi động (endpoint /ready chỉ báo sẵn sàng khi warm-up xong)
+        self.warmup_enabled = os.getenv("WARMUP_ENABLED", "1") == "1"
+        self.warmup_numbers_file = os.getenv("WARMUP_NUMBERS_FILE", None)
+        self.warmup_max_numbers = int(os.getenv("WARMUP_MAX_NUMBERS", 1000))
+        self.warmup_model_client = os.getenv("WARMUP_MODEL_CLIENT", "1") == "1"
+        self.warmup_timeout = float(os.getenv("WARMUP_TIMEOUT", 120))  # seconds per step
+        self.warmup_fail_open = os.getenv("WARMUP_FAIL_OPEN", "1") == "1"
+        
         # Session settings
         self.session_ttl = int(os.getenv("SESSION_TTL", 3600))  # 1 hour in seconds
         self.session_store_type = os.getenv("SESSION_STORE_TYPE", "memory")
         self.session_redis_url = os.getenv("SESSION_REDIS_URL", None)
+        self.session_sqlite_path = os.getenv("SESSION_SQLITE_PATH", "data/sessions.sqlite3")
+        self.session_reap_interval = float(os.getenv("SESSION_REAP_INTERVAL", 30))  # seconds
+        self.session_reap_batch_size = int(os.getenv("SESSION_REAP_BATCH_SIZE", 500))
+        self.session_reap_max_slice = float(os.getenv("SESSION_REAP_MAX_SLICE", 0.05))  # seconds
+        
+        # Conversation history settings
+        self.history_max_messages = int(os.getenv("HISTORY_MAX_MESSAGES", 200))
+        self.history_max_session_bytes = int(os.getenv("HISTORY_MAX_SESSION_BYTES", 256 * 1024))
+        self.history_max_total_bytes = int(os.getenv("HISTORY_MAX_TOTAL_BYTES", 64 * 1024 * 1024))
+        self.history_compaction = os.getenv("HISTORY_COMPACTION", "summary")  # summary | drop
+        self.history_spill_dir = os.getenv("HISTORY_SPILL_DIR", None)
+        
+        # Analysis cache settings
+        self.analysis_cache_max_entries = int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", 10000))
+        self.analysis_cache_ttl = int(os.getenv("ANALYSIS_CACHE_TTL", 3600))  # 1 hour in seconds
+        self.analysis_cache_max_bytes = int(os.getenv("ANALYSIS_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+        
+        # Endpoint /analyze/batch: số phần tử tối đa mỗi request, nhường event loop sau mỗi N phần tử
+        self.analyze_batch_max_items = int(os.getenv("ANALYZE_BATCH_MAX_ITEMS", 1000))
+        self.analyze_batch_yield_every = max(1, int(os.getenv("ANALYZE_BATCH_YIELD_EVERY", 50)))
+        
+        # Bảng điểm số điện thoại dựng sẵn (memmap theo đầu số)
+        self.phone_score_table_dir = os.getenv("PHONE_SCORE_TABLE_DIR", "data/phone_scores")
+        
+        # Kho số tra cứu theo sao: file nạp khi khởi động, mỗi dòng một số điện thoại
+        self.star_inventory_file = os.getenv("STAR_INVENTORY_FILE", None)
+        
+        # Phiên phân tích tăng dần khi sửa số điện thoại
+        self.phone_edit_session_max = int(os.getenv("PHONE_EDIT_SESSION_MAX", 10000))
+        self.phone_edit_session_ttl = int(os.getenv("PHONE_EDIT_SESSION_TTL", 1800))  # 30 minutes in seconds
+        
+        # Response phân tích rút gọn (chỉ mã sao / tổ hợp) và từ điển sao dùng kèm
+        self.analysis_compact_default = os.getenv("ANALYSIS_COMPACT_DEFAULT", "0") == "1"
+        self.analysis_dictionary_max_age = int(os.getenv("ANALYSIS_DICTIONARY_MAX_AGE", 86400))  # 1 day in seconds
         
         # Database settings
         self.mongo_uri = os.getenv("MONGO_URI", None)
@@ -65,11 +145,101 @@ class AppConfig:
             "location": self.location
         }
         
+        # Cài đặt fast path
+        self.fast_path_config = {
+            "enabled": self.fast_path_enabled,
+            "max_chars": self.fast_path_max_chars
+        }
+        
+        # Cài đặt gọi thẳng sub-agent
+        self.direct_dispatch_config = {
+            "enabled": self.direct_dispatch_enabled,
+            "min_confidence": self.direct_dispatch_min_confidence
+        }
+        
+        # Cài đặt cache câu trả lời
+        self.response_cache_config = {
+            "enabled": self.response_cache_enabled,
+            "max_entries": self.response_cache_max_entries,
+            "ttl": self.response_cache_ttl,
+            "max_bytes": self.response_cache_max_bytes,
+            "exclude_agents": self.response_cache_exclude_agents,
+            "max_chars": self.response_cache_max_chars
+        }
+        
+        # Cài đặt lưu response theo Idempotency-Key
+        self.idempotency_config = {
+            "max_entries": self.idempotency_max_entries,
+            "ttl": self.idempotency_ttl,
+            "max_bytes": self.idempotency_max_bytes
+        }
+        
+        # Cài đặt pool agent
+        self.agent_pool_config = {
+            "size": self.agent_pool_size,
+            "sizes": self.agent_pool_sizes,
+            "max_waiters": self.agent_pool_max_waiters,
+            "wait_timeout": self.agent_pool_wait_timeout
+        }
+        
+        # Cài đặt warm-up khi khởi động
+        self.warmup_config = {
+            "enabled": self.warmup_enabled,
+            "agents": self.agent_eager_init,
+            "numbers_file": self.warmup_numbers_file,
+            "max_numbers": self.warmup_max_numbers,
+            "model_client": self.warmup_model_client,
+            "timeout": self.warmup_timeout,
+            "fail_open": self.warmup_fail_open
+        }
+        
         # Cài đặt session
         self.session_config = {
             "ttl": self.session_ttl,
             "store_type": self.session_store_type,
-            "redis_url": self.session_redis_url
+            "redis_url": self.session_redis_url,
+            "sqlite_path": self.session_sqlite_path
+        }
+        
+        # Cài đặt dọn phiên hết hạn chạy nền
+        self.session_reaper_config = {
+            "interval": self.session_reap_interval,
+            "batch_size": self.session_reap_batch_size,
+            "max_slice": self.session_reap_max_slice
+        }
+        
+        # Cài đặt lưu trữ lịch sử trò chuyện
+        self.history_config = {
+            "max_messages": self.history_max_messages,
+            "max_session_bytes": self.history_max_session_bytes,
+            "max_total_bytes": self.history_max_total_bytes,
+            "compaction": self.history_compaction,
+            "spill_dir": self.history_spill_dir
+        }
+        
+        # Cài đặt cache cho các analyzer
+        self.analysis_cache_config = {
+            "max_entries": self.analysis_cache_max_entries,
+            "ttl": self.analysis_cache_ttl,
+            "max_bytes": self.analysis_cache_max_bytes
+        }
+        
+        # Cài đặt phân tích hàng loạt
+        self.analyze_batch_config = {
+            "max_items": self.analyze_batch_max_items,
+            "yield_every": self.analyze_batch_yield_every
+        }
+        
+        # Cài đặt phiên sửa số điện thoại
+        self.phone_edit_session_config = {
+            "max_entries": self.phone_edit_session_max,
+            "ttl": self.phone_edit_session_ttl
+        }
+        
+        # Cài đặt response phân tích rút gọn
+        self.analysis_response_config = {
+            "compact_default": self.analysis_compact_default,
+            "dictionary_max_age": self.analysis_dictionary_max_age
         }
         
         # Cài đặt database
@@ -78,6 +248,24 @@ class AppConfig:
             "db_name": self.mongo_db_name
         }
     
+    @staticmethod
+    def _parse_pool_sizes(value: str) -> Dict[str, int]:
+        """
+        Đọc kích thước pool riêng theo loại agent
+        
+        Args:
+            value (str): Chuỗi dạng "batcuclinh_so=4,payment=1"
+            
+        Returns:
+            Dict[str, int]: Loại agent -> kích thước pool
+        """
+        sizes = {}
+        for item in value.split(","):
+            name, _, size = item.partition("=")
+            if name.strip() and size.strip():
+                sizes[name.strip()] = int(size)
+        return sizes
+    
     def get_agent_config(self, agent_type: str) -> Dict[str, Any]:
         """Lấy cấu hình cho một loại agent cụ thể
         
@@ -0,0 +1,33 @@
+"""
+Đầu số di động Việt Nam theo nhà mạng
+"""
+
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
+
+MOBILE_PREFIXES: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    "viettel": ("086", "096", "097", "098", "032", "033", "034", "035", "036", "037", "038", "039"),
+    "vinaphone": ("088", "091", "094", "081", "082", "083", "084", "085"),
+    "mobifone": ("089", "090", "093", "070", "076", "077", "078", "079"),
+    "vietnamobile": ("092", "056", "058"),
+    "gmobile": ("099", "059"),
+    "itelecom": ("087",),
+    "reddi": ("055",),
+})
+
+# Đầu số 3 chữ số → nhà mạng
+PREFIX_CARRIERS: Mapping[str, str] = MappingProxyType({
+    prefix: carrier for carrier, prefixes in MOBILE_PREFIXES.items() for prefix in prefixes
+})
+
+
+def carrier_of(phone_number: str) -> Optional[str]:
+    """Xác định nhà mạng theo 3 chữ số đầu
+
+    Args:
+        phone_number: Số điện thoại (hoặc đầu số) dạng 0xx...
+
+    Returns:
+        Tên nhà mạng, None nếu đầu số không hợp lệ
+    """
+    return PREFIX_CARRIERS.get(phone_number[:3])
@@ -0,0 +1,76 @@
+"""
+Mục đích sử dụng số và các sao thuận lợi / bất lợi tương ứng
+
+Dùng chung cho phân tích độ phù hợp mục đích của số điện thoại và bộ sinh số điện thoại.
+Mỗi mục đích có danh sách từ đồng nghĩa (tiếng Việt, tiếng Anh) để nhận diện từ
+câu mô tả tự do của người dùng.
+"""
+
+import unicodedata
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
+PURPOSE_STARS: Mapping[str, Mapping[str, Any]] = MappingProxyType({
+    "business": {
+        "name": "Kinh doanh",
+        "aliases": ("business", "kinh doanh", "buôn bán", "bán hàng", "công ty", "doanh nghiệp", "làm ăn"),
+        "favorable_stars": ("THIEN_Y", "DIEN_NIEN"),
+        "unfavorable_stars": ("TUYET_MENH", "NGU_QUY"),
+    },
+    "wealth": {
+        "name": "Tài lộc",
+        "aliases": ("wealth", "tài lộc", "tài chính", "tiền bạc", "đầu tư", "tiết kiệm"),
+        "favorable_stars": ("THIEN_Y", "SINH_KHI"),
+        "unfavorable_stars": ("TUYET_MENH", "NGU_QUY"),
+    },
+    "career": {
+        "name": "Sự nghiệp",
+        "aliases": ("career", "sự nghiệp", "công việc", "thăng tiến", "công danh"),
+        "favorable_stars": ("DIEN_NIEN", "SINH_KHI"),
+        "unfavorable_stars": ("TUYET_MENH", "LUC_SAT"),
+    },
+    "love": {
+        "name": "Tình cảm",
+        "aliases": ("love", "tình cảm", "tình yêu", "gia đình", "hôn nhân"),
+        "favorable_stars": ("THIEN_Y", "SINH_KHI"),
+        "unfavorable_stars": ("LUC_SAT", "HOA_HAI"),
+    },
+    "health": {
+        "name": "Sức khỏe",
+        "aliases": ("health", "sức khỏe", "sức khoẻ", "y tế"),
+        "favorable_stars": ("THIEN_Y", "SINH_KHI"),
+        "unfavorable_stars": ("NGU_QUY", "TUYET_MENH"),
+    },
+    "study": {
+        "name": "Học tập",
+        "aliases": ("study", "học tập", "giáo dục", "nghiên cứu", "thi cử"),
+        "favorable_stars": ("DIEN_NIEN", "SINH_KHI"),
+        "unfavorable_stars": ("HOA_HAI", "NGU_QUY"),
+    },
+    "personal": {
+        "name": "Cá nhân",
+        "aliases": ("personal", "cá nhân", "tiêu dùng"),
+        "favorable_stars": ("SINH_KHI", "THIEN_Y"),
+        "unfavorable_stars": ("HOA_HAI", "LUC_SAT"),
+    },
+})
+
+
+def resolve_purpose(purpose: Optional[str]) -> Optional[str]:
+    """Xác định mục đích chuẩn từ mô tả của người dùng
+
+    Args:
+        purpose: Mã mục đích (ví dụ "business") hoặc câu mô tả (ví dụ "số cho công ty")
+
+    Returns:
+        Mã mục đích trong PURPOSE_STARS, None nếu không nhận diện được
+    """
+    if not purpose:
+        return None
+    text = unicodedata.normalize("NFC", purpose).strip().lower()
+    if text in PURPOSE_STARS:
+        return text
+    for key, info in PURPOSE_STARS.items():
+        if any(alias in text for alias in info["aliases"]):
+            return key
+    return None
@@ -0,0 +1,90 @@
+"""
+Bảng tra cứu cặp số → sao Bát Tinh được dựng sẵn một lần khi import
+
+Thay cho việc duyệt tuần tự BAT_TINH và kiểm tra `pair in info["numbers"]`
+ở mỗi request, mọi analyzer tra cứu một cặp số (2-3 chữ số) bằng đúng một
+phép tra dict, bất kể bảng sao lớn đến đâu.
+"""
+
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+from python_adk.constants.bat_tinh import BAT_TINH
+from python_adk.constants.response_factors import RESPONSE_FACTORS
+from python_adk.shared_libraries.digit_tokenizer import tokenize_digits
+
+
+class PairStar(NamedTuple):
+    """Thông tin sao tương ứng với một cặp số"""
+    pair: str
+    star: str
+    energy: float
+    nature: str
+    response_factor: float
+    info: Mapping[str, Any]
+
+
+# Thứ tự các sao theo BAT_TINH, dùng làm mã số nguyên cho sao
+STAR_KEYS: Tuple[str, ...] = tuple(BAT_TINH.keys())
+STAR_CODES: Mapping[str, int] = MappingProxyType({key: code for code, key in enumerate(STAR_KEYS)})
+
+
+def _build_pair_index() -> Mapping[str, PairStar]:
+    """Dựng bảng tra cứu cặp số → sao từ BAT_TINH
+
+    Giữ nguyên ngữ nghĩa "sao đầu tiên khớp" của vòng lặp cũ
+    nếu một cặp số xuất hiện ở nhiều sao.
+    """
+    star_factors = RESPONSE_FACTORS.get("STAR_RESPONSE_FACTORS", {})
+    index = {}
+    for star_key, info in BAT_TINH.items():
+        for pair in info.get("numbers", []):
+            if pair in index:
+                continue
+            index[pair] = PairStar(
+                pair=pair,
+                star=star_key,
+                energy=info.get("energy", {}).get(pair, 1),
+                nature=info.get("nature", ""),
+                response_factor=star_factors.get(star_key, 1),
+                info=MappingProxyType(info),
+            )
+    return MappingProxyType(index)
+
+
+# Bảng tra cứu bất biến, dựng một lần khi import
+PAIR_INDEX: Mapping[str, PairStar] = _build_pair_index()
+
+
+def lookup_pair(pair: str) -> Optional[PairStar]:
+    """Tra cứu sao của một cặp số
+
+    Args:
+        pair: Cặp số 2-3 chữ số (ví dụ "14", "104")
+
+    Returns:
+        PairStar nếu cặp số thuộc một sao, None nếu không
+    """
+    return PAIR_INDEX.get(pair)
+
+
+def star_pairs(digits: str) -> List[Dict[str, Any]]:
+    """Chuỗi sao rút gọn của một dãy chữ số (tách cặp bằng tokenize_digits)
+
+    Args:
+        digits: Dãy chữ số (số điện thoại, CCCD, số tài khoản, phần số của mật khẩu)
+
+    Returns:
+        Danh sách {pair, star, nature, energy} theo thứ tự cặp số; cặp không thuộc sao nào bị bỏ qua
+    """
+    sequence = []
+    for token in tokenize_digits(digits):
+        entry = PAIR_INDEX.get(token.pair)
+        if entry:
+            sequence.append({
+                "pair": digits[token.start:token.end],
+                "star": entry.star,
+                "nature": entry.nature,
+                "energy": max(1, entry.energy + token.five_count - token.zero_count)
+            })
+    return sequence
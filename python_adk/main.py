@@ -8,26 +8,83 @@ import os
 import sys
 import argparse
 import logging
-from typing import Dict, Optional, Any
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Any
 from datetime import datetime
 import json
+import asyncio
+import time
+import uuid
+from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
-import google.generativeai as genai
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Header
 from pydantic import BaseModel
 import uvicorn
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 
-# Import the root agent instance directly
-from python_adk.agents import root_agent
+# Root agent được dựng trễ (trong warm-up hoặc ở request đầu tiên)
+from python_adk.agents import get_root_agent
+from python_adk.agents.agent_pool import AgentOverloadedError
+from python_adk.agents.agent_runtime import agent_runtime
+from python_adk.agents.root_agent.direct_dispatch import direct_dispatcher
+from python_adk.agents.root_agent.fast_path import fast_path
 from python_adk.shared_libraries.logger import get_logger
+from python_adk.shared_libraries.cache import analysis_cache
+from python_adk.shared_libraries.response_cache import response_cache
+from python_adk.shared_libraries.request_dedup import (
+    StoredResponse, idempotency_store, request_fingerprint, single_flight
+)
+from python_adk.shared_libraries.json_response import FastJSONResponse, dumps_json
+from python_adk.shared_libraries.analysis_dictionary import (
+    DICTIONARY_BODY, DICTIONARY_ETAG, DICTIONARY_VERSION, compact_analysis, etag_matches
+)
+from python_adk.config.config import AppConfig
+from python_adk.session.history_store import history_store
+from python_adk.session.session_manager import SessionManager
+from python_adk.session.session_reaper import SessionReaper
+from python_adk.warmup import WarmupManager
+
+
+async def _release_sessions(session_ids: List[str]) -> None:
+    """Giải phóng session của agent và lịch sử trò chuyện của các phiên đã hết hạn / bị xóa"""
+    for session_id in session_ids:
+        await agent_runtime.end_session(session_id)
+    # Xóa lịch sử có thể xóa file đã ghi ra đĩa nên chạy trong thread
+    await asyncio.to_thread(lambda: [history_store.clear(session_id) for session_id in session_ids])
+
+
+# Session Manager và tác vụ dọn phiên hết hạn dùng chung cho toàn bộ tiến trình: mỗi phiên chat
+# được ghi nhận (và gia hạn) trong SessionManager, phiên hết hạn kéo theo session của agent và lịch sử
+app_config = AppConfig()
+session_manager = SessionManager.from_config(app_config)
+session_reaper = SessionReaper(
+    session_manager,
+    on_expired=[_release_sessions],
+    **app_config.session_reaper_config
+)
+warmup = WarmupManager(**app_config.warmup_config)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Khởi động và dừng các tác vụ nền cùng vòng đời ứng dụng"""
+    session_reaper.start()
+    # Warm-up chạy nền: worker nhận kết nối ngay nhưng /ready trả 503 cho tới khi xong
+    warmup.start()
+    try:
+        yield
+    finally:
+        await warmup.stop()
+        await session_reaper.stop()
+
 
 # Khởi tạo ứng dụng FastAPI
 app = FastAPI(
     title="Phong Thủy Số API",
     description="API cho ứng dụng phân tích phong thủy số học",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 def configure_logging():
@@ -67,6 +124,8 @@ def configure_gemini(api_key: Optional[str] = None):
         raise ValueError("Không tìm thấy API key. Vui lòng cung cấp GOOGLE_API_KEY hoặc GEMINI_API_KEY trong môi trường hoặc trực tiếp.")
     
     # Cấu hình Gemini
+    import google.generativeai as genai
+    
     genai.configure(api_key=api_key)
 
 
@@ -84,6 +143,11 @@ def run_interactive_shell(model_name: str):
     # Lưu ý: model_name từ command line hiện không được sử dụng để cấu hình lại root_agent
     # Nếu cần cấu hình model động, cần cơ chế khác.
     
+    session_id = f"shell-{uuid.uuid4()}"
+    # Một event loop cho cả phiên shell: client model và semaphore của AgentRuntime gắn với loop
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    
     print("\n===== Phong Thủy Số - Interactive Shell =====")
     print("Nhập 'exit' hoặc 'quit' để thoát\n")
     
@@ -97,10 +161,8 @@ def run_interactive_shell(model_name: str):
                 print("Tạm biệt!")
                 break
             
-            # Xử lý input với Root Agent (instance đã import)
-            # Lưu ý: Phương thức 'run' không tồn tại trên GeminiAgent, sử dụng 'invoke'
-            # Xử lý input với Root Agent
-            response = root_agent.invoke(user_input)
+            # Xử lý input với Root Agent qua AgentRuntime (giữ ngữ cảnh trong một phiên)
+            response = loop.run_until_complete(_invoke_root_agent(user_input, session_id=session_id))
             
             # Hiển thị phản hồi
             print(f"\nPhong Thủy Số: {response}")
@@ -111,6 +173,8 @@ def run_interactive_shell(model_name: str):
         except Exception as e:
             logger.error(f"Lỗi: {e}")
             print(f"\nCó lỗi xảy ra: {e}")
+    
+    loop.close()
 
 
 def parse_arguments():
@@ -184,9 +248,6 @@ def main():
         sys.exit(1)
 
 
-if __name__ == "__main__":
-    main()
-
 # Định nghĩa các models cho API
 class UserMessage(BaseModel):
     """Model cho user message trong API"""
@@ -210,6 +271,26 @@ class ChatSession(BaseModel):
     sessionId: str
     session_id: Optional[str] = None  # Thêm field session_id để tương thích với Node.js API
 
+class AnalyzeResult(BaseModel):
+    """Phần result trong response phân tích"""
+    success: bool
+    value: Optional[str] = None
+    phoneNumber: Optional[str] = None
+    normalized: Optional[str] = None
+    analysis: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+class AnalyzeResponse(BaseModel):
+    """
+    Model cho response của /analyze và /analyze/phone, chỉ dùng để mô tả schema trong OpenAPI
+    (endpoint trả thẳng FastJSONResponse nên FastAPI không kiểm tra lại theo model này)
+    """
+    success: bool
+    message: str
+    type: Optional[str] = None
+    result: AnalyzeResult
+    dictionaryVersion: Optional[str] = None  # Chỉ có ở chế độ compact
+
 class ChatRequest(BaseModel):
     message: str
     sessionId: Optional[str] = None
@@ -217,36 +298,258 @@ class ChatRequest(BaseModel):
 class AnalyzeRequest(BaseModel):
     type: str
     value: str
+    compact: Optional[bool] = None  # True: chỉ trả mã sao / tổ hợp, mô tả lấy từ /analyze/dictionary
+
+class BatchAnalyzeRequest(BaseModel):
+    """Model cho yêu cầu phân tích hàng loạt"""
+    items: List[AnalyzeRequest]
+    compact: Optional[bool] = None  # Áp dụng cho các phần tử không tự đặt compact
 
 class PhoneRequest(BaseModel):
     phoneNumber: str
     purpose: Optional[str] = None
+    compact: Optional[bool] = None
+
+class PhoneEditSessionRequest(BaseModel):
+    """Model tạo phiên phân tích tăng dần"""
+    phoneNumber: str = ""
+    purpose: Optional[str] = None
+    compact: Optional[bool] = None
+
+class PhoneEditRequest(BaseModel):
+    """Model sửa một chữ số trong phiên phân tích tăng dần"""
+    op: str  # insert | delete | replace
+    position: int
+    digit: Optional[str] = None
+    version: Optional[int] = None  # Phiên bản client đang giữ, lệch thì trả 409
+    compact: Optional[bool] = None
+
+class InventoryRequest(BaseModel):
+    """Model thêm / bỏ số trong kho số tra cứu theo sao"""
+    numbers: List[str]
+
+async def _track_session(session_id: Optional[str], user_id: Optional[str] = None) -> bool:
+    """
+    Ghi nhận lượt chat của phiên trong SessionManager (tạo mới hoặc gia hạn)
+    
+    Args:
+        session_id (Optional[str]): ID phiên, None với request không giữ ngữ cảnh
+        user_id (Optional[str]): ID người dùng
+        
+    Returns:
+        bool: True nếu đây là lượt đầu tiên của phiên (hoặc request không có phiên)
+    """
+    if not session_id:
+        return True
+    # Backend SQLite/Redis có I/O chặn nên chạy trong thread
+    return await asyncio.to_thread(session_manager.track_session, session_id, user_id)
+
+def _record_turn(session_id: Optional[str], message: str, response: str) -> None:
+    """Lưu lượt hỏi / đáp của phiên vào lịch sử trò chuyện dùng chung"""
+    if not session_id:
+        return
+    now = time.time()
+    history_store.append(session_id, {"role": "user", "content": message, "timestamp": now})
+    history_store.append(session_id, {"role": "assistant", "content": response, "timestamp": now})
+
+async def _invoke_root_agent(message: str, session_id: Optional[str] = None, user_id: Optional[str] = None) -> str:
+    """
+    Gọi root agent mà không chặn event loop (giới hạn số lượt đồng thời bởi AgentRuntime)
+    
+    Args:
+        message (str): Tin nhắn của người dùng
+        session_id (Optional[str]): ID phiên để giữ ngữ cảnh hội thoại
+        user_id (Optional[str]): ID người dùng
+        
+    Returns:
+        str: Phản hồi của root agent (hoặc của fast path / sub-agent được gọi thẳng / cache)
+    """
+    # Chỉ lưu câu trả lời của lượt đầu; lượt sau có thể dựa vào ngữ cảnh trước đó nên chỉ đọc cache
+    # với câu hỏi kiến thức tự đủ nghĩa
+    first_turn = await _track_session(session_id, user_id)
+    response = fast_path.answer(message)
+    if response is None:
+        agent = direct_dispatcher.select(message, get_root_agent())
+        response = response_cache.get(message, agent.name, first_turn)
+        if response is None:
+            started = time.perf_counter()
+            response = await agent_runtime.run(agent, message, session_id=session_id, user_id=user_id)
+            fast_path.record_agent_latency(time.perf_counter() - started)
+            response_cache.set(message, agent.name, response, first_turn)
+    _record_turn(session_id, message, response)
+    return response
+
+async def _stream_root_agent(message: str, session_id: Optional[str] = None, user_id: Optional[str] = None) -> AsyncIterator[str]:
+    """
+    Chuyển tiếp từng đoạn phản hồi của root agent (hoặc sub-agent được gọi thẳng) ngay khi
+    được sinh ra (fast path trả lời trong một đoạn duy nhất)
+    
+    Args:
+        message (str): Tin nhắn của người dùng
+        session_id (Optional[str]): ID phiên để giữ ngữ cảnh hội thoại
+        user_id (Optional[str]): ID người dùng
+        
+    Yields:
+        str: Đoạn văn bản tiếp theo của phản hồi
+    """
+    first_turn = await _track_session(session_id, user_id)
+    reply = fast_path.answer(message)
+    if reply is None:
+        agent = direct_dispatcher.select(message, get_root_agent())
+        reply = response_cache.get(message, agent.name, first_turn)
+    if reply is not None:
+        _record_turn(session_id, message, reply)
+        yield reply
+        return
+    started = time.perf_counter()
+    chunks = []
+    async for chunk in agent_runtime.stream(agent, message, session_id=session_id, user_id=user_id):
+        chunks.append(chunk)
+        yield chunk
+    fast_path.record_agent_latency(time.perf_counter() - started)
+    response = "".join(chunks)
+    response_cache.set(message, agent.name, response, first_turn)
+    _record_turn(session_id, message, response)
+
+async def _sse_stream(chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+    """
+    Đóng gói các đoạn phản hồi của agent thành sự kiện SSE
+    theo định dạng {"type": "chunk" | "error" | "complete"}
+    
+    Args:
+        chunks (AsyncIterator[str]): Các đoạn văn bản của phản hồi
+        
+    Yields:
+        str: Sự kiện SSE
+    """
+    try:
+        async for chunk in chunks:
+            yield f"data: {json.dumps({'type': 'chunk', 'content': chunk})}\n\n"
+    except Exception as e:
+        get_logger("API").error(f"Lỗi khi stream phản hồi của agent: {e}")
+        yield f"data: {json.dumps({'type': 'error', 'content': str(e)})}\n\n"
+    yield f"data: {json.dumps({'type': 'complete'})}\n\n"
+
+def _overloaded_exception(error: AgentOverloadedError) -> HTTPException:
+    """Chuyển lỗi quá tải của pool agent thành HTTP 429 / 503 kèm Retry-After"""
+    return HTTPException(
+        status_code=error.status_code,
+        detail=str(error),
+        headers={"Retry-After": str(error.retry_after)}
+    )
+
+async def _prime_stream(chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+    """
+    Chờ đoạn phản hồi đầu tiên trước khi mở stream SSE, để lỗi quá tải của pool agent
+    được trả về bằng mã HTTP (các lỗi khác vẫn là sự kiện "error" trong stream)
+    
+    Raises:
+        AgentOverloadedError: Nếu pool agent quá tải
+    """
+    first: List[str] = []
+    error: Optional[Exception] = None
+    try:
+        first.append(await chunks.__anext__())
+    except StopAsyncIteration:
+        pass
+    except AgentOverloadedError:
+        raise
+    except Exception as e:
+        error = e
+
+    async def primed() -> AsyncIterator[str]:
+        if error is not None:
+            raise error
+        for chunk in first:
+            yield chunk
+        async for chunk in chunks:
+            yield chunk
+
+    return primed()
+
+async def _deduplicated(
+    route: str,
+    payload: BaseModel,
+    idempotency_key: Optional[str],
+    compute: Callable[[], Awaitable[Response]],
+    coalesce: bool = True
+) -> Response:
+    """
+    Chạy endpoint qua lớp gộp request: trả lại response đã lưu theo Idempotency-Key,
+    và (nếu `coalesce`) để các request giống hệt nhau đang chạy đồng thời dùng chung một lượt tính
+    
+    Args:
+        route (str): Đường dẫn endpoint (kèm tham số đường dẫn)
+        payload (BaseModel): Body của request đã xác thực
+        idempotency_key (Optional[str]): Giá trị header Idempotency-Key
+        compute (Callable[[], Awaitable[Response]]): Hàm xử lý request
+        coalesce (bool): Gộp request trùng nội dung; tắt cho endpoint thay đổi trạng thái,
+            khi đó chỉ các lần gửi lại cùng Idempotency-Key mới được gộp
+        
+    Returns:
+        Response: Response của request
+    """
+    fingerprint = request_fingerprint(route, payload.model_dump_json())
+    if idempotency_key:
+        try:
+            stored = idempotency_store.get(route, idempotency_key, fingerprint)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        if stored is not None:
+            return stored.to_response(replayed=True)
+    
+    async def run() -> StoredResponse:
+        return StoredResponse.from_response(fingerprint, await compute())
+    
+    if coalesce:
+        stored = await single_flight.do(fingerprint, run)
+    elif idempotency_key:
+        stored = await single_flight.do((route, idempotency_key, fingerprint), run)
+    else:
+        stored = await run()
+    if idempotency_key and stored.status_code < 400:
+        idempotency_store.set(route, idempotency_key, stored)
+    return stored.to_response()
+
+def _agent_pool_stats() -> Dict[str, Any]:
+    """Thống kê pool agent nếu router đã được dựng (không tự dựng router / import Google ADK)"""
+    router_module = sys.modules.get("python_adk.agents.root_agent.tools.agent_router")
+    if router_module is None or not router_module.get_agent_router.initialized:
+        return {}
+    return router_module.get_agent_router().stats()
 
 # --- API Routes ---
 # Endpoint /chat cho Node.js API Gateway
 @app.post("/chat")
-async def chat_endpoint(user_message: UserMessage):
+async def chat_endpoint(user_message: UserMessage, idempotency_key: Optional[str] = Header(None)):
     """
     Endpoint chính cho Node.js API Gateway
     """
-    try:
-        # Log the request
-        logger = get_logger("API")
-        logger.info(f"Nhận API request từ Node.js: {user_message.message or user_message.text}")
-        
-        # Gọi root agent để xử lý tin nhắn
-        message_text = user_message.message or user_message.text or ""
-        response = root_agent.invoke(message_text)
-        
-        # Trả về response theo format mà Node.js API Gateway mong đợi
-        return {
-            "response": response,
-            "success": True,
-            "agent_type": "root"
-        }
-    except Exception as e:
-        logger.error(f"Lỗi xử lý API request: {e}")
-        raise HTTPException(status_code=500, detail=f"Lỗi xử lý request: {str(e)}")
+    # Log the request
+    logger = get_logger("API")
+    logger.info(f"Nhận API request từ Node.js: {user_message.message or user_message.text}")
+    
+    async def compute() -> Response:
+        try:
+            # Gọi root agent để xử lý tin nhắn
+            message_text = user_message.message or user_message.text or ""
+            response = await _invoke_root_agent(
+                message_text,
+                session_id=user_message.session_id or user_message.sessionId,
+                user_id=user_message.user_id
+            )
+            
+            # Trả về response theo format mà Node.js API Gateway mong đợi
+            return FastJSONResponse({
+                "response": response,
+                "success": True,
+                "agent_type": "root"
+            })
+        except Exception as e:
+            logger.error(f"Lỗi xử lý API request: {e}")
+            raise HTTPException(status_code=500, detail=f"Lỗi xử lý request: {str(e)}")
+    
+    return await _deduplicated("/chat", user_message, idempotency_key, compute)
 
 # Endpoint /chat/stream cho Node.js API Gateway
 @app.post("/chat/stream")
@@ -254,40 +557,18 @@ async def chat_stream_endpoint(user_message: UserMessage):
     """
     Endpoint stream cho Node.js API Gateway
     """
-    from fastapi.responses import StreamingResponse
-    import json
-    import asyncio
+    # Log the request
+    logger = get_logger("API")
+    logger.info(f"Nhận stream request từ Node.js: {user_message.message or user_message.text}")
     
-    try:
-        # Log the request
-        logger = get_logger("API")
-        logger.info(f"Nhận stream request từ Node.js: {user_message.message or user_message.text}")
-        
-        # Gọi root agent để xử lý tin nhắn
-        message_text = user_message.message or user_message.text or ""
-        response = root_agent.invoke(message_text)
-        
-        # Giả lập streaming bằng cách chia nhỏ phản hồi
-        async def fake_stream():
-            # Chia phản hồi thành các chunk nhỏ
-            chunk_size = 10  # Số ký tự mỗi chunk
-            for i in range(0, len(response), chunk_size):
-                chunk = response[i:i+chunk_size]
-                # Format theo định dạng SSE mà Node.js đang mong đợi
-                yield f"data: {json.dumps({'type': 'chunk', 'content': chunk})}\n\n"
-                await asyncio.sleep(0.05)  # Tạm dừng để giả lập stream
-            
-            # Gửi sự kiện hoàn thành
-            yield f"data: {json.dumps({'type': 'complete'})}\n\n"
-        
-        # Trả về streaming response
-        return StreamingResponse(
-            fake_stream(),
-            media_type="text/event-stream"
-        )
-    except Exception as e:
-        logger.error(f"Lỗi xử lý stream request: {e}")
-        raise HTTPException(status_code=500, detail=f"Lỗi xử lý request: {str(e)}")
+    # Chuyển tiếp từng đoạn phản hồi của root agent ngay khi được sinh ra
+    message_text = user_message.message or user_message.text or ""
+    chunks = _stream_root_agent(
+        message_text,
+        session_id=user_message.session_id or user_message.sessionId,
+        user_id=user_message.user_id
+    )
+    return StreamingResponse(_sse_stream(chunks), media_type="text/event-stream")
 
 # Thêm route /agent/chat để tương thích với frontend
 @app.post("/agent/chat", response_model=ChatSession)
@@ -330,14 +611,13 @@ async def stream_chat(user_message: UserMessage):
         # Extract message
         message_text = user_message.message or user_message.text or ""
         
-        # Gọi root agent để xử lý tin nhắn
-        try:
-            response = root_agent.invoke(message_text)
-            # Trả về response dạng JSON
-            return {"text": response, "done": True}
-        except Exception as agent_error:
-            logger.error(f"Lỗi khi gọi agent: {agent_error}")
-            return {"error": f"Lỗi khi gọi agent: {str(agent_error)}", "done": True}
+        # Chuyển tiếp từng đoạn phản hồi của root agent ngay khi được sinh ra
+        chunks = _stream_root_agent(
+            message_text,
+            session_id=user_message.sessionId or user_message.session_id,
+            user_id=user_message.user_id
+        )
+        return StreamingResponse(_sse_stream(chunks), media_type="text/event-stream")
             
     except Exception as e:
         logger.error(f"Lỗi xử lý stream request: {e}")
@@ -353,8 +633,8 @@ async def legacy_query(user_message: UserMessage):
     try:
         # Extract message text from either message or text field
         message_text = user_message.message or user_message.text or ""
-        response = root_agent.invoke(message_text)
-        return {"response": response}
+        response = await _invoke_root_agent(message_text, session_id=user_message.sessionId or user_message.session_id)
+        return FastJSONResponse({"response": response})
     except Exception as e:
         logger.error(f"Lỗi xử lý query request: {e}")
         raise HTTPException(status_code=500, detail=f"Đã xảy ra lỗi khi xử lý tin nhắn")
@@ -393,55 +673,98 @@ async def health_check():
     """
     return {
         "status": "healthy",
-        "timestamp": datetime.now().isoformat()
+        "timestamp": datetime.now().isoformat(),
+        "cache": analysis_cache.stats(),
+        "agent_runtime": agent_runtime.stats(),
+        "agent_pools": _agent_pool_stats(),
+        "fast_path": fast_path.stats(),
+        "direct_dispatch": direct_dispatcher.stats(),
+        "response_cache": response_cache.stats(),
+        "single_flight": single_flight.stats(),
+        "idempotency": idempotency_store.stats(),
+        "sessions": session_reaper.stats(),
+        "warmup": warmup.stats()
     }
 
+@app.get("/ready")
+async def readiness_check():
+    """
+    Endpoint readiness cho load balancer: 200 khi warm-up đã xong, 503 khi worker còn nguội
+    """
+    return FastJSONResponse(
+        {
+            "status": "ready" if warmup.ready else "warming_up",
+            "timestamp": datetime.now().isoformat(),
+            "warmup": warmup.stats()
+        },
+        status_code=200 if warmup.ready else 503
+    )
+
 # Giữ lại /api/chat endpoint cho direct access
 @app.post("/api/chat", response_model=AgentResponse)
-async def chat_with_agent(user_message: UserMessage):
+async def chat_with_agent(user_message: UserMessage, idempotency_key: Optional[str] = Header(None)):
     """
     Endpoint cho phép chat với agent thông qua API request trực tiếp
     """
-    try:
-        # Log the request
-        logger = get_logger("API")
-        logger.info(f"Nhận API request trực tiếp: {user_message.message or user_message.text}")
-        
-        # Gọi root agent để xử lý tin nhắn
-        message_text = user_message.message or user_message.text or ""
-        response = root_agent.invoke(message_text)
-        
-        # Trả về response
-        return AgentResponse(response=response, text=response)
-    except Exception as e:
-        logger.error(f"Lỗi xử lý API request: {e}")
-        raise HTTPException(status_code=500, detail=f"Lỗi xử lý request: {str(e)}")
+    # Log the request
+    logger = get_logger("API")
+    logger.info(f"Nhận API request trực tiếp: {user_message.message or user_message.text}")
+    
+    async def compute() -> Response:
+        try:
+            # Gọi root agent để xử lý tin nhắn
+            message_text = user_message.message or user_message.text or ""
+            response = await _invoke_root_agent(
+                message_text,
+                session_id=user_message.session_id or user_message.sessionId,
+                user_id=user_message.user_id
+            )
+            
+            # Trả về response
+            return FastJSONResponse(AgentResponse(response=response, text=response))
+        except Exception as e:
+            logger.error(f"Lỗi xử lý API request: {e}")
+            raise HTTPException(status_code=500, detail=f"Lỗi xử lý request: {str(e)}")
+    
+    return await _deduplicated("/api/chat", user_message, idempotency_key, compute)
 
 # Thêm các endpoint mới cho Python ADK API
 # Các endpoint này được định nghĩa dựa trên tài liệu interface.md
 
-@app.post('/chat')
-async def chat(request: ChatRequest):
+@app.post('/chat/batcuclinh-so')
+async def chat(request: ChatRequest, idempotency_key: Optional[str] = Header(None)):
+    """
+    Chat trực tiếp với BatCucLinhSo Agent qua AgentRouter (không qua root agent).
+    Tách khỏi /chat của Node.js API Gateway vì hai endpoint trả response khác định dạng.
+    """
     # Log the request
     logger = get_logger("API")
     logger.info(f"Nhận yêu cầu chat: {request.message}")
     
-    # Sử dụng AgentRouter để chuyển hướng yêu cầu
-    from python_adk.agents.root_agent.tools.agent_router import AgentRouter
-    router = AgentRouter()
-    session_id = request.sessionId or str(uuid.uuid4())
-    result = await router.execute(agent_type="batcuclinh_so", request=request.message, session_id=session_id)
+    async def compute() -> Response:
+        # Sử dụng AgentRouter dùng chung để chuyển hướng yêu cầu
+        from python_adk.agents.root_agent.tools.agent_router import get_agent_router
+        router = get_agent_router()
+        await _track_session(request.sessionId)
+        # Không có sessionId thì chạy session tạm (bị xóa sau lượt), không tạo phiên mới mỗi lần gọi
+        session_id = request.sessionId
+        try:
+            result = await router.execute(agent_type="batcuclinh_so", request=request.message, session_id=session_id)
+        except AgentOverloadedError as e:
+            raise _overloaded_exception(e)
+        
+        return FastJSONResponse({
+            'success': result['success'],
+            'message': 'Xử lý tin nhắn thành công' if result['success'] else 'Xử lý tin nhắn thất bại',
+            'result': {
+                'sessionId': session_id,
+                'response': result['response'],
+                'agentType': result['agent_type'],
+                'success': result['success']
+            }
+        })
     
-    return {
-        'success': result['success'],
-        'message': 'Xử lý tin nhắn thành công' if result['success'] else 'Xử lý tin nhắn thất bại',
-        'result': {
-            'sessionId': session_id,
-            'response': result['response'],
-            'agentType': result['agent_type'],
-            'success': result['success']
-        }
-    }
+    return await _deduplicated("/chat/batcuclinh-so", request, idempotency_key, compute)
 
 @app.get('/stream')
 async def stream(message: str, sessionId: str = None, userId: str = None):
@@ -449,68 +772,85 @@ async def stream(message: str, sessionId: str = None, userId: str = None):
     logger = get_logger("API")
     logger.info(f"Nhận yêu cầu stream: {message}")
     
-    # Sử dụng AgentRouter để chuyển hướng yêu cầu
-    from python_adk.agents.root_agent.tools.agent_router import AgentRouter
-    router = AgentRouter()
-    session_id = sessionId or str(uuid.uuid4())
-    result = await router.execute(agent_type="batcuclinh_so", request=message, session_id=session_id)
-    
-    # Xử lý stream response
-    async def event_stream():
-        if result['success']:
-            chunks = result['response'].split('\n')
-            for chunk in chunks:
-                if chunk.strip():
-                    yield 'data: ' + json.dumps({"type": "chunk", "content": chunk}) + '\n\n'
-                    await asyncio.sleep(0.05)  # Giả lập stream
-            yield 'data: ' + json.dumps({"type": "complete"}) + '\n\n'
-        else:
-            yield 'data: ' + json.dumps({"type": "error", "content": result["error"]}) + '\n\n'
-            yield 'data: ' + json.dumps({"type": "complete"}) + '\n\n'
-    return StreamingResponse(event_stream(), media_type='text/event-stream')
+    # Sử dụng AgentRouter dùng chung để chuyển hướng yêu cầu, chuyển tiếp từng đoạn phản hồi
+    from python_adk.agents.root_agent.tools.agent_router import get_agent_router
+    from python_adk.agents.root_agent.tools.intent_classifier import AgentType
+    router = get_agent_router()
+    await _track_session(sessionId, userId)
+    try:
+        chunks = await _prime_stream(router.stream_to_agent(AgentType.BAT_CUC_LINH_SO, message, sessionId))
+    except AgentOverloadedError as e:
+        raise _overloaded_exception(e)
+    return StreamingResponse(_sse_stream(chunks), media_type='text/event-stream')
 
 @app.get('/sessions/{sessionId}')
-async def get_session(sessionId: str):
+async def get_session(sessionId: str, limit: Optional[int] = None):
+    """
+    Lấy thông tin và lịch sử trò chuyện gần nhất của phiên
+    """
+    session = await asyncio.to_thread(session_manager.get_session, sessionId)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Không tìm thấy phiên hoặc phiên đã hết hạn")
     return {
         'success': True,
         'sessionId': sessionId,
-        'history': [
-            {
-                'role': 'user',
-                'content': 'Phân tích số điện thoại 0987654321',
-                'timestamp': '2023-06-15T14:30:00Z'
-            },
-            {
-                'role': 'assistant',
-                'content': 'Phân tích số điện thoại 0987654321: ...',
-                'timestamp': '2023-06-15T14:30:05Z'
-            }
-        ],
+        'history': history_store.get(sessionId, limit),
+        'summary': history_store.get_summary(sessionId),
         'metadata': {
-            'lastAnalysis': 'phone',
-            'lastUpdated': '2023-07-15T14:30:05Z'
+            **session.state,
+            'userId': session.user_id,
+            'createdAt': session.created_at.isoformat(),
+            'lastUpdated': session.last_updated.isoformat()
         }
     }
 
 @app.delete('/sessions/{sessionId}')
 async def delete_session(sessionId: str):
+    """
+    Xóa phiên cùng session của agent và lịch sử trò chuyện
+    """
+    deleted = await asyncio.to_thread(session_manager.delete_session, sessionId)
+    await _release_sessions([sessionId])
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Không tìm thấy phiên hoặc phiên đã hết hạn")
     return {
         'success': True,
         'message': 'Phiên đã được xóa thành công'
     }
 
-@app.post('/analyze')
-async def analyze(request: AnalyzeRequest):
-    # Log the request
-    logger = get_logger("API")
-    logger.info(f"Nhận yêu cầu phân tích: {request.type} - {request.value}")
+def _present_analysis(result: Dict[str, Any], compact: Optional[bool]) -> Dict[str, Any]:
+    """
+    Rút gọn kết quả phân tích nếu được yêu cầu (hoặc theo ANALYSIS_COMPACT_DEFAULT)
     
+    Args:
+        result (Dict[str, Any]): Kết quả phân tích đầy đủ
+        compact (Optional[bool]): Cờ của request, None thì dùng mặc định trong cấu hình
+        
+    Returns:
+        Dict[str, Any]: Kết quả đầy đủ, hoặc bản rút gọn kèm dictionaryVersion
+    """
+    if compact is None:
+        compact = app_config.analysis_compact_default
+    if not compact:
+        return result
+    return {**compact_analysis(result), 'dictionaryVersion': DICTIONARY_VERSION}
+
+def _run_analysis(request: AnalyzeRequest) -> Dict[str, Any]:
+    """
+    Chạy analyzer phù hợp với loại phân tích, dùng chung cho /analyze và /analyze/batch
+    
+    Args:
+        request (AnalyzeRequest): Loại và giá trị cần phân tích
+        
+    Returns:
+        Dict[str, Any]: Kết quả theo định dạng response của /analyze
+    """
     # Xác định loại phân tích và gọi công cụ phù hợp
     if request.type.lower() == 'phone':
-        from python_adk.agents.batcuclinh_so_agent.tools.phone_analyzer import PhoneAnalyzer
+        from python_adk.agents.batcuclinh_so_agent.tools.phone_analyzer import PhoneAnalyzer, phone_analyzer
         try:
             normalized = PhoneAnalyzer._normalize_phone_number(request.value)
-            analysis_result = PhoneAnalyzer.analyze_phone_number(normalized)
+            analysis_result = phone_analyzer(normalized)
             return {
                 'success': True,
                 'message': 'Phân tích thành công',
@@ -534,9 +874,9 @@ async def analyze(request: AnalyzeRequest):
                 }
             }
     elif request.type.lower() == 'cccd':
-        from python_adk.agents.batcuclinh_so_agent.tools.cccd_analyzer import CCCDAnalyzer
+        from python_adk.agents.batcuclinh_so_agent.tools.cccd_analyzer import cccd_analyzer
         try:
-            analysis_result = CCCDAnalyzer.analyze_cccd(request.value)
+            analysis_result = cccd_analyzer(request.value)
             return {
                 'success': True,
                 'message': 'Phân tích CCCD thành công',
@@ -559,9 +899,9 @@ async def analyze(request: AnalyzeRequest):
                 }
             }
     elif request.type.lower() == 'password':
-        from python_adk.agents.batcuclinh_so_agent.tools.password_analyzer import PasswordAnalyzer
+        from python_adk.agents.batcuclinh_so_agent.tools.password_analyzer import password_analyzer
         try:
-            analysis_result = PasswordAnalyzer.analyze_password(request.value)
+            analysis_result = password_analyzer(request.value)
             return {
                 'success': True,
                 'message': 'Phân tích mật khẩu thành công',
@@ -584,9 +924,9 @@ async def analyze(request: AnalyzeRequest):
                 }
             }
     elif request.type.lower() == 'bank_account':
-        from python_adk.agents.batcuclinh_so_agent.tools.bank_account_analyzer import BankAccountAnalyzer
+        from python_adk.agents.batcuclinh_so_agent.tools.bank_account_analyzer import bank_account_analyzer
         try:
-            analysis_result = BankAccountAnalyzer.analyze_bank_account(request.value)
+            analysis_result = bank_account_analyzer(request.value)
             return {
                 'success': True,
                 'message': 'Phân tích tài khoản ngân hàng thành công',
@@ -620,15 +960,58 @@ async def analyze(request: AnalyzeRequest):
             }
         }
 
-@app.post('/analyze/phone')
-async def analyze_phone(request: PhoneRequest):
-    from python_adk.agents.batcuclinh_so_agent.tools.phone_analyzer import PhoneAnalyzer
+@app.post('/analyze', responses={200: {"model": AnalyzeResponse}})
+async def analyze(request: AnalyzeRequest, idempotency_key: Optional[str] = Header(None)):
+    # Log the request
+    logger = get_logger("API")
+    logger.info(f"Nhận yêu cầu phân tích: {request.type} - {request.value}")
+    
+    async def compute() -> Response:
+        return FastJSONResponse(_present_analysis(_run_analysis(request), request.compact))
+    
+    return await _deduplicated("/analyze", request, idempotency_key, compute)
+
+@app.post('/analyze/batch')
+async def analyze_batch(request: BatchAnalyzeRequest):
+    """
+    Phân tích nhiều giá trị (phone/cccd/bank_account/password) trong một request,
+    trả kết quả dạng NDJSON (mỗi dòng một kết quả) ngay khi từng phần tử được tính xong
+    """
+    logger = get_logger("API")
+    logger.info(f"Nhận yêu cầu phân tích hàng loạt: {len(request.items)} phần tử")
+    
+    max_items = app_config.analyze_batch_max_items
+    yield_every = app_config.analyze_batch_yield_every
+    if len(request.items) > max_items:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Số phần tử vượt quá giới hạn {max_items}"
+        )
+    
+    async def ndjson_stream():
+        for index, item in enumerate(request.items):
+            compact = item.compact if item.compact is not None else request.compact
+            result = _present_analysis(_run_analysis(item), compact)
+            yield dumps_json({"index": index, **result}) + b"\n"
+            # Nhường event loop định kỳ để không chặn các request khác
+            if index % yield_every == yield_every - 1:
+                await asyncio.sleep(0)
+    
+    return StreamingResponse(ndjson_stream(), media_type="application/x-ndjson")
+
+@app.post('/analyze/phone', responses={200: {"model": AnalyzeResponse}})
+async def analyze_phone(request: PhoneRequest, idempotency_key: Optional[str] = Header(None)):
+    return await _deduplicated("/analyze/phone", request, idempotency_key, lambda: _analyze_phone(request))
+
+async def _analyze_phone(request: PhoneRequest) -> Response:
+    """Phân tích số điện thoại cho /analyze/phone"""
+    from python_adk.agents.batcuclinh_so_agent.tools.phone_analyzer import PhoneAnalyzer, phone_analyzer
     try:
         # Chuẩn hóa số điện thoại
         normalized = PhoneAnalyzer._normalize_phone_number(request.phoneNumber)
-        # Phân tích số điện thoại
-        analysis_result = PhoneAnalyzer.analyze_phone_number(normalized, request.purpose)
-        return {
+        # Phân tích số điện thoại (kết quả được ghi nhớ trong analysis_cache)
+        analysis_result = phone_analyzer(normalized, request.purpose)
+        return FastJSONResponse(_present_analysis({
             'success': True,
             'message': 'Phân tích số điện thoại thành công',
             'result': {
@@ -637,9 +1020,9 @@ async def analyze_phone(request: PhoneRequest):
                 'normalized': normalized,
                 'analysis': analysis_result
             }
-        }
+        }, request.compact))
     except Exception as e:
-        return {
+        return FastJSONResponse({
             'success': False,
             'message': f'Phân tích số điện thoại thất bại: {str(e)}',
             'result': {
@@ -647,4 +1030,131 @@ async def analyze_phone(request: PhoneRequest):
                 'phoneNumber': request.phoneNumber,
                 'error': str(e)
             }
-        } 
+        })
+
+@app.post('/analyze/phone/session')
+async def create_phone_edit_session(request: PhoneEditSessionRequest, idempotency_key: Optional[str] = Header(None)):
+    """
+    Tạo phiên phân tích tăng dần cho ô nhập số điện thoại, trả về toàn bộ kết quả ban đầu
+    (gửi lại cùng Idempotency-Key không tạo thêm phiên)
+    """
+    from python_adk.agents.batcuclinh_so_agent.tools.phone_analyzer import PhoneAnalyzer
+    from python_adk.agents.batcuclinh_so_agent.tools.phone_edit_session import phone_edit_sessions
+    
+    async def compute() -> Response:
+        try:
+            normalized = PhoneAnalyzer._normalize_phone_number(request.phoneNumber) if request.phoneNumber else ""
+            session = phone_edit_sessions.create(normalized, request.purpose)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return FastJSONResponse(_present_analysis({'success': True, 'result': session.snapshot()}, request.compact))
+    
+    return await _deduplicated("/analyze/phone/session", request, idempotency_key, compute, coalesce=False)
+
+@app.post('/analyze/phone/session/{session_id}/edit')
+async def edit_phone_edit_session(session_id: str, request: PhoneEditRequest, idempotency_key: Optional[str] = Header(None)):
+    """
+    Sửa một chữ số trong phiên, chỉ trả về phần kết quả thay đổi (delta)
+    (gửi lại cùng Idempotency-Key không áp dụng thao tác thêm lần nữa)
+    """
+    from python_adk.agents.batcuclinh_so_agent.tools.phone_edit_session import phone_edit_sessions
+    
+    async def compute() -> Response:
+        session = phone_edit_sessions.get(session_id)
+        if session is None:
+            raise HTTPException(status_code=404, detail="Không tìm thấy phiên phân tích")
+        with session.lock:
+            if request.version is not None and request.version != session.version:
+                raise HTTPException(
+                    status_code=409,
+                    detail=f"Phiên bản không khớp (server: {session.version}), cần tải lại toàn bộ kết quả"
+                )
+            try:
+                delta = session.apply(request.op, request.position, request.digit)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        return FastJSONResponse(_present_analysis({'success': True, 'result': delta}, request.compact))
+    
+    route = f"/analyze/phone/session/{session_id}/edit"
+    return await _deduplicated(route, request, idempotency_key, compute, coalesce=False)
+
+@app.get('/analyze/phone/session/{session_id}')
+async def get_phone_edit_session(session_id: str, compact: Optional[bool] = None):
+    """
+    Lấy toàn bộ kết quả hiện tại của phiên (dùng khi client lệch phiên bản)
+    """
+    from python_adk.agents.batcuclinh_so_agent.tools.phone_edit_session import phone_edit_sessions
+    session = phone_edit_sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Không tìm thấy phiên phân tích")
+    with session.lock:
+        snapshot = session.snapshot()
+    return FastJSONResponse(_present_analysis({'success': True, 'result': snapshot}, compact))
+
+@app.delete('/analyze/phone/session/{session_id}')
+async def delete_phone_edit_session(session_id: str):
+    from python_adk.agents.batcuclinh_so_agent.tools.phone_edit_session import phone_edit_sessions
+    if not phone_edit_sessions.delete(session_id):
+        raise HTTPException(status_code=404, detail="Không tìm thấy phiên phân tích")
+    return {'success': True, 'message': 'Phiên phân tích đã được xóa'}
+
+@app.get('/analyze/dictionary')
+async def get_analysis_dictionary(if_none_match: Optional[str] = Header(None)):
+    """
+    Từ điển sao / tổ hợp sao cho response rút gọn (compact), có ETag theo phiên bản nội dung;
+    trả 304 nếu client đã giữ đúng phiên bản
+    """
+    headers = {
+        'ETag': DICTIONARY_ETAG,
+        'Cache-Control': f"public, max-age={app_config.analysis_dictionary_max_age}"
+    }
+    if etag_matches(if_none_match):
+        return Response(status_code=304, headers=headers)
+    return Response(content=DICTIONARY_BODY, media_type="application/json", headers=headers)
+
+@app.get('/analyze/dictionary/{version}')
+async def get_analysis_dictionary_version(version: str):
+    """
+    Từ điển theo phiên bản cố định (nội dung không bao giờ đổi, cache vĩnh viễn)
+    """
+    if version != DICTIONARY_VERSION:
+        raise HTTPException(status_code=404, detail=f"Không có từ điển phiên bản {version}, phiên bản hiện tại: {DICTIONARY_VERSION}")
+    headers = {'ETag': DICTIONARY_ETAG, 'Cache-Control': "public, max-age=31536000, immutable"}
+    return Response(content=DICTIONARY_BODY, media_type="application/json", headers=headers)
+
+@app.post('/inventory/numbers')
+async def add_inventory_numbers(request: InventoryRequest):
+    """
+    Thêm số vào kho số tra cứu theo sao (bỏ qua số đã có); số không hợp lệ làm cả lô bị từ chối
+    """
+    from python_adk.agents.batcuclinh_so_agent.tools.star_inventory_index import star_inventory_index
+    try:
+        added = await asyncio.to_thread(star_inventory_index.add_many, request.numbers)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {'success': True, 'added': added, 'total': len(star_inventory_index)}
+
+@app.post('/inventory/numbers/remove')
+async def remove_inventory_numbers(request: InventoryRequest):
+    """
+    Bỏ số khỏi kho số (ví dụ khi đã bán); số không có trong kho được bỏ qua
+    """
+    from python_adk.agents.batcuclinh_so_agent.tools.star_inventory_index import star_inventory_index
+    removed = await asyncio.to_thread(star_inventory_index.remove_many, request.numbers)
+    return {'success': True, 'removed': removed, 'total': len(star_inventory_index)}
+
+@app.get('/inventory/stats')
+async def get_inventory_stats():
+    """
+    Thống kê kho số: kích thước chỉ mục và số lượng số chứa từng sao
+    """
+    from python_adk.agents.batcuclinh_so_agent.tools.star_inventory_index import star_inventory_index
+    return {
+        'success': True,
+        'stats': star_inventory_index.stats(),
+        'starCounts': star_inventory_index.star_counts()
+    }
+
+
+if __name__ == "__main__":
+    main()
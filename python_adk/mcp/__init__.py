@@ -6,6 +6,8 @@ trong các chức năng phân tích của Phong Thủy Số, cũng như
 các thành phần quản lý tài nguyên và cấu hình cho các agents.
 """
 
+from python_adk.shared_libraries.lazy import lazy_module_getattr
+
 # Import từ server.py - Quản lý tài nguyên và cấu hình
 from .server import (
     TemplateParam,
@@ -14,7 +16,7 @@ from .server import (
     ModelConfig,
     Resource,
     MCPServer,
-    mcp_server
+    get_mcp_server
 )
 
 # Import từ common.py - Các hàm tiện ích chung
@@ -27,6 +29,9 @@ from .common import (
     is_unlucky_number
 )
 
+# mcp_server được tạo ở lần truy cập đầu tiên
+__getattr__ = lazy_module_getattr(__name__, {"mcp_server": get_mcp_server})
+
 __all__ = [
     # Server components
     'TemplateParam',
@@ -36,6 +41,7 @@ __all__ = [
     'Resource',
     'MCPServer',
     'mcp_server',
+    'get_mcp_server',
     
     # Common utilities
     'extract_digits',
@@ -13,6 +13,8 @@ from typing import Dict, Any, Optional, List
 from fastapi import FastAPI, HTTPException, Depends
 from pydantic import BaseModel, Field
 
+from python_adk.shared_libraries.lazy import LazySingleton, lazy_module_getattr
+
 # Định nghĩa các models cho MCP
 
 class TemplateParam(BaseModel):
@@ -158,5 +160,6 @@ class MCPServer:
         return self.resources.get(resource_id)
 
 
-# Singleton instance of MCPServer
-mcp_server = MCPServer() 
\ No newline at end of file
+# Singleton instance of MCPServer (tạo thư mục và quét ./mcp_data ở lần truy cập đầu tiên)
+get_mcp_server = LazySingleton(MCPServer)
+__getattr__ = lazy_module_getattr(__name__, {"mcp_server": get_mcp_server})
@@ -5,16 +5,27 @@ Module quản lý việc đăng ký và khởi tạo các agent trong hệ thố
 Sử dụng Singleton pattern để đảm bảo chỉ có một registry được sử dụng trong toàn bộ ứng dụng.
 """
 
-from typing import Dict, Optional, Type
+from typing import Dict, Optional, Type, Union
 
 from python_adk.agents.base_agent import BaseAgent
-from python_adk.agents.root_agent.agent import AgentType, root_agent
-from python_adk.agents.batcuclinh_so_agent import BatCucLinhSoAgent
-from python_adk.agents.payment_agent import PaymentAgent
-from python_adk.agents.user_agent import UserAgent
+from python_adk.agents.root_agent.agent import AgentType, get_root_agent
+from python_adk.agents.batcuclinh_so_agent.agent import BatCucLinhSoAgent
+from python_adk.agents.payment_agent.agent import PaymentAgent
+from python_adk.agents.user_agent.agent import UserAgent
 from python_adk.shared_libraries.logger import get_logger
 
 
+def normalize_agent_type(agent_type: Union[AgentType, str]) -> AgentType:
+    """
+    Chuyển loại agent (AgentType của registry, AgentType của IntentClassifier hoặc chuỗi)
+    về AgentType của registry theo giá trị
+
+    Raises:
+        ValueError: Nếu không phải loại agent hợp lệ
+    """
+    return AgentType(getattr(agent_type, "value", agent_type))
+
+
 class AgentRegistry:
     """
     Singleton class quản lý việc đăng ký và khởi tạo các agent trong hệ thống
@@ -43,9 +54,7 @@ class AgentRegistry:
     
     def _register_default_agents(self) -> None:
         """Đăng ký các lớp agent mặc định"""
-        # Sử dụng root_agent đã được tạo thay vì đăng ký lớp
-        self.agent_instances[AgentType.ROOT] = root_agent
-        
+        # RootAgent không đăng ký lớp: get_agent trả về root_agent dùng chung (dựng trễ)
         self.register_agent_class(AgentType.BATCUCLINH_SO, BatCucLinhSoAgent)
         self.register_agent_class(AgentType.PAYMENT, PaymentAgent)
         self.register_agent_class(AgentType.USER, UserAgent)
@@ -77,46 +86,56 @@ class AgentRegistry:
         Raises:
             ValueError: Nếu loại agent không được đăng ký
         """
-        # Nếu là RootAgent, trả về instance đã tạo
-        # if agent_type == AgentType.ROOT:
-        #     return root_agent
+        agent_type = normalize_agent_type(agent_type)
+        
+        # Nếu là RootAgent, trả về instance dùng chung
+        if agent_type == AgentType.ROOT:
+            return get_root_agent()
             
         # Kiểm tra nếu đã có instance
         if agent_type in self.agent_instances:
             return self.agent_instances[agent_type]
         
+        # Tạo instance mới và lưu vào cache
+        agent = self.create_agent(agent_type, model_name)
+        self.agent_instances[agent_type] = agent
+        
+        # Bỏ đăng ký với RootAgent, việc này giờ được làm khi khởi tạo RootAgent
+        # root_agent.register_agent(agent_type, agent)
+        
+        return agent
+    
+    def create_agent(self, agent_type: AgentType, model_name: Optional[str] = None) -> BaseAgent:
+        """
+        Tạo một instance agent mới (không cache), dùng cho pool agent của AgentRouter
+        
+        Args:
+            agent_type (AgentType): Loại agent cần tạo
+            model_name (Optional[str]): Tên model, None thì dùng model mặc định của lớp agent
+            
+        Returns:
+            BaseAgent: Instance agent mới
+            
+        Raises:
+            ValueError: Nếu loại agent không được đăng ký
+        """
+        agent_type = normalize_agent_type(agent_type)
+        
         # Kiểm tra nếu lớp agent đã được đăng ký
         if agent_type not in self.agent_classes:
             self.logger.error(f"Không tìm thấy agent: {agent_type}")
             raise ValueError(f"Agent type not registered: {agent_type}")
         
-        # Tạo instance mới
         agent_class = self.agent_classes[agent_type]
-        
-        if model_name:
-            agent = agent_class(model_name=model_name)
-        else:
-            agent = agent_class()
-        
-        # Lưu instance vào cache
-        self.agent_instances[agent_type] = agent
+        agent = agent_class(model_name=model_name) if model_name else agent_class()
         
         self.logger.info(f"Đã khởi tạo agent: {agent_type}")
-        
-        # Bỏ đăng ký với RootAgent, việc này giờ được làm khi khởi tạo RootAgent
-        # root_agent.register_agent(agent_type, agent)
-        
         return agent
     
     def clear_instances(self) -> None:
         """Xóa tất cả các instance đã tạo ngoại trừ RootAgent"""
-        # Giữ lại RootAgent
-        root = self.agent_instances.get(AgentType.ROOT)
+        # RootAgent không nằm trong agent_instances nên được giữ lại
         self.agent_instances.clear()
-        
-        # Khôi phục RootAgent
-        if root:
-            self.agent_instances[AgentType.ROOT] = root
             
         self.logger.info("Đã xóa tất cả các instance agent (ngoại trừ RootAgent)")
 
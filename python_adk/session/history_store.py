@@ -0,0 +1,394 @@
+"""
+History Store - Lưu trữ lịch sử trò chuyện có giới hạn
+
+Module này chứa kho lưu lịch sử trò chuyện theo phiên với bộ nhớ có thể dự đoán:
+- Mỗi phiên là một ring buffer giới hạn theo số tin nhắn và số byte
+- Tổng dung lượng của mọi phiên cũng bị giới hạn; khi vượt, tin nhắn cũ nhất của
+  phiên lâu không hoạt động nhất bị loại trước
+- Tin nhắn bị loại được tóm tắt (số lượng, khoảng thời gian, trích đoạn) và có thể
+  được ghi ra file JSONL trên đĩa
+- Tóm tắt của phiên bị loại hết tin nhắn vẫn được giữ lại; việc ghi đĩa chạy ngoài lock
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict, deque
+from itertools import islice
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from python_adk.shared_libraries.cache import estimate_size
+
+# Cách xử lý tin nhắn cũ bị loại khỏi ring buffer
+COMPACTION_MODES = ("summary", "drop")
+
+# Độ dài tối đa của trích đoạn trong phần tóm tắt
+SUMMARY_EXCERPT_LENGTH = 200
+
+
+class _SessionHistory:
+    """Ring buffer tin nhắn của một phiên"""
+
+    __slots__ = ("messages", "bytes", "summary")
+
+    def __init__(self):
+        self.messages: Deque[Tuple[Dict[str, Any], int]] = deque()
+        self.bytes = 0
+        self.summary: Optional[Dict[str, Any]] = None
+
+
+class HistoryStore:
+    """Kho lịch sử trò chuyện theo phiên, giới hạn theo số tin nhắn và dung lượng"""
+
+    def __init__(
+        self,
+        max_messages: int = 200,
+        max_session_bytes: int = 256 * 1024,
+        max_total_bytes: int = 64 * 1024 * 1024,
+        compaction: str = "summary",
+        spill_dir: Optional[str] = None
+    ):
+        """Khởi tạo History Store
+
+        Args:
+            max_messages: Số tin nhắn tối đa giữ trong bộ nhớ cho mỗi phiên
+            max_session_bytes: Dung lượng tối đa (byte) cho mỗi phiên
+            max_total_bytes: Tổng dung lượng tối đa (byte) của mọi phiên
+            compaction: "summary" để giữ tóm tắt các tin nhắn bị loại, "drop" để bỏ hẳn
+            spill_dir: Thư mục ghi tin nhắn bị loại ra file JSONL, None để không ghi
+
+        Raises:
+            ValueError: Nếu compaction không hợp lệ
+        """
+        if compaction not in COMPACTION_MODES:
+            raise ValueError(f"Chế độ compaction không hợp lệ: {compaction}")
+
+        self.max_messages = max(1, max_messages)
+        self.max_session_bytes = max(1, max_session_bytes)
+        self.max_total_bytes = max(1, max_total_bytes)
+        self.compaction = compaction
+        self.spill_dir = spill_dir
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+        # session_id -> lịch sử, theo thứ tự cập nhật gần nhất ở cuối
+        self._sessions: "OrderedDict[str, _SessionHistory]" = OrderedDict()
+        # session_id -> (tóm tắt, dung lượng) của phiên đã bị loại hết tin nhắn trong bộ nhớ
+        self._summaries: "OrderedDict[str, Tuple[Dict[str, Any], int]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+        # Hàng đợi ghi đĩa (loại, session_id, dữ liệu) theo đúng thứ tự bị loại; chỉ một
+        # luồng giữ _spill_lock để ghi, ngoài _lock
+        self._spill_queue: Deque[Tuple[str, str, Dict[str, Any]]] = deque()
+        self._spill_lock = threading.Lock()
+
+        self.evicted_messages = 0
+
+    def append(self, session_id: str, message: Dict[str, Any]) -> int:
+        """Thêm tin nhắn vào lịch sử của phiên, loại tin nhắn cũ nếu vượt giới hạn
+
+        Args:
+            session_id: ID của phiên trò chuyện
+            message: Tin nhắn cần thêm
+
+        Returns:
+            int: Số tin nhắn của phiên đang giữ trong bộ nhớ
+        """
+        size = estimate_size(message)
+        with self._lock:
+            history = self._sessions.get(session_id)
+            if history is None:
+                history = self._sessions[session_id] = _SessionHistory()
+                archived = self._summaries.pop(session_id, None)
+                if archived is not None:
+                    history.summary, summary_size = archived
+                    self._total_bytes -= summary_size
+            else:
+                self._sessions.move_to_end(session_id)
+
+            history.messages.append((message, size))
+            history.bytes += size
+            self._total_bytes += size
+
+            # Giới hạn theo phiên (luôn giữ lại tin nhắn mới nhất)
+            while len(history.messages) > 1 and (
+                len(history.messages) > self.max_messages or history.bytes > self.max_session_bytes
+            ):
+                self._evict_oldest(session_id, history)
+
+            # Giới hạn toàn cục: loại tin nhắn cũ nhất của phiên lâu không hoạt động nhất,
+            # tóm tắt chỉ bị loại khi không còn tin nhắn nào khác để loại
+            while self._total_bytes > self.max_total_bytes:
+                if not self._reclaim(session_id):
+                    break
+
+            count = len(history.messages)
+
+        if self._spill_queue:
+            self._drain_spill()
+        return count
+
+    def get(self, session_id: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Lấy các tin nhắn gần nhất của phiên
+
+        Chỉ duyệt `limit` tin nhắn cuối của ring buffer thay vì sao chép toàn bộ lịch sử.
+
+        Args:
+            session_id: ID của phiên trò chuyện
+            limit: Số lượng tin nhắn tối đa trả về, None hoặc <= 0 để lấy tất cả
+
+        Returns:
+            List[Dict[str, Any]]: Tin nhắn theo thứ tự thời gian
+        """
+        with self._lock:
+            history = self._sessions.get(session_id)
+            if history is None:
+                return []
+            if not limit or limit <= 0:
+                return [message for message, _ in history.messages]
+            recent = [message for message, _ in islice(reversed(history.messages), limit)]
+        recent.reverse()
+        return recent
+
+    def get_summary(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Lấy tóm tắt các tin nhắn cũ đã bị loại khỏi bộ nhớ của phiên
+
+        Args:
+            session_id: ID của phiên trò chuyện
+
+        Returns:
+            Optional[Dict[str, Any]]: Tóm tắt hoặc None nếu chưa có tin nhắn nào bị loại
+        """
+        with self._lock:
+            history = self._sessions.get(session_id)
+            if history is not None:
+                summary = history.summary
+            else:
+                summary = self._summaries.get(session_id, (None, 0))[0]
+            summary = self._copy_summary(summary)
+
+        if self.spill_dir:
+            # Phần tóm tắt cũ hơn có thể đã được ghi ra đĩa khi bộ nhớ đầy
+            self._drain_spill()
+            spilled = self._read_summary(session_id)
+            if spilled is not None:
+                summary = self._merge_summaries(spilled, summary)
+        return summary
+
+    def iter_spilled(self, session_id: str) -> Iterator[Dict[str, Any]]:
+        """Đọc lại các tin nhắn đã bị loại và ghi ra đĩa của phiên
+
+        Args:
+            session_id: ID của phiên trò chuyện
+
+        Yields:
+            Dict[str, Any]: Tin nhắn theo thứ tự thời gian
+        """
+        path = self._spill_path(session_id)
+        if not path:
+            return
+        self._drain_spill()
+        if not os.path.exists(path):
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def clear(self, session_id: str) -> None:
+        """Xóa lịch sử (kể cả phần tóm tắt và file đã ghi ra đĩa) của phiên
+
+        Args:
+            session_id: ID của phiên trò chuyện
+        """
+        with self._spill_lock:
+            with self._lock:
+                history = self._sessions.pop(session_id, None)
+                if history is not None:
+                    self._total_bytes -= history.bytes
+                archived = self._summaries.pop(session_id, None)
+                if archived is not None:
+                    self._total_bytes -= archived[1]
+                if self._spill_queue:
+                    pending = [entry for entry in self._spill_queue if entry[1] != session_id]
+                    self._spill_queue.clear()
+                    self._spill_queue.extend(pending)
+            if self.spill_dir:
+                for path in (self._spill_path(session_id), self._summary_path(session_id)):
+                    if os.path.exists(path):
+                        os.remove(path)
+
+    def flush(self) -> None:
+        """Ghi ra đĩa mọi tin nhắn / tóm tắt bị loại còn trong hàng đợi"""
+        self._drain_spill()
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def stats(self) -> Dict[str, Any]:
+        """Lấy thống kê của kho lịch sử
+
+        Returns:
+            Dict[str, Any]: Số phiên, tổng dung lượng, số tin nhắn đã bị loại
+        """
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "archived_summaries": len(self._summaries),
+                "bytes": self._total_bytes,
+                "max_total_bytes": self.max_total_bytes,
+                "max_messages": self.max_messages,
+                "max_session_bytes": self.max_session_bytes,
+                "evicted_messages": self.evicted_messages
+            }
+
+    def _evict_oldest(self, session_id: str, history: _SessionHistory) -> None:
+        """Loại tin nhắn cũ nhất của phiên (đã giữ lock)"""
+        message, size = history.messages.popleft()
+        history.bytes -= size
+        self._total_bytes -= size
+        self.evicted_messages += 1
+
+        if self.compaction == "summary":
+            history.summary = self._summarize(history.summary, message)
+        if self.spill_dir:
+            self._spill_queue.append(("message", session_id, message))
+
+    def _reclaim(self, session_id: str) -> bool:
+        """Giải phóng một phần tử khi vượt giới hạn toàn cục (đã giữ lock)
+
+        Args:
+            session_id: Phiên vừa được ghi, luôn giữ lại tin nhắn mới nhất của phiên này
+
+        Returns:
+            bool: False nếu không còn gì để loại
+        """
+        oldest_id, oldest = next(iter(self._sessions.items()))
+        # Phiên vừa ghi đã được đưa xuống cuối, nên chỉ đứng đầu khi là phiên duy nhất
+        if oldest_id != session_id or len(oldest.messages) > 1:
+            self._evict_oldest(oldest_id, oldest)
+            if not oldest.messages:
+                del self._sessions[oldest_id]
+                if oldest.summary:
+                    summary_size = estimate_size(oldest.summary)
+                    self._summaries[oldest_id] = (oldest.summary, summary_size)
+                    self._total_bytes += summary_size
+            return True
+
+        if self._summaries:
+            archived_id, (summary, summary_size) = self._summaries.popitem(last=False)
+            self._total_bytes -= summary_size
+            if self.spill_dir:
+                self._spill_queue.append(("summary", archived_id, summary))
+            return True
+        return False
+
+    @staticmethod
+    def _summarize(summary: Optional[Dict[str, Any]], message: Dict[str, Any]) -> Dict[str, Any]:
+        """Cập nhật tóm tắt các tin nhắn bị loại với một tin nhắn mới"""
+        if summary is None:
+            summary = {
+                "evicted_messages": 0,
+                "first_timestamp": message.get("timestamp"),
+                "last_timestamp": None,
+                "roles": {},
+                "excerpt": ""
+            }
+        summary["evicted_messages"] += 1
+        summary["last_timestamp"] = message.get("timestamp")
+        role = message.get("role", "unknown")
+        summary["roles"][role] = summary["roles"].get(role, 0) + 1
+
+        # Giữ trích đoạn của tin nhắn người dùng gần nhất bị loại
+        content = message.get("content")
+        if role == "user" and isinstance(content, str):
+            summary["excerpt"] = content[:SUMMARY_EXCERPT_LENGTH]
+        return summary
+
+    @staticmethod
+    def _copy_summary(summary: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Bản sao của tóm tắt để người gọi không sửa được dữ liệu trong kho"""
+        if not summary:
+            return None
+        return {**summary, "roles": dict(summary["roles"])}
+
+    @staticmethod
+    def _merge_summaries(older: Dict[str, Any], newer: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Gộp tóm tắt cũ hơn (đã ghi ra đĩa) với tóm tắt mới hơn"""
+        if not newer:
+            return older
+        roles = dict(older["roles"])
+        for role, count in newer["roles"].items():
+            roles[role] = roles.get(role, 0) + count
+        return {
+            "evicted_messages": older["evicted_messages"] + newer["evicted_messages"],
+            "first_timestamp": older["first_timestamp"],
+            "last_timestamp": newer["last_timestamp"],
+            "roles": roles,
+            "excerpt": newer["excerpt"] or older["excerpt"]
+        }
+
+    def _spill_stem(self, session_id: str) -> str:
+        """Tên file (không phần mở rộng) của phiên trong spill_dir
+
+        Phần hash của session_id gốc giữ tên file phân biệt giữa các ID chỉ khác nhau ở
+        ký tự bị thay thế (ví dụ "a/b" và "a_b").
+        """
+        safe_id = re.sub(r"[^A-Za-z0-9_.-]", "_", session_id)[:64]
+        digest = hashlib.sha1(session_id.encode("utf-8")).hexdigest()[:12]
+        return os.path.join(self.spill_dir, f"{safe_id}-{digest}")
+
+    def _spill_path(self, session_id: str) -> Optional[str]:
+        """Đường dẫn file JSONL chứa tin nhắn đã bị loại của phiên"""
+        if not self.spill_dir:
+            return None
+        return self._spill_stem(session_id) + ".jsonl"
+
+    def _summary_path(self, session_id: str) -> str:
+        """Đường dẫn file JSON chứa tóm tắt đã bị loại khỏi bộ nhớ của phiên"""
+        return self._spill_stem(session_id) + ".summary.json"
+
+    def _read_summary(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Đọc tóm tắt đã ghi ra đĩa của phiên"""
+        path = self._summary_path(session_id)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _drain_spill(self) -> None:
+        """Ghi hàng đợi tin nhắn / tóm tắt bị loại ra đĩa (không giữ _lock)"""
+        with self._spill_lock:
+            while self._spill_queue:
+                kind, session_id, payload = self._spill_queue.popleft()
+                if kind == "summary":
+                    spilled = self._read_summary(session_id)
+                    if spilled is not None:
+                        payload = self._merge_summaries(spilled, payload)
+                    with open(self._summary_path(session_id), "w", encoding="utf-8") as f:
+                        json.dump(payload, f, ensure_ascii=False, default=str)
+                    continue
+
+                # Gom các tin nhắn liên tiếp của cùng phiên vào một lần mở file
+                lines = [json.dumps(payload, ensure_ascii=False, default=str)]
+                while self._spill_queue and self._spill_queue[0][:2] == ("message", session_id):
+                    lines.append(json.dumps(self._spill_queue.popleft()[2], ensure_ascii=False, default=str))
+                with open(self._spill_path(session_id), "a", encoding="utf-8") as f:
+                    f.write("\n".join(lines) + "\n")
+
+
+def _create_history_store() -> HistoryStore:
+    """Tạo kho lịch sử trò chuyện dùng chung từ cấu hình ứng dụng"""
+    from python_adk.config.config import AppConfig
+    return HistoryStore(**AppConfig().history_config)
+
+
+# Lịch sử trò chuyện dùng chung: endpoint chat ghi từng lượt, ConversationManager đọc / ghi,
+# SessionReaper xóa lịch sử của phiên hết hạn
+history_store = _create_history_store()
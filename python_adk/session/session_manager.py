@@ -12,8 +12,7 @@ import logging
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 
-# ADK imports
-from google.adk.state import SessionState
+from python_adk.session.session_store import SessionStore, create_session_store
 
 logger = logging.getLogger(__name__)
 
@@ -25,7 +24,7 @@ class Session:
         self, 
         session_id: Optional[str] = None, 
         user_id: Optional[str] = None,
-        state: Optional[SessionState] = None
+        state: Optional[Dict[str, Any]] = None
     ):
         """Khởi tạo một phiên mới
         
@@ -36,7 +35,7 @@ class Session:
         """
         self.session_id = session_id or f"session-{uuid.uuid4()}"
         self.user_id = user_id
-        self.state = state or SessionState()
+        self.state = state if state is not None else {}
         self.created_at = datetime.now()
         self.last_updated = self.created_at
         self.messages = []
@@ -56,6 +55,7 @@ class Session:
             "user_id": self.user_id,
             "created_at": self.created_at.isoformat(),
             "last_updated": self.last_updated.isoformat(),
+            "state": self.state,
             "messages": self.messages
         }
     
@@ -71,7 +71,8 @@ class Session:
         """
         session = cls(
             session_id=data.get("session_id"),
-            user_id=data.get("user_id")
+            user_id=data.get("user_id"),
+            state=data.get("state")
         )
         
         # Khôi phục timestamps
@@ -87,21 +88,57 @@ class Session:
 
 
 class SessionManager:
-    """Quản lý các phiên làm việc"""
+    """Quản lý các phiên làm việc
     
-    def __init__(self, ttl: int = 3600, store_type: str = "memory"):
+    Dữ liệu phiên được lưu qua một SessionStore (memory, sqlite, redis). Mỗi lần lưu
+    phiên sẽ gia hạn phiên thêm `ttl` giây; phiên hết hạn không còn được trả về và
+    được dọn theo chỉ mục thời điểm hết hạn của backend.
+    """
+    
+    def __init__(
+        self,
+        ttl: int = 3600,
+        store_type: str = "memory",
+        store: Optional[SessionStore] = None,
+        sqlite_path: Optional[str] = None,
+        redis_url: Optional[str] = None
+    ):
         """Khởi tạo Session Manager
         
         Args:
             ttl: Time-to-live cho phiên (giây)
-            store_type: Loại lưu trữ ("memory", "redis", "mongo")
+            store_type: Loại lưu trữ ("memory", "sqlite", "redis")
+            store: Backend lưu trữ có sẵn, bỏ qua store_type nếu được cung cấp
+            sqlite_path: Đường dẫn file SQLite (với store_type="sqlite")
+            redis_url: URL Redis (với store_type="redis")
         """
         self.ttl = ttl
         self.store_type = store_type
-        self.sessions = {}  # Lưu trữ trong bộ nhớ
+        self.store = store or create_session_store(store_type, sqlite_path=sqlite_path, redis_url=redis_url)
         
         logger.info(f"Khởi tạo SessionManager với store_type={store_type}, ttl={ttl}s")
     
+    @classmethod
+    def from_config(cls, config: Any = None) -> 'SessionManager':
+        """Tạo Session Manager từ cấu hình ứng dụng
+        
+        Args:
+            config: AppConfig, mặc định tạo mới từ biến môi trường
+            
+        Returns:
+            SessionManager: Session Manager theo `session_config`
+        """
+        if config is None:
+            from python_adk.config.config import AppConfig
+            config = AppConfig()
+        session_config = config.session_config
+        return cls(
+            ttl=session_config["ttl"],
+            store_type=session_config["store_type"],
+            sqlite_path=session_config["sqlite_path"],
+            redis_url=session_config["redis_url"]
+        )
+    
     def get_session(self, session_id: str) -> Optional[Session]:
         """Lấy phiên theo ID
         
@@ -109,27 +146,20 @@ class SessionManager:
             session_id: ID của phiên cần lấy
             
         Returns:
-            Session: Phiên tìm thấy hoặc None
+            Session: Phiên tìm thấy hoặc None (kể cả khi phiên đã hết hạn)
         """
         if not session_id:
             return None
         
-        if session_id in self.sessions:
-            # Kiểm tra xem phiên đã hết hạn chưa
-            session = self.sessions[session_id]
-            if self._is_expired(session):
-                logger.info(f"Phiên {session_id} đã hết hạn, xóa phiên")
-                self.delete_session(session_id)
-                return None
-            return session
-        
-        return None
+        data = self.store.get(session_id)
+        return Session.from_dict(data) if data is not None else None
     
-    def get_or_create_session(self, session_id: Optional[str] = None) -> Session:
+    def get_or_create_session(self, session_id: Optional[str] = None, user_id: Optional[str] = None) -> Session:
         """Lấy phiên nếu tồn tại, nếu không tạo phiên mới
         
         Args:
             session_id: ID của phiên cần lấy
+            user_id: ID của người dùng khi tạo phiên mới
             
         Returns:
             Session: Phiên hiện có hoặc mới
@@ -140,14 +170,14 @@ class SessionManager:
                 return session
         
         # Tạo phiên mới
-        session = Session(session_id)
+        session = Session(session_id, user_id=user_id)
         self.save_session(session)
         logger.info(f"Tạo phiên mới với ID {session.session_id}")
         
         return session
     
     def save_session(self, session: Session) -> bool:
-        """Lưu phiên vào kho lưu trữ
+        """Lưu phiên vào kho lưu trữ và gia hạn phiên
         
         Args:
             session: Phiên cần lưu
@@ -156,10 +186,39 @@ class SessionManager:
             bool: True nếu lưu thành công
         """
         session.update_timestamp()
-        self.sessions[session.session_id] = session
+        expires_at = time.time() + self.ttl
+        self.store.put(session.session_id, session.to_dict(), expires_at, user_id=session.user_id)
         logger.debug(f"Đã lưu phiên {session.session_id}")
         return True
     
+    def track_session(self, session_id: str, user_id: Optional[str] = None) -> bool:
+        """Ghi nhận hoạt động của phiên hội thoại: gia hạn phiên còn hạn, nếu không tạo phiên mới
+        
+        Args:
+            session_id: ID của phiên
+            user_id: ID của người dùng khi tạo phiên mới
+            
+        Returns:
+            bool: True nếu phiên vừa được tạo (lượt đầu tiên của phiên)
+        """
+        if self.touch_session(session_id):
+            return False
+        self.save_session(Session(session_id, user_id=user_id))
+        return True
+    
+    def touch_session(self, session_id: str) -> bool:
+        """Gia hạn phiên thêm `ttl` giây mà không ghi lại dữ liệu phiên
+        
+        Args:
+            session_id: ID của phiên
+            
+        Returns:
+            bool: False nếu phiên không có hoặc đã hết hạn
+        """
+        if not session_id:
+            return False
+        return self.store.touch(session_id, time.time() + self.ttl)
+    
     def delete_session(self, session_id: str) -> bool:
         """Xóa phiên khỏi kho lưu trữ
         
@@ -169,8 +228,7 @@ class SessionManager:
         Returns:
             bool: True nếu xóa thành công
         """
-        if session_id in self.sessions:
-            del self.sessions[session_id]
+        if self.store.delete(session_id):
             logger.info(f"Đã xóa phiên {session_id}")
             return True
         
@@ -178,49 +236,45 @@ class SessionManager:
         return False
     
     def list_sessions(self, user_id: Optional[str] = None) -> List[Session]:
-        """Liệt kê tất cả các phiên
+        """Liệt kê các phiên còn hạn
         
         Args:
-            user_id: Nếu có, chỉ liệt kê phiên của người dùng cụ thể
+            user_id: Nếu có, chỉ liệt kê phiên của người dùng cụ thể (dùng chỉ mục theo người dùng)
             
         Returns:
             List[Session]: Danh sách các phiên
         """
-        sessions = []
-        for session in self.sessions.values():
-            if user_id and session.user_id != user_id:
-                continue
-            
-            if not self._is_expired(session):
-                sessions.append(session)
-        
-        return sessions
+        return [Session.from_dict(data) for data in self.store.list(user_id)]
     
-    def cleanup_expired_sessions(self) -> int:
-        """Xóa các phiên đã hết hạn
+    def expire_sessions(self, limit: Optional[int] = None) -> List[str]:
+        """Xóa các phiên đã hết hạn, bắt đầu từ phiên hết hạn sớm nhất
         
+        Args:
+            limit: Số phiên tối đa xóa trong một lần gọi, None nếu không giới hạn
+            
         Returns:
-            int: Số phiên đã xóa
+            List[str]: ID các phiên đã xóa
         """
-        expired_sessions = []
-        for session_id, session in self.sessions.items():
-            if self._is_expired(session):
-                expired_sessions.append(session_id)
-        
-        for session_id in expired_sessions:
-            self.delete_session(session_id)
-        
-        logger.info(f"Đã xóa {len(expired_sessions)} phiên hết hạn")
-        return len(expired_sessions)
+        removed = self.store.pop_expired(limit=limit)
+        if removed:
+            logger.info(f"Đã xóa {len(removed)} phiên hết hạn")
+        return removed
     
-    def _is_expired(self, session: Session) -> bool:
-        """Kiểm tra xem phiên đã hết hạn chưa
+    def cleanup_expired_sessions(self, limit: Optional[int] = None) -> int:
+        """Xóa các phiên đã hết hạn, bắt đầu từ phiên hết hạn sớm nhất
         
         Args:
-            session: Phiên cần kiểm tra
+            limit: Số phiên tối đa xóa trong một lần gọi, None nếu không giới hạn
             
         Returns:
-            bool: True nếu phiên đã hết hạn
+            int: Số phiên đã xóa
         """
-        elapsed = (datetime.now() - session.last_updated).total_seconds()
-        return elapsed > self.ttl 
\ No newline at end of file
+        return len(self.expire_sessions(limit))
+    
+    def count_sessions(self) -> int:
+        """Số phiên đang lưu (bao gồm phiên hết hạn chưa được dọn)"""
+        return self.store.count()
+    
+    def close(self) -> None:
+        """Đóng kết nối tới backend lưu trữ"""
+        self.store.close()
@@ -0,0 +1,136 @@
+"""
+Session Reaper - Dọn phiên hết hạn chạy nền
+
+Module này chứa tác vụ asyncio chạy nền, định kỳ xóa các phiên đã hết hạn của
+SessionManager theo từng lô nhỏ. Mỗi lượt dọn bị giới hạn thời gian để không
+chiếm event loop quá lâu, phần còn lại được dọn ở lượt sau. ID các phiên vừa hết hạn
+được chuyển cho các listener để giải phóng dữ liệu gắn với phiên ở nơi khác
+(session của agent, lịch sử trò chuyện).
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from python_adk.session.session_manager import SessionManager
+from python_adk.shared_libraries.metrics import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+
+class SessionReaper:
+    """Tác vụ nền dọn phiên hết hạn theo từng lô"""
+
+    def __init__(
+        self,
+        session_manager: SessionManager,
+        interval: float = 30.0,
+        batch_size: int = 500,
+        max_slice: float = 0.05,
+        on_expired: Optional[List[Callable[[List[str]], Any]]] = None
+    ):
+        """Khởi tạo Session Reaper
+
+        Args:
+            session_manager: Session Manager cần dọn
+            interval: Khoảng thời gian giữa hai lượt dọn (giây)
+            batch_size: Số phiên tối đa xóa trong một lô
+            max_slice: Thời gian tối đa cho một lượt dọn (giây)
+            on_expired: Các hàm (đồng bộ hoặc async) nhận danh sách ID phiên vừa hết hạn của mỗi lô
+        """
+        self.session_manager = session_manager
+        self.interval = interval
+        self.batch_size = max(1, batch_size)
+        self.max_slice = max_slice
+        self.on_expired: List[Callable[[List[str]], Any]] = list(on_expired or [])
+        self._task: Optional[asyncio.Task] = None
+
+        # Thống kê
+        self.runs = 0
+        self.total_evictions = 0
+        self.last_evictions = 0
+        self.last_run_at: Optional[float] = None
+        self.reap_time = LatencyStats()
+
+    def start(self) -> None:
+        """Bắt đầu tác vụ nền (cần gọi bên trong event loop đang chạy)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="session-reaper")
+            logger.info(f"Khởi động SessionReaper: interval={self.interval}s, batch_size={self.batch_size}")
+
+    async def stop(self) -> None:
+        """Dừng tác vụ nền"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("Đã dừng SessionReaper")
+
+    async def reap_once(self) -> int:
+        """Chạy một lượt dọn: xóa từng lô cho tới khi hết phiên hết hạn hoặc hết thời gian của lượt
+
+        Returns:
+            int: Số phiên đã xóa trong lượt
+        """
+        started_at = time.perf_counter()
+        evicted = 0
+        while True:
+            # Backend SQLite/Redis có I/O chặn nên chạy trong thread
+            removed = await asyncio.to_thread(self.session_manager.expire_sessions, self.batch_size)
+            evicted += len(removed)
+            if removed:
+                await self._notify(removed)
+            if len(removed) < self.batch_size or time.perf_counter() - started_at >= self.max_slice:
+                break
+            # Nhường event loop giữa các lô
+            await asyncio.sleep(0)
+
+        self.reap_time.observe(time.perf_counter() - started_at)
+        self.runs += 1
+        self.last_evictions = evicted
+        self.total_evictions += evicted
+        self.last_run_at = time.time()
+        return evicted
+
+    def stats(self) -> Dict[str, Any]:
+        """Lấy thống kê dọn phiên
+
+        Returns:
+            Dict[str, Any]: Số phiên, số phiên đã xóa ở lượt gần nhất / tổng cộng, độ trễ mỗi lượt
+        """
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "interval": self.interval,
+            "batch_size": self.batch_size,
+            "sessions": self.session_manager.count_sessions(),
+            "runs": self.runs,
+            "last_evictions": self.last_evictions,
+            "total_evictions": self.total_evictions,
+            "last_run_at": self.last_run_at,
+            "reap_time": self.reap_time.snapshot()
+        }
+
+    async def _notify(self, session_ids: List[str]) -> None:
+        """Chuyển ID các phiên vừa hết hạn cho listener; lỗi của một listener không chặn listener khác"""
+        for callback in self.on_expired:
+            try:
+                result = callback(session_ids)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Lỗi khi giải phóng dữ liệu của phiên hết hạn: {e}")
+
+    async def _run(self) -> None:
+        """Vòng lặp chính của tác vụ nền"""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.reap_once()
+            except Exception as e:
+                logger.error(f"Lỗi khi dọn phiên hết hạn: {e}")
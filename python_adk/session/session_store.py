@@ -0,0 +1,464 @@
+"""
+Session Store - Các backend lưu trữ phiên
+
+Module này chứa các backend lưu trữ dữ liệu phiên cho SessionManager:
+- MemorySessionStore: lưu trong bộ nhớ tiến trình
+- SQLiteSessionStore: lưu vào file SQLite, giữ được phiên sau khi khởi động lại
+- RedisSessionStore: lưu vào Redis (hoặc server tương thích giao thức Redis),
+  dùng chung giữa nhiều tiến trình
+
+Mỗi phiên được lưu kèm thời điểm hết hạn (epoch, giây). Việc dọn phiên hết hạn
+dựa trên chỉ mục theo thời điểm hết hạn (min-heap, index SQLite, sorted set Redis)
+nên chỉ chạm tới các phiên thực sự hết hạn thay vì duyệt toàn bộ.
+"""
+
+import abc
+import heapq
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+class SessionStore(abc.ABC):
+    """Giao diện chung cho các backend lưu trữ phiên"""
+
+    @abc.abstractmethod
+    def get(self, session_id: str, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Lấy dữ liệu phiên còn hạn
+
+        Args:
+            session_id: ID của phiên
+            now: Thời điểm hiện tại (epoch), mặc định là time.time()
+
+        Returns:
+            Optional[Dict[str, Any]]: Dữ liệu phiên hoặc None nếu không có / đã hết hạn
+        """
+
+    @abc.abstractmethod
+    def put(self, session_id: str, data: Dict[str, Any], expires_at: float, user_id: Optional[str] = None) -> None:
+        """Lưu dữ liệu phiên
+
+        Args:
+            session_id: ID của phiên
+            data: Dữ liệu phiên (có thể chuyển thành JSON)
+            expires_at: Thời điểm hết hạn (epoch)
+            user_id: ID người dùng, dùng cho chỉ mục theo người dùng
+        """
+
+    @abc.abstractmethod
+    def touch(self, session_id: str, expires_at: float, now: Optional[float] = None) -> bool:
+        """Gia hạn phiên còn hạn mà không ghi lại dữ liệu
+
+        Args:
+            session_id: ID của phiên
+            expires_at: Thời điểm hết hạn mới (epoch)
+            now: Thời điểm hiện tại (epoch), mặc định là time.time()
+
+        Returns:
+            bool: False nếu phiên không có hoặc đã hết hạn
+        """
+
+    @abc.abstractmethod
+    def delete(self, session_id: str) -> bool:
+        """Xóa phiên
+
+        Returns:
+            bool: True nếu phiên tồn tại và đã bị xóa
+        """
+
+    @abc.abstractmethod
+    def list(self, user_id: Optional[str] = None, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Liệt kê dữ liệu các phiên còn hạn, có thể lọc theo người dùng"""
+
+    @abc.abstractmethod
+    def pop_expired(self, now: Optional[float] = None, limit: Optional[int] = None) -> List[str]:
+        """Xóa các phiên đã hết hạn theo thứ tự hết hạn sớm nhất
+
+        Args:
+            now: Thời điểm hiện tại (epoch), mặc định là time.time()
+            limit: Số phiên tối đa xóa trong một lần gọi, None nếu không giới hạn
+
+        Returns:
+            List[str]: ID các phiên đã xóa
+        """
+
+    @abc.abstractmethod
+    def count(self) -> int:
+        """Số phiên đang lưu (bao gồm phiên hết hạn chưa được dọn)"""
+
+    def close(self) -> None:
+        """Giải phóng tài nguyên của backend"""
+
+
+class MemorySessionStore(SessionStore):
+    """Lưu phiên trong bộ nhớ, dọn phiên hết hạn bằng min-heap
+
+    Dữ liệu được lưu dạng JSON như các backend khác, nên nơi gọi luôn nhận bản sao riêng
+    và không thể sửa trạng thái trong kho.
+    """
+
+    def __init__(self):
+        # session_id -> (JSON của dữ liệu, expires_at, user_id)
+        self._sessions: Dict[str, Tuple[str, float, Optional[str]]] = {}
+        # Min-heap (expires_at, session_id); entry cũ không còn khớp được bỏ qua khi pop
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._by_user: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return None
+        payload, expires_at, _ = entry
+        if expires_at <= (now if now is not None else time.time()):
+            return None
+        return json.loads(payload)
+
+    def put(self, session_id: str, data: Dict[str, Any], expires_at: float, user_id: Optional[str] = None) -> None:
+        payload = json.dumps(data, ensure_ascii=False)
+        with self._lock:
+            old = self._sessions.get(session_id)
+            if old is not None and old[2] != user_id:
+                self._unindex_user(session_id, old[2])
+            self._sessions[session_id] = (payload, expires_at, user_id)
+            if user_id:
+                self._by_user.setdefault(user_id, set()).add(session_id)
+            heapq.heappush(self._expiry_heap, (expires_at, session_id))
+            self._compact_heap()
+
+    def touch(self, session_id: str, expires_at: float, now: Optional[float] = None) -> bool:
+        now = now if now is not None else time.time()
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None or entry[1] <= now:
+                return False
+            self._sessions[session_id] = (entry[0], expires_at, entry[2])
+            heapq.heappush(self._expiry_heap, (expires_at, session_id))
+            self._compact_heap()
+        return True
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+            if entry is None:
+                return False
+            self._unindex_user(session_id, entry[2])
+            return True
+
+    def list(self, user_id: Optional[str] = None, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        now = now if now is not None else time.time()
+        with self._lock:
+            if user_id:
+                entries = [self._sessions[sid] for sid in self._by_user.get(user_id, ())]
+            else:
+                entries = list(self._sessions.values())
+        return [json.loads(payload) for payload, expires_at, _ in entries if expires_at > now]
+
+    def pop_expired(self, now: Optional[float] = None, limit: Optional[int] = None) -> List[str]:
+        now = now if now is not None else time.time()
+        removed = []
+        with self._lock:
+            heap = self._expiry_heap
+            while heap and heap[0][0] <= now and (limit is None or len(removed) < limit):
+                expires_at, session_id = heapq.heappop(heap)
+                entry = self._sessions.get(session_id)
+                # Bỏ qua entry cũ: phiên đã bị xóa hoặc đã được gia hạn
+                if entry is None or entry[1] != expires_at:
+                    continue
+                del self._sessions[session_id]
+                self._unindex_user(session_id, entry[2])
+                removed.append(session_id)
+        return removed
+
+    def count(self) -> int:
+        return len(self._sessions)
+
+    def _unindex_user(self, session_id: str, user_id: Optional[str]) -> None:
+        """Xóa phiên khỏi chỉ mục theo người dùng (đã giữ lock)"""
+        if not user_id:
+            return
+        ids = self._by_user.get(user_id)
+        if ids is not None:
+            ids.discard(session_id)
+            if not ids:
+                del self._by_user[user_id]
+
+    def _compact_heap(self) -> None:
+        """Dựng lại heap khi entry cũ chiếm đa số, tránh heap phình to khi phiên được lưu liên tục (đã giữ lock)"""
+        if len(self._expiry_heap) > 2 * len(self._sessions) + 64:
+            self._expiry_heap = [(expires_at, sid) for sid, (_, expires_at, _) in self._sessions.items()]
+            heapq.heapify(self._expiry_heap)
+
+
+class SQLiteSessionStore(SessionStore):
+    """Lưu phiên vào file SQLite, có index theo thời điểm hết hạn và theo người dùng"""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Đường dẫn file SQLite (":memory:" để dùng cơ sở dữ liệu tạm)
+        """
+        self.path = path
+        if path != ":memory:":
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS sessions (
+                session_id TEXT PRIMARY KEY,
+                user_id TEXT,
+                expires_at REAL NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions (expires_at);
+            CREATE INDEX IF NOT EXISTS idx_sessions_user_id ON sessions (user_id);
+            """
+        )
+
+    def get(self, session_id: str, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        now = now if now is not None else time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM sessions WHERE session_id = ? AND expires_at > ?",
+                (session_id, now)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, session_id: str, data: Dict[str, Any], expires_at: float, user_id: Optional[str] = None) -> None:
+        payload = json.dumps(data, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sessions (session_id, user_id, expires_at, data) VALUES (?, ?, ?, ?)",
+                (session_id, user_id, expires_at, payload)
+            )
+
+    def touch(self, session_id: str, expires_at: float, now: Optional[float] = None) -> bool:
+        now = now if now is not None else time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE sessions SET expires_at = ? WHERE session_id = ? AND expires_at > ?",
+                (expires_at, session_id, now)
+            )
+        return cursor.rowcount > 0
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+        return cursor.rowcount > 0
+
+    def list(self, user_id: Optional[str] = None, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        now = now if now is not None else time.time()
+        with self._lock:
+            if user_id:
+                rows = self._conn.execute(
+                    "SELECT data FROM sessions WHERE user_id = ? AND expires_at > ?", (user_id, now)
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    "SELECT data FROM sessions WHERE expires_at > ?", (now,)
+                ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def pop_expired(self, now: Optional[float] = None, limit: Optional[int] = None) -> List[str]:
+        now = now if now is not None else time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT session_id FROM sessions WHERE expires_at <= ? ORDER BY expires_at LIMIT ?",
+                    (now, -1 if limit is None else limit)
+                ).fetchall()
+                removed = [row[0] for row in rows]
+                self._conn.executemany("DELETE FROM sessions WHERE session_id = ?", rows)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return removed
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class RedisSessionStore(SessionStore):
+    """Lưu phiên vào Redis hoặc server tương thích giao thức Redis
+
+    Mỗi phiên là một key có TTL của Redis. Sorted set `<prefix>expiry` (score = thời điểm
+    hết hạn) dùng để tìm phiên hết hạn, set `<prefix>user:<user_id>` lưu ID phiên của từng
+    người dùng và hash `<prefix>owners` ánh xạ ID phiên → người dùng để dọn chỉ mục
+    ngay cả khi key phiên đã bị Redis xóa theo TTL.
+    """
+
+    def __init__(self, client: Any = None, url: Optional[str] = None, prefix: str = "phongthuy:session:"):
+        """
+        Args:
+            client: Redis client đã khởi tạo (ví dụ redis.Redis hoặc client giả lập khi test)
+            url: URL Redis, dùng khi không truyền client (cần cài package `redis`)
+            prefix: Tiền tố cho các key
+        """
+        if client is None:
+            if not url:
+                raise ValueError("Cần cung cấp client hoặc url cho RedisSessionStore")
+            try:
+                import redis
+            except ImportError as e:
+                raise ImportError("Cần cài đặt package 'redis' để dùng SESSION_STORE_TYPE=redis") from e
+            client = redis.Redis.from_url(url, decode_responses=True)
+        self.client = client
+        self.prefix = prefix
+        self._expiry_key = f"{prefix}expiry"
+        self._owners_key = f"{prefix}owners"
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.prefix}{session_id}"
+
+    def _user_key(self, user_id: str) -> str:
+        return f"{self.prefix}user:{user_id}"
+
+    def get(self, session_id: str, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        payload = self.client.get(self._key(session_id))
+        if payload is None:
+            return None
+        record = json.loads(payload)
+        if record["expires_at"] <= (now if now is not None else time.time()):
+            return None
+        return record["data"]
+
+    def put(self, session_id: str, data: Dict[str, Any], expires_at: float, user_id: Optional[str] = None) -> None:
+        record = {"expires_at": expires_at, "user_id": user_id, "data": data}
+        old_owner = self.client.hget(self._owners_key, session_id)
+        pipe = self.client.pipeline()
+        self._write(pipe, session_id, record)
+        if old_owner and old_owner != user_id:
+            pipe.srem(self._user_key(old_owner), session_id)
+            pipe.hdel(self._owners_key, session_id)
+        if user_id:
+            pipe.sadd(self._user_key(user_id), session_id)
+            pipe.hset(self._owners_key, session_id, user_id)
+        pipe.execute()
+
+    def touch(self, session_id: str, expires_at: float, now: Optional[float] = None) -> bool:
+        payload = self.client.get(self._key(session_id))
+        if payload is None:
+            return False
+        record = json.loads(payload)
+        if record["expires_at"] <= (now if now is not None else time.time()):
+            return False
+        record["expires_at"] = expires_at
+        pipe = self.client.pipeline()
+        self._write(pipe, session_id, record)
+        pipe.execute()
+        return True
+
+    def _write(self, pipe: Any, session_id: str, record: Dict[str, Any]) -> None:
+        """Ghi bản ghi phiên (kèm TTL của Redis) và cập nhật sorted set hết hạn trong pipeline"""
+        ttl_ms = max(1, int((record["expires_at"] - time.time()) * 1000))
+        pipe.set(self._key(session_id), json.dumps(record, ensure_ascii=False), px=ttl_ms)
+        pipe.zadd(self._expiry_key, {session_id: record["expires_at"]})
+
+    def delete(self, session_id: str) -> bool:
+        user_id = self.client.hget(self._owners_key, session_id)
+        pipe = self.client.pipeline()
+        pipe.delete(self._key(session_id))
+        pipe.zrem(self._expiry_key, session_id)
+        if user_id:
+            pipe.srem(self._user_key(user_id), session_id)
+            pipe.hdel(self._owners_key, session_id)
+        deleted = pipe.execute()[0]
+        return bool(deleted)
+
+    def list(self, user_id: Optional[str] = None, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        now = now if now is not None else time.time()
+        if user_id:
+            session_ids = list(self.client.smembers(self._user_key(user_id)))
+        else:
+            session_ids = list(self.client.zrangebyscore(self._expiry_key, f"({now}", "+inf"))
+        if not session_ids:
+            return []
+        payloads = self.client.mget([self._key(sid) for sid in session_ids])
+        sessions = []
+        for payload in payloads:
+            if payload is None:
+                continue
+            record = json.loads(payload)
+            if record["expires_at"] > now:
+                sessions.append(record["data"])
+        return sessions
+
+    def pop_expired(self, now: Optional[float] = None, limit: Optional[int] = None) -> List[str]:
+        now = now if now is not None else time.time()
+        if limit is None:
+            session_ids = self.client.zrangebyscore(self._expiry_key, "-inf", now)
+        else:
+            session_ids = self.client.zrangebyscore(self._expiry_key, "-inf", now, start=0, num=limit)
+        if not session_ids:
+            return []
+
+        # Bỏ qua phiên đã được gia hạn bởi tiến trình khác (key phiên có thể đã bị Redis xóa theo TTL)
+        payloads = self.client.mget([self._key(sid) for sid in session_ids])
+        owners = self.client.hmget(self._owners_key, session_ids)
+        removed = []
+        pipe = self.client.pipeline()
+        for session_id, payload, user_id in zip(session_ids, payloads, owners):
+            if payload is not None and json.loads(payload)["expires_at"] > now:
+                continue
+            pipe.delete(self._key(session_id))
+            pipe.zrem(self._expiry_key, session_id)
+            if user_id:
+                pipe.srem(self._user_key(user_id), session_id)
+                pipe.hdel(self._owners_key, session_id)
+            removed.append(session_id)
+        pipe.execute()
+        return removed
+
+    def count(self) -> int:
+        return self.client.zcard(self._expiry_key)
+
+    def close(self) -> None:
+        close = getattr(self.client, "close", None)
+        if close is not None:
+            close()
+
+
+def create_session_store(
+    store_type: str = "memory",
+    sqlite_path: Optional[str] = None,
+    redis_url: Optional[str] = None,
+    redis_client: Any = None
+) -> SessionStore:
+    """Tạo backend lưu trữ phiên theo loại
+
+    Args:
+        store_type: "memory", "sqlite" hoặc "redis"
+        sqlite_path: Đường dẫn file SQLite (với store_type="sqlite")
+        redis_url: URL Redis (với store_type="redis")
+        redis_client: Redis client có sẵn (với store_type="redis")
+
+    Returns:
+        SessionStore: Backend lưu trữ phiên
+
+    Raises:
+        ValueError: Nếu loại lưu trữ không được hỗ trợ
+    """
+    store_type = (store_type or "memory").lower()
+    if store_type == "memory":
+        return MemorySessionStore()
+    if store_type == "sqlite":
+        return SQLiteSessionStore(sqlite_path or "sessions.sqlite3")
+    if store_type == "redis":
+        return RedisSessionStore(client=redis_client, url=redis_url)
+    raise ValueError(f"Loại lưu trữ phiên không được hỗ trợ: {store_type}")
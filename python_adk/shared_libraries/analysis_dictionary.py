@@ -0,0 +1,96 @@
+"""
+Analysis Dictionary Module
+
+Từ điển sao (BAT_TINH) và tổ hợp sao (COMBINATIONS) được phục vụ một lần qua endpoint có
+ETag / Cache-Control, để response phân tích ở chế độ rút gọn (compact) chỉ cần trả mã sao và
+mã tổ hợp thay vì lặp lại toàn bộ phần mô tả tiếng Việt cho từng cặp số.
+
+Phiên bản từ điển là hash nội dung, nên client / gateway có thể cache vô thời hạn theo phiên bản.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict
+
+from python_adk.constants.bat_tinh import BAT_TINH
+from python_adk.constants.combinations import COMBINATIONS
+
+# Các trường đã có trong từ điển, bị bỏ khỏi response rút gọn
+DICTIONARY_FIELDS = frozenset({"description", "detailedDescription", "detailed_description", "position"})
+
+
+def _build_dictionary() -> Dict[str, Any]:
+    """Dựng nội dung từ điển (chưa có phiên bản)"""
+    return {
+        "stars": {
+            key: {
+                "name": info.get("name", ""),
+                "nature": info.get("nature", ""),
+                "description": info.get("description", ""),
+                "detailedDescription": info.get("detailedDescription", ""),
+                "position": info.get("position", ""),
+                "energy": info.get("energy", {})
+            }
+            for key, info in BAT_TINH.items()
+        },
+        "combinations": {
+            key: {
+                "name": info.get("name", ""),
+                "description": info.get("description", ""),
+                "detailedDescription": info.get("detailedDescription", "")
+            }
+            for key, info in COMBINATIONS.items()
+        }
+    }
+
+
+def _serialize(content: Dict[str, Any]) -> bytes:
+    """Tuần tự hóa ổn định (khóa sắp xếp) để hash không đổi giữa các lần khởi động"""
+    return json.dumps(content, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+_CONTENT = _build_dictionary()
+DICTIONARY_VERSION = hashlib.sha256(_serialize(_CONTENT)).hexdigest()[:16]
+DICTIONARY_ETAG = f'"{DICTIONARY_VERSION}"'
+# Body JSON dựng sẵn một lần khi import
+DICTIONARY_BODY = _serialize({"version": DICTIONARY_VERSION, **_CONTENT})
+
+
+def etag_matches(if_none_match: str) -> bool:
+    """
+    Kiểm tra header If-None-Match có khớp phiên bản từ điển hiện tại
+
+    Args:
+        if_none_match (str): Giá trị header If-None-Match (có thể chứa nhiều ETag hoặc "*")
+
+    Returns:
+        bool: True nếu client đã có đúng phiên bản
+    """
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == DICTIONARY_ETAG for tag in candidates)
+
+
+def compact_analysis(payload: Any) -> Any:
+    """
+    Tạo bản rút gọn của kết quả phân tích: bỏ các trường mô tả đã có trong từ điển
+    (và bảng năng lượng của sao), giữ nguyên mã sao / mã tổ hợp để client tra từ điển.
+
+    Không sửa payload gốc (kết quả có thể đang nằm trong analysis_cache).
+
+    Args:
+        payload (Any): Kết quả phân tích (dict / list lồng nhau)
+
+    Returns:
+        Any: Bản sao đã rút gọn
+    """
+    if isinstance(payload, dict):
+        return {
+            key: compact_analysis(value)
+            for key, value in payload.items()
+            if key not in DICTIONARY_FIELDS and not (key == "energy" and isinstance(value, dict))
+        }
+    if isinstance(payload, list):
+        return [compact_analysis(item) for item in payload]
+    return payload
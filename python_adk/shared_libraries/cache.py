@@ -0,0 +1,267 @@
+"""
+Cache Module
+
+Module cung cấp bộ nhớ đệm LRU có giới hạn (số entry, dung lượng byte, TTL)
+và lớp ghi nhớ (memoization) dùng chung cho các analyzer thuần túy.
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+# Đối tượng đánh dấu không tìm thấy trong cache
+_MISSING = object()
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Ước lượng dung lượng (byte) của một giá trị theo độ dài JSON đã mã hóa.
+
+    Args:
+        value (Any): Giá trị cần ước lượng
+
+    Returns:
+        int: Số byte ước lượng
+    """
+    try:
+        return len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+    except (TypeError, ValueError):
+        return len(repr(value).encode("utf-8"))
+
+
+class LRUCache:
+    """
+    Bộ nhớ đệm LRU an toàn luồng, giới hạn theo số entry, tổng dung lượng và TTL.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        name: str = "cache",
+        size_of: Callable[[Any], int] = estimate_size
+    ):
+        """
+        Khởi tạo LRUCache
+
+        Args:
+            max_entries (int): Số entry tối đa
+            ttl (Optional[float]): Thời gian sống của mỗi entry (giây), None nếu không hết hạn
+            max_bytes (Optional[int]): Tổng dung lượng tối đa (byte), None nếu không giới hạn
+            name (str): Tên cache, dùng khi xuất thống kê
+            size_of (Callable[[Any], int]): Hàm ước lượng dung lượng của giá trị
+        """
+        self.name = name
+        self.max_entries = max(1, int(max_entries))
+        self.ttl = ttl if ttl and ttl > 0 else None
+        self.max_bytes = max_bytes if max_bytes and max_bytes > 0 else None
+        self._size_of = size_of
+
+        # key -> (value, size, expires_at)
+        self._entries: OrderedDict[Hashable, Tuple[Any, int, Optional[float]]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Lấy giá trị theo khóa và đánh dấu là vừa được sử dụng
+
+        Args:
+            key (Hashable): Khóa cần lấy
+            default (Any): Giá trị trả về khi không tìm thấy
+
+        Returns:
+            Any: Giá trị trong cache hoặc `default`
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, size, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key, size)
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, size: Optional[int] = None) -> bool:
+        """
+        Lưu giá trị vào cache, loại bỏ các entry cũ nhất nếu vượt giới hạn
+
+        Args:
+            key (Hashable): Khóa
+            value (Any): Giá trị cần lưu
+            size (Optional[int]): Dung lượng của giá trị, tự ước lượng nếu không cung cấp
+
+        Returns:
+            bool: False nếu giá trị lớn hơn toàn bộ ngân sách byte nên không được lưu
+        """
+        if size is None:
+            size = self._size_of(value) if self.max_bytes else 0
+        if self.max_bytes and size > self.max_bytes:
+            return False
+
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+
+            self._entries[key] = (value, size, expires_at)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or (self.max_bytes and self._bytes > self.max_bytes):
+                old_key, (_, old_size, _) = next(iter(self._entries.items()))
+                self._remove(old_key, old_size)
+                self.evictions += 1
+        return True
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Lấy giá trị từ cache, nếu chưa có thì tính toán và lưu lại
+
+        Args:
+            key (Hashable): Khóa
+            compute (Callable[[], Any]): Hàm tính giá trị khi cache miss
+
+        Returns:
+            Any: Giá trị
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def delete(self, key: Hashable) -> bool:
+        """Xóa một entry khỏi cache"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            self._remove(key, entry[1])
+            return True
+
+    def clear(self) -> None:
+        """Xóa toàn bộ cache (giữ nguyên các bộ đếm)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Lấy thống kê của cache
+
+        Returns:
+            Dict[str, Any]: Số entry, dung lượng, hit/miss/eviction
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: Hashable, size: int) -> None:
+        """Xóa entry (đã giữ lock)"""
+        del self._entries[key]
+        self._bytes -= size
+
+
+def _create_analysis_cache() -> LRUCache:
+    """Tạo cache dùng chung cho các analyzer từ cấu hình ứng dụng"""
+    from python_adk.config.config import AppConfig
+    return LRUCache(name="analysis", **AppConfig().analysis_cache_config)
+
+
+# Cache dùng chung cho các analyzer thuần túy
+analysis_cache = _create_analysis_cache()
+
+
+def hash_key(value: str) -> str:
+    """Băm giá trị nhạy cảm (ví dụ mật khẩu) trước khi dùng làm khóa cache"""
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def memoize_analysis(
+    analyzer: str,
+    key: Optional[Callable[[Any], Hashable]] = None,
+    cache: Optional[LRUCache] = None
+) -> Callable:
+    """
+    Decorator ghi nhớ kết quả của analyzer thuần túy theo (analyzer, các tham số).
+
+    Tham số được gắn theo chữ ký của hàm (kể cả giá trị mặc định) nên gọi theo vị trí
+    hay theo tên, có hay không truyền tham số mặc định đều dùng chung một khóa. Input được
+    truyền nguyên vẹn cho analyzer. Kết quả được lưu dạng pickle và mỗi lần gọi nhận một bản
+    sao riêng, nên nơi gọi có thể sửa kết quả mà không ảnh hưởng cache; dung lượng tính theo
+    kích thước bản pickle. Lỗi (exception) không được lưu vào cache.
+
+    Args:
+        analyzer (str): Tên analyzer, là thành phần đầu của khóa cache
+        key (Optional[Callable[[Any], Hashable]]): Hàm biến đổi tham số đầu tiên thành khóa
+            (ví dụ băm mật khẩu để không giữ bản rõ trong khóa)
+        cache (Optional[LRUCache]): Cache sử dụng, mặc định là `analysis_cache`
+
+    Returns:
+        Callable: Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        first = next(iter(signature.parameters))
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            target = cache if cache is not None else analysis_cache
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            if key is not None:
+                arguments[first] = key(arguments[first])
+            cache_key = (analyzer, tuple(arguments.items()))
+            try:
+                stored = target.get(cache_key, _MISSING)
+            except TypeError:
+                # Tham số không băm được (list, dict, ...): không dùng cache
+                return func(*args, **kwargs)
+
+            if stored is not _MISSING:
+                return pickle.loads(stored)
+            result = func(*args, **kwargs)
+            stored = pickle.dumps(result, pickle.HIGHEST_PROTOCOL)
+            target.set(cache_key, stored, size=len(stored))
+            return result
+
+        wrapper.cache_analyzer = analyzer
+        return wrapper
+    return decorator
@@ -0,0 +1,114 @@
+"""
+Digit Tokenizer Module
+
+Bộ tách cặp số dùng chung cho số điện thoại, CCCD, số tài khoản và phần chữ số của mật khẩu.
+
+Quy tắc (giống `PhoneAnalyzer._generate_pairs`): một cặp đi từ một chữ số neo (khác 0/5)
+qua nhóm số 0/5 liền sau tới chữ số neo kế tiếp; số 0/5 đứng đầu bị bỏ qua; nhóm 0/5 sau
+chữ số neo cuối cùng tạo thành một cặp lẻ chỉ có chữ số neo. Ký tự không phải chữ số bị bỏ qua.
+
+Bộ tách là một máy trạng thái hữu hạn dựng sẵn thành bảng tra (trạng thái, ký tự) -> (trạng thái
+kế, hành động) và chạy một lượt trên dãy ký tự, chỉ sinh bộ (start, end, pair, zero_count,
+five_count) mà không ghép chuỗi trung gian.
+"""
+
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+class PairToken(NamedTuple):
+    """Một cặp số trong dãy ký tự"""
+    start: int          # Vị trí chữ số neo đầu
+    end: int            # Vị trí sau ký tự cuối của cặp (không tính)
+    pair: str           # Cặp số đã bỏ 0/5 (2 chữ số, hoặc 1 chữ số với nhóm 0/5 ở cuối)
+    zero_count: int     # Số chữ số 0 trong nhóm
+    five_count: int     # Số chữ số 5 trong nhóm
+
+
+# Trạng thái
+_IDLE = 0    # Chưa gặp chữ số neo
+_OPEN = 1    # Đang có chữ số neo, chờ chữ số neo kế tiếp
+
+# Hành động
+_SKIP = 0
+_ANCHOR = 1
+_ZERO = 2
+_FIVE = 3
+_EMIT = 4
+
+# Lớp ký tự -> hành động theo trạng thái
+_CLASS_ACTIONS = {
+    "anchor": {_IDLE: (_OPEN, _ANCHOR), _OPEN: (_OPEN, _EMIT)},
+    "zero": {_IDLE: (_IDLE, _SKIP), _OPEN: (_OPEN, _ZERO)},
+    "five": {_IDLE: (_IDLE, _SKIP), _OPEN: (_OPEN, _FIVE)},
+    "other": {_IDLE: (_IDLE, _SKIP), _OPEN: (_OPEN, _SKIP)},
+}
+_CHARACTER_CLASSES = {
+    **{digit: "anchor" for digit in "12346789"},
+    "0": "zero",
+    "5": "five",
+}
+
+
+def _compile() -> Tuple[Tuple[Dict[str, Tuple[int, int]], Tuple[int, int]], ...]:
+    """Dựng bảng chuyển theo từng trạng thái: (ký tự -> (trạng thái kế, hành động), mặc định cho ký tự khác)"""
+    table = []
+    for state in (_IDLE, _OPEN):
+        transitions = {char: _CLASS_ACTIONS[cls][state] for char, cls in _CHARACTER_CLASSES.items()}
+        table.append((transitions, _CLASS_ACTIONS["other"][state]))
+    return tuple(table)
+
+
+_TABLE = _compile()
+
+
+def tokenize_digits(text: str, start: int = 0, end: Optional[int] = None) -> List[PairToken]:
+    """
+    Tách cặp số trong một lượt duyệt
+
+    Args:
+        text (str): Dãy ký tự (số điện thoại, CCCD, số tài khoản, mật khẩu...)
+        start (int): Vị trí bắt đầu cửa sổ
+        end (Optional[int]): Vị trí kết thúc cửa sổ (không tính), mặc định hết dãy
+
+    Returns:
+        List[PairToken]: Các cặp số theo thứ tự xuất hiện
+    """
+    end = len(text) if end is None else end
+    tokens: List[PairToken] = []
+    state = _IDLE
+    anchor = -1
+    last = -1
+    zeros = fives = 0
+    for index in range(start, end):
+        char = text[index]
+        transitions, other = _TABLE[state]
+        state, action = transitions.get(char, other)
+        if action == _EMIT:
+            tokens.append(PairToken(anchor, index + 1, text[anchor] + char, zeros, fives))
+            anchor = index
+            zeros = fives = 0
+        elif action == _ZERO:
+            zeros += 1
+            last = index
+        elif action == _FIVE:
+            fives += 1
+            last = index
+        elif action == _ANCHOR:
+            anchor = index
+    # Nhóm 0/5 sau chữ số neo cuối cùng
+    if zeros or fives:
+        tokens.append(PairToken(anchor, last + 1, text[anchor], zeros, fives))
+    return tokens
+
+
+def tokenize_many(texts: List[str]) -> List[List[PairToken]]:
+    """
+    Tách cặp số cho nhiều dãy ký tự
+
+    Args:
+        texts (List[str]): Các dãy ký tự
+
+    Returns:
+        List[List[PairToken]]: Các cặp số của từng dãy
+    """
+    return [tokenize_digits(text) for text in texts]
@@ -0,0 +1,59 @@
+"""
+JSON Response Module
+
+Response JSON cho các endpoint phân tích và chat, mã hóa trực tiếp kết quả (dict hoặc Pydantic
+model) thành bytes mà không qua bước `jsonable_encoder` của FastAPI. Dùng `orjson` nếu đã cài
+(tùy chọn), nếu không thì dùng `json` chuẩn với output gọn.
+
+Endpoint cần trả `FastJSONResponse(...)` thay vì trả dict: FastAPI chỉ bỏ qua `jsonable_encoder`
+khi endpoint trả về một `Response`.
+"""
+
+import json
+from typing import Any
+
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson là phụ thuộc tùy chọn
+    orjson = None
+
+HAS_ORJSON = orjson is not None
+
+
+def _default(value: Any) -> Any:
+    """Chuyển các kiểu mà bộ mã hóa JSON không tự xử lý (set, numpy, Pydantic model)"""
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if hasattr(value, "tolist"):  # numpy array / scalar
+        return value.tolist()
+    raise TypeError(f"Không mã hóa được kiểu {type(value).__name__} thành JSON")
+
+
+def dumps_json(content: Any) -> bytes:
+    """
+    Mã hóa nội dung thành JSON (UTF-8, không escape tiếng Việt)
+
+    Args:
+        content (Any): dict / list lồng nhau hoặc Pydantic model
+
+    Returns:
+        bytes: JSON đã mã hóa
+    """
+    if isinstance(content, BaseModel):
+        # Bộ tuần tự hóa đã biên dịch của pydantic-core, không qua dict trung gian
+        return content.__pydantic_serializer__.to_json(content)
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse mã hóa bằng `dumps_json`"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
@@ -0,0 +1,157 @@
+"""
+Keyword Automaton Module
+
+Module cung cấp automaton Aho–Corasick để tìm nhiều từ khóa (thuộc nhiều nhóm)
+trong một văn bản chỉ với một lần duyệt, thời gian tuyến tính theo độ dài văn bản
+và không phụ thuộc số lượng từ khóa.
+
+Văn bản và từ khóa được chuẩn hóa Unicode NFC và chuyển về chữ thường trước khi so khớp,
+nên tiếng Việt có dấu ở dạng dựng sẵn hay tổ hợp đều cho cùng kết quả.
+"""
+
+import unicodedata
+from collections import deque
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+
+def normalize_text(text: str) -> str:
+    """
+    Chuẩn hóa văn bản để so khớp từ khóa (NFC + chữ thường)
+
+    Args:
+        text (str): Văn bản cần chuẩn hóa
+
+    Returns:
+        str: Văn bản đã chuẩn hóa
+    """
+    return unicodedata.normalize("NFC", text).lower()
+
+
+class KeywordAutomaton:
+    """
+    Automaton Aho–Corasick cho các từ khóa được gom theo nhóm.
+
+    Kết quả tìm kiếm giữ ngữ nghĩa "từ khóa là chuỗi con của văn bản": mọi từ khóa
+    xuất hiện (kể cả chồng lấn hoặc lồng nhau) đều được tính, mỗi từ khóa một lần.
+    """
+
+    def __init__(self):
+        """Khởi tạo automaton rỗng"""
+        # Danh sách (nhóm, từ khóa gốc) theo thứ tự thêm vào
+        self._patterns: List[Tuple[Hashable, str]] = []
+        self._seen: Dict[Tuple[Hashable, str], int] = {}
+        self._groups: List[Hashable] = []
+
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Từ khóa kết thúc đúng tại trạng thái; _output gộp thêm từ khóa của chuỗi liên kết thất bại
+        self._terminal: List[Tuple[int, ...]] = [()]
+        self._output: List[Tuple[int, ...]] = [()]
+        self._built = True
+
+    def add(self, group: Hashable, keyword: str) -> None:
+        """
+        Thêm một từ khóa vào nhóm
+
+        Args:
+            group (Hashable): Nhóm của từ khóa (ví dụ loại agent)
+            keyword (str): Từ khóa
+        """
+        normalized = normalize_text(keyword)
+        if not normalized or (group, normalized) in self._seen:
+            return
+        if group not in self._groups:
+            self._groups.append(group)
+
+        pattern_id = len(self._patterns)
+        self._patterns.append((group, keyword))
+        self._seen[(group, normalized)] = pattern_id
+
+        state = 0
+        for char in normalized:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._terminal.append(())
+            state = next_state
+        self._terminal[state] = self._terminal[state] + (pattern_id,)
+        self._built = False
+
+    def add_many(self, group: Hashable, keywords: Iterable[str]) -> None:
+        """
+        Thêm nhiều từ khóa vào nhóm
+
+        Args:
+            group (Hashable): Nhóm của từ khóa
+            keywords (Iterable[str]): Các từ khóa
+        """
+        for keyword in keywords:
+            self.add(group, keyword)
+
+    def build(self) -> "KeywordAutomaton":
+        """
+        Dựng liên kết thất bại (failure link) theo BFS. Được gọi tự động khi tìm kiếm
+        nếu có từ khóa mới được thêm.
+
+        Returns:
+            KeywordAutomaton: Chính automaton này
+        """
+        goto, fail = self._goto, self._fail
+        output = self._output = list(self._terminal)
+        queue = deque()
+        for state in goto[0].values():
+            fail[state] = 0
+            queue.append(state)
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(char, 0)
+                # Gộp sẵn output của chuỗi liên kết thất bại để không phải lần theo khi tìm kiếm
+                if output[fail[next_state]]:
+                    output[next_state] = output[next_state] + output[fail[next_state]]
+
+        self._built = True
+        return self
+
+    def search(self, text: str) -> Dict[Hashable, List[str]]:
+        """
+        Tìm tất cả từ khóa xuất hiện trong văn bản với một lần duyệt
+
+        Args:
+            text (str): Văn bản cần tìm
+
+        Returns:
+            Dict[Hashable, List[str]]: Nhóm -> các từ khóa tìm thấy (theo thứ tự thêm vào),
+            mọi nhóm đều có mặt kể cả khi không tìm thấy từ khóa nào
+        """
+        if not self._built:
+            self.build()
+
+        goto, fail, output = self._goto, self._fail, self._output
+        found = set()
+        state = 0
+        for char in normalize_text(text):
+            next_state = goto[state].get(char)
+            while next_state is None and state:
+                state = fail[state]
+                next_state = goto[state].get(char)
+            state = next_state or 0
+            if output[state]:
+                found.update(output[state])
+
+        result: Dict[Hashable, List[str]] = {group: [] for group in self._groups}
+        for pattern_id in sorted(found):
+            group, keyword = self._patterns[pattern_id]
+            result[group].append(keyword)
+        return result
+
+    def __len__(self) -> int:
+        return len(self._patterns)
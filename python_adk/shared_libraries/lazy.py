@@ -0,0 +1,81 @@
+"""
+Lazy Module
+
+Các tiện ích khởi tạo trễ: đối tượng nặng (agent, MCP server, FunctionTool của Google ADK)
+chỉ được dựng ở lần truy cập đầu tiên hoặc trong startup hook, để việc import module
+(worker khởi động, `test_imports.py`) không kéo theo toàn bộ Google ADK.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class LazySingleton(Generic[T]):
+    """
+    Đối tượng dựng một lần khi gọi lần đầu, an toàn luồng
+    """
+
+    def __init__(self, factory: Callable[[], T]):
+        """
+        Khởi tạo LazySingleton
+
+        Args:
+            factory (Callable[[], T]): Hàm dựng đối tượng
+        """
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._value: Any = None
+        self._initialized = False
+
+    @property
+    def initialized(self) -> bool:
+        """Đối tượng đã được dựng chưa"""
+        return self._initialized
+
+    def __call__(self) -> T:
+        """Trả về đối tượng, dựng nếu chưa có"""
+        if not self._initialized:
+            with self._lock:
+                if not self._initialized:
+                    self._value = self._factory()
+                    self._initialized = True
+        return self._value
+
+
+def lazy_module_getattr(module_name: str, getters: Dict[str, Callable[[], Any]]) -> Callable[[str], Any]:
+    """
+    Tạo hàm `__getattr__` cấp module (PEP 562) trả về các thuộc tính khởi tạo trễ,
+    để `from module import name` vẫn dùng được như trước
+
+    Args:
+        module_name (str): Tên module (`__name__`)
+        getters (Dict[str, Callable[[], Any]]): Tên thuộc tính -> hàm lấy giá trị
+
+    Returns:
+        Callable[[str], Any]: Hàm `__getattr__` cho module
+    """
+    def __getattr__(name: str) -> Any:
+        if name in getters:
+            return getters[name]()
+        raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+
+    return __getattr__
+
+
+def lazy_function_tool(func: Callable[..., Any]) -> LazySingleton:
+    """
+    FunctionTool của Google ADK cho một hàm, chỉ import ADK và dựng tool khi cần
+
+    Args:
+        func (Callable[..., Any]): Hàm công cụ
+
+    Returns:
+        LazySingleton: Hàm lấy FunctionTool
+    """
+    def build() -> Any:
+        from google.adk.tools import FunctionTool
+        return FunctionTool(func)
+
+    return LazySingleton(build)
@@ -0,0 +1,58 @@
+"""
+Metrics Module
+
+Module cung cấp các bộ đếm và thống kê độ trễ đơn giản trong tiến trình,
+được xuất ra qua endpoint /health.
+"""
+
+import threading
+from typing import Any, Dict
+
+
+class LatencyStats:
+    """
+    Thống kê độ trễ (số lần, trung bình, lớn nhất, gần nhất) an toàn luồng
+    """
+
+    def __init__(self):
+        """Khởi tạo LatencyStats"""
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """
+        Ghi nhận một giá trị độ trễ
+
+        Args:
+            seconds (float): Độ trễ tính bằng giây
+        """
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            self.last = seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    @property
+    def average(self) -> float:
+        """Độ trễ trung bình (giây)"""
+        return self.total / self.count if self.count else 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Lấy thống kê hiện tại
+
+        Returns:
+            Dict[str, Any]: Thống kê tính bằng mili giây
+        """
+        with self._lock:
+            return {
+                "count": self.count,
+                "avg_ms": round(self.average * 1000, 3),
+                "max_ms": round(self.max * 1000, 3),
+                "last_ms": round(self.last * 1000, 3),
+                "total_ms": round(self.total * 1000, 3)
+            }
@@ -5,8 +5,31 @@ Module chứa các Pydantic models dùng cho xác thực dữ liệu và typing.
 """
 
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
-from pydantic import BaseModel, Field, validator
+from typing import Annotated, Any, Dict, List, Optional, Union
+from pydantic import AfterValidator, BaseModel, Field
+
+
+def _check_phone_digits(value: str) -> str:
+    """Kiểm tra số điện thoại chỉ gồm 10 hoặc 11 chữ số"""
+    if not value.isdigit():
+        raise ValueError("Số điện thoại chỉ được chứa chữ số")
+    if len(value) not in (10, 11):
+        raise ValueError("Số điện thoại phải có 10 hoặc 11 chữ số")
+    return value
+
+
+def _check_cccd_last_digits(value: str) -> str:
+    """Kiểm tra đúng 6 chữ số cuối của CCCD"""
+    if not value.isdigit():
+        raise ValueError("Dãy số chỉ được chứa chữ số")
+    if len(value) != 6:
+        raise ValueError("Phải nhập đúng 6 chữ số cuối của CCCD")
+    return value
+
+
+# Kiểu chuỗi dùng chung cho các model, giữ thông báo lỗi tiếng Việt của validator cũ
+PhoneDigits = Annotated[str, AfterValidator(_check_phone_digits)]
+CCCDLastDigits = Annotated[str, AfterValidator(_check_cccd_last_digits)]
 
 
 class ServiceType(str, Enum):
@@ -34,30 +57,12 @@ class SubscriptionPlan(str, Enum):
 
 class PhoneAnalysisRequest(BaseModel):
     """Model cho yêu cầu phân tích số điện thoại"""
-    phone_number: str = Field(..., description="Số điện thoại cần phân tích")
-    
-    @validator("phone_number")
-    def validate_phone_number(cls, v):
-        """Xác thực định dạng số điện thoại"""
-        if not v.isdigit():
-            raise ValueError("Số điện thoại chỉ được chứa chữ số")
-        if len(v) not in [10, 11]:
-            raise ValueError("Số điện thoại phải có 10 hoặc 11 chữ số")
-        return v
+    phone_number: PhoneDigits = Field(..., description="Số điện thoại cần phân tích (10 hoặc 11 chữ số)")
 
 
 class CCCDAnalysisRequest(BaseModel):
     """Model cho yêu cầu phân tích CCCD"""
-    cccd_last_digits: str = Field(..., description="6 chữ số cuối của CCCD cần phân tích")
-    
-    @validator("cccd_last_digits")
-    def validate_cccd_last_digits(cls, v):
-        """Xác thực định dạng 6 số cuối CCCD"""
-        if not v.isdigit():
-            raise ValueError("Dãy số chỉ được chứa chữ số")
-        if len(v) != 6:
-            raise ValueError("Phải nhập đúng 6 chữ số cuối của CCCD")
-        return v
+    cccd_last_digits: CCCDLastDigits = Field(..., description="6 chữ số cuối của CCCD cần phân tích")
 
 
 class BankAccountRequest(BaseModel):
@@ -71,7 +76,7 @@ class PasswordRequest(BaseModel):
     """Model cho yêu cầu tạo hoặc phân tích mật khẩu theo phong thủy"""
     purpose: str = Field(..., description="Mục đích sử dụng mật khẩu")
     keywords: Optional[List[str]] = Field(None, description="Các từ khóa liên quan (không bắt buộc)")
-    min_length: Optional[int] = Field(8, description="Độ dài tối thiểu của mật khẩu")
+    min_length: Optional[int] = Field(8, ge=1, description="Độ dài tối thiểu của mật khẩu")
     require_special_chars: Optional[bool] = Field(True, description="Yêu cầu ký tự đặc biệt")
     require_numbers: Optional[bool] = Field(True, description="Yêu cầu chữ số")
 
@@ -0,0 +1,63 @@
+"""
+Number Extractor Module
+
+Tách các dãy số (số điện thoại, CCCD, số tài khoản, ...) khỏi tin nhắn tự do. Chấp nhận
+cách viết thường gặp trong chat: có dấu cách / dấu chấm / gạch ngang giữa các nhóm số
+("0912 345 678", "0912.345.678") và tiền tố quốc tế "+84".
+"""
+
+import re
+from typing import List, NamedTuple
+
+# Dãy chữ số, giữa hai chữ số có thể có một ký tự phân cách; cho phép "+" ở đầu
+_NUMBER_PATTERN = re.compile(r"(?<![\w+])\+?\d(?:[ .\-]?\d)*(?!\w)")
+
+# Độ dài hợp lệ của các loại số trong hệ thống, dùng khi phải tách một cụm số bị dính
+_KNOWN_LENGTHS = (6, 10, 11, 12)
+
+
+class NumberMatch(NamedTuple):
+    """Một dãy số tìm thấy trong tin nhắn"""
+    digits: str   # Chỉ gồm chữ số
+    raw: str      # Đoạn văn bản gốc
+    start: int
+    end: int
+
+
+def _split_group(match: re.Match) -> List[NumberMatch]:
+    """
+    Tách một cụm số viết liền bằng dấu cách thành nhiều số khi cả cụm không phải độ dài hợp lệ
+    (ví dụ "0912345678 0987654321" là hai số điện thoại, "0912 345 678" là một)
+    """
+    raw = match.group(0)
+    digits = re.sub(r"\D", "", raw)
+    if len(digits) in _KNOWN_LENGTHS or " " not in raw:
+        return [NumberMatch(digits, raw, match.start(), match.end())]
+
+    parts = []
+    for part in re.finditer(r"\S+", raw):
+        part_digits = re.sub(r"\D", "", part.group(0))
+        if part_digits:
+            start = match.start() + part.start()
+            parts.append(NumberMatch(part_digits, part.group(0), start, start + len(part.group(0))))
+    # Chỉ tách khi mọi phần đều là số đầy đủ, nếu không giữ nguyên cụm
+    if len(parts) > 1 and all(len(part.digits) >= min(_KNOWN_LENGTHS) for part in parts):
+        return parts
+    return [NumberMatch(digits, raw, match.start(), match.end())]
+
+
+def extract_numbers(text: str, min_digits: int = 1) -> List[NumberMatch]:
+    """
+    Tìm các dãy số trong văn bản
+
+    Args:
+        text (str): Văn bản cần tìm
+        min_digits (int): Bỏ qua các dãy ngắn hơn số chữ số này
+
+    Returns:
+        List[NumberMatch]: Các dãy số theo thứ tự xuất hiện
+    """
+    numbers = []
+    for match in _NUMBER_PATTERN.finditer(text):
+        numbers.extend(number for number in _split_group(match) if len(number.digits) >= min_digits)
+    return numbers
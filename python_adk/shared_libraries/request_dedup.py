@@ -0,0 +1,195 @@
+"""
+Request Dedup Module
+
+Gộp các request trùng nhau cho endpoint chat / phân tích:
+- SingleFlight: các request giống hệt nhau đến cùng lúc (gateway retry khi timeout, nhiều tab
+  hỏi cùng một câu) dùng chung một lượt tính toán đang chạy thay vì mỗi request gọi model riêng.
+- IdempotencyStore: request có header `Idempotency-Key` trùng với một request đã hoàn tất gần đây
+  nhận lại đúng response đã lưu, không chạy lại.
+"""
+
+import asyncio
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, Hashable, NamedTuple, Optional
+
+from fastapi.responses import Response
+
+from python_adk.shared_libraries.cache import LRUCache
+
+
+def request_fingerprint(route: str, body: str) -> str:
+    """
+    Dấu vân tay của request (route + nội dung đã chuẩn hóa)
+
+    Args:
+        route (str): Đường dẫn endpoint
+        body (str): Nội dung request (JSON của model đã xác thực)
+
+    Returns:
+        str: Chuỗi băm sha256
+    """
+    return hashlib.sha256(f"{route}\n{body}".encode("utf-8")).hexdigest()
+
+
+class StoredResponse(NamedTuple):
+    """Response đã hoàn tất, có thể trả lại cho nhiều request"""
+    fingerprint: str
+    status_code: int
+    body: bytes
+    media_type: Optional[str]
+
+    @classmethod
+    def from_response(cls, fingerprint: str, response: Response) -> "StoredResponse":
+        """Lưu lại status / body của một Response"""
+        return cls(fingerprint, response.status_code, bytes(response.body), response.media_type)
+
+    def to_response(self, replayed: bool = False) -> Response:
+        """
+        Tạo Response mới cho request hiện tại
+
+        Args:
+            replayed (bool): Đánh dấu header `Idempotent-Replayed` khi trả lại response đã lưu
+        """
+        headers = {"Idempotent-Replayed": "true"} if replayed else None
+        return Response(content=self.body, status_code=self.status_code, media_type=self.media_type, headers=headers)
+
+
+class SingleFlight:
+    """Gộp các lượt tính toán có cùng khóa đang chạy đồng thời"""
+
+    def __init__(self, enabled: bool = True):
+        """
+        Khởi tạo SingleFlight
+
+        Args:
+            enabled (bool): Bật gộp request (tắt thì mỗi lượt gọi chạy riêng)
+        """
+        self.enabled = enabled
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+        # Thống kê
+        self.leaders = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Chạy `fn` hoặc chờ lượt đang chạy có cùng khóa
+
+        Lượt tính toán chạy trong task riêng: request đầu tiên bị hủy (client ngắt kết nối)
+        không làm hủy kết quả của các request đang chờ.
+
+        Args:
+            key (Hashable): Khóa của lượt tính toán
+            fn (Callable[[], Awaitable[Any]]): Hàm bất đồng bộ tính kết quả
+
+        Returns:
+            Any: Kết quả (lỗi của `fn` được ném lại cho mọi request đang chờ)
+        """
+        if not self.enabled:
+            return await fn()
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+            self.leaders += 1
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        """Bỏ lượt đã xong khỏi danh sách đang chạy"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Đọc lỗi để asyncio không cảnh báo khi mọi request chờ đã bị hủy
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Lấy thống kê gộp request
+
+        Returns:
+            Dict[str, Any]: Số lượt tính toán thực sự, số request dùng chung kết quả và số lượt đang chạy
+        """
+        return {
+            "enabled": self.enabled,
+            "inflight": len(self._inflight),
+            "leaders": self.leaders,
+            "shared": self.shared
+        }
+
+
+class IdempotencyStore:
+    """Lưu response theo (endpoint, Idempotency-Key) trong một khoảng thời gian"""
+
+    def __init__(self, max_entries: int = 10000, ttl: Optional[float] = 600, max_bytes: Optional[int] = 32 * 1024 * 1024):
+        """
+        Khởi tạo IdempotencyStore
+
+        Args:
+            max_entries (int): Số response lưu tối đa
+            ttl (Optional[float]): Thời gian lưu mỗi response (giây)
+            max_bytes (Optional[int]): Tổng dung lượng tối đa (byte)
+        """
+        self._cache = LRUCache(
+            max_entries=max_entries,
+            ttl=ttl,
+            max_bytes=max_bytes,
+            name="idempotency",
+            size_of=lambda stored: len(stored.body)
+        )
+        self.conflicts = 0
+
+    def get(self, route: str, key: str, fingerprint: str) -> Optional[StoredResponse]:
+        """
+        Lấy response đã lưu cho khóa idempotency của endpoint
+
+        Args:
+            route (str): Đường dẫn endpoint
+            key (str): Giá trị header Idempotency-Key
+            fingerprint (str): Dấu vân tay của request hiện tại
+
+        Returns:
+            Optional[StoredResponse]: Response đã lưu, None nếu chưa có
+
+        Raises:
+            ValueError: Nếu khóa đã được dùng cho một request có nội dung khác
+        """
+        stored = self._cache.get((route, key))
+        if stored is not None and stored.fingerprint != fingerprint:
+            self.conflicts += 1
+            raise ValueError("Idempotency-Key đã được dùng cho một request có nội dung khác")
+        return stored
+
+    def set(self, route: str, key: str, stored: StoredResponse) -> None:
+        """Lưu response đã hoàn tất cho khóa idempotency của endpoint"""
+        self._cache.set((route, key), stored)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Lấy thống kê
+
+        Returns:
+            Dict[str, Any]: Thống kê LRU (hit = số lần trả lại response đã lưu) và số lần khóa bị dùng lại
+                với nội dung khác
+        """
+        return {**self._cache.stats(), "conflicts": self.conflicts}
+
+
+def _create_single_flight() -> SingleFlight:
+    """Tạo SingleFlight dùng chung từ cấu hình ứng dụng"""
+    from python_adk.config.config import AppConfig
+    return SingleFlight(enabled=AppConfig().single_flight_enabled)
+
+
+def _create_idempotency_store() -> IdempotencyStore:
+    """Tạo IdempotencyStore dùng chung từ cấu hình ứng dụng"""
+    from python_adk.config.config import AppConfig
+    return IdempotencyStore(**AppConfig().idempotency_config)
+
+
+# Dùng chung cho các endpoint chat / phân tích
+single_flight = _create_single_flight()
+idempotency_store = _create_idempotency_store()
@@ -0,0 +1,277 @@
+"""
+Response Cache Module
+
+Bộ nhớ đệm câu trả lời của agent cho các câu hỏi gần như trùng nhau ("ý nghĩa sao Thiên Y
+là gì", "Ý nghĩa sao thiên y là gì?"). Khóa cache là tin nhắn đã chuẩn hóa: bỏ dấu tiếng Việt,
+chữ thường, gộp khoảng trắng / dấu câu. Các số trong tin nhắn giữ nguyên trong khóa vì chúng
+quyết định nội dung câu trả lời (năm sinh 1990 và 1985 cho hai câu trả lời khác nhau); tin nhắn
+chứa số dài (số điện thoại, CCCD, số tài khoản) là câu hỏi cá nhân nên không dùng cache.
+
+Câu trả lời chỉ được dùng chung khi không phụ thuộc ngữ cảnh riêng của người hỏi:
+- Chỉ lưu câu trả lời của lượt đầu tiên trong phiên (hoặc request không có phiên), khi agent
+  chưa có lịch sử hội thoại nào để dựa vào.
+- Lượt sau chỉ đọc cache với câu hỏi kiến thức tự đủ nghĩa ("... là gì", "ý nghĩa ...") không
+  nhắc tới người hỏi ("của tôi", "số mình", "bạn", ...); câu trả lời ngắn tiếp nối hội thoại
+  ("Có, phân tích giúp tôi") luôn đi qua agent.
+- Không lưu câu trả lời chứa số dài hoặc số (từ 3 chữ số) không có trong tin nhắn, vì đó là dữ
+  liệu lấy từ lịch sử hội thoại của người khác.
+"""
+
+import re
+import time
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from python_adk.shared_libraries.cache import LRUCache
+from python_adk.shared_libraries.metrics import LatencyStats
+
+_NUMBER = re.compile(r"\d+")
+_NON_WORD = re.compile(r"[^\w]+")
+# Nhóm chữ số viết tách ("0912 345 678", "0912.345.678")
+_DIGIT_SEPARATOR = re.compile(r"(?<=\d)[ .\-](?=\d)")
+
+# Cụm từ (đã bỏ dấu) của câu hỏi kiến thức tự đủ nghĩa
+FAQ_PHRASES = ("la gi", "y nghia", "nghia la", "co nghia", "la sao nao", "la cap nao")
+# Từ (đã bỏ dấu) trỏ về nội dung trước đó trong hội thoại
+FOLLOW_UP_WORDS = frozenset(("do", "nay", "kia", "ay", "tren", "vua", "nua", "tiep", "vay"))
+# Từ (đã bỏ dấu) nhắc tới người hỏi / người trả lời: câu trả lời có thể dựa vào dữ liệu riêng của họ
+PERSONAL_WORDS = frozenset(("toi", "tui", "minh", "em", "anh", "ban"))
+# Câu hỏi kiến thức phải có ít nhất số từ này
+MIN_FAQ_WORDS = 4
+
+
+def fold_text(text: str) -> str:
+    """
+    Bỏ dấu tiếng Việt, chuyển chữ thường, gộp khoảng trắng và dấu câu
+
+    Args:
+        text (str): Văn bản gốc
+
+    Returns:
+        str: Văn bản đã chuẩn hóa
+    """
+    decomposed = unicodedata.normalize("NFD", text.lower().replace("đ", "d").replace("Đ", "d"))
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return _NON_WORD.sub(" ", stripped).strip()
+
+
+def extract_digit_runs(text: str) -> List[str]:
+    """
+    Lấy các dãy chữ số trong văn bản (nhóm số viết tách được gộp lại)
+
+    Args:
+        text (str): Văn bản
+
+    Returns:
+        List[str]: Các dãy chữ số theo thứ tự xuất hiện
+    """
+    return _NUMBER.findall(_DIGIT_SEPARATOR.sub("", text))
+
+
+def normalize_prompt(message: str, max_digits: int = 8) -> Optional[str]:
+    """
+    Chuẩn hóa tin nhắn thành khóa cache (số giữ nguyên)
+
+    Args:
+        message (str): Tin nhắn của người dùng
+        max_digits (int): Số có nhiều chữ số hơn làm tin nhắn không được cache
+
+    Returns:
+        Optional[str]: Khóa, None nếu tin nhắn không được cache
+    """
+    folded = fold_text(message)
+    if not folded:
+        return None
+    if any(len(digits) > max_digits for digits in extract_digit_runs(message)):
+        return None
+    return folded
+
+
+def is_standalone_question(message: str) -> bool:
+    """
+    Tin nhắn có phải câu hỏi kiến thức tự đủ nghĩa (không dựa vào các lượt trước) không
+
+    Args:
+        message (str): Tin nhắn của người dùng
+
+    Returns:
+        bool: True nếu có cụm từ hỏi kiến thức, đủ dài, không có từ trỏ về nội dung trước đó
+            và không nhắc tới người hỏi ("số điện thoại của tôi")
+    """
+    folded = fold_text(message)
+    words = folded.split()
+    if len(words) < MIN_FAQ_WORDS or FOLLOW_UP_WORDS.intersection(words) or PERSONAL_WORDS.intersection(words):
+        return False
+    return any(phrase in folded for phrase in FAQ_PHRASES)
+
+
+def foreign_numbers(message: str, response: str, max_digits: int = 8) -> Optional[str]:
+    """
+    Kiểm tra câu trả lời có chứa số không đến từ tin nhắn không
+
+    Args:
+        message (str): Tin nhắn của người dùng
+        response (str): Câu trả lời của agent
+        max_digits (int): Số có nhiều chữ số hơn luôn bị coi là dữ liệu cá nhân
+
+    Returns:
+        Optional[str]: Lý do ("long_number" / "foreign_number"), None nếu câu trả lời dùng chung được.
+            Số 1-2 chữ số (cặp số, số thứ tự) không bị tính.
+    """
+    prompt_numbers = set(extract_digit_runs(message))
+    for digits in extract_digit_runs(response):
+        if len(digits) > max_digits:
+            return "long_number"
+        if len(digits) >= 3 and digits not in prompt_numbers:
+            return "foreign_number"
+    return None
+
+
+class ResponseCache:
+    """Cache câu trả lời theo (agent, tin nhắn đã chuẩn hóa)"""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        max_entries: int = 5000,
+        ttl: Optional[float] = 3600,
+        max_bytes: Optional[int] = 16 * 1024 * 1024,
+        exclude_agents: Iterable[str] = (),
+        max_chars: int = 300
+    ):
+        """
+        Khởi tạo ResponseCache
+
+        Args:
+            enabled (bool): Bật cache
+            max_entries (int): Số câu trả lời tối đa (LRU)
+            ttl (Optional[float]): Thời gian sống của mỗi câu trả lời (giây)
+            max_bytes (Optional[int]): Tổng dung lượng tối đa (byte)
+            exclude_agents (Iterable[str]): Tên agent không dùng cache (câu trả lời mang tính cá nhân)
+            max_chars (int): Tin nhắn dài hơn không dùng cache
+        """
+        self.enabled = enabled
+        self.exclude_agents = set(exclude_agents)
+        self.max_chars = max_chars
+        self._cache = LRUCache(
+            max_entries=max_entries,
+            ttl=ttl,
+            max_bytes=max_bytes,
+            name="response",
+            size_of=lambda value: len(value.encode("utf-8"))
+        )
+
+        # Thống kê
+        self.bypassed: Dict[str, int] = {}
+        self.rejected: Dict[str, int] = {}
+        self.stored = 0
+        self.hit_latency = LatencyStats()
+
+    def _key(self, message: str, agent_name: str, first_turn: bool) -> Optional[Tuple[str, str]]:
+        """Khóa cache của tin nhắn, None (kèm ghi nhận lý do) nếu không dùng cache"""
+        reason = None
+        key = None
+        if not self.enabled:
+            reason = "disabled"
+        elif agent_name in self.exclude_agents:
+            reason = "agent_opt_out"
+        elif not message or len(message) > self.max_chars:
+            reason = "length"
+        elif not first_turn and not is_standalone_question(message):
+            reason = "follow_up"
+        else:
+            key = normalize_prompt(message)
+            if key is None:
+                reason = "personal_number"
+        if reason:
+            self.bypassed[reason] = self.bypassed.get(reason, 0) + 1
+            return None
+        return agent_name, key
+
+    def get(self, message: str, agent_name: str, first_turn: bool = True) -> Optional[str]:
+        """
+        Lấy câu trả lời đã lưu cho tin nhắn
+
+        Args:
+            message (str): Tin nhắn của người dùng
+            agent_name (str): Tên agent sẽ xử lý tin nhắn
+            first_turn (bool): Lượt đầu tiên của phiên (hoặc request không có phiên)
+
+        Returns:
+            Optional[str]: Câu trả lời, None nếu không có
+        """
+        started = time.perf_counter()
+        key = self._key(message, agent_name, first_turn)
+        if key is None:
+            return None
+        response = self._cache.get(key)
+        if response is None:
+            return None
+        self.hit_latency.observe(time.perf_counter() - started)
+        return response
+
+    def set(self, message: str, agent_name: str, response: Any, first_turn: bool = True) -> bool:
+        """
+        Lưu câu trả lời của agent
+
+        Args:
+            message (str): Tin nhắn của người dùng
+            agent_name (str): Tên agent đã xử lý tin nhắn
+            response (Any): Câu trả lời
+            first_turn (bool): Lượt đầu tiên của phiên (hoặc request không có phiên); chỉ lượt
+                đầu tiên được lưu
+
+        Returns:
+            bool: True nếu đã lưu
+        """
+        if not isinstance(response, str) or not response.strip():
+            return False
+        if not self.enabled or agent_name in self.exclude_agents:
+            return False
+        if not message or len(message) > self.max_chars:
+            return False
+        # Lượt sau có thể dựa vào lịch sử riêng của phiên, kể cả khi câu hỏi trông như câu hỏi chung
+        if not first_turn:
+            return False
+        key = normalize_prompt(message)
+        if key is None:
+            return False
+        reason = foreign_numbers(message, response)
+        if reason:
+            self.rejected[reason] = self.rejected.get(reason, 0) + 1
+            return False
+        stored = self._cache.set((agent_name, key), response)
+        self.stored += int(stored)
+        return stored
+
+    def clear(self) -> None:
+        """Xóa toàn bộ câu trả lời đã lưu"""
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Lấy thống kê cache câu trả lời
+
+        Returns:
+            Dict[str, Any]: Thống kê LRU (hit / miss / hit rate / eviction), số lần bỏ qua theo lý do,
+                số câu trả lời bị từ chối lưu theo lý do, số câu trả lời đã lưu và độ trễ khi trúng cache
+        """
+        return {
+            "enabled": self.enabled,
+            **self._cache.stats(),
+            "bypassed": dict(self.bypassed),
+            "rejected": dict(self.rejected),
+            "stored": self.stored,
+            "exclude_agents": sorted(self.exclude_agents),
+            "hit_latency": self.hit_latency.snapshot()
+        }
+
+
+def _create_response_cache() -> ResponseCache:
+    """Tạo cache câu trả lời dùng chung từ cấu hình ứng dụng"""
+    from python_adk.config.config import AppConfig
+    return ResponseCache(**AppConfig().response_cache_config)
+
+
+# Cache câu trả lời dùng chung cho các endpoint chat
+response_cache = _create_response_cache()
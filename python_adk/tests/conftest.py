@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Đưa thư mục gốc của project (thư mục cha của python_adk) vào sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
@@ -0,0 +1,96 @@
+import asyncio
+import itertools
+
+import pytest
+
+from python_adk.agents.agent_pool import AgentOverloadedError, AgentPool
+
+
+def _pool(**kwargs):
+    counter = itertools.count()
+    return AgentPool("test", lambda: f"agent-{next(counter)}", **kwargs)
+
+
+def test_instances_are_reused():
+    async def scenario():
+        pool = _pool(size=2)
+        seen = []
+        for _ in range(3):
+            async with pool.acquire() as agent:
+                seen.append(agent)
+        async with pool.acquire() as first:
+            async with pool.acquire() as second:
+                seen.extend([first, second])
+        return seen, pool.stats()
+
+    seen, stats = asyncio.run(scenario())
+    assert seen == ["agent-0", "agent-0", "agent-0", "agent-0", "agent-1"]
+    assert stats["created"] == 2 and stats["served"] == 5 and stats["in_use"] == 0
+
+
+def test_full_wait_queue_is_rejected_with_429():
+    async def scenario():
+        pool = _pool(size=1, max_waiters=1, wait_timeout=5)
+        release = asyncio.Event()
+
+        async def hold():
+            async with pool.acquire():
+                await release.wait()
+
+        async def use():
+            async with pool.acquire() as agent:
+                return agent
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(use())
+        await asyncio.sleep(0)
+        with pytest.raises(AgentOverloadedError) as error:
+            async with pool.acquire():
+                pass
+        release.set()
+        await holder
+        return error.value, await waiter, pool.stats()
+
+    error, waited, stats = asyncio.run(scenario())
+    assert error.status_code == 429
+    assert waited == "agent-0"
+    assert stats["rejected"] == 1 and stats["waiting"] == 0
+
+
+def test_wait_timeout_is_503_with_retry_after():
+    async def scenario():
+        pool = _pool(size=1, wait_timeout=0.05)
+        async with pool.acquire():
+            with pytest.raises(AgentOverloadedError) as error:
+                async with pool.acquire():
+                    pass
+        return error.value, pool.stats()
+
+    error, stats = asyncio.run(scenario())
+    assert error.status_code == 503 and error.retry_after == 1
+    assert stats["timeouts"] == 1 and stats["waiting"] == 0
+
+
+def test_failed_create_releases_the_slot():
+    calls = []
+
+    def factory():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("không dựng được agent")
+        return "agent"
+
+    async def scenario():
+        pool = AgentPool("test", factory, size=1, wait_timeout=0.05)
+        with pytest.raises(RuntimeError):
+            async with pool.acquire():
+                pass
+        # Slot đã được trả: lần mượn sau không phải chờ (nếu không sẽ hết thời gian chờ)
+        async with pool.acquire() as agent:
+            pass
+        return agent, pool.stats()
+
+    agent, stats = asyncio.run(scenario())
+    assert agent == "agent"
+    assert stats["created"] == 1 and stats["in_use"] == 0 and stats["timeouts"] == 0
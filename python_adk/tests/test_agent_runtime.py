@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("google.adk")
+
+from google.adk.agents import BaseAgent
+from google.adk.events import Event
+from google.genai import types
+
+from python_adk.agents.agent_runtime import AgentRuntime
+
+
+class EchoAgent(BaseAgent):
+    """Agent trả lời số event đã có trong session, không gọi model"""
+
+    async def _run_async_impl(self, ctx):
+        text = f"seen {len(ctx.session.events)}"
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            content=types.Content(role="model", parts=[types.Part(text=text)])
+        )
+
+
+def _stored_sessions(runtime):
+    sessions = runtime._services["session_service"].sessions.get(runtime.app_name, {})
+    return sorted(session_id for by_user in sessions.values() for session_id in by_user)
+
+
+def test_session_keeps_history_and_ephemeral_is_deleted():
+    async def scenario():
+        runtime = AgentRuntime()
+        agent = EchoAgent(name="echo")
+        assert await runtime.run(agent, "a", session_id="s1") == "seen 1"
+        assert await runtime.run(agent, "b", session_id="s1") == "seen 3"
+        await runtime.run(agent, "c")
+        return _stored_sessions(runtime)
+
+    assert asyncio.run(scenario()) == ["s1"]
+
+
+def test_sessions_are_bounded_by_count_and_idle_time():
+    async def scenario():
+        runtime = AgentRuntime(max_sessions=3, session_ttl=0.2)
+        agent = EchoAgent(name="echo")
+        for index in range(5):
+            await runtime.run(agent, "x", session_id=f"s{index}")
+        by_count = _stored_sessions(runtime)
+        await asyncio.sleep(0.25)
+        await runtime.run(agent, "x", session_id="late")
+        return by_count, _stored_sessions(runtime), runtime.stats()["evicted_sessions"]
+
+    by_count, by_idle, evicted = asyncio.run(scenario())
+    assert by_count == ["s2", "s3", "s4"]
+    assert by_idle == ["late"]
+    assert evicted == 5
+
+
+def test_end_session():
+    async def scenario():
+        runtime = AgentRuntime()
+        agent = EchoAgent(name="echo")
+        await runtime.run(agent, "x", session_id="s1", user_id="u1")
+        await runtime.run(agent, "x", session_id="s2", user_id="u1")
+        await runtime.run(agent, "x", session_id="s2", user_id="u2")
+        missing = await runtime.end_session("s1", "u2")
+        ended = await runtime.end_session("s1", "u1")
+        ended_all = await runtime.end_session("s2")
+        return missing, ended, ended_all, _stored_sessions(runtime), runtime._session_users
+
+    assert asyncio.run(scenario()) == (0, 1, 2, [], {})
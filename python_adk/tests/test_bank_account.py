@@ -0,0 +1,75 @@
+import itertools
+
+import pytest
+
+from python_adk.agents.batcuclinh_so_agent.tools.bank_account_analyzer import (
+    ENERGY_MATCH_SCORE,
+    LUCKY_DIGIT_SCORE,
+    SPECIAL_PAIR_SCORE,
+    UNLUCKY_DIGIT_SCORE,
+    bank_account_analyzer,
+    score_bank_account,
+)
+from python_adk.agents.batcuclinh_so_agent.tools.bank_account_suggester import search_bank_accounts
+
+
+def test_weights():
+    assert (LUCKY_DIGIT_SCORE, UNLUCKY_DIGIT_SCORE, SPECIAL_PAIR_SCORE, ENERGY_MATCH_SCORE) == (1, -1, 2, 3)
+
+
+@pytest.mark.parametrize("digits, purpose, expected", [
+    # 1 + 2 + 3 + 0 = 6 -> năng lượng 6, không có chữ số may mắn / xui
+    ("123", None, {"energy_number": 6, "special_pairs": [], "lucky_count": 0, "unlucky_count": 0, "score": 0}),
+    # Năng lượng 6 hợp "personal": chỉ cộng điểm năng lượng
+    ("123", "personal", {"energy_number": 6, "special_pairs": [], "lucky_count": 0, "unlucky_count": 0, "score": 3}),
+    ("123", "Personal", {"energy_number": 6, "special_pairs": [], "lucky_count": 0, "unlucky_count": 0, "score": 3}),
+    ("123", "business", {"energy_number": 6, "special_pairs": [], "lucky_count": 0, "unlucky_count": 0, "score": 0}),
+    # 6, 8 may mắn (+2), cặp 68 (+2), 4, 7 xui (-2); tổng 25 -> năng lượng 7
+    ("6847", None, {"energy_number": 7, "special_pairs": ["68"], "lucky_count": 2, "unlucky_count": 2, "score": 2}),
+    # Cặp lặp lại được tính mỗi lần xuất hiện, theo thứ tự SPECIAL_PAIRS; tổng 46 -> năng lượng 1
+    ("896896", None, {
+        "energy_number": 1, "special_pairs": ["68", "89", "89", "96", "96"],
+        "lucky_count": 6, "unlucky_count": 0, "score": 16
+    }),
+    # Tổng chia hết cho 9 -> năng lượng 9
+    ("999", "personal", {"energy_number": 9, "special_pairs": [], "lucky_count": 3, "unlucky_count": 0, "score": 6}),
+])
+def test_score_bank_account(digits, purpose, expected):
+    assert score_bank_account(digits, purpose) == expected
+
+
+def test_analyzer_uses_shared_score():
+    result = bank_account_analyzer("0123-6847")
+    analysis = result["analysis"]
+    scored = score_bank_account("01236847")
+    assert analysis["score"] == scored["score"]
+    assert analysis["energyNumber"] == scored["energy_number"]
+    assert analysis["specialPairs"] == scored["special_pairs"]
+    assert (analysis["luckyCount"], analysis["unluckyCount"]) == (scored["lucky_count"], scored["unlucky_count"])
+
+
+@pytest.mark.parametrize("prefix, length, purpose", [
+    ("", 4, None),
+    ("1", 5, "business"),
+    ("47", 6, "savings"),
+    ("9", 5, "investment"),
+])
+def test_search_matches_brute_force(prefix, length, purpose):
+    count = 10
+    accounts = [
+        prefix + "".join(tail) for tail in itertools.product("0123456789", repeat=length - len(prefix))
+    ]
+    expected = sorted((score_bank_account(account, purpose)["score"] for account in accounts), reverse=True)[:count]
+
+    result = search_bank_accounts(prefix, length, purpose, count)
+    assert [score for _, score in result] == expected
+    assert len({account for account, _ in result}) == count
+    for account, score in result:
+        assert account.startswith(prefix) and len(account) == length
+        assert score_bank_account(account, purpose)["score"] == score
+
+
+def test_seed_only_reorders_equal_scores():
+    plain = search_bank_accounts("", 5, "personal", 20)
+    seeded = search_bank_accounts("", 5, "personal", 20, seed=1)
+    assert [score for _, score in plain] == [score for _, score in seeded]
@@ -0,0 +1,145 @@
+import pytest
+
+from python_adk.shared_libraries import cache as cache_module
+from python_adk.shared_libraries.cache import LRUCache, hash_key, memoize_analysis
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(cache_module.time, "monotonic", fake)
+    return fake
+
+
+def test_lru_hit_miss_and_recency():
+    cache = LRUCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)  # "b" ít được dùng nhất nên bị loại
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 1, 1)
+
+
+def test_lru_ttl_expiry(clock):
+    cache = LRUCache(ttl=10)
+    cache.set("a", 1)
+    clock.now += 9.9
+    assert cache.get("a") == 1
+    clock.now += 0.2
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+    assert len(cache) == 0
+
+
+def test_lru_byte_budget_eviction():
+    cache = LRUCache(max_entries=100, max_bytes=10, size_of=len)
+    cache.set("a", "xxxx")
+    cache.set("b", "yyyy")
+    cache.set("c", "zzzz")  # vượt 10 byte: loại "a"
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 8
+    # Giá trị lớn hơn toàn bộ ngân sách không được lưu
+    assert cache.set("big", "x" * 11) is False
+    assert cache.get("b") == "yyyy"
+
+
+def _counting_analyzer(cache):
+    calls = []
+
+    @memoize_analysis("test", cache=cache)
+    def analyze(value, purpose=None):
+        calls.append((value, purpose))
+        if value == "bad":
+            raise ValueError("bad input")
+        return {"value": value, "purpose": purpose, "items": [1, 2]}
+
+    return analyze, calls
+
+
+def test_memoize_key_ignores_call_form():
+    analyze, calls = _counting_analyzer(LRUCache())
+    first = analyze("0912345678")
+    assert analyze("0912345678", None) == first
+    assert analyze("0912345678", purpose=None) == first
+    assert analyze(value="0912345678") == first
+    assert len(calls) == 1
+    analyze("0912345678", "business")
+    assert len(calls) == 2
+
+
+def test_memoize_returns_independent_copies():
+    analyze, calls = _counting_analyzer(LRUCache())
+    first = analyze("0912345678")
+    first["items"].append(3)
+    second = analyze("0912345678")
+    assert second["items"] == [1, 2]
+    second["value"] = "changed"
+    assert analyze("0912345678")["value"] == "0912345678"
+    assert len(calls) == 1
+
+
+def test_memoize_passes_input_unchanged():
+    analyze, calls = _counting_analyzer(LRUCache())
+    assert analyze(" 0912 345 678 ")["value"] == " 0912 345 678 "
+    assert calls == [(" 0912 345 678 ", None)]
+
+
+def test_memoize_does_not_cache_errors():
+    cache = LRUCache()
+    analyze, calls = _counting_analyzer(cache)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            analyze("bad")
+    assert len(calls) == 2
+    assert len(cache) == 0
+
+
+def test_memoize_ttl_and_byte_budget(clock):
+    cache = LRUCache(ttl=5, max_bytes=400)
+    analyze, calls = _counting_analyzer(cache)
+    analyze("a")
+    clock.now += 6
+    analyze("a")
+    assert len(calls) == 2
+
+    for value in "bcdefghij":
+        analyze(value)
+    assert cache.stats()["bytes"] <= 400
+    assert cache.stats()["evictions"] > 0
+
+
+def test_memoize_key_function_hides_raw_value():
+    cache = LRUCache()
+
+    @memoize_analysis("password", key=hash_key, cache=cache)
+    def analyze(password):
+        return {"length": len(password)}
+
+    analyze("secret123")
+    assert analyze("secret123") == {"length": 9}
+    assert all("secret123" not in repr(key) for key in cache._entries)
+
+
+def test_memoize_unhashable_arguments_bypass_cache():
+    cache = LRUCache()
+    calls = []
+
+    @memoize_analysis("list", cache=cache)
+    def analyze(values):
+        calls.append(values)
+        return len(values)
+
+    assert analyze([1, 2]) == 2
+    assert analyze([1, 2]) == 2
+    assert len(calls) == 2
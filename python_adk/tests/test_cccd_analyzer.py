@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+from python_adk.agents.batcuclinh_so_agent.tools.cccd_analyzer import cccd_analyzer
+from python_adk.constants.star_index import PAIR_INDEX, star_pairs
+
+
+def test_zero_five_groups_keep_clean_pair_and_adjust_energy():
+    analysis = cccd_analyzer("001203012345")["analysis"]
+    assert [(item["number"], item["digits"]) for item in analysis] == [
+        ("12", "12"), ("23", "203"), ("31", "301"), ("12", "12"), ("23", "23"), ("34", "34")
+    ]
+    thien_y = analysis[2]
+    assert thien_y["tinh"] == "THIEN_Y"
+    # Một số 0 trong nhóm "301" làm năng lượng giảm 1 so với bảng
+    assert thien_y["energy_level"] == thien_y["energy"][thien_y["number"]] - 1
+
+
+def test_matches_star_pairs_on_random_numbers():
+    rng = random.Random(2)
+    for _ in range(500):
+        number = "".join(rng.choice("0123456789") for _ in range(12))
+        analysis = cccd_analyzer(number)["analysis"]
+        expected = star_pairs(number)
+        assert [item["digits"] for item in analysis] == [item["pair"] for item in expected]
+        assert [item["tinh"] for item in analysis] == [item["star"] for item in expected]
+        assert [item["energy_level"] for item in analysis] == [item["energy"] for item in expected]
+        for item in analysis:
+            assert PAIR_INDEX[item["number"]].star == item["tinh"]
+            assert item["number"] in item["energy"]
+
+
+def test_combinations_use_clean_pairs():
+    result = cccd_analyzer("001203012345")
+    pairs = {item["number"] for item in result["analysis"]}
+    for combination in result["combinations"]:
+        left, right = combination["numbers"].split("-")
+        assert left in pairs and right in pairs
+
+
+@pytest.mark.parametrize("value", ["12345", "00120301234a", ""])
+def test_invalid_cccd(value):
+    with pytest.raises(ValueError):
+        cccd_analyzer(value)
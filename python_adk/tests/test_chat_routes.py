@@ -0,0 +1,67 @@
+import collections
+
+import pytest
+
+pytest.importorskip("google.adk")
+
+from fastapi.testclient import TestClient
+
+import python_adk.main as main
+from python_adk.agents.agent_pool import AgentOverloadedError
+from python_adk.agents.root_agent.tools import agent_router
+
+
+class RecordingRouter:
+    def __init__(self):
+        self.session_ids = []
+
+    async def execute(self, **kwargs):
+        self.session_ids.append(kwargs["session_id"])
+        return {"success": True, "response": "ok", "agent_type": kwargs["agent_type"]}
+
+
+class OverloadedRouter:
+    def __init__(self, error):
+        self.error = error
+
+    async def execute(self, **kwargs):
+        raise self.error
+
+    async def stream_to_agent(self, agent_type, request, session_id):
+        raise self.error
+        yield  # generator bất đồng bộ như AgentRouter.stream_to_agent
+
+
+def test_routes_are_not_shadowed():
+    routes = collections.Counter(
+        (route.path, method) for route in main.app.routes for method in getattr(route, "methods", ())
+    )
+    assert [key for key, count in routes.items() if count > 1] == []
+
+
+def test_anonymous_chat_does_not_create_session(monkeypatch):
+    router = RecordingRouter()
+    monkeypatch.setattr(agent_router, "get_agent_router", lambda: router)
+    client = TestClient(main.app)
+
+    anonymous = client.post("/chat/batcuclinh-so", json={"message": "xin chào"}).json()
+    named = client.post("/chat/batcuclinh-so", json={"message": "xin chào", "sessionId": "s1"}).json()
+
+    assert router.session_ids == [None, "s1"]
+    assert anonymous["result"]["sessionId"] is None
+    assert named["result"]["sessionId"] == "s1"
+
+
+@pytest.mark.parametrize("status_code, retry_after", [(429, 1), (503, 30)])
+def test_overloaded_pool_maps_to_http_status(monkeypatch, status_code, retry_after):
+    error = AgentOverloadedError("quá tải", status_code=status_code, retry_after=retry_after)
+    monkeypatch.setattr(agent_router, "get_agent_router", lambda: OverloadedRouter(error))
+    client = TestClient(main.app)
+
+    responses = [
+        client.post("/chat/batcuclinh-so", json={"message": "xin chào"}),
+        client.get("/stream", params={"message": "xin chào"}),
+    ]
+    for response in responses:
+        assert response.status_code == status_code
+        assert response.headers["Retry-After"] == str(retry_after)
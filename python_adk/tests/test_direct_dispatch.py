@@ -0,0 +1,92 @@
+import pytest
+
+pytest.importorskip("google.adk")
+
+from python_adk.agents.root_agent.direct_dispatch import DirectDispatcher
+from python_adk.agents.root_agent.tools import intent_classifier
+from python_adk.agents.root_agent.tools.intent_classifier import AgentType
+
+BAT_CUC = AgentType.BAT_CUC_LINH_SO
+
+
+class StubClassifier:
+    def __init__(self, intent):
+        self.intent = intent
+
+    def classify(self, message):
+        return self.intent
+
+
+class StubRootAgent:
+    name = "root_agent"
+
+    def __init__(self, sub_agents):
+        self.sub_agents = sub_agents
+
+    def find_sub_agent(self, name):
+        return self.sub_agents.get(name)
+
+
+def _intent(agent_type=BAT_CUC, confidence=0.9, keywords=("phân tích",), matches=None):
+    if matches is None:
+        matches = {agent_type: list(keywords)} if keywords else {}
+    return {"agent_type": agent_type, "confidence": confidence, "keywords": list(keywords), "matches": matches}
+
+
+@pytest.fixture
+def classify(monkeypatch):
+    def use(intent):
+        monkeypatch.setattr(intent_classifier, "get_intent_classifier", lambda: StubClassifier(intent))
+    return use
+
+
+@pytest.mark.parametrize("intent, expected", [
+    (_intent(), ("bat_cuc_linh_so_agent", "ok")),
+    (_intent(AgentType.PAYMENT, keywords=("thanh toán",)), ("payment_agent", "ok")),
+    (_intent(confidence=0.5), ("bat_cuc_linh_so_agent", "ok")),
+    (_intent(confidence=0.49), (None, "low_confidence")),
+    (_intent(AgentType.UNKNOWN, confidence=0.0, keywords=()), (None, "unknown")),
+    # Loại agent khác có từ khóa riêng: nhiều ý định, để root agent xử lý
+    (_intent(matches={BAT_CUC: ["phân tích"], AgentType.PAYMENT: ["thanh toán"]}), (None, "mixed")),
+    # Loại agent khác chỉ khớp từ khóa trùng với ý định chính: vẫn gọi thẳng
+    (_intent(keywords=("số", "phân tích"), matches={BAT_CUC: ["số", "phân tích"], AgentType.PAYMENT: ["số"]}),
+     ("bat_cuc_linh_so_agent", "ok")),
+])
+def test_route(classify, intent, expected):
+    classify(intent)
+    assert DirectDispatcher(min_confidence=0.5).route("tin nhắn") == expected
+
+
+def test_disabled_never_dispatches(classify):
+    classify(_intent())
+    assert DirectDispatcher(enabled=False).route("tin nhắn") == (None, "disabled")
+
+
+def test_select_falls_back_to_root_agent(classify):
+    sub_agent = object()
+    root = StubRootAgent({"bat_cuc_linh_so_agent": sub_agent})
+    dispatcher = DirectDispatcher()
+
+    classify(_intent())
+    assert dispatcher.select("tin nhắn", root) is sub_agent
+
+    classify(_intent(confidence=0.1))
+    assert dispatcher.select("tin nhắn", root) is root
+
+    # Sub-agent đích không có trong cây của root agent
+    classify(_intent(AgentType.USER, keywords=("đăng nhập",)))
+    assert dispatcher.select("tin nhắn", root) is root
+
+    stats = dispatcher.stats()
+    assert stats["dispatched"] == {"bat_cuc_linh_so_agent": 1}
+    assert stats["to_root"] == {"low_confidence": 1, "no_sub_agent": 1}
+    assert stats["dispatch_rate"] == round(1 / 3, 4)
+
+
+def test_select_with_real_classifier_and_agent_tree():
+    from python_adk.agents import get_root_agent
+
+    root = get_root_agent()
+    dispatcher = DirectDispatcher(min_confidence=0.5)
+    assert dispatcher.select("phân tích số điện thoại", root).name == "bat_cuc_linh_so_agent"
+    assert dispatcher.select("xin chào", root) is root
@@ -0,0 +1,45 @@
+import pytest
+
+pytest.importorskip("google.adk")
+
+from python_adk.agents.batcuclinh_so_agent.tools.cccd_analyzer import cccd_analyzer
+from python_adk.agents.root_agent.fast_path import FastPath
+
+
+@pytest.fixture
+def fast_path():
+    return FastPath(enabled=True)
+
+
+@pytest.mark.parametrize("message, expected", [
+    ("0912345678", ("phone", "0912345678")),
+    ("phân tích số 0912345678", ("phone", "0912345678")),
+    ("sđt 0912345678 có tốt không", ("phone", "0912345678")),
+    ("số 0912345678 thế nào", ("phone", "0912345678")),
+    ("cccd 001203012345", ("cccd", "001203012345")),
+    ("stk 896896 ra sao", ("bank_account", "896896")),
+])
+def test_accepts_clear_cut_requests(fast_path, message, expected):
+    assert fast_path.match(message) == (expected, "ok")
+
+
+@pytest.mark.parametrize("message, reason", [
+    ("sđt 0912345678 có hợp mệnh Hỏa không", "context"),
+    ("tôi sinh năm 1990, số 0912345678 thế nào", "context"),
+    ("so với số trước thì 0912345678 thế nào", "context"),
+    ("số 0912345678 có tốt hơn không", "context"),
+    ("tôi 1990, số 0912345678 thế nào", "numbers"),
+    ("số 0912345678 và 0987654321 thế nào", "numbers"),
+    ("gợi ý số giống 0912345678", "blocked"),
+    ("0912345678 hôm nay trời đẹp", "intent"),
+])
+def test_rejects_qualified_or_contextual_requests(fast_path, message, reason):
+    assert fast_path.match(message) == (None, reason)
+
+
+def test_cccd_answer_uses_adjusted_energy_of_clean_pair(fast_path):
+    reply = fast_path.answer("cccd 001203012345")
+    analysis = cccd_analyzer("001203012345")["analysis"]
+    assert "?" not in reply
+    for star in analysis:
+        assert f"- {star['digits']}: {star['name']} ({star['nature']}, năng lượng {star['energy_level']})" in reply
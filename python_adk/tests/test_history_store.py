@@ -0,0 +1,148 @@
+import os
+
+import pytest
+
+from python_adk.session.history_store import HistoryStore
+from python_adk.shared_libraries.cache import estimate_size
+
+
+def _message(index, role="user"):
+    return {"role": role, "content": f"tin nhắn {index:03d}", "timestamp": index}
+
+
+SIZE = estimate_size(_message(0))
+
+
+def _contents(messages):
+    return [message["content"] for message in messages]
+
+
+def test_invalid_compaction_mode():
+    with pytest.raises(ValueError):
+        HistoryStore(compaction="zip")
+
+
+def test_session_message_cap_keeps_latest_and_summarizes():
+    store = HistoryStore(max_messages=3)
+    for index in range(5):
+        store.append("s1", _message(index, "user" if index % 2 == 0 else "assistant"))
+
+    assert _contents(store.get("s1")) == _contents([_message(i) for i in (2, 3, 4)])
+    assert _contents(store.get("s1", limit=2)) == _contents([_message(i) for i in (3, 4)])
+    summary = store.get_summary("s1")
+    assert summary["evicted_messages"] == 2
+    assert summary["first_timestamp"] == 0 and summary["last_timestamp"] == 1
+    assert summary["roles"] == {"user": 1, "assistant": 1}
+    assert summary["excerpt"] == _message(0)["content"]
+
+    # Người gọi không sửa được tóm tắt trong kho
+    summary["roles"]["user"] = 99
+    assert store.get_summary("s1")["roles"]["user"] == 1
+
+
+def test_session_byte_cap_always_keeps_newest_message():
+    store = HistoryStore(max_session_bytes=SIZE * 2)
+    for index in range(4):
+        store.append("s1", _message(index))
+    assert len(store.get("s1")) == 2
+    assert store.stats()["bytes"] == SIZE * 2
+
+    big = {"role": "user", "content": "x" * (SIZE * 4), "timestamp": 9}
+    assert store.append("s1", big) == 1
+    assert store.get("s1") == [big]
+
+
+def test_drop_mode_keeps_no_summary():
+    store = HistoryStore(max_messages=1, compaction="drop")
+    store.append("s1", _message(0))
+    store.append("s1", _message(1))
+    assert store.get_summary("s1") is None
+    assert store.stats()["evicted_messages"] == 1
+
+
+def test_global_cap_evicts_least_recently_active_session_first():
+    store = HistoryStore(max_total_bytes=SIZE * 4)
+    store.append("a", _message(0))
+    store.append("b", _message(1))
+    store.append("a", _message(2))
+    store.append("b", _message(3))
+    # "a" vừa hoạt động nên "b" (cũ hơn) bị loại trước
+    store.append("a", _message(4))
+
+    assert _contents(store.get("b")) == [_message(3)["content"]]
+    assert len(store.get("a")) == 3
+    assert store.stats()["bytes"] <= SIZE * 4
+
+
+def test_summary_survives_when_session_is_fully_evicted():
+    store = HistoryStore(max_total_bytes=SIZE * 3)
+    store.append("old", _message(0))
+    store.append("old", _message(1))
+    for index in range(2, 5):
+        store.append("new", _message(index))
+
+    assert store.get("old") == []
+    summary = store.get_summary("old")
+    assert summary["evicted_messages"] == 2
+    assert store.stats()["archived_summaries"] == 1
+
+    # Phiên quay lại tiếp tục cộng dồn vào tóm tắt cũ
+    store.append("old", _message(5))
+    assert store.stats()["archived_summaries"] == 0
+    assert store.get_summary("old")["evicted_messages"] == 2
+
+
+def test_summaries_spill_to_disk_only_when_nothing_else_to_evict(tmp_path):
+    store = HistoryStore(max_total_bytes=SIZE, spill_dir=str(tmp_path))
+    store.append("old", _message(0))
+    store.append("new", _message(1))
+    store.append("new", _message(2))
+
+    assert store.stats()["archived_summaries"] == 0
+    assert store.stats()["bytes"] <= SIZE
+    assert store.get_summary("old")["evicted_messages"] == 1
+    assert store.get_summary("new")["evicted_messages"] == 1
+
+    # Tóm tắt trên đĩa được gộp với phần tóm tắt mới hơn trong bộ nhớ
+    store.append("old", _message(3))
+    store.append("old", _message(4))
+    summary = store.get_summary("old")
+    assert summary["evicted_messages"] == 2
+    assert summary["first_timestamp"] == 0
+    assert summary["excerpt"] == _message(3)["content"]
+
+
+def test_spill_writes_evicted_messages_in_order(tmp_path):
+    store = HistoryStore(max_messages=2, spill_dir=str(tmp_path))
+    for index in range(6):
+        store.append("s1", _message(index))
+
+    assert list(store.iter_spilled("s1")) == [_message(i) for i in range(4)]
+    assert _contents(store.get("s1")) == _contents([_message(4), _message(5)])
+
+
+def test_spill_file_names_do_not_collide(tmp_path):
+    store = HistoryStore(max_messages=1, spill_dir=str(tmp_path))
+    for session_id in ("a/b", "a_b", "a:b"):
+        store.append(session_id, _message(0, session_id))
+        store.append(session_id, _message(1))
+
+    assert len(os.listdir(tmp_path)) == 3
+    for session_id in ("a/b", "a_b", "a:b"):
+        assert list(store.iter_spilled(session_id)) == [_message(0, session_id)]
+
+
+def test_clear_removes_memory_summary_and_files(tmp_path):
+    store = HistoryStore(max_messages=1, max_total_bytes=SIZE, spill_dir=str(tmp_path))
+    store.append("s1", _message(0))
+    store.append("s1", _message(1))
+    store.append("s2", _message(2))
+    store.append("s2", _message(3))
+    assert os.listdir(tmp_path)
+
+    store.clear("s1")
+    store.clear("s2")
+    assert store.get("s1") == [] and store.get_summary("s1") is None
+    assert list(store.iter_spilled("s1")) == []
+    assert os.listdir(tmp_path) == []
+    assert store.stats()["bytes"] == 0
@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+pytest.importorskip("google.adk")
+
+from python_adk.agents.root_agent.tools.intent_classifier import AgentType, IntentClassifier
+
+
+def _legacy_classify(classifier, message):
+    """Cách chấm điểm cũ: kiểm tra chuỗi con cho từng từ khóa của từng nhóm"""
+    message = message.lower()
+
+    def detect(keywords):
+        found = [keyword for keyword in keywords if keyword in message]
+        return len(found), found
+
+    batcuc_score, batcuc_keywords = detect(classifier.batcuclinh_so_keywords)
+    payment_score, payment_keywords = detect(classifier.payment_keywords)
+    user_score, user_keywords = detect(classifier.user_keywords)
+
+    max_score = max(batcuc_score, payment_score, user_score)
+    if max_score == 0:
+        return AgentType.UNKNOWN, 0.0, []
+    if max_score == batcuc_score:
+        agent_type, score, keywords = AgentType.BAT_CUC_LINH_SO, batcuc_score, batcuc_keywords
+    elif max_score == payment_score:
+        agent_type, score, keywords = AgentType.PAYMENT, payment_score, payment_keywords
+    else:
+        agent_type, score, keywords = AgentType.USER, user_score, user_keywords
+    return agent_type, min(1.0, score / len(message.split()) * 3), keywords
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    return IntentClassifier()
+
+
+def test_matches_legacy_substring_loop(classifier):
+    rng = random.Random(3)
+    vocabulary = (
+        classifier.batcuclinh_so_keywords + classifier.payment_keywords + classifier.user_keywords
+        + ["tôi", "muốn", "xem", "giúp", "số", "này", "0912345678", "THANH TOÁN", "Đăng Nhập", "SĐT"]
+    )
+    for _ in range(1000):
+        message = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(1, 8)))
+        result = classifier.classify(message)
+        assert (result["agent_type"], result["confidence"], result["keywords"]) == _legacy_classify(
+            classifier, message
+        ), message
+
+
+def test_examples(classifier):
+    result = classifier.classify("Phân tích SĐT 0912345678 giúp tôi")
+    assert result["agent_type"] == AgentType.BAT_CUC_LINH_SO
+    assert result["keywords"] == ["sđt"]
+    assert classifier.classify("tôi muốn nâng cấp gói vip")["agent_type"] == AgentType.PAYMENT
+    assert classifier.classify("quên mật khẩu đăng nhập")["agent_type"] == AgentType.USER
+    assert classifier.classify("xin chào")["agent_type"] == AgentType.UNKNOWN
+
+
+def test_added_keywords_are_case_insensitive_and_deduplicated():
+    classifier = IntentClassifier()
+    classifier.add_keywords(AgentType.PAYMENT, ["Ví Điện Tử", "ví điện tử", "thanh toán"])
+    result = classifier.classify("nạp ví điện tử")
+    assert result["agent_type"] == AgentType.PAYMENT
+    assert result["keywords"] == ["Ví Điện Tử"]
@@ -0,0 +1,81 @@
+import random
+import unicodedata
+
+from python_adk.shared_libraries.keyword_automaton import KeywordAutomaton, normalize_text
+
+
+def _substring_search(groups, text):
+    text = normalize_text(text)
+    return {
+        group: [keyword for keyword in keywords if normalize_text(keyword) in text]
+        for group, keywords in groups.items()
+    }
+
+
+def _automaton(groups):
+    automaton = KeywordAutomaton()
+    for group, keywords in groups.items():
+        automaton.add_many(group, keywords)
+    return automaton
+
+
+def test_finds_keywords_of_every_group_in_one_pass():
+    automaton = _automaton({"phone": ["sđt", "sim"], "payment": ["thanh toán"], "user": ["login"]})
+    result = automaton.search("Thanh toán gói SIM cho sđt này")
+    assert result == {"phone": ["sđt", "sim"], "payment": ["thanh toán"], "user": []}
+
+
+def test_overlapping_and_nested_keywords_each_count_once():
+    automaton = _automaton({"g": ["he", "she", "his", "hers", "số", "số sim", "sim số"]})
+    assert automaton.search("ushers") == {"g": ["he", "she", "hers"]}
+    # "số" xuất hiện nhiều lần nhưng chỉ được tính một lần
+    assert automaton.search("số sim số") == {"g": ["số", "số sim", "sim số"]}
+
+
+def test_same_keyword_in_several_groups():
+    automaton = _automaton({"a": ["ngân hàng"], "b": ["ngân hàng", "hàng"]})
+    assert automaton.search("ngân hàng nào") == {"a": ["ngân hàng"], "b": ["ngân hàng", "hàng"]}
+
+
+def test_duplicate_keywords_are_deduplicated_after_normalization():
+    automaton = _automaton({"g": ["SIM", "sim", "Sim"]})
+    assert len(automaton) == 1
+    assert automaton.search("sim số đẹp") == {"g": ["SIM"]}
+
+
+def test_nfc_normalization_matches_decomposed_text_and_keywords():
+    keyword = "phong thủy"
+    decomposed = unicodedata.normalize("NFD", keyword)
+    assert decomposed != keyword
+
+    automaton = _automaton({"g": [keyword]})
+    assert automaton.search(f"xem {decomposed} số") == {"g": [keyword]}
+
+    automaton = _automaton({"g": [decomposed]})
+    assert automaton.search("XEM PHONG THỦY SỐ") == {"g": [decomposed]}
+
+
+def test_keywords_added_after_build_are_found():
+    automaton = _automaton({"g": ["abc"]})
+    assert automaton.search("xabcx") == {"g": ["abc"]}
+    automaton.add("g", "bcx")
+    assert automaton.search("xabcx") == {"g": ["abc", "bcx"]}
+
+
+def test_empty_keywords_and_text():
+    automaton = _automaton({"g": ["", "a"]})
+    assert len(automaton) == 1
+    assert automaton.search("") == {"g": []}
+
+
+def test_matches_substring_search_on_random_texts():
+    rng = random.Random(7)
+    alphabet = "abcđ ố"
+    groups = {
+        group: list({"".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(15)})
+        for group in ("x", "y", "z")
+    }
+    automaton = _automaton(groups)
+    for _ in range(500):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        assert automaton.search(text) == _substring_search(groups, text)
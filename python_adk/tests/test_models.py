@@ -0,0 +1,30 @@
+import pytest
+from pydantic import ValidationError
+
+from python_adk.shared_libraries.models import CCCDAnalysisRequest, PhoneAnalysisRequest
+
+
+@pytest.mark.parametrize("value", ["0912345678", "01234567890"])
+def test_valid_phone_number(value):
+    assert PhoneAnalysisRequest(phone_number=value).phone_number == value
+
+
+@pytest.mark.parametrize("value, message", [
+    ("09123a5678", "Số điện thoại chỉ được chứa chữ số"),
+    ("091234567", "Số điện thoại phải có 10 hoặc 11 chữ số"),
+    ("091234567890", "Số điện thoại phải có 10 hoặc 11 chữ số"),
+])
+def test_invalid_phone_number_keeps_vietnamese_message(value, message):
+    with pytest.raises(ValidationError) as error:
+        PhoneAnalysisRequest(phone_number=value)
+    assert message in str(error.value)
+
+
+@pytest.mark.parametrize("value, message", [
+    ("12a456", "Dãy số chỉ được chứa chữ số"),
+    ("12345", "Phải nhập đúng 6 chữ số cuối của CCCD"),
+])
+def test_invalid_cccd_keeps_vietnamese_message(value, message):
+    with pytest.raises(ValidationError) as error:
+        CCCDAnalysisRequest(cccd_last_digits=value)
+    assert message in str(error.value)
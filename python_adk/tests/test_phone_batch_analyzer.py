@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from python_adk.constants.combinations import COMBINATIONS
+from python_adk.agents.batcuclinh_so_agent.tools.phone_analyzer import PhoneAnalyzer
+from python_adk.agents.batcuclinh_so_agent.tools.phone_batch_analyzer import (
+    STAR_LEVELS,
+    batch_analyze_phones,
+    iter_batch_analyze_phones,
+    phones_to_digit_array,
+)
+
+
+def _random_phones(count, seed=2024):
+    rng = np.random.default_rng(seed)
+    digits = rng.integers(0, 10, size=(count, 10), dtype=np.uint8)
+    # Tăng tỉ lệ số 0/5 để có nhiều nhóm 0/5 liên tiếp
+    digits[rng.random((count, 10)) < 0.2] = 0
+    digits[rng.random((count, 10)) < 0.1] = 5
+    digits[:, 0] = 0
+    return ["".join(map(str, row)) for row in digits]
+
+
+def test_batch_matches_map_to_star_sequence():
+    phones = _random_phones(5000) + ["0000000000", "0555555555", "0912345678", "0505050505"]
+    result = batch_analyze_phones(phones_to_digit_array(phones))
+
+    for row, phone in enumerate(phones):
+        expected = PhoneAnalyzer._map_to_star_sequence(phone)
+        mask = result.pair_mask[row]
+        assert result.star_sequence(row) == [entry["star"] for entry in expected], phone
+        assert result.energy_level[row][mask].tolist() == [entry["energyLevel"] for entry in expected], phone
+        assert [STAR_LEVELS[i] for i in result.level_index[row][mask]] == [entry["level"] for entry in expected]
+        assert result.zero_count[row][mask].tolist() == [entry["zeroCount"] for entry in expected]
+        assert result.five_count[row][mask].tolist() == [entry["fiveCount"] for entry in expected]
+        assert np.allclose(result.adjusted_energy[row][mask], [entry["adjustedEnergy"] for entry in expected])
+        stars = [entry["star"] for entry in expected]
+        pairs = [f"{first}_{second}" for first, second in zip(stars, stars[1:])]
+        assert result.combinations(row) == [key for key in pairs if key in COMBINATIONS], phone
+        assert result.total_energy[row] == pytest.approx(sum(entry["adjustedEnergy"] for entry in expected), rel=1e-5)
+
+
+def test_iter_batch_matches_single_batch():
+    phones = _random_phones(1000, seed=7)
+    digits = phones_to_digit_array(phones)
+    whole = batch_analyze_phones(digits)
+
+    offsets = []
+    for offset, chunk in iter_batch_analyze_phones(digits, chunk_size=256):
+        offsets.append(offset)
+        assert np.array_equal(chunk.star_index, whole.star_index[offset:offset + len(chunk)])
+        assert np.array_equal(chunk.combination_index, whole.combination_index[offset:offset + len(chunk)])
+    assert offsets == [0, 256, 512, 768]
+
+
+def test_invalid_input_rejected():
+    with pytest.raises(ValueError):
+        phones_to_digit_array(["091234567"])
+    with pytest.raises(ValueError):
+        batch_analyze_phones(np.zeros((2, 9), dtype=np.uint8))
+    with pytest.raises(ValueError):
+        batch_analyze_phones(np.full((1, 10), 10, dtype=np.uint8))
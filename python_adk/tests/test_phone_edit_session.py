@@ -0,0 +1,100 @@
+import random
+
+import pytest
+
+from python_adk.agents.batcuclinh_so_agent.tools.phone_analyzer import PhoneAnalyzer
+from python_adk.agents.batcuclinh_so_agent.tools.phone_edit_session import MAX_DIGITS, PhoneEditSession
+
+
+def _full(session):
+    snapshot = session.snapshot()
+    return snapshot["digits"], snapshot["starSequence"], snapshot["combinations"]
+
+
+def _random_edit(rng, digits):
+    operations = ["insert"] if not digits else ["insert", "delete", "replace"]
+    if len(digits) >= MAX_DIGITS:
+        operations.remove("insert")
+    operation = rng.choice(operations)
+    limit = len(digits) if operation == "insert" else len(digits) - 1
+    # Ưu tiên 0 / 5 để hay tạo nhóm 0/5 dài, nơi cửa sổ neo dễ sai nhất
+    digit = rng.choice("0055123456789") if operation != "delete" else None
+    return operation, rng.randint(0, limit), digit
+
+
+def _splice(items, change):
+    items[change["start"]:change["start"] + change["deleteCount"]] = change["items"]
+
+
+def test_edits_match_fresh_analysis():
+    rng = random.Random(15)
+    for _ in range(200):
+        session = PhoneEditSession("".join(rng.choice("0123456789") for _ in range(rng.randint(0, 12))))
+        stars = session.snapshot()["starSequence"]
+        combinations = list(session.combinations)
+        for _ in range(25):
+            operation, position, digit = _random_edit(rng, session.digits)
+            delta = session.apply(operation, position, digit)
+
+            fresh = PhoneEditSession(session.digits)
+            assert _full(session) == _full(fresh)
+            assert session.snapshot()["starSequence"] == PhoneAnalyzer._map_to_star_sequence(session.digits)
+
+            # Client áp delta lên bản đang giữ phải ra đúng kết quả mới
+            _splice(stars, delta["starSequence"])
+            _splice(combinations, delta["combinations"])
+            if "specialAttribute" in delta:
+                stars = [{**star, **delta["specialAttribute"]} for star in stars]
+            assert stars == fresh.snapshot()["starSequence"]
+            assert combinations == fresh.combinations
+            assert delta["version"] == session.version
+
+
+@pytest.mark.parametrize("operation, position, digit", [
+    ("swap", 0, "1"),
+    ("insert", 11, "1"),
+    ("delete", 10, None),
+    ("replace", -1, "1"),
+    ("replace", 0, None),
+    ("insert", 0, "12"),
+    ("replace", 0, "a"),
+])
+def test_invalid_edit(operation, position, digit):
+    session = PhoneEditSession("0912345678")
+    with pytest.raises(ValueError):
+        session.apply(operation, position, digit)
+    assert session.digits == "0912345678" and session.version == 0
+
+
+def test_invalid_digits_and_length():
+    with pytest.raises(ValueError):
+        PhoneEditSession("09123a5678")
+    with pytest.raises(ValueError):
+        PhoneEditSession("1" * (MAX_DIGITS + 1))
+    session = PhoneEditSession("1" * MAX_DIGITS)
+    with pytest.raises(ValueError):
+        session.apply("insert", 0, "1")
+
+
+def test_edit_routes_reject_stale_version_and_invalid_edit():
+    pytest.importorskip("google.adk")
+    from fastapi.testclient import TestClient
+
+    import python_adk.main as main
+
+    client = TestClient(main.app)
+    created = client.post("/analyze/phone/session", json={"phoneNumber": "0912345678", "compact": False}).json()
+    session_id = created["result"]["sessionId"]
+    edit_url = f"/analyze/phone/session/{session_id}/edit"
+
+    edited = client.post(edit_url, json={"op": "replace", "position": 9, "digit": "9", "version": 0})
+    assert edited.status_code == 200 and edited.json()["result"]["version"] == 1
+
+    stale = client.post(edit_url, json={"op": "replace", "position": 9, "digit": "1", "version": 0})
+    assert stale.status_code == 409
+    assert client.get(f"/analyze/phone/session/{session_id}").json()["result"]["digits"] == "0912345679"
+
+    assert client.post(edit_url, json={"op": "swap", "position": 0, "version": 1}).status_code == 400
+    assert client.post(edit_url, json={"op": "delete", "position": 10}).status_code == 400
+    assert client.post("/analyze/phone/session/khong-co/edit", json={"op": "delete", "position": 0}).status_code == 404
+    assert client.post("/analyze/phone/session", json={"phoneNumber": "1" * (MAX_DIGITS + 1)}).status_code == 400
@@ -0,0 +1,75 @@
+import itertools
+
+import pytest
+
+from python_adk.agents.batcuclinh_so_agent.tools.phone_generator import (
+    PHONE_LENGTH,
+    generate_phone_numbers,
+    phone_generator,
+    score_phone,
+)
+
+
+def _brute_force(prefix, required="", forbidden="", purpose=None, top_k=5):
+    allowed = [digit for digit in "0123456789" if digit not in forbidden]
+    scored = []
+    for tail in itertools.product(allowed, repeat=PHONE_LENGTH - len(prefix)):
+        number = prefix + "".join(tail)
+        if set(required) <= set(number):
+            scored.append((-score_phone(number, purpose)["score"], number))
+    scored.sort()
+    return scored[:top_k]
+
+
+@pytest.mark.parametrize("prefix, required, forbidden, purpose", [
+    ("098812", "", "", None),
+    ("098812", "68", "4", "kinh doanh"),
+    ("090555", "9", "07", "tình cảm"),
+    ("0368", "", "012345", None),
+])
+def test_beam_search_matches_brute_force_top_k(prefix, required, forbidden, purpose):
+    top_k = 8
+    expected = _brute_force(prefix, required, forbidden, purpose, top_k)
+    result = generate_phone_numbers(prefix, required, forbidden, purpose, top_k)
+
+    assert [item["score"] for item in result] == pytest.approx([-score for score, _ in expected])
+    for item in result:
+        number = item["phone_number"]
+        assert number.startswith(prefix) and len(number) == PHONE_LENGTH
+        assert set(required) <= set(number)
+        assert not set(number[len(prefix):]) & set(forbidden)
+        assert item == score_phone(number, purpose)
+
+
+def test_forbidden_zero_only_applies_to_subscriber_digits():
+    result = generate_phone_numbers(forbidden_digits=["0"], top_k=3)
+    assert len(result) == 3
+    for item in result:
+        assert item["phone_number"].startswith("0")
+        assert "0" not in item["phone_number"][3:]
+
+
+def test_forbidden_digit_in_carrier_prefix_keeps_prefix():
+    result = generate_phone_numbers(prefix="098", forbidden_digits="98", top_k=3)
+    assert len(result) == 3
+    for item in result:
+        assert item["phone_number"].startswith("098")
+        assert item["carrier"] == "viettel"
+        assert not set(item["phone_number"][3:]) & {"8", "9"}
+
+
+def test_invalid_constraints():
+    with pytest.raises(ValueError):
+        generate_phone_numbers(required_digits="6", forbidden_digits="6")
+    with pytest.raises(ValueError):
+        generate_phone_numbers(forbidden_digits="0123456789")
+    with pytest.raises(ValueError):
+        generate_phone_numbers(prefix="0111")
+    with pytest.raises(ValueError):
+        generate_phone_numbers(forbidden_digits=["ab"])
+
+
+def test_tool_reports_errors():
+    assert phone_generator(forbidden_digits=["0"], top_k=2)["success"] is True
+    result = phone_generator(required_digits=["1"], forbidden_digits=["1"])
+    assert result["success"] is False and result["suggestions"] == []
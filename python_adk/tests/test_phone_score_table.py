@@ -0,0 +1,101 @@
+import random
+
+import pytest
+
+from python_adk.agents.batcuclinh_so_agent.tools.phone_analyzer import PhoneAnalyzer
+from python_adk.agents.batcuclinh_so_agent.tools.phone_generator import (
+    STAR_SIGNS,
+    generate_phone_numbers,
+    score_phone,
+)
+from python_adk.agents.batcuclinh_so_agent.tools.phone_score_table import (
+    PURPOSE_KEYS,
+    STAR_NIBBLE_MAX,
+    PhoneScoreTable,
+    _prefix_state,
+    _star_code,
+    _TransitionTable,
+    build_prefix_table,
+)
+from python_adk.constants.star_index import STAR_KEYS
+
+PREFIX = "098"
+TOP_N = 30
+# Điểm trong bảng được làm tròn tới 0.01 ở mỗi bước
+TOLERANCE = 0.05
+
+
+@pytest.fixture(scope="module")
+def table(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("phone_scores")
+    build_prefix_table(PREFIX, str(directory), top_n=TOP_N)
+    return PhoneScoreTable(str(directory))
+
+
+def _sample_numbers():
+    rng = random.Random(11)
+    numbers = [PREFIX + "0000000", PREFIX + "9999999", PREFIX + "5050505", PREFIX + "0555000"]
+    numbers += [PREFIX + "".join(rng.choice("0123456789") for _ in range(7)) for _ in range(300)]
+    return numbers
+
+
+def test_no_zero_star_is_emitted():
+    start = _prefix_state(PREFIX)[0]
+    transitions = _TransitionTable(start)
+    emitted = {STAR_KEYS[code] for code in transitions.star.tolist() if code >= 0}
+    assert emitted and not any(star.endswith("_ZERO") for star in emitted)
+    assert int(transitions.star.max()) + 1 <= STAR_NIBBLE_MAX
+
+    with pytest.raises(ValueError):
+        _star_code(STAR_KEYS[-1])
+
+
+def test_records_match_score_phone(table):
+    for number in _sample_numbers():
+        record = table.lookup(number)
+        expected = score_phone(number)
+        assert record["stars"] == expected["stars"], number
+        assert record["score"] == pytest.approx(expected["score"], abs=TOLERANCE), number
+
+        energy = sum(
+            STAR_SIGNS.get(item["star"], 0) * item["energyLevel"] * item["responseFactor"]
+            for item in PhoneAnalyzer._map_to_star_sequence(number)
+            if item["star"] != "UNKNOWN"
+        )
+        assert record["energy"] == pytest.approx(energy, abs=TOLERANCE), number
+        assert record["good_count"] == sum(STAR_SIGNS.get(star, 0) > 0 for star in expected["stars"])
+        assert record["bad_count"] == sum(STAR_SIGNS.get(star, 0) < 0 for star in expected["stars"])
+
+        for key in PURPOSE_KEYS:
+            with_purpose = score_phone(number, key)
+            net = with_purpose["favorable_count"] - with_purpose["unfavorable_count"]
+            assert record["purpose_net"][key] == net, (number, key)
+
+
+@pytest.mark.parametrize("purpose", [None] + list(PURPOSE_KEYS[:3]))
+def test_top_n_matches_generator(table, purpose):
+    best = table.best(PREFIX, TOP_N, purpose)
+    expected = generate_phone_numbers(PREFIX, purpose=purpose, top_k=TOP_N)
+
+    assert len(best) == TOP_N
+    assert [score for _, score in best] == pytest.approx(
+        [item["score"] for item in expected], abs=TOLERANCE
+    )
+    for number, score in best:
+        assert score == pytest.approx(score_phone(number, purpose)["score"], abs=TOLERANCE)
+
+    # Vượt top-N trong sidecar thì quét cột điểm, phần đầu vẫn giữ nguyên
+    assert table.best(PREFIX, TOP_N + 5, purpose)[:TOP_N] == best
+
+
+def test_percentile(table):
+    top_number = table.best(PREFIX, 1)[0][0]
+    assert table.percentile(top_number) > 99.9
+    # Phần trăm xếp hạng tăng theo điểm
+    numbers = sorted(_sample_numbers()[:50], key=lambda number: table.lookup(number)["score"])
+    percentiles = [table.percentile(number) for number in numbers]
+    assert percentiles == sorted(percentiles)
+    assert 0 <= percentiles[0] <= percentiles[-1] <= 100
+    assert table.lookup("0100000000") is None and table.percentile("0100000000") is None
+    with pytest.raises(ValueError):
+        table.lookup("098123")
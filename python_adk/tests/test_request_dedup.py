@@ -0,0 +1,206 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from python_adk.shared_libraries.request_dedup import (
+    IdempotencyStore, SingleFlight, StoredResponse, request_fingerprint
+)
+
+
+class Counter:
+    """Hàm tính toán đếm số lần chạy, chờ `gate` trước khi trả kết quả"""
+
+    def __init__(self, result="ok", error=None):
+        self.result = result
+        self.error = error
+        self.calls = 0
+        self.finished = 0
+        self.gate = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.gate.wait()
+        self.finished += 1
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def test_concurrent_identical_calls_share_one_computation():
+    async def scenario():
+        flight = SingleFlight()
+        fn = Counter()
+        waiters = [asyncio.create_task(flight.do("k", fn)) for _ in range(5)]
+        await asyncio.sleep(0)
+        fn.gate.set()
+        results = await asyncio.gather(*waiters)
+        return results, fn.calls, flight.stats()
+
+    results, calls, stats = asyncio.run(scenario())
+    assert results == ["ok"] * 5 and calls == 1
+    assert stats == {"enabled": True, "inflight": 0, "leaders": 1, "shared": 4}
+
+
+def test_error_is_raised_to_every_waiter_and_not_kept():
+    async def scenario():
+        flight = SingleFlight()
+        error = RuntimeError("model lỗi")
+        fn = Counter(error=error)
+        waiters = [asyncio.create_task(flight.do("k", fn)) for _ in range(3)]
+        await asyncio.sleep(0)
+        fn.gate.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+
+        # Lượt lỗi không được giữ lại: lần gọi sau chạy lại
+        retry = Counter()
+        retry.gate.set()
+        return error, results, await flight.do("k", retry), retry.calls
+
+    error, results, retried, calls = asyncio.run(scenario())
+    assert all(result is error for result in results)
+    assert retried == "ok" and calls == 1
+
+
+def test_cancelling_the_leader_does_not_cancel_the_shared_computation():
+    async def scenario():
+        flight = SingleFlight()
+        fn = Counter()
+        leader = asyncio.create_task(flight.do("k", fn))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("k", fn))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        fn.gate.set()
+        return leader, await follower, fn
+
+    leader, result, fn = asyncio.run(scenario())
+    assert leader.cancelled()
+    assert result == "ok" and fn.calls == 1 and fn.finished == 1
+
+
+def test_disabled_single_flight_runs_every_call():
+    async def scenario():
+        flight = SingleFlight(enabled=False)
+        fn = Counter()
+        fn.gate.set()
+        await asyncio.gather(flight.do("k", fn), flight.do("k", fn))
+        return fn.calls
+
+    assert asyncio.run(scenario()) == 2
+
+
+def test_idempotency_store_rejects_reused_key_with_other_body():
+    store = IdempotencyStore()
+    fingerprint = request_fingerprint("/analyze", '{"value":"1"}')
+    stored = StoredResponse(fingerprint, 200, b"{}", "application/json")
+    store.set("/analyze", "key-1", stored)
+
+    assert store.get("/analyze", "key-1", fingerprint) == stored
+    assert store.get("/analyze/phone", "key-1", fingerprint) is None
+    with pytest.raises(ValueError):
+        store.get("/analyze", "key-1", request_fingerprint("/analyze", '{"value":"2"}'))
+    assert store.stats()["conflicts"] == 1
+
+
+# --- _deduplicated trong main.py ---
+
+class Payload(BaseModel):
+    value: str
+
+
+@pytest.fixture
+def main(monkeypatch):
+    pytest.importorskip("google.adk")
+    import python_adk.main as main
+
+    monkeypatch.setattr(main, "single_flight", SingleFlight())
+    monkeypatch.setattr(main, "idempotency_store", IdempotencyStore())
+    return main
+
+
+def _compute(counter, status_code=200):
+    async def compute():
+        counter.append(1)
+        await asyncio.sleep(0.01)
+        return Response(content=f"lần {len(counter)}", status_code=status_code)
+    return compute
+
+
+def test_replay_with_idempotency_key(main):
+    async def scenario():
+        calls = []
+        first = await main._deduplicated("/r", Payload(value="a"), "key-1", _compute(calls))
+        second = await main._deduplicated("/r", Payload(value="a"), "key-1", _compute(calls))
+        return calls, first, second
+
+    calls, first, second = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert "Idempotent-Replayed" not in first.headers
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert second.body == first.body == "lần 1".encode("utf-8")
+
+
+def test_reused_key_with_other_body_is_422(main):
+    async def scenario():
+        calls = []
+        await main._deduplicated("/r", Payload(value="a"), "key-1", _compute(calls))
+        await main._deduplicated("/r", Payload(value="b"), "key-1", _compute(calls))
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(scenario())
+    assert error.value.status_code == 422
+
+
+def test_error_responses_are_not_stored(main):
+    async def failing():
+        raise HTTPException(status_code=409, detail="lệch phiên bản")
+
+    async def scenario():
+        calls = []
+        first = await main._deduplicated("/r", Payload(value="a"), "key-1", _compute(calls, 500))
+        second = await main._deduplicated("/r", Payload(value="a"), "key-1", _compute(calls, 500))
+        with pytest.raises(HTTPException):
+            await main._deduplicated("/r", Payload(value="b"), "key-2", failing)
+        third = await main._deduplicated("/r", Payload(value="b"), "key-2", _compute(calls))
+        return calls, first, second, third
+
+    calls, first, second, third = asyncio.run(scenario())
+    assert len(calls) == 3
+    assert first.status_code == second.status_code == 500
+    assert "Idempotent-Replayed" not in second.headers
+    assert third.status_code == 200
+
+
+def test_without_coalescing_only_same_key_retries_are_merged(main):
+    async def run(keys):
+        calls = []
+        await asyncio.gather(*(
+            main._deduplicated("/edit", Payload(value="a"), key, _compute(calls), coalesce=False) for key in keys
+        ))
+        return len(calls)
+
+    assert asyncio.run(run([None, None])) == 2
+    assert asyncio.run(run(["key-1", "key-2"])) == 2
+    assert asyncio.run(run(["key-3", "key-3"])) == 1
+
+
+def test_edit_route_retry_with_same_key_applies_once(main):
+    from fastapi.testclient import TestClient
+
+    client = TestClient(main.app)
+    session_id = client.post("/analyze/phone/session", json={"phoneNumber": "0912345678"}).json()["result"]["sessionId"]
+    url = f"/analyze/phone/session/{session_id}/edit"
+    edit = {"op": "insert", "position": 0, "digit": "1"}
+
+    first = client.post(url, json=edit, headers={"Idempotency-Key": "edit-1"})
+    retry = client.post(url, json=edit, headers={"Idempotency-Key": "edit-1"})
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+    # Cùng nội dung nhưng không có khóa (hoặc khóa khác) là một lần sửa mới
+    client.post(url, json=edit)
+    client.post(url, json=edit, headers={"Idempotency-Key": "edit-2"})
+    assert client.get(f"/analyze/phone/session/{session_id}").json()["result"]["digits"] == "1110912345678"
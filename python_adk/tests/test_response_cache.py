@@ -0,0 +1,87 @@
+import pytest
+
+from python_adk.shared_libraries.response_cache import ResponseCache, is_standalone_question, normalize_prompt
+
+
+@pytest.fixture
+def cache():
+    return ResponseCache(ttl=None)
+
+
+def test_folded_questions_share_an_entry(cache):
+    assert cache.set("Ý nghĩa sao Thiên Y là gì?", "root", "Thiên Y là sao cát, cặp 13, 31, 68, 86.")
+    assert cache.get("y nghia  sao thien y la gi", "root") == "Thiên Y là sao cát, cặp 13, 31, 68, 86."
+
+
+def test_follow_up_does_not_leak_another_users_analysis(cache):
+    # Người dùng A: lượt thứ hai trả lời xác nhận, agent phân tích số đã nêu ở lượt trước
+    analysis = "Số 0912345678 có các cặp 09, 12, 34, 56, 78: Phục Vị, Thiên Y, ..."
+    assert not cache.set("Có, phân tích giúp tôi", "root", analysis, first_turn=False)
+    # Kể cả khi bị coi là lượt đầu, câu trả lời chứa số không có trong tin nhắn không được lưu
+    assert not cache.set("Có, phân tích giúp tôi", "root", analysis, first_turn=True)
+    assert cache.stats()["rejected"] == {"long_number": 1}
+
+    # Người dùng B hỏi đúng câu đó không nhận được phân tích của A
+    assert cache.get("Có, phân tích giúp tôi", "root") is None
+    assert cache.get("Có, phân tích giúp tôi", "root", first_turn=False) is None
+    assert cache.stats()["bypassed"]["follow_up"] == 1
+
+
+def test_numbers_stay_literal_in_the_key(cache):
+    assert cache.set("Tôi sinh năm 1990 thì mệnh gì?", "root", "Người sinh năm 1990 mệnh Thổ.")
+    assert cache.get("Tôi sinh năm 1985 thì mệnh gì?", "root") is None
+    assert cache.get("tôi sinh năm 1990 thì mệnh gì", "root") == "Người sinh năm 1990 mệnh Thổ."
+    assert normalize_prompt("Sinh năm 1990") != normalize_prompt("Sinh năm 1985")
+
+
+def test_response_with_number_not_in_prompt_is_not_stored(cache):
+    assert not cache.set("Tôi sinh năm 1990 thì mệnh gì?", "root", "Người sinh năm 1985 mệnh Kim.")
+    assert cache.stats()["rejected"] == {"foreign_number": 1}
+
+
+def test_personal_numbers_bypass_the_cache(cache):
+    assert not cache.set("số 0912 345 678 thế nào", "root", "Số này tốt.")
+    assert cache.get("số 0912 345 678 thế nào", "root") is None
+    assert cache.stats()["bypassed"] == {"personal_number": 1}
+
+
+def test_later_turns_read_standalone_questions_but_never_store(cache):
+    assert not cache.set("Ý nghĩa sao Thiên Y là gì?", "root", "Thiên Y là sao cát.", first_turn=False)
+    assert cache.get("Ý nghĩa sao Thiên Y là gì?", "root") is None
+
+    assert cache.set("Ý nghĩa sao Thiên Y là gì?", "root", "Thiên Y là sao cát.")
+    assert cache.get("Ý nghĩa sao Thiên Y là gì?", "root", first_turn=False) == "Thiên Y là sao cát."
+
+
+def test_personal_question_mid_session_does_not_leak(cache):
+    # Người dùng A hỏi giữa phiên, agent trả lời dựa vào số của A trong lịch sử (chỉ có cặp 2 chữ số)
+    message = "Ý nghĩa số điện thoại của tôi là gì?"
+    personal = "Số của bạn có cặp 68 là sao Sinh Khí, cặp 14 Thiên Y..."
+    assert not cache.set(message, "root", personal, first_turn=False)
+    assert cache.get(message, "root") is None
+
+    # Câu trả lời chung ở lượt đầu (chưa có số) không được trả cho người đã nêu số ở lượt trước
+    generic = "Bạn hãy cho tôi biết số điện thoại cần phân tích."
+    assert cache.set(message, "root", generic)
+    assert cache.get(message, "root") == generic
+    assert cache.get(message, "root", first_turn=False) is None
+
+
+@pytest.mark.parametrize("message, expected", [
+    ("Ý nghĩa sao Thiên Y là gì?", True),
+    ("Sao Diên Niên có nghĩa là gì", True),
+    ("Vậy sao đó là gì?", False),
+    ("là gì?", False),
+    ("Có, phân tích giúp tôi", False),
+    ("Ý nghĩa số điện thoại của tôi là gì?", False),
+    ("Số mình có ý nghĩa là gì", False),
+    ("Sim của bạn có ý nghĩa là gì", False),
+])
+def test_is_standalone_question(message, expected):
+    assert is_standalone_question(message) is expected
+
+
+def test_excluded_agents_are_never_cached():
+    cache = ResponseCache(exclude_agents=["payment_agent"])
+    assert not cache.set("Giá gói VIP là gì vậy bạn", "payment_agent", "Gói VIP có giá ...")
+    assert cache.get("Giá gói VIP là gì vậy bạn", "payment_agent") is None
@@ -0,0 +1,42 @@
+import asyncio
+import time
+
+from python_adk.session.session_manager import SessionManager
+from python_adk.session.session_reaper import SessionReaper
+from python_adk.session.session_store import MemorySessionStore
+
+
+def _manager_with_expired(count):
+    manager = SessionManager(ttl=60, store=MemorySessionStore())
+    for index in range(count):
+        manager.store.put(f"s{index}", {"session_id": f"s{index}"}, time.time() - 1)
+    manager.track_session("live", user_id="u1")
+    return manager
+
+
+def test_reap_once_notifies_listeners_in_batches():
+    manager = _manager_with_expired(5)
+    seen_sync, seen_async = [], []
+
+    async def async_listener(session_ids):
+        seen_async.append(list(session_ids))
+
+    def failing_listener(session_ids):
+        raise RuntimeError("boom")
+
+    reaper = SessionReaper(
+        manager, batch_size=2, max_slice=10,
+        on_expired=[seen_sync.append, failing_listener, async_listener]
+    )
+    assert asyncio.run(reaper.reap_once()) == 5
+    assert [len(batch) for batch in seen_sync] == [2, 2, 1]
+    assert seen_async == seen_sync
+    assert manager.count_sessions() == 1
+    assert reaper.stats()["total_evictions"] == 5
+
+
+def test_track_session_creates_then_extends():
+    manager = SessionManager(ttl=60, store=MemorySessionStore())
+    assert manager.track_session("s1", user_id="u1") is True
+    assert manager.track_session("s1", user_id="u1") is False
+    assert manager.get_session("s1").user_id == "u1"
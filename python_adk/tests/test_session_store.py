@@ -0,0 +1,111 @@
+import time
+
+import pytest
+
+from python_adk.session.session_manager import Session, SessionManager
+from python_adk.session.session_store import (
+    MemorySessionStore,
+    RedisSessionStore,
+    SQLiteSessionStore,
+    create_session_store,
+)
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        backend = MemorySessionStore()
+    elif request.param == "sqlite":
+        backend = SQLiteSessionStore(str(tmp_path / "sessions.sqlite3"))
+    else:
+        fakeredis = pytest.importorskip("fakeredis")
+        backend = RedisSessionStore(client=fakeredis.FakeRedis(decode_responses=True), prefix="test:")
+    yield backend
+    backend.close()
+
+
+@pytest.fixture
+def now():
+    # Thời điểm hết hạn nằm trong tương lai thật (Redis đặt TTL theo time.time()),
+    # các lần kiểm tra dùng `now` logic để giả lập thời gian trôi
+    return time.time() + 60
+
+
+def test_put_get_and_ttl_expiry(store, now):
+    store.put("s1", {"state": {"step": 1}}, now + 10, user_id="u1")
+    assert store.get("s1", now=now) == {"state": {"step": 1}}
+    assert store.get("s1", now=now + 10) is None
+    assert store.get("missing", now=now) is None
+
+
+def test_get_returns_copy(store, now):
+    data = {"messages": ["hi"]}
+    store.put("s1", data, now + 10)
+    data["messages"].append("changed after put")
+    loaded = store.get("s1", now=now)
+    loaded["messages"].append("changed after get")
+    assert store.get("s1", now=now) == {"messages": ["hi"]}
+
+
+def test_pop_expired_in_expiry_order_with_limit(store, now):
+    for index, offset in enumerate([5, 1, 3, 100]):
+        store.put(f"s{index}", {"index": index}, now + offset, user_id="u1")
+    assert store.pop_expired(now=now + 10, limit=2) == ["s1", "s2"]
+    assert store.pop_expired(now=now + 10) == ["s0"]
+    assert store.pop_expired(now=now + 10) == []
+    assert store.count() == 1
+    assert [data["index"] for data in store.list("u1", now=now)] == [3]
+
+
+def test_list_filters_user_and_expired(store, now):
+    store.put("a", {"id": "a"}, now + 10, user_id="u1")
+    store.put("b", {"id": "b"}, now + 10, user_id="u2")
+    store.put("c", {"id": "c"}, now + 1, user_id="u1")
+    assert sorted(data["id"] for data in store.list(now=now)) == ["a", "b", "c"]
+    assert sorted(data["id"] for data in store.list("u1", now=now + 5)) == ["a"]
+    assert store.list("nobody", now=now) == []
+
+
+def test_touch_extends_expiry(store, now):
+    store.put("s1", {"v": 1}, now + 5, user_id="u1")
+    assert store.touch("s1", now + 50, now=now)
+    assert store.pop_expired(now=now + 10) == []
+    assert store.get("s1", now=now + 10) == {"v": 1}
+    assert store.pop_expired(now=now + 60) == ["s1"]
+    # Phiên đã hết hạn hoặc không tồn tại không được gia hạn
+    store.put("s2", {"v": 2}, now + 5)
+    assert not store.touch("s2", now + 50, now=now + 6)
+    assert not store.touch("missing", now + 50, now=now)
+
+
+def test_put_again_moves_expiry_and_owner(store, now):
+    store.put("s1", {"v": 1}, now + 5, user_id="u1")
+    store.put("s1", {"v": 2}, now + 50, user_id="u2")
+    assert store.pop_expired(now=now + 10) == []
+    assert store.list("u1", now=now) == []
+    assert store.list("u2", now=now) == [{"v": 2}]
+
+
+def test_delete(store, now):
+    store.put("s1", {"v": 1}, now + 5, user_id="u1")
+    assert store.delete("s1")
+    assert not store.delete("s1")
+    assert store.list("u1", now=now) == []
+    assert store.pop_expired(now=now + 10) == []
+
+
+def test_create_session_store_rejects_unknown_type():
+    with pytest.raises(ValueError):
+        create_session_store("mongo")
+
+
+def test_session_manager_round_trip_and_touch():
+    manager = SessionManager(ttl=60, store=MemorySessionStore())
+    session = manager.get_or_create_session("s1", user_id="u1")
+    session.state["purpose"] = "business"
+    manager.save_session(session)
+    assert manager.get_session("s1").state == {"purpose": "business"}
+    assert manager.touch_session("s1")
+    assert not manager.touch_session("missing")
+    assert [s.session_id for s in manager.list_sessions("u1")] == ["s1"]
+    assert isinstance(manager.get_session("s1"), Session)
@@ -0,0 +1,138 @@
+import random
+
+import pytest
+
+from python_adk.agents.batcuclinh_so_agent.tools import star_inventory_index as inventory_module
+from python_adk.agents.batcuclinh_so_agent.tools.phone_analyzer import PhoneAnalyzer
+from python_adk.agents.batcuclinh_so_agent.tools.star_inventory_index import StarInventoryIndex
+
+
+def _numbers(count, seed=5):
+    rng = random.Random(seed)
+    return list(dict.fromkeys(
+        "09" + "".join(rng.choice("0123456789") for _ in range(8)) for _ in range(count)
+    ))
+
+
+def _stars(number):
+    return [item["star"] for item in PhoneAnalyzer._map_to_star_sequence(number)]
+
+
+def _brute_force(numbers, at=None, include=(), exclude=(), min_counts=None, max_counts=None):
+    matched = []
+    for number in numbers:
+        stars = _stars(number)
+        if any(position >= len(stars) or position < -len(stars) or stars[position] != star
+               for position, star in (at or {}).items()):
+            continue
+        if any(star not in stars for star in include) or any(star in stars for star in exclude):
+            continue
+        if any(stars.count(star) < count for star, count in (min_counts or {}).items()):
+            continue
+        if any(stars.count(star) > count for star, count in (max_counts or {}).items()):
+            continue
+        matched.append(number)
+    return matched
+
+
+QUERIES = [
+    {"at": {-1: "THIEN_Y"}},
+    {"at": {0: "SINH_KHI", -1: "DIEN_NIEN"}},
+    {"include": ["SINH_KHI"], "exclude": ["TUYET_MENH"]},
+    {"min_counts": {"SINH_KHI": 2}},
+    {"at": {-1: "THIEN_Y"}, "exclude": ["TUYET_MENH"], "min_counts": {"SINH_KHI": 2}},
+    {"max_counts": {"HOA_HAI": 0, "LUC_SAT": 1}},
+]
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_query_matches_brute_force(query):
+    numbers = _numbers(3000)
+    index = StarInventoryIndex(initial_capacity=64)
+    assert index.add_many(numbers) == len(numbers)
+
+    result = index.query(limit=None, **query)
+    expected = _brute_force(numbers, **query)
+    assert result["numbers"] == expected
+    assert result["total"] == len(expected)
+    assert index.query(limit=3, **query)["numbers"] == expected[:3]
+
+
+def test_remove_and_slot_reuse():
+    numbers = _numbers(500)
+    index = StarInventoryIndex()
+    index.add_many(numbers)
+    sold, kept = numbers[:200], numbers[200:]
+
+    assert index.remove_many(sold + ["0900000000"]) == 200
+    assert len(index) == 300 and sold[0] not in index
+    assert index.stats()["free_slots"] == 200
+
+    query = {"include": ["SINH_KHI"]}
+    assert sorted(index.query(limit=None, **query)["numbers"]) == sorted(_brute_force(kept, **query))
+
+    # Slot trống được dùng lại, số đã có thì bỏ qua
+    assert index.add_many(sold[:50] + kept[:10]) == 50
+    assert index.stats()["slots"] == 500
+    assert sorted(index.query(limit=None, **query)["numbers"]) == sorted(_brute_force(kept + sold[:50], **query))
+
+
+def test_invalid_input():
+    index = StarInventoryIndex()
+    with pytest.raises(ValueError):
+        index.add_many(["0912345678", "123"])
+    assert len(index) == 0
+    with pytest.raises(ValueError):
+        index.query(include=["KHONG_CO"])
+
+
+@pytest.mark.parametrize("limit", [0, -1])
+def test_non_positive_limit_returns_no_numbers(limit):
+    index = StarInventoryIndex()
+    index.add_many(_numbers(50))
+    result = index.query(limit=limit)
+    assert result == {"total": 50, "numbers": []}
+    assert len(index.query(limit=1)["numbers"]) == 1
+
+
+def test_load_file_skips_comments_and_invalid_lines(tmp_path):
+    path = tmp_path / "inventory.txt"
+    path.write_text("# kho số\n0912345678\n\n+84 988 123 456\nabc\n0912345678\n", encoding="utf-8")
+    index = StarInventoryIndex()
+    assert index.load_file(str(path)) == 2
+    assert "0988123456" in index and "0912345678" in index
+
+
+def test_singleton_loads_configured_file(tmp_path, monkeypatch):
+    path = tmp_path / "inventory.txt"
+    path.write_text("\n".join(_numbers(20)), encoding="utf-8")
+    monkeypatch.setenv("STAR_INVENTORY_FILE", str(path))
+    assert len(inventory_module._create_star_inventory_index()) == 20
+
+    monkeypatch.setenv("STAR_INVENTORY_FILE", str(tmp_path / "missing.txt"))
+    assert len(inventory_module._create_star_inventory_index()) == 0
+
+
+def test_query_tool(monkeypatch):
+    numbers = _numbers(1000)
+    index = StarInventoryIndex()
+    index.add_many(numbers)
+    monkeypatch.setattr(inventory_module, "star_inventory_index", index)
+
+    result = inventory_module.star_inventory_query(last_star="thien_y", exclude_stars=["TUYET_MENH"], limit=5)
+    expected = _brute_force(numbers, at={-1: "THIEN_Y"}, exclude=["TUYET_MENH"])
+    assert result["success"] is True
+    assert result["total"] == len(expected) and result["numbers"] == expected[:5]
+
+    assert inventory_module.star_inventory_query(include_stars=["XYZ"])["success"] is False
+    for limit in (0, -3):
+        rejected = inventory_module.star_inventory_query(last_star="THIEN_Y", limit=limit)
+        assert rejected["success"] is False and rejected["numbers"] == []
+
+
+def test_query_tool_is_registered_on_agent():
+    pytest.importorskip("google.adk")
+    from python_adk.agents.batcuclinh_so_agent.agent import BatCucLinhSoAgent
+
+    agent = BatCucLinhSoAgent()
+    assert "star_inventory_query" in [tool.name for tool in agent.tools]
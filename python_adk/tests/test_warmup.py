@@ -0,0 +1,31 @@
+import asyncio
+
+from python_adk.agents.batcuclinh_so_agent.tools.cccd_analyzer import cccd_analyzer
+from python_adk.agents.batcuclinh_so_agent.tools.phone_analyzer import phone_analyzer
+from python_adk.shared_libraries.cache import analysis_cache
+from python_adk.warmup import WarmupManager, load_warmup_numbers
+
+
+def test_load_warmup_numbers(tmp_path):
+    path = tmp_path / "numbers.txt"
+    path.write_text("# số hay hỏi\n0912 345 678\ncccd:001203012345\npassword:abc\n\nbank_account:896896\n")
+    assert load_warmup_numbers(str(path), 10) == [
+        ("phone", "0912 345 678"), ("cccd", "001203012345"), ("bank_account", "896896")
+    ]
+    assert load_warmup_numbers(str(path), 1) == [("phone", "0912 345 678")]
+
+
+def test_warm_caches_use_same_keys_as_routes(tmp_path):
+    path = tmp_path / "numbers.txt"
+    path.write_text("+84 912 345 679\ncccd:001203012346\n")
+    analysis_cache.clear()
+    manager = WarmupManager(agents=False, numbers_file=str(path), model_client=False)
+    assert asyncio.run(manager.run())
+    assert manager.steps["caches"]["numbers"] == 2
+
+    hits = analysis_cache.stats()["hits"]
+    # /analyze gọi không có purpose, /analyze/phone truyền purpose=None
+    phone_analyzer("0912345679")
+    phone_analyzer("0912345679", None)
+    cccd_analyzer("001203012346")
+    assert analysis_cache.stats()["hits"] == hits + 3
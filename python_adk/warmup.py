@@ -0,0 +1,241 @@
+"""
+Warm-up Module
+
+Giai đoạn khởi động nóng chạy nền trong lifespan của API: dựng agent graph, nạp các bảng tra
+của analyzer, nạp trước analysis_cache bằng các số được hỏi nhiều nhất và dựng sẵn client model.
+Endpoint /ready chỉ báo sẵn sàng khi giai đoạn này kết thúc, để load balancer không chuyển
+request tới worker còn nguội (còn /health chỉ báo tiến trình đang sống).
+"""
+
+import asyncio
+import importlib
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Các module analyzer / bảng tra được nạp ở bước "indexes"
+INDEX_MODULES = (
+    "python_adk.agents.batcuclinh_so_agent.tools.phone_analyzer",
+    "python_adk.agents.batcuclinh_so_agent.tools.cccd_analyzer",
+    "python_adk.agents.batcuclinh_so_agent.tools.bank_account_analyzer",
+    "python_adk.agents.batcuclinh_so_agent.tools.bank_account_suggester",
+    "python_adk.agents.batcuclinh_so_agent.tools.password_analyzer",
+    "python_adk.agents.batcuclinh_so_agent.tools.phone_generator",
+    "python_adk.agents.batcuclinh_so_agent.tools.star_inventory_index",
+    "python_adk.agents.batcuclinh_so_agent.tools.phone_edit_session",
+)
+
+# Loại số hỗ trợ trong file warm-up (không nạp mật khẩu)
+WARMUP_TYPES = ("phone", "cccd", "bank_account")
+
+
+def load_warmup_numbers(path: str, max_numbers: int) -> List[Tuple[str, str]]:
+    """
+    Đọc danh sách số cần nạp trước, mỗi dòng `<loại>:<giá trị>` hoặc chỉ `<giá trị>` (số điện thoại).
+    Dòng trống và dòng bắt đầu bằng `#` bị bỏ qua.
+
+    Args:
+        path (str): Đường dẫn file
+        max_numbers (int): Số dòng tối đa được đọc
+
+    Returns:
+        List[Tuple[str, str]]: Các cặp (loại, giá trị) theo thứ tự trong file
+    """
+    numbers: List[Tuple[str, str]] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            kind, _, value = line.rpartition(":")
+            kind = kind.strip().lower() or "phone"
+            if kind not in WARMUP_TYPES:
+                logger.warning(f"Bỏ qua dòng warm-up không hỗ trợ: {line}")
+                continue
+            numbers.append((kind, value.strip()))
+            if len(numbers) >= max_numbers:
+                break
+    return numbers
+
+
+class WarmupManager:
+    """Chạy các bước warm-up nền và theo dõi trạng thái sẵn sàng"""
+
+    STEPS = ("agents", "indexes", "caches", "model_client")
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        agents: bool = True,
+        numbers_file: Optional[str] = None,
+        max_numbers: int = 1000,
+        model_client: bool = True,
+        timeout: float = 120.0,
+        fail_open: bool = True
+    ):
+        """Khởi tạo Warmup Manager
+
+        Args:
+            enabled: Bật giai đoạn warm-up (tắt thì sẵn sàng ngay)
+            agents: Dựng agent graph trong warm-up
+            numbers_file: File danh sách số được hỏi nhiều nhất để nạp trước cache
+            max_numbers: Số lượng số tối đa nạp trước
+            model_client: Khởi tạo client model (Gemini) của root agent
+            timeout: Thời gian tối đa cho mỗi bước (giây)
+            fail_open: Vẫn báo sẵn sàng khi có bước lỗi / quá thời gian
+        """
+        self.enabled = enabled
+        self.agents = agents
+        self.numbers_file = numbers_file
+        self.max_numbers = max(0, max_numbers)
+        self.model_client = model_client
+        self.timeout = timeout
+        self.fail_open = fail_open
+        self._task: Optional[asyncio.Task] = None
+        self._ready = not enabled
+
+        # Thống kê
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.steps: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def ready(self) -> bool:
+        """Worker đã sẵn sàng nhận traffic chưa"""
+        return self._ready
+
+    def start(self) -> None:
+        """Bắt đầu warm-up nền (cần gọi bên trong event loop đang chạy)"""
+        if not self.enabled:
+            logger.info("Warm-up bị tắt, worker sẵn sàng ngay")
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run(), name="warmup")
+
+    async def stop(self) -> None:
+        """Dừng warm-up nếu còn đang chạy"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def run(self) -> bool:
+        """Chạy lần lượt các bước warm-up
+
+        Returns:
+            bool: True nếu worker sẵn sàng sau warm-up
+        """
+        self.started_at = time.time()
+        logger.info("Bắt đầu warm-up")
+        steps: Dict[str, Callable[[], Optional[Dict[str, Any]]]] = {
+            "agents": self._warm_agents,
+            "indexes": self._warm_indexes,
+            "caches": self._warm_caches,
+            "model_client": self._warm_model_client,
+        }
+        failed = False
+        for name in self.STEPS:
+            step_started = time.perf_counter()
+            try:
+                # Các bước đều là công việc CPU / import chặn nên chạy trong thread
+                detail = await asyncio.wait_for(asyncio.to_thread(steps[name]), timeout=self.timeout)
+                status = "skipped" if detail is None else "ok"
+                self.steps[name] = {"status": status, **(detail or {})}
+            except asyncio.TimeoutError:
+                failed = True
+                self.steps[name] = {"status": "timeout"}
+                logger.error(f"Warm-up bước {name} quá {self.timeout}s")
+            except Exception as e:
+                failed = True
+                self.steps[name] = {"status": "failed", "error": str(e)}
+                logger.error(f"Warm-up bước {name} lỗi: {e}")
+            self.steps[name]["seconds"] = round(time.perf_counter() - step_started, 3)
+            logger.info(f"Warm-up bước {name}: {self.steps[name]}")
+
+        self.finished_at = time.time()
+        self._ready = self.fail_open or not failed
+        logger.info(f"Kết thúc warm-up sau {self.finished_at - self.started_at:.2f}s, ready={self._ready}")
+        return self._ready
+
+    def _warm_agents(self) -> Optional[Dict[str, Any]]:
+        """Dựng root agent cùng các sub-agent và AgentRouter dùng chung"""
+        if not self.agents:
+            return None
+        from python_adk.agents import get_root_agent
+        from python_adk.agents.root_agent.tools.agent_router import get_agent_router
+        root_agent = get_root_agent()
+        get_agent_router()
+        return {"agent": root_agent.name, "sub_agents": len(root_agent.sub_agents)}
+
+    def _warm_indexes(self) -> Optional[Dict[str, Any]]:
+        """Nạp các module analyzer cùng bảng tra dựng sẵn lúc import và bộ phân loại của fast path"""
+        for module in INDEX_MODULES:
+            importlib.import_module(module)
+        # Bộ phân loại ý định của fast path (automaton từ khóa)
+        from python_adk.agents.root_agent.fast_path import fast_path
+        if fast_path.enabled:
+            fast_path.warm()
+        return {"modules": len(INDEX_MODULES)}
+
+    def _warm_caches(self) -> Optional[Dict[str, Any]]:
+        """Chạy analyzer cho các số trong file warm-up để nạp trước analysis_cache"""
+        if not self.numbers_file or not self.max_numbers:
+            return None
+        if not os.path.exists(self.numbers_file):
+            raise FileNotFoundError(f"Không tìm thấy file warm-up: {self.numbers_file}")
+        from python_adk.agents.batcuclinh_so_agent.tools.bank_account_analyzer import bank_account_analyzer
+        from python_adk.agents.batcuclinh_so_agent.tools.cccd_analyzer import cccd_analyzer
+        from python_adk.agents.batcuclinh_so_agent.tools.phone_analyzer import PhoneAnalyzer, phone_analyzer
+
+        analyzers: Dict[str, Callable[[str], Any]] = {
+            # Gọi giống hệt /analyze và /analyze/phone (số đã chuẩn hóa, không có purpose); khóa
+            # cache gắn cả tham số mặc định nên phone_analyzer(n) và phone_analyzer(n, None) trùng nhau
+            "phone": lambda value: phone_analyzer(PhoneAnalyzer._normalize_phone_number(value), None),
+            "cccd": lambda value: cccd_analyzer(value),
+            "bank_account": lambda value: bank_account_analyzer(value),
+        }
+        warmed = errors = 0
+        for kind, value in load_warmup_numbers(self.numbers_file, self.max_numbers):
+            try:
+                analyzers[kind](value)
+                warmed += 1
+            except Exception:
+                errors += 1
+        return {"numbers": warmed, "errors": errors}
+
+    def _warm_model_client(self) -> Optional[Dict[str, Any]]:
+        """
+        Dựng sẵn đối tượng client model của root agent (đọc cấu hình, credential) để lượt chat
+        đầu tiên không phải làm việc này. Bước này không gửi request nên chưa mở kết nối HTTP:
+        kết nối được tạo ở lượt gọi model đầu tiên.
+        """
+        if not self.model_client:
+            return None
+        from python_adk.agents import get_root_agent
+        if not get_root_agent.initialized:
+            return None
+        model = get_root_agent().canonical_model
+        client = model.api_client
+        return {"model": model.model, "vertexai": bool(client.vertexai)}
+
+    def stats(self) -> Dict[str, Any]:
+        """Lấy trạng thái warm-up
+
+        Returns:
+            Dict[str, Any]: Sẵn sàng hay chưa, thời điểm bắt đầu / kết thúc và kết quả từng bước
+        """
+        return {
+            "enabled": self.enabled,
+            "ready": self._ready,
+            "running": self._task is not None and not self._task.done(),
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "steps": self.steps
+        }
@@ -173,4 +173,17 @@ def test_post_suggest_bank_account(base_url):
     if resp.status_code == 200:
         data = resp.json()
         assert data.get('success') is True
-        assert 'result' in data, "Suggest bank account missing result" 
\ No newline at end of file
+        assert 'result' in data, "Suggest bank account missing result" 
+
+def test_adk_analyze_batch(adk_url):
+    url = f"{adk_url}/analyze/batch"
+    payload = {"items": [
+        {"type": "phone", "value": "0984851439"},
+        {"type": "cccd", "value": "012345678912"}
+    ]}
+    resp = requests.post(url, json=payload, stream=True)
+    assert resp.status_code == 200, f"Batch analysis failed: {resp.status_code}"
+    assert resp.headers.get('content-type', '').startswith('application/x-ndjson')
+    results = [json.loads(line) for line in resp.iter_lines() if line]
+    assert [r['index'] for r in results] == [0, 1]
+    assert all(r.get('success') is True for r in results)